@@ -3,10 +3,8 @@
 Centralized FastAPI dependencies for database sessions, repositories, and authentication.
 """
 
-import os
-from typing import Generator
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy import text
+from sqlalchemy.orm import Session
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
@@ -17,24 +15,14 @@ from app.infrastructure.database.repository import (
 )
 from app.infrastructure.database.voice_logs_repository import VoiceLogRepository
 from app.infrastructure.database.models import UserModel
+from app.infrastructure.database.session import get_db, get_engine  # shared pool
 from app.config.settings import settings  # Global settings configuration
 
-# -- Instead of reading from an env var with a fallback:
-# DATABASE_URL = os.getenv("SQLALCHEMY_DATABASE_URI", "postgresql://postgres:password@db:5432/crave_db")
-# -- Use the one from your settings (which logs show is correct on Railway):
-DATABASE_URL = settings.DATABASE_URL
-
-# Create the SQLAlchemy engine.
-engine = create_engine(DATABASE_URL)
-
-# Create a configured session class.
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
 
 def init_db() -> None:
     """Check DB connectivity with a simple query."""
     try:
-        with engine.connect() as connection:
+        with get_engine().connect() as connection:
             connection.execute(text("SELECT 1"))
             connection.commit()
         print("Database connection established successfully.")
@@ -42,15 +30,6 @@ def init_db() -> None:
         print("Error establishing database connection:", e)
 
 
-def get_db() -> Generator[Session, None, None]:
-    """Provide a new SQLAlchemy session for each request."""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 def get_craving_repository(db: Session = Depends(get_db)) -> CravingRepository:
     return CravingRepository(db)
 
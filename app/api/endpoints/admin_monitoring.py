@@ -13,10 +13,16 @@ from typing import List, Dict, Any, Optional
 import json
 
 # Import your DB, models, and AuthService:
-from app.infrastructure.database.session import get_db, engine
+from app.infrastructure.database.session import get_db, get_engine
+from app.infrastructure.database.async_session import current_async_engine
+from app.infrastructure.database.engine import pool_status
 from app.infrastructure.database.models import UserModel, CravingModel, VoiceLogModel, Base
 from app.infrastructure.auth.auth_service import AuthService
 from app.config.settings import Settings
+from app.core.services.craving_indexing_worker import craving_indexing_worker
+from app.core.services.transcription_worker import transcription_worker
+from app.infrastructure.database.outbox_repository import CravingIndexOutboxRepository
+from app.infrastructure.database.transcription_job_repository import TranscriptionJobRepository
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -100,7 +106,7 @@ async def get_application_logs(
 # GET /api/admin/metrics
 # -----------------------------------------------------
 @router.get("/metrics", tags=["Admin"])
-async def get_system_metrics(
+def get_system_metrics(
     admin_user: UserModel = Depends(admin_only),
     db: Session = Depends(get_db)
 ):
@@ -117,7 +123,7 @@ async def get_system_metrics(
         }
         
         db_metrics = {}
-        inspector = inspect(engine)
+        inspector = inspect(get_engine())
         
         # Count users
         try:
@@ -161,12 +167,33 @@ async def get_system_metrics(
             db_metrics["transcribed_voice_logs"] = transcribed_count or 0
         except Exception as e:
             db_metrics["voice_logs_error"] = str(e)
+
+        # Connection pools (checkouts, overflow, time spent waiting for a connection)
+        db_metrics["pools"] = {"sync": pool_status(get_engine())}
+        async_engine = current_async_engine()
+        if async_engine is not None:
+            db_metrics["pools"]["async"] = pool_status(async_engine)
         
+        # Imported here: building the service creates the OpenAI client
+        from app.core.services.embedding_service import get_embedding_service
+        from app.core.services.conversation_store import get_conversation_store
+        from app.core.services.insight_cache import insight_cache
+        from app.core.services.prompt_builder import prompt_builder
+        from app.infrastructure.external.openai_client import current_openai_provider
+        provider = current_openai_provider()
+        openai_stats = provider.stats() if provider is not None else {"circuit": "not_started"}
+
         app_metrics = {
             "environment": os.environ.get("ENVIRONMENT", "development"),
             "version": "0.1.0",
             "api_requests_total": 0,
-            "api_errors_total": 0
+            "api_errors_total": 0,
+            "embedding_cache": get_embedding_service().cache_stats(),
+            "embedding_requests": get_embedding_service().request_stats(),
+            "insight_cache": insight_cache.stats(),
+            "chat_sessions": get_conversation_store().stats(),
+            "rag_prompts": prompt_builder.stats.snapshot(),
+            "openai": openai_stats
         }
         
         return {
@@ -184,11 +211,114 @@ async def get_system_metrics(
         )
 
 
+# -----------------------------------------------------
+# GET /api/admin/indexing-outbox
+# -----------------------------------------------------
+@router.get("/indexing-outbox", tags=["Admin"])
+def get_indexing_outbox_status(
+    admin_user: UserModel = Depends(admin_only),
+    db: Session = Depends(get_db)
+):
+    """
+    Backlog of the vector indexing outbox, by state, and whether the
+    background worker is running. Requires admin privileges.
+    """
+    try:
+        return {
+            "worker_running": craving_indexing_worker.running,
+            "states": CravingIndexOutboxRepository(db).state_counts(),
+        }
+    except Exception as e:
+        logger.error(f"Error reading indexing outbox: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to read indexing outbox: {str(e)}"
+        )
+
+
+# -----------------------------------------------------
+# POST /api/admin/indexing-outbox/redrive
+# -----------------------------------------------------
+@router.post("/indexing-outbox/redrive", tags=["Admin"])
+def redrive_indexing_outbox(
+    craving_ids: Optional[List[int]] = Query(None, description="Only re-drive these cravings"),
+    admin_user: UserModel = Depends(admin_only),
+    db: Session = Depends(get_db)
+):
+    """
+    Re-queue FAILED indexing rows with a fresh retry budget.
+    Requires admin privileges.
+    """
+    try:
+        count = CravingIndexOutboxRepository(db).redrive_failed(craving_ids)
+        craving_indexing_worker.notify()
+        return {"redriven": count}
+    except Exception as e:
+        logger.error(f"Error re-driving indexing outbox: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to re-drive indexing outbox: {str(e)}"
+        )
+
+
+# -----------------------------------------------------
+# POST /api/admin/indexing-outbox/backfill
+# -----------------------------------------------------
+@router.post("/indexing-outbox/backfill", tags=["Admin"])
+def backfill_indexing_outbox(
+    user_id: Optional[int] = Query(None, description="Only re-index this user's cravings"),
+    admin_user: UserModel = Depends(admin_only),
+    db: Session = Depends(get_db)
+):
+    """
+    Queue every live craving for re-indexing (e.g. to move existing vectors
+    into per-user namespaces). Cravings already queued are skipped.
+    Requires admin privileges.
+    """
+    try:
+        count = CravingIndexOutboxRepository(db).enqueue_all_live(user_id)
+        craving_indexing_worker.notify()
+        return {"queued": count}
+    except Exception as e:
+        logger.error(f"Error backfilling indexing outbox: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to backfill indexing outbox: {str(e)}"
+        )
+
+
+# -----------------------------------------------------
+# GET /api/admin/transcription-jobs
+# -----------------------------------------------------
+@router.get("/transcription-jobs", tags=["Admin"])
+def get_transcription_jobs_status(
+    admin_user: UserModel = Depends(admin_only),
+    db: Session = Depends(get_db)
+):
+    """
+    Transcription jobs by state, and the worker pool's size and load.
+    Requires admin privileges.
+    """
+    try:
+        return {
+            "worker_running": transcription_worker.running,
+            "concurrency": transcription_worker.concurrency,
+            "busy": transcription_worker.busy,
+            "states": TranscriptionJobRepository(db).state_counts(),
+        }
+    except Exception as e:
+        logger.error(f"Error reading transcription jobs: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to read transcription jobs: {str(e)}"
+        )
+
+
 # -----------------------------------------------------
 # GET /api/admin/health-detailed
 # -----------------------------------------------------
 @router.get("/health-detailed", tags=["Admin"])
-async def detailed_health_check(
+def detailed_health_check(
     db: Session = Depends(get_db),
     admin_user: UserModel = Depends(admin_only)
 ):
@@ -265,7 +395,7 @@ async def detailed_health_check(
     
     # Schema verification
     try:
-        inspector = inspect(engine)
+        inspector = inspect(get_engine())
         tables = inspector.get_table_names()
         required_tables = ["users", "cravings", "voice_logs"]
         missing_tables = [t for t in required_tables if t not in tables]
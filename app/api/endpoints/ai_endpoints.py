@@ -1,21 +1,49 @@
 # app/api/endpoints/ai_endpoints.py
+import asyncio
+import logging
+from functools import partial
+from typing import Optional
+
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
-import openai
 from sqlalchemy.orm import Session
 
-from app.config.settings import get_settings
+from app.api.sse import sse_token_stream
+from app.core.services.conversation_store import (
+    ConversationNotFound,
+    ConversationStore,
+    get_conversation_store,
+    summarize_turns,
+)
+from app.core.services.rag_service import RAGService, get_rag_service
 from app.infrastructure.auth.auth_service import oauth2_scheme, AuthService
 from app.infrastructure.database.models import UserModel
+from app.infrastructure.external.openai_chat import OpenAIChatService, get_openai_chat_service
 from app.api.dependencies import get_db
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 class ChatRequestDTO(BaseModel):
     userQuery: str
+    # Continue an earlier conversation; omit to start a new one
+    session_id: Optional[str] = None
+    # When true the reply is streamed as Server-Sent Events (text/event-stream)
+    stream: bool = False
 
 class ChatResponseDTO(BaseModel):
     message: str
+    session_id: str
+
+class InsightRequestDTO(BaseModel):
+    query: str
+    persona: Optional[str] = None
+    top_k: int = 5
+    stream: bool = False
+
+class InsightResponseDTO(BaseModel):
+    answer: str
 
 def get_current_user(
     token: str = Depends(oauth2_scheme),
@@ -29,32 +57,82 @@ def get_current_user(
 @router.post("/chat", response_model=ChatResponseDTO)
 async def chat_v1(
     payload: ChatRequestDTO, 
-    current_user: UserModel = Depends(get_current_user)
+    current_user: UserModel = Depends(get_current_user),
+    chat_service: OpenAIChatService = Depends(get_openai_chat_service),
+    conversations: ConversationStore = Depends(get_conversation_store)
 ):
     """
     Receives a user query and returns an AI-generated response.
 
-    Uses the new openai.chat.completions.create(...) function required for openai>=1.0.0.
+    Uses the async OpenAI client, so the event loop is free while the model
+    runs. With `stream: true` the tokens are sent as they are generated.
+
+    Each reply carries a session_id (JSON field, or the X-Session-Id header
+    when streaming); send it back to continue the conversation. The server
+    replays a bounded, compacted history, so only the new message is sent.
     """
     try:
-        # Use the new style of setting the API key
-        openai.api_key = get_settings().OPENAI_API_KEY
-
-        # NOTE: openai.ChatCompletion.create(...) is no longer valid in openai>=1.0.0
-        # Instead, do:
-        response = openai.chat.completions.create(
-            model="gpt-3.5-turbo",  # or whichever model you prefer
-            messages=[
-                {"role": "user", "content": payload.userQuery},
-            ],
-            temperature=0.7,
-        )
+        conversation = await conversations.open(current_user.id, payload.session_id)
+    except ConversationNotFound:
+        raise HTTPException(status_code=404, detail="Chat session not found")
+
+    messages = conversations.history(conversation) + [{"role": "user", "content": payload.userQuery}]
+    summarize = partial(summarize_turns, chat_service)
+
+    async def remember(reply: str) -> None:
+        try:
+            await conversations.add_turn(conversation, payload.userQuery, reply, summarize)
+        except Exception:
+            logger.error("Could not save chat turn", exc_info=True, extra={"session_id": conversation.session_id})
+
+    if payload.stream:
+        async def tokens():
+            parts = []
+            async for token in chat_service.stream(messages, temperature=0.7):
+                parts.append(token)
+                yield token
+            await remember("".join(parts))
 
-        return {"message": response.choices[0].message.content}
+        response = await sse_token_stream(tokens())
+        response.headers["X-Session-Id"] = conversation.session_id
+        return response
 
+    try:
+        message = await chat_service.complete(messages, temperature=0.7)
     except Exception as exc:
-        print("OpenAI Chat Error:", str(exc))
+        logger.error("OpenAI chat error", exc_info=True)
         raise HTTPException(
             status_code=500,
             detail="Chat error: " + str(exc)
-        )
\ No newline at end of file
+        )
+    await remember(message)
+    return {"message": message, "session_id": conversation.session_id}
+
+@router.post("/insights", response_model=InsightResponseDTO)
+async def insights(
+    payload: InsightRequestDTO,
+    current_user: UserModel = Depends(get_current_user),
+    rag_service: RAGService = Depends(get_rag_service),
+):
+    """
+    Personalized insight over the authenticated user's own cravings (RAG).
+    With `stream: true` the answer is sent as Server-Sent Events.
+    """
+    if payload.stream:
+        return await sse_token_stream(
+            rag_service.stream_personalized_insight(
+                user_id=current_user.id,
+                query=payload.query,
+                persona=payload.persona,
+                top_k=payload.top_k,
+            )
+        )
+
+    answer = await asyncio.to_thread(
+        rag_service.generate_personalized_insight,
+        user_id=current_user.id,
+        query=payload.query,
+        persona=payload.persona,
+        top_k=payload.top_k,
+    )
+    return {"answer": answer}
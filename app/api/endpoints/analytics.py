@@ -4,26 +4,70 @@ Analytics endpoints for CRAVE Trinity Backend.
 
 Provides endpoints for analyzing craving patterns, including
 a /basic route that returns BasicAnalyticsResult matching the front-end.
+
+By default both routes read the per-user daily rollups (craving_daily_rollups),
+so the work per request is proportional to the number of days, not cravings;
+windows are whole UTC calendar days: [today - days, today]. With
+ANALYTICS_USE_ROLLUPS disabled they aggregate the cravings table in SQL over
+the exact [now - days, now] window instead. Neither path hydrates cravings.
+The queries run on the request's AsyncSession (via run_sync), so they do not
+block the event loop.
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from datetime import datetime, timedelta
-from collections import defaultdict
-import statistics
 
 from pydantic import BaseModel
-from app.infrastructure.database.session import SessionLocal
-from app.infrastructure.database.models import CravingModel
+from app.config.settings import get_settings
+from app.infrastructure.database.async_session import get_async_db
+from app.infrastructure.database.craving_aggregates import CravingAggregateQueries
+from app.infrastructure.database.rollup_repository import CravingRollupRepository, RollupTotals
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+
+def _daily_window(db: Session, user_id: int, days: int) -> Tuple[RollupTotals, Dict[str, int]]:
+    """
+    Totals plus per-day counts for the last N days, from rollups or SQL GROUP BY.
+    """
+    end_date = datetime.utcnow()
+    start_date = end_date - timedelta(days=days)
+
+    if get_settings().ANALYTICS_USE_ROLLUPS:
+        rows = CravingRollupRepository(db).get_rollups(user_id, start_date.date(), end_date.date())
+        per_day = [(r.day, r) for r in rows]
+    else:
+        per_day = CravingAggregateQueries(db).daily_totals(user_id, start_date, end_date)
+
+    totals = RollupTotals.from_rows(day_totals for _, day_totals in per_day)
+    cravings_by_date = {
+        day.strftime("%Y-%m-%d"): day_totals.count for day, day_totals in per_day if day_totals.count > 0
+    }
+    return totals, cravings_by_date
+
+
+def _summary_window(db: Session, user_id: int, days: int) -> Tuple[int, float, Optional[float], Optional[float], float]:
+    """
+    (total, average, max, min, stddev) of intensity over the last N days.
+    """
+    end_date = datetime.utcnow()
+    start_date = end_date - timedelta(days=days)
+
+    if get_settings().ANALYTICS_USE_ROLLUPS:
+        rollups = CravingRollupRepository(db).get_rollups(user_id, start_date.date(), end_date.date())
+        totals = RollupTotals.from_rows(rollups)
+        return (
+            totals.count, totals.average_intensity, totals.intensity_max,
+            totals.intensity_min, totals.intensity_stddev,
+        )
+
+    stats = CravingAggregateQueries(db).window_stats(user_id, start_date, end_date)
+    return (
+        stats.total, stats.average_intensity, stats.max_intensity,
+        stats.min_intensity, stats.intensity_stddev,
+    )
 
 
 # -------------------------------------------------------------------------
@@ -53,10 +97,10 @@ class BasicAnalyticsResponse(BaseModel):
 async def get_basic_craving_analytics(
     user_id: int,
     days: Optional[int] = Query(30, description="Analyze the last N days"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Computes a 'BasicAnalyticsResult' for the specified user, from [now - days] to now.
+    Computes a 'BasicAnalyticsResult' for the specified user over the last N days.
     1) totalCravings
     2) totalResisted (confidence_to_resist > 7)
     3) averageIntensity
@@ -64,20 +108,8 @@ async def get_basic_craving_analytics(
     5) successRate (resisted / total * 100)
     6) cravingsByDate
     """
-    end_date = datetime.utcnow()
-    start_date = end_date - timedelta(days=days)
-
-    query = db.query(CravingModel).filter(
-        CravingModel.is_deleted == False,
-        CravingModel.timestamp >= start_date,
-        CravingModel.timestamp <= end_date
-    )
-
-    # If your 'cravings' table does have user_id, filter:
-    query = query.filter(CravingModel.user_id == user_id)
-
-    cravings = query.all()
-    if not cravings:
+    totals, cravings_by_date = await db.run_sync(_daily_window, user_id, days)
+    if totals.count == 0:
         return BasicAnalyticsResponse(
             user_id=user_id,
             period=f"Last {days} days",
@@ -89,33 +121,17 @@ async def get_basic_craving_analytics(
             cravingsByDate={}
         )
 
-    total = len(cravings)
-    total_resisted = sum([
-        1 for c in cravings if (c.confidence_to_resist or 0.0) > 7.0
-    ])
-
-    intensities = [c.intensity for c in cravings]
-    resistances = [c.confidence_to_resist for c in cravings if c.confidence_to_resist is not None]
-
-    avg_intensity = sum(intensities) / len(intensities) if intensities else 0.0
-    avg_resistance = sum(resistances) / len(resistances) if resistances else 0.0
-    success_rate = (total_resisted / total * 100.0) if total > 0 else 0.0
-
-    # group by date string
-    cravings_by_date = defaultdict(int)
-    for c in cravings:
-        day_str = c.timestamp.strftime("%Y-%m-%d")
-        cravings_by_date[day_str] += 1
+    success_rate = totals.resisted_count / totals.count * 100.0
 
     return BasicAnalyticsResponse(
         user_id=user_id,
         period=f"Last {days} days",
-        totalCravings=total,
-        totalResisted=total_resisted,
-        averageIntensity=avg_intensity,
-        averageResistance=avg_resistance,
+        totalCravings=totals.count,
+        totalResisted=totals.resisted_count,
+        averageIntensity=totals.average_intensity,
+        averageResistance=totals.average_resistance,
         successRate=success_rate,
-        cravingsByDate=dict(cravings_by_date)
+        cravingsByDate=cravings_by_date
     )
 
 
@@ -136,34 +152,23 @@ class AnalyticsResponse(BaseModel):
 async def get_user_craving_summary(
    user_id: int,
    days: Optional[int] = Query(30),
-   db: Session = Depends(get_db)
+   db: AsyncSession = Depends(get_async_db)
 ) -> AnalyticsResponse:
-    # old logic remains
-    end_date = datetime.utcnow()
-    start_date = end_date - timedelta(days=days)
-
-    cravings = db.query(CravingModel).filter(
-        CravingModel.is_deleted == False,
-        CravingModel.timestamp >= start_date,
-        CravingModel.timestamp <= end_date,
-        CravingModel.user_id == user_id
-    ).all()
+    total, average, maximum, minimum, stddev = await db.run_sync(_summary_window, user_id, days)
 
-    if not cravings:
+    if total == 0:
         return AnalyticsResponse(
             user_id=user_id,
             period=f"Last {days} days",
             message="No cravings recorded in this period."
         )
 
-    intensities = [c.intensity for c in cravings]
-    avg_int = sum(intensities) / len(intensities) if intensities else 0
     return AnalyticsResponse(
         user_id=user_id,
         period=f"Last {days} days",
-        total_cravings=len(cravings),
-        average_intensity=round(avg_int, 1),
-        max_intensity=max(intensities),
-        min_intensity=min(intensities),
-        std_deviation=round(statistics.stdev(intensities), 2) if len(intensities) > 1 else 0
+        total_cravings=total,
+        average_intensity=round(average, 1),
+        max_intensity=maximum,
+        min_intensity=minimum,
+        std_deviation=round(stddev, 2)
     )
\ No newline at end of file
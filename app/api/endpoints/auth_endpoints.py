@@ -15,10 +15,6 @@ from fastapi import APIRouter, HTTPException, status, Depends
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
-# Google OAuth libs for ID token verification
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
-
 from app.utils.logger import get_logger
 from app.api.dependencies import get_db
 from app.config.settings import get_settings
@@ -97,6 +93,9 @@ def verify_google_id_token(payload: GoogleVerifyRequest, db: Session = Depends(g
     3) Returns a local JWT upon success
     """
     logger.info("Verifying Google ID token", extra={"route": "/verify-google-id-token"})
+    # Google OAuth libs (and requests) are only loaded when this route is used
+    from google.oauth2 import id_token
+    from google.auth.transport import requests as google_requests
     try:
         settings = get_settings()
         ios_client_id = settings.GOOGLE_IOS_CLIENT_ID
@@ -5,15 +5,17 @@ including creation, listing, and retrieval, matching the front-end CravingEntity
 """
 
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import List, Optional
 from uuid import UUID as pyUUID
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_db
-from app.infrastructure.database.repository import CravingRepository
+from app.config.settings import get_settings
+from app.core.services.craving_indexing_worker import craving_indexing_worker
+from app.infrastructure.database.async_repository import AsyncCravingRepository
+from app.infrastructure.database.async_session import get_async_db
 from app.infrastructure.database.models import CravingModel
 
 router = APIRouter()
@@ -53,7 +55,40 @@ class CravingListResponse(BaseModel):
     Response model for listing cravings.
     """
     cravings: List[CravingResponse]
-    count: int
+    count: Optional[int] = Field(None, description="Total live cravings; omitted when include_total=false")
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to fetch the next page")
+
+class BatchCreateCravingsRequest(BaseModel):
+    """
+    Cravings queued offline by the client, replayed in one request.
+    """
+    cravings: List[CreateCravingRequest]
+
+class BatchCreateCravingsResponse(BaseModel):
+    """
+    Result of a batch create. Items whose UUID already existed are reported
+    in `skipped` rather than failing the batch, so replays are safe.
+    """
+    created: List[CravingResponse]
+    skipped: List[pyUUID]
+
+def _as_naive_utc(ts: datetime) -> datetime:
+    # cravings.timestamp is timezone-naive UTC; asyncpg rejects aware values for it
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+def _craving_response(c: CravingModel) -> CravingResponse:
+    return CravingResponse(
+        id=c.craving_uuid,
+        user_id=c.user_id,
+        cravingDescription=c.description,
+        cravingStrength=c.intensity,
+        confidenceToResist=c.confidence_to_resist or 0.0,
+        emotions=c.emotions or [],
+        timestamp=c.timestamp,
+        isArchived=c.is_archived
+    )
 
 # -------------------------------------------------------------------------
 # ENDPOINTS (Routes defined without trailing slashes)
@@ -62,13 +97,12 @@ class CravingListResponse(BaseModel):
 @router.post("", response_model=CravingResponse, tags=["Cravings"])
 async def create_craving(
     request: CreateCravingRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new craving entry.
     """
     try:
-        repo = CravingRepository(db)
         # Use a valid UUID if not provided
         craving_uuid = request.id or uuid.uuid4()
         new_craving = CravingModel(
@@ -78,53 +112,82 @@ async def create_craving(
             intensity=request.cravingStrength,
             confidence_to_resist=request.confidenceToResist,
             emotions=request.emotions,
-            timestamp=request.timestamp,
+            timestamp=_as_naive_utc(request.timestamp),
             is_archived=request.isArchived,
             is_deleted=False
         )
-        db.add(new_craving)
-        db.commit()
-        db.refresh(new_craving)
-        return CravingResponse(
-            id=new_craving.craving_uuid,
-            user_id=new_craving.user_id,
-            cravingDescription=new_craving.description,
-            cravingStrength=new_craving.intensity,
-            confidenceToResist=new_craving.confidence_to_resist or 0.0,
-            emotions=new_craving.emotions or [],
-            timestamp=new_craving.timestamp,
-            isArchived=new_craving.is_archived
-        )
+        new_craving = await AsyncCravingRepository(db).save_new_craving(new_craving)
+        craving_indexing_worker.notify()
+        return _craving_response(new_craving)
     except Exception as e:
-        db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create craving: {str(e)}")
 
+@router.post("/batch", response_model=BatchCreateCravingsResponse, tags=["Cravings"])
+async def create_cravings_batch(
+    request: BatchCreateCravingsRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create many cravings in one round trip: a single INSERT ... RETURNING,
+    idempotent on the craving UUID. New cravings are embedded in batches by
+    the background indexing worker.
+    """
+    max_items = get_settings().CRAVING_BATCH_MAX_ITEMS
+    if len(request.cravings) > max_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(request.cravings)} cravings exceeds the limit of {max_items}"
+        )
+
+    rows, requested = [], []
+    seen = set()
+    now = datetime.utcnow()
+    for item in request.cravings:
+        craving_uuid = item.id or uuid.uuid4()
+        requested.append(craving_uuid)
+        if craving_uuid in seen:
+            continue
+        seen.add(craving_uuid)
+        rows.append({
+            "craving_uuid": craving_uuid,
+            "user_id": item.user_id,
+            "description": item.cravingDescription,
+            "intensity": item.cravingStrength,
+            "confidence_to_resist": item.confidenceToResist,
+            "emotions": item.emotions,
+            "timestamp": _as_naive_utc(item.timestamp),
+            "is_archived": item.isArchived,
+            "is_deleted": False,
+            "created_at": now,
+            "updated_at": now,
+        })
+
+    try:
+        created = await AsyncCravingRepository(db).create_cravings_batch(rows)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create cravings: {str(e)}")
+
+    if created:
+        craving_indexing_worker.notify()
+    created_uuids = {c.craving_uuid for c in created}
+    return BatchCreateCravingsResponse(
+        created=[_craving_response(c) for c in created],
+        skipped=[u for u in requested if u not in created_uuids]
+    )
+
 @router.get("/{craving_uuid}", response_model=CravingResponse, tags=["Cravings"])
 async def get_craving(
     craving_uuid: pyUUID = Path(..., description="The UUID of the craving to retrieve"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Retrieve a single craving by its UUID.
     """
     try:
-        repo = CravingRepository(db)
-        craving = db.query(CravingModel).filter(
-            CravingModel.craving_uuid == craving_uuid,
-            CravingModel.is_deleted == False
-        ).first()
+        craving = await AsyncCravingRepository(db).get_craving_by_uuid(craving_uuid)
         if not craving:
             raise HTTPException(status_code=404, detail=f"Craving with UUID {craving_uuid} not found")
-        return CravingResponse(
-            id=craving.craving_uuid,
-            user_id=craving.user_id,
-            cravingDescription=craving.description,
-            cravingStrength=craving.intensity,
-            confidenceToResist=craving.confidence_to_resist or 0.0,
-            emotions=craving.emotions or [],
-            timestamp=craving.timestamp,
-            isArchived=craving.is_archived
-        )
+        return _craving_response(craving)
     except HTTPException:
         raise
     except Exception as e:
@@ -133,34 +196,27 @@ async def get_craving(
 @router.get("", response_model=CravingListResponse, tags=["Cravings"])
 async def list_cravings(
     user_id: int = Query(..., description="Filter by user ID"),
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    include_total: bool = Query(True, description="Set false to skip the COUNT query"),
+    skip: int = Query(0, ge=0, description="Legacy offset; ignored when cursor is given"),
     limit: int = Query(100, ge=1),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Paginated list of cravings for the specified user.
+    Paginated list of cravings for the specified user, newest first.
+
+    Pages are keyed on (timestamp, id): follow `next_cursor` until it is null.
     """
     try:
-        repo = CravingRepository(db)
-        query = db.query(CravingModel).filter(
-            CravingModel.user_id == user_id,
-            CravingModel.is_deleted == False
-        )
-        cravings = query.offset(skip).limit(limit).all()
-        count = query.count()
-        craving_responses = [
-            CravingResponse(
-                id=c.craving_uuid,
-                user_id=c.user_id,
-                cravingDescription=c.description,
-                cravingStrength=c.intensity,
-                confidenceToResist=c.confidence_to_resist or 0.0,
-                emotions=c.emotions or [],
-                timestamp=c.timestamp,
-                isArchived=c.is_archived
-            )
-            for c in cravings
-        ]
-        return CravingListResponse(cravings=craving_responses, count=count)
+        repo = AsyncCravingRepository(db)
+        try:
+            cravings, next_cursor = await repo.get_cravings_page(user_id, limit=limit, cursor=cursor, skip=skip)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        count = await repo.count_cravings_for_user(user_id) if include_total else None
+        craving_responses = [_craving_response(c) for c in cravings]
+        return CravingListResponse(cravings=craving_responses, count=count, next_cursor=next_cursor)
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to list cravings: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Failed to list cravings: {str(e)}")
@@ -6,10 +6,12 @@ from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, ConfigDict  # Import ConfigDict
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.infrastructure.database.repository import CravingRepository
-from app.api.dependencies import get_db, get_current_user
+from app.core.services.craving_indexing_worker import craving_indexing_worker
+from app.infrastructure.database.async_repository import AsyncCravingRepository
+from app.infrastructure.database.async_session import get_async_db
+from app.api.dependencies import get_current_user
 from app.infrastructure.database.models import UserModel
 
 router = APIRouter()
@@ -33,13 +35,12 @@ class CravingsResponse(BaseModel):
 @router.get("/user/queries", response_model=CravingsResponse, tags=["Cravings"])
 async def get_user_cravings(
     current_user: UserModel = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> CravingsResponse:
     """
     Retrieves all cravings for the currently authenticated user.
     """
-    craving_repo = CravingRepository(db)
-    db_cravings = craving_repo.get_cravings_for_user(current_user.id)
+    db_cravings = await AsyncCravingRepository(db).get_cravings_for_user(current_user.id)
 
     cravings = [
         Craving(
@@ -59,13 +60,13 @@ async def get_user_cravings(
 async def delete_user_craving(
     craving_id: int,
     current_user: UserModel = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Deletes a specific craving for the authenticated user. Implements soft delete.
     """
-    craving_repo = CravingRepository(db)
-    craving = craving_repo.get_craving_by_id(craving_id)
+    craving_repo = AsyncCravingRepository(db)
+    craving = await craving_repo.get_craving_by_id(craving_id)
 
     if not craving:
         raise HTTPException(status_code=404, detail="Craving not found")
@@ -73,5 +74,6 @@ async def delete_user_craving(
     if craving.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this craving")
 
-    craving_repo.delete_craving(craving_id)
+    await craving_repo.delete_craving(craving_id)
+    craving_indexing_worker.notify()
     return {"message": f"Craving {craving_id} deleted successfully"}
\ No newline at end of file
@@ -4,28 +4,27 @@
 import uuid
 from typing import Optional
 from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from pydantic import ConfigDict
 
 # CHANGED: Import the renamed VoiceLogRepository (singular)
 from app.infrastructure.database.voice_logs_repository import VoiceLogRepository
 
+from app.config.settings import get_settings
+from app.core.services.audio_upload import EmptyUpload, UploadTooLarge, stream_upload
+from app.core.services.transcription_worker import transcription_worker
 from app.core.services.voice_logs_service import VoiceLogsService
+from app.infrastructure.database.audio_blob_repository import blob_root
+from app.infrastructure.database.async_repository import AsyncVoiceLogRepository
+from app.infrastructure.database.async_session import get_async_db
 from app.infrastructure.auth.auth_service import AuthService
-from app.infrastructure.database.session import SessionLocal
+from app.infrastructure.database.session import get_db
 from app.core.entities.voice_log_schemas import VoiceLogCreate, VoiceLogOut
 from app.infrastructure.database.models import UserModel
-from app.infrastructure.external.transcription_service import TranscriptionService
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 def get_voice_logs_service(db: Session = Depends(get_db)) -> VoiceLogsService:
     repo = VoiceLogRepository(db)
     return VoiceLogsService(repo)
@@ -34,43 +33,56 @@ def get_voice_logs_service(db: Session = Depends(get_db)) -> VoiceLogsService:
 async def create_voice_log(
     file: UploadFile = File(...),
     payload: VoiceLogCreate = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(AuthService().get_current_user),
 ):
-    audio_bytes = await file.read()
-    if not audio_bytes:
+    settings = get_settings()
+    # Streamed to disk in chunks (thread pool I/O), capped and hashed on the way
+    try:
+        staged = await stream_upload(
+            file,
+            blob_root(),
+            max_bytes=settings.VOICE_UPLOAD_MAX_BYTES,
+            chunk_size=settings.VOICE_UPLOAD_CHUNK_BYTES,
+        )
+    except EmptyUpload:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Empty file or unable to read file bytes."
         )
-    repo = VoiceLogRepository(db)
-    service = VoiceLogsService(repo)
-    voice_log = service.upload_new_voice_log(
-        user_id=current_user.id,
-        audio_bytes=audio_bytes
-    )
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    # Stored under its SHA-256: duplicate audio is dropped here and shares the
+    # existing blob (and its transcript, if it has one)
+    try:
+        voice_log = await AsyncVoiceLogRepository(db).create_from_upload(
+            current_user.id, staged.sha256, staged.size_bytes, staged.path
+        )
+    finally:
+        staged.discard()
     return VoiceLogOut(model_config=ConfigDict(from_attributes=True), **voice_log.dict())
 
-@router.post("/{voice_log_id}/transcribe", response_model=VoiceLogOut)
+@router.post("/{voice_log_id}/transcribe", response_model=VoiceLogOut, status_code=status.HTTP_202_ACCEPTED)
 def transcribe_voice_log(
     voice_log_id: int,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(AuthService().get_current_user),
 ):
+    """
+    Queue the voice log for transcription and return at once; poll
+    /voice-logs-enhancement/{id}/status or GET /{id}/transcript for the result.
+    """
     repo = VoiceLogRepository(db)
     service = VoiceLogsService(repo)
     voice_log = repo.get_by_id(voice_log_id)
     if not voice_log or voice_log.user_id != current_user.id or voice_log.is_deleted:
         raise HTTPException(status_code=404, detail="Voice log not found or inaccessible.")
 
-    transcription_service = TranscriptionService()
-    updated_in_progress = service.trigger_transcription(voice_log_id)
-    if not updated_in_progress:
+    queued = service.enqueue_transcription(voice_log_id)
+    if not queued:
         raise HTTPException(status_code=404, detail="Voice log not found or already deleted.")
-
-    transcription_text = transcription_service.transcribe_audio(updated_in_progress)
-    completed_log = service.complete_transcription(voice_log_id, transcription_text)
-    return VoiceLogOut(model_config=ConfigDict(from_attributes=True), **completed_log.dict()) if completed_log else None
+    transcription_worker.notify()
+    return VoiceLogOut(model_config=ConfigDict(from_attributes=True), **queued.dict())
 
 @router.get("/{voice_log_id}/transcript")
 def get_transcript(
@@ -3,20 +3,23 @@
 #====================================================
 
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any, Optional
 from pydantic import ConfigDict
 
 from app.infrastructure.auth.auth_service import AuthService
+from app.infrastructure.database.async_repository import AsyncVoiceLogRepository
+from app.infrastructure.database.async_session import get_async_db
 from app.infrastructure.database.session import get_db
 from app.infrastructure.database.models import UserModel
 
 # CHANGED: Import the renamed VoiceLogRepository (singular)
 from app.infrastructure.database.voice_logs_repository import VoiceLogRepository
 
+from app.core.services.transcription_worker import transcription_worker
 from app.core.services.voice_logs_service import VoiceLogsService
-from app.infrastructure.external.transcription_service import TranscriptionService
 from app.core.entities.voice_log_schemas import VoiceLogCreate, VoiceLogOut
 from app.core.entities.voice_log import VoiceLog
 
@@ -28,9 +31,8 @@ def get_voice_logs_service(db: Session = Depends(get_db)) -> VoiceLogsService:
     return VoiceLogsService(repo)
 
 @router.post("/{voice_log_id}/retry-transcription", response_model=VoiceLogOut)
-async def retry_transcription(
+def retry_transcription(
     voice_log_id: int,
-    background_tasks: BackgroundTasks,
     service: VoiceLogsService = Depends(get_voice_logs_service),
     current_user: UserModel = Depends(AuthService().get_current_user)
 ):
@@ -43,21 +45,17 @@ async def retry_transcription(
     if voice_log.transcription_status == "COMPLETED" and voice_log.transcribed_text:
         return VoiceLogOut(**voice_log.dict())
 
-    updated_log = service.trigger_transcription(voice_log_id)
+    updated_log = service.enqueue_transcription(voice_log_id)
     if not updated_log:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update voice log status"
         )
-
-    background_tasks.add_task(
-        service.process_transcription,
-        voice_log_id
-    )
+    transcription_worker.notify()
     return VoiceLogOut(**updated_log.dict())
 
 @router.get("/{voice_log_id}/status", response_model=Dict[str, Any])
-async def get_transcription_status(
+def get_transcription_status(
     voice_log_id: int,
     service: VoiceLogsService = Depends(get_voice_logs_service),
     current_user: UserModel = Depends(AuthService().get_current_user)
@@ -68,22 +66,31 @@ async def get_transcription_status(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Voice log not found or inaccessible"
         )
+    job = service.get_transcription_job(voice_log_id)
     return {
         "id": voice_log.id,
         "created_at": voice_log.created_at.isoformat(),
         "transcription_status": voice_log.transcription_status,
         "has_transcript": bool(voice_log.transcribed_text),
         "transcript_length": len(voice_log.transcribed_text) if voice_log.transcribed_text else 0,
-        "last_updated": voice_log.updated_at.isoformat() if hasattr(voice_log, "updated_at") and voice_log.updated_at else None
+        "last_updated": job.updated_at.isoformat() if job else None,
+        "job": {
+            "id": job.id,
+            "state": job.state,
+            "attempts": job.attempts,
+            "last_error": job.last_error,
+            # Next retry, or the lease expiry while running
+            "next_attempt_at": job.next_attempt_at.isoformat() if job.state in ("PENDING", "IN_PROGRESS") else None,
+        } if job else None,
     }
 
 @router.post("/{voice_log_id}/analyze", response_model=Dict[str, Any])
 async def analyze_voice_log(
     voice_log_id: int,
-    service: VoiceLogsService = Depends(get_voice_logs_service),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(AuthService().get_current_user)
 ):
-    voice_log = service.get_voice_log(voice_log_id)
+    voice_log = await AsyncVoiceLogRepository(db).get_by_id(voice_log_id)
     if not voice_log or voice_log.user_id != current_user.id or voice_log.is_deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,10 +1,19 @@
 # File: app/api/main.py
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-import time
 
 from app.utils.logger import get_logger
+from app.config.settings import get_settings
+from app.core.services.craving_indexing_worker import craving_indexing_worker
+from app.core.services.transcription_worker import transcription_worker
+from app.infrastructure.external.openai_client import current_openai_provider
+from app.infrastructure.database.async_session import current_async_engine
+from app.infrastructure.database.session import dispose_engine, get_engine
 
 # Import all your endpoint routers
 from app.api.endpoints.health import router as health_router
@@ -21,8 +30,58 @@ from app.api.endpoints.voice_logs_enhancement import router as voice_logs_enhanc
 
 logger = get_logger("main")
 
+# ----------------------------------------
+# Lifespan: providers and background workers
+# ----------------------------------------
+def warm_providers():
+    """
+    Build the lazy singletons before the first request. Construction only:
+    the engine connects on first checkout and the API clients on first call.
+    """
+    from app.core.services.embedding_service import get_embedding_service
+    from app.core.services.rag_service import get_rag_service
+    get_engine()
+    get_embedding_service()
+    get_rag_service()
+    if get_settings().TRANSCRIPTION_BACKEND == "local":
+        # The one exception: a local Whisper model takes seconds to load,
+        # which would otherwise land on the first transcription job
+        from app.infrastructure.external.transcription_service import get_transcription_service
+        get_transcription_service().backend.load()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    if settings.STARTUP_WARM_PROVIDERS:
+        try:
+            await asyncio.to_thread(warm_providers)
+        except Exception:
+            # Not fatal: each provider is retried on first use
+            logger.warning("Provider warm-up failed", exc_info=True)
+    if settings.INDEXING_WORKER_ENABLED:
+        await craving_indexing_worker.start()
+    if settings.TRANSCRIPTION_WORKER_ENABLED:
+        await transcription_worker.start()
+    try:
+        yield
+    finally:
+        await transcription_worker.stop()
+        await craving_indexing_worker.stop()
+        from app.core.services.embedding_service import current_embedding_service
+        embeddings = current_embedding_service()
+        if embeddings is not None:
+            # Writes queued for the embedding cache's disk tier
+            await asyncio.to_thread(embeddings.close)
+        provider = current_openai_provider()
+        if provider is not None:
+            await provider.aclose()
+        async_engine = current_async_engine()
+        if async_engine is not None:
+            await async_engine.dispose()
+        dispose_engine()
+
 # Disable automatic redirect for trailing slashes for canonical URLs.
-app = FastAPI(redirect_slashes=False)
+app = FastAPI(redirect_slashes=False, lifespan=lifespan)
 
 # ----------------------------------------
 # CORS Setup
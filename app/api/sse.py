@@ -0,0 +1,57 @@
+# File: app/api/sse.py
+"""
+Server-Sent Events helpers for streaming LLM output.
+
+Each token is sent as `data: {"token": "..."}`; the stream ends with an
+`event: done` message, or `event: error` if the upstream fails mid-stream.
+"""
+
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    # Stop nginx-style proxies from buffering the stream
+    "X-Accel-Buffering": "no",
+}
+
+
+def sse_event(data: Dict[str, Any], event: Optional[str] = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+async def sse_token_stream(tokens: AsyncIterator[str]) -> StreamingResponse:
+    """
+    Wrap a token iterator in an SSE response. The first token is awaited
+    before the response starts, so failures that happen before any output
+    (bad key, upstream down) still surface as an HTTP 502.
+    """
+    try:
+        first: Optional[str] = await tokens.__anext__()
+    except StopAsyncIteration:
+        first = None
+    except Exception as exc:
+        logger.error("Streaming request failed before first token", exc_info=True)
+        raise HTTPException(status_code=502, detail=f"Upstream model error: {exc}")
+
+    async def body():
+        if first is not None:
+            yield sse_event({"token": first})
+        try:
+            async for token in tokens:
+                yield sse_event({"token": token})
+        except Exception as exc:
+            logger.error("Streaming response failed mid-stream", exc_info=True)
+            yield sse_event({"detail": str(exc)}, event="error")
+            return
+        yield sse_event({}, event="done")
+
+    return StreamingResponse(body(), media_type="text/event-stream", headers=SSE_HEADERS)
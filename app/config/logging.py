@@ -4,9 +4,6 @@ import os
 from pythonjsonlogger import jsonlogger
 from logging.handlers import RotatingFileHandler
 
-import sentry_sdk
-from sentry_sdk.integrations.logging import LoggingIntegration
-
 # Logging configuration from environment variables
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 LOG_FILE_PATH = os.getenv("LOG_FILE_PATH", "logs/crave_trinity_backend.log")
@@ -58,6 +55,10 @@ def configure_logging() -> None:
 
     # Initialize Sentry if DSN is provided
     if SENTRY_DSN:
+        # Imported only when reporting is on: the SDK is slow to import
+        import sentry_sdk
+        from sentry_sdk.integrations.logging import LoggingIntegration
+
         sentry_logging = LoggingIntegration(
             level=logging.INFO,        # Capture INFO-level logs as breadcrumbs
             event_level=logging.ERROR  # Send ERROR-level logs as Sentry events
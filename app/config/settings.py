@@ -39,10 +39,160 @@ class Settings(BaseSettings):
     PINECONE_API_KEY: str = Field("YOUR_PINECONE_API_KEY")
     PINECONE_ENV: str = Field("us-east-1-aws")
     PINECONE_INDEX_NAME: str = Field("crave-embeddings")
+    # Vector store behind VectorRepository: "pinecone" or "local" (in-process
+    # NumPy index persisted under VECTOR_LOCAL_PATH; see local_index.py)
+    VECTOR_BACKEND: str = Field("pinecone")
+    VECTOR_LOCAL_PATH: str = Field("data/vector_index")
+    # Partitions (users) at or above this many vectors switch from exact
+    # search to IVF, scanning the VECTOR_LOCAL_IVF_NPROBE nearest lists
+    VECTOR_LOCAL_IVF_THRESHOLD: int = Field(20000)
+    VECTOR_LOCAL_IVF_NPROBE: int = Field(8)
+    # One namespace per user ("user-<id>"), so user-scoped searches never
+    # scan other users' vectors; user searches fetch OVERFETCH x top_k
+    # candidates to re-check and re-rank
+    VECTOR_NAMESPACE_PER_USER: bool = Field(True)
+    VECTOR_SEARCH_OVERFETCH: int = Field(3)
+
+    # RAG re-ranking: similarity x recency x intensity (craving_reranker.py).
+    # Decay curve "exponential" (RAG_DECAY_HALF_LIFE_DAYS) or "piecewise";
+    # RAG_MMR_LAMBDA < 1 diversifies the picks, None disables MMR
+    RAG_DECAY_CURVE: str = Field("exponential")
+    RAG_DECAY_HALF_LIFE_DAYS: float = Field(30.0)
+    RAG_RECENCY_FLOOR: float = Field(0.2)
+    RAG_INTENSITY_WEIGHT: float = Field(0.3)
+    RAG_MMR_LAMBDA: Optional[float] = Field(0.7)
+    # Insight prompts are packed best-first into RAG_PROMPT_TOKEN_BUDGET tokens
+    # (prompt_builder.py); tokenizer "auto" uses tiktoken when available,
+    # "approx" always estimates from character counts
+    RAG_PROMPT_TOKEN_BUDGET: int = Field(1500)
+    RAG_PROMPT_DESCRIPTION_MAX_TOKENS: int = Field(80)
+    RAG_PROMPT_TOKENIZER: str = Field("auto")
+    # Semantic cache of insight answers (insight_cache.py): reused when the
+    # same user asks a question with cosine >= INSIGHT_CACHE_SIMILARITY to one
+    # already answered and their cravings have not changed since
+    INSIGHT_CACHE_ENABLED: bool = Field(True)
+    INSIGHT_CACHE_SIMILARITY: float = Field(0.95)
+    INSIGHT_CACHE_MAX_USERS: int = Field(10000)
+    INSIGHT_CACHE_MAX_PER_USER: int = Field(32)
+    INSIGHT_CACHE_TTL_SECONDS: float = Field(3600)
     OPENAI_API_KEY: str = Field("YOUR_OPENAI_API_KEY")
+    OPENAI_CHAT_MODEL: str = Field("gpt-3.5-turbo")
+    # Multi-turn /ai/chat memory (conversation_store.py): at most this much
+    # history is replayed; older turns are summarized ("summary") or dropped
+    # ("window"). Recently used sessions stay in an in-process LRU
+    CHAT_HISTORY_MAX_MESSAGES: int = Field(20)
+    CHAT_HISTORY_MAX_TOKENS: int = Field(2000)
+    CHAT_MEMORY_STRATEGY: str = Field("summary")
+    CHAT_SESSION_CACHE_SIZE: int = Field(1024)
+    # Shared OpenAI provider (external/openai_client.py): pooled keep-alive
+    # connections, SDK retries, a cap on in-flight calls and a breaker that
+    # fails fast after consecutive upstream failures
+    OPENAI_TIMEOUT_SECONDS: float = Field(30.0)
+    OPENAI_CONNECT_TIMEOUT_SECONDS: float = Field(5.0)
+    OPENAI_MAX_RETRIES: int = Field(2)
+    OPENAI_MAX_CONNECTIONS: int = Field(100)
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = Field(20)
+    OPENAI_KEEPALIVE_EXPIRY_SECONDS: float = Field(30.0)
+    OPENAI_HTTP2: bool = Field(True)
+    OPENAI_MAX_CONCURRENCY: int = Field(32)
+    OPENAI_BREAKER_FAILURE_THRESHOLD: int = Field(5)
+    OPENAI_BREAKER_RESET_SECONDS: float = Field(30.0)
+
+    # Embedding cache: in-memory LRU of float32 vectors, optionally persisted
+    # to a SQLite file so warm entries survive restarts (unset = memory only).
+    # The file is written behind and capped at EMBEDDING_CACHE_DISK_MAX_ENTRIES
+    # (unset = 10 x EMBEDDING_CACHE_MAX_ENTRIES)
+    EMBEDDING_CACHE_MAX_ENTRIES: int = Field(10000)
+    EMBEDDING_CACHE_TTL_SECONDS: float = Field(24 * 3600)
+    EMBEDDING_CACHE_PATH: Optional[str] = Field(None)
+    EMBEDDING_CACHE_DISK_MAX_ENTRIES: Optional[int] = Field(None)
+    # Single-text embedding misses arriving within this window share one
+    # upstream request (0 disables micro-batching)
+    EMBEDDING_BATCH_WINDOW_MS: float = Field(5.0)
+    EMBEDDING_BATCH_MAX_SIZE: int = Field(64)
 
     MIGRATION_MODE: str = Field("auto")
 
+    # Connection pool (one per driver per process; see database/engine.py)
+    DB_POOL_SIZE: int = Field(5)
+    DB_MAX_OVERFLOW: int = Field(10)
+    DB_POOL_TIMEOUT_SECONDS: float = Field(30.0)
+    DB_POOL_RECYCLE_SECONDS: int = Field(300)
+    DB_STATEMENT_TIMEOUT_MS: int = Field(30000)  # 0 disables
+
+    # Analytics: read the daily rollup table (O(days)); when False, aggregate
+    # the cravings table directly in SQL (exact rolling window, O(rows) in the DB)
+    ANALYTICS_USE_ROLLUPS: bool = Field(True)
+
+    # Upper bound on items accepted by POST /cravings/batch
+    CRAVING_BATCH_MAX_ITEMS: int = Field(500)
+
+    # Startup: nothing connects at import; providers (DB engine, embedding and
+    # RAG services) are built on first use, or up front by the lifespan hook
+    # when this is True (object construction only, no network I/O)
+    STARTUP_WARM_PROVIDERS: bool = Field(True)
+
+    # Background vector indexing (craving_index_outbox drained by an asyncio worker)
+    INDEXING_WORKER_ENABLED: bool = Field(True)
+    INDEXING_BATCH_SIZE: int = Field(64)
+    INDEXING_CONCURRENCY: int = Field(1)  # batches in flight at once
+    INDEXING_POLL_INTERVAL_SECONDS: float = Field(5.0)
+    INDEXING_LEASE_SECONDS: float = Field(120.0)
+    INDEXING_MAX_ATTEMPTS: int = Field(8)
+    INDEXING_RETRY_BASE_SECONDS: float = Field(2.0)
+    INDEXING_RETRY_MAX_SECONDS: float = Field(600.0)
+
+    # Voice log uploads are streamed to disk in chunks; the cap is enforced
+    # while streaming (default matches the Whisper API's 25 MB file limit)
+    VOICE_UPLOAD_MAX_BYTES: int = Field(25 * 1024 * 1024)
+    VOICE_UPLOAD_CHUNK_BYTES: int = Field(1024 * 1024)
+    # Content-addressed audio store (unset = app/uploads/blobs)
+    AUDIO_BLOB_DIR: Optional[str] = Field(None)
+
+    # Audio preprocessing before Whisper: 16 kHz mono, silence trimmed, long
+    # recordings split at quiet points into chunks transcribed in parallel.
+    # AUDIO_OUTPUT_FORMAT: "auto" (FLAC if soundfile is installed), "flac", "wav"
+    AUDIO_PREPROCESSING_ENABLED: bool = Field(True)
+    AUDIO_TARGET_SAMPLE_RATE: int = Field(16000)
+    AUDIO_SILENCE_THRESHOLD_DB: float = Field(-40.0)
+    AUDIO_CHUNK_SECONDS: float = Field(60.0)
+    AUDIO_CHUNK_CONCURRENCY: int = Field(4)
+    AUDIO_OUTPUT_FORMAT: str = Field("auto")
+
+    # Speech-to-text backend: "openai" (whisper-1 over the API) or "local"
+    # (faster-whisper on this machine; pip install faster-whisper). The local
+    # model is loaded once per process. LOCAL_WHISPER_MODEL is a model name
+    # ("tiny", "base", "small", ...) or a converted model directory, which
+    # keeps startup offline; LOCAL_WHISPER_CPU_THREADS=0 uses the default,
+    # LOCAL_WHISPER_LANGUAGE unset detects the language per recording.
+    TRANSCRIPTION_BACKEND: str = Field("openai")
+    LOCAL_WHISPER_MODEL: str = Field("base")
+    LOCAL_WHISPER_DEVICE: str = Field("cpu")
+    LOCAL_WHISPER_COMPUTE_TYPE: str = Field("int8")
+    LOCAL_WHISPER_CPU_THREADS: int = Field(0)
+    LOCAL_WHISPER_NUM_WORKERS: int = Field(1)
+    LOCAL_WHISPER_BEAM_SIZE: int = Field(1)
+    LOCAL_WHISPER_LANGUAGE: Optional[str] = Field(None)
+
+    # Background transcription (transcription_jobs drained by a pool of
+    # TRANSCRIPTION_CONCURRENCY workers, each running one job at a time)
+    TRANSCRIPTION_WORKER_ENABLED: bool = Field(True)
+    TRANSCRIPTION_CONCURRENCY: int = Field(2)
+    TRANSCRIPTION_POLL_INTERVAL_SECONDS: float = Field(5.0)
+    TRANSCRIPTION_LEASE_SECONDS: float = Field(600.0)
+    TRANSCRIPTION_MAX_ATTEMPTS: int = Field(4)
+    TRANSCRIPTION_RETRY_BASE_SECONDS: float = Field(10.0)
+    TRANSCRIPTION_RETRY_MAX_SECONDS: float = Field(900.0)
+
+    # Per-user craving summaries (user_craving_summaries), refreshed by the
+    # indexing worker and injected into RAG prompts; with a summary, RAG
+    # retrieves at most RAG_SUMMARY_TOP_K raw cravings
+    CRAVING_SUMMARY_ENABLED: bool = Field(True)
+    CRAVING_SUMMARY_WEEKS: int = Field(8)
+    CRAVING_SUMMARY_TOP_N: int = Field(5)
+    CRAVING_SUMMARY_MAX_PHRASES: int = Field(200)
+    RAG_SUMMARY_TOP_K: int = Field(3)
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
 _settings = None
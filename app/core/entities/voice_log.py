@@ -18,4 +18,6 @@ class VoiceLog(BaseModel):
     created_at: datetime
     transcribed_text: Optional[str] = None
     transcription_status: Optional[str] = None  # e.g. PENDING, FAILED, COMPLETED
-    is_deleted: bool = False
\ No newline at end of file
+    is_deleted: bool = False
+    content_sha256: Optional[str] = None
+    size_bytes: Optional[int] = None
\ No newline at end of file
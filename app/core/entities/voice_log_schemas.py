@@ -16,4 +16,6 @@ class VoiceLogOut(BaseModel):
     transcribed_text: Optional[str] = None
     transcription_status: Optional[str] = None
     is_deleted: bool
+    content_sha256: Optional[str] = None
+    size_bytes: Optional[int] = None
     model_config = ConfigDict(from_attributes=True)  # Use ConfigDict and from_attributes
\ No newline at end of file
@@ -0,0 +1,245 @@
+# File: app/core/services/audio_preprocessing.py
+"""
+Audio preprocessing ahead of transcription.
+
+Voice logs arrive as whatever the client recorded (typically 44.1/48 kHz,
+sometimes stereo). Whisper only needs 16 kHz mono, so before upload the
+audio is:
+
+  1. decoded (PCM WAV, stdlib `wave` + NumPy) and down-mixed to mono;
+  2. resampled to AUDIO_TARGET_SAMPLE_RATE;
+  3. trimmed of leading and trailing silence (frame energy below
+     AUDIO_SILENCE_THRESHOLD_DB, relative to full scale);
+  4. split into chunks of at most AUDIO_CHUNK_SECONDS, each cut at the
+     quietest frame near the limit so words are not split;
+  5. encoded as FLAC when the optional `soundfile` package is installed,
+     otherwise as 16-bit WAV.
+
+Input that cannot be decoded here (compressed WAV, m4a, ...) is left alone
+and sent to Whisper as before.
+"""
+
+import io
+import logging
+import os
+import wave
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class UnsupportedAudio(ValueError):
+    """The file is not PCM WAV audio this module can decode."""
+
+
+@dataclass
+class AudioChunk:
+    index: int
+    start_seconds: float
+    end_seconds: float
+    data: bytes
+    file_name: str
+
+
+@dataclass
+class PreparedAudio:
+    chunks: List[AudioChunk] = field(default_factory=list)
+    duration_seconds: float = 0.0
+    trimmed_seconds: float = 0.0
+    input_bytes: int = 0
+
+    @property
+    def output_bytes(self) -> int:
+        return sum(len(c.data) for c in self.chunks)
+
+
+def read_wav(path: str) -> Tuple[np.ndarray, int]:
+    """Mono float32 samples in [-1, 1] and the sample rate of a PCM WAV file."""
+    try:
+        with wave.open(path, "rb") as wav:
+            channels = wav.getnchannels()
+            width = wav.getsampwidth()
+            rate = wav.getframerate()
+            raw = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError) as e:
+        raise UnsupportedAudio(str(e)) from e
+
+    if width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        samples = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    elif width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        ints = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+        ints = np.where(ints & 0x800000, ints - (1 << 24), ints)
+        samples = ints.astype(np.float32) / float(1 << 23)
+    elif width == 4:
+        samples = np.frombuffer(raw, dtype="<i4").astype(np.float32) / float(1 << 31)
+    else:
+        raise UnsupportedAudio(f"unsupported sample width: {width}")
+
+    if channels > 1:
+        samples = samples[: len(samples) - len(samples) % channels].reshape(-1, channels).mean(axis=1)
+    return samples.astype(np.float32, copy=False), rate
+
+
+def resample(samples: np.ndarray, rate: int, target_rate: int) -> np.ndarray:
+    """
+    Linear-interpolation resampling. When downsampling, a moving average
+    over one output period first suppresses content above the new Nyquist
+    frequency (speech energy sits well below 8 kHz).
+    """
+    if rate == target_rate or len(samples) == 0:
+        return samples
+    if target_rate < rate:
+        width = int(round(rate / target_rate))
+        if width > 1:
+            cumsum = np.cumsum(np.concatenate(([0.0], samples.astype(np.float64))))
+            smoothed = (cumsum[width:] - cumsum[:-width]) / width
+            samples = np.concatenate((smoothed, samples[len(smoothed):])).astype(np.float32)
+    n_out = int(round(len(samples) * target_rate / rate))
+    positions = np.arange(n_out, dtype=np.float64) * (rate / target_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def frame_levels_db(samples: np.ndarray, frame: int) -> np.ndarray:
+    """RMS level of each `frame`-sample frame, in dBFS."""
+    n = len(samples) // frame
+    if n == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = samples[: n * frame].reshape(n, frame).astype(np.float64)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    return (20.0 * np.log10(np.maximum(rms, 1e-10))).astype(np.float32)
+
+
+def voiced_span(levels: np.ndarray, threshold_db: float) -> Optional[Tuple[int, int]]:
+    """First and one-past-last frame above the threshold, or None if all silent."""
+    loud = np.flatnonzero(levels > threshold_db)
+    if len(loud) == 0:
+        return None
+    return int(loud[0]), int(loud[-1]) + 1
+
+
+def split_frames(levels: np.ndarray, max_frames: int, search_frames: int) -> List[Tuple[int, int]]:
+    """
+    [start, end) frame ranges of at most max_frames each. Every cut is placed
+    at the quietest frame in the last search_frames before the limit.
+    """
+    spans = []
+    start, total = 0, len(levels)
+    while total - start > max_frames:
+        window_start = start + max(max_frames - search_frames, 1)
+        window = levels[window_start:start + max_frames]
+        cut = window_start + int(np.argmin(window))
+        spans.append((start, cut))
+        start = cut
+    spans.append((start, total))
+    return spans
+
+
+def _soundfile():
+    try:
+        import soundfile
+        return soundfile
+    except ImportError:
+        return None
+
+
+def encode(samples: np.ndarray, rate: int, fmt: str) -> Tuple[bytes, str]:
+    """(data, file name) of 16-bit audio as FLAC or WAV."""
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767.0).astype("<i2")
+    buf = io.BytesIO()
+    if fmt == "flac":
+        _soundfile().write(buf, pcm, rate, format="FLAC", subtype="PCM_16")
+        return buf.getvalue(), "audio.flac"
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(pcm.tobytes())
+    return buf.getvalue(), "audio.wav"
+
+
+class AudioPreprocessor:
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        silence_threshold_db: float = -40.0,
+        frame_ms: int = 30,
+        max_chunk_seconds: float = 60.0,
+        split_search_seconds: float = 10.0,
+        output_format: str = "auto",
+    ):
+        if output_format not in ("auto", "flac", "wav"):
+            raise ValueError(f"Unknown audio output format: {output_format}")
+        if output_format == "auto":
+            output_format = "flac" if _soundfile() is not None else "wav"
+        elif output_format == "flac" and _soundfile() is None:
+            logger.warning("soundfile is not installed; encoding audio as WAV")
+            output_format = "wav"
+        self.sample_rate = sample_rate
+        self.silence_threshold_db = silence_threshold_db
+        self.frame_ms = frame_ms
+        self.max_chunk_seconds = max_chunk_seconds
+        self.split_search_seconds = split_search_seconds
+        self.output_format = output_format
+
+    @classmethod
+    def from_settings(cls) -> "AudioPreprocessor":
+        from app.config.settings import get_settings
+        s = get_settings()
+        return cls(
+            sample_rate=s.AUDIO_TARGET_SAMPLE_RATE,
+            silence_threshold_db=s.AUDIO_SILENCE_THRESHOLD_DB,
+            max_chunk_seconds=s.AUDIO_CHUNK_SECONDS,
+            output_format=s.AUDIO_OUTPUT_FORMAT,
+        )
+
+    def prepare(self, path: str) -> PreparedAudio:
+        """
+        Chunks ready for upload, in order. No chunks means the recording is
+        silence. Raises UnsupportedAudio for input this module cannot decode.
+        """
+        samples, rate = read_wav(path)
+        samples = resample(samples, rate, self.sample_rate)
+        rate = self.sample_rate
+        frame = max(int(rate * self.frame_ms / 1000), 1)
+        levels = frame_levels_db(samples, frame)
+        duration = len(samples) / rate
+        input_bytes = os.path.getsize(path)
+
+        span = voiced_span(levels, self.silence_threshold_db)
+        if span is None:
+            return PreparedAudio(duration_seconds=duration, trimmed_seconds=duration, input_bytes=input_bytes)
+        first, last = span
+        # Keep one frame of context either side of the speech
+        first, last = max(first - 1, 0), min(last + 1, len(levels))
+
+        frames_per_second = rate / frame
+        max_frames = max(int(self.max_chunk_seconds * frames_per_second), 1)
+        search_frames = max(int(self.split_search_seconds * frames_per_second), 1)
+        chunks = []
+        for i, (start, end) in enumerate(split_frames(levels[first:last], max_frames, search_frames)):
+            lo, hi = (first + start) * frame, (first + end) * frame
+            data, name = encode(samples[lo:hi], rate, self.output_format)
+            chunks.append(AudioChunk(i, lo / rate, hi / rate, data, name))
+
+        prepared = PreparedAudio(
+            chunks=chunks,
+            duration_seconds=duration,
+            trimmed_seconds=duration - (last - first) * frame / rate,
+            input_bytes=input_bytes,
+        )
+        logger.info(
+            "Audio prepared for transcription",
+            extra={
+                "chunks": len(chunks),
+                "input_bytes": input_bytes,
+                "output_bytes": prepared.output_bytes,
+                "trimmed_seconds": round(prepared.trimmed_seconds, 2),
+            },
+        )
+        return prepared
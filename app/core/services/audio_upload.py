@@ -0,0 +1,127 @@
+# File: app/core/services/audio_upload.py
+"""
+Streaming audio uploads to disk.
+
+The upload is copied chunk by chunk into a staging file in the blob
+directory, so memory per upload is one chunk whatever the file size. The
+size cap is enforced while copying and the SHA-256 is computed on the same
+pass. The complete staged file is then either renamed into place as a new
+blob (atomic) or dropped as a duplicate (see AudioBlobRepository.acquire);
+a rejected or interrupted upload leaves nothing behind.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from fastapi import UploadFile
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_BYTES = 1024 * 1024
+
+
+class UploadTooLarge(ValueError):
+    """The upload exceeded the configured size cap."""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Upload exceeds the {max_bytes} byte limit")
+        self.max_bytes = max_bytes
+
+
+class EmptyUpload(ValueError):
+    """The upload had no content."""
+
+
+@dataclass
+class StagedUpload:
+    """A complete upload in its staging file, not yet placed."""
+    path: str
+    size_bytes: int
+    sha256: str
+
+    def discard(self) -> None:
+        """Delete the staging file if it was not placed."""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def _open_temp(directory: str) -> BinaryIO:
+    os.makedirs(directory, exist_ok=True)
+    return tempfile.NamedTemporaryFile(dir=directory, prefix=".upload-", suffix=".part", delete=False)
+
+
+def _finish(tmp: BinaryIO) -> None:
+    tmp.flush()
+    os.fsync(tmp.fileno())
+    tmp.close()
+
+
+def _discard(tmp: BinaryIO) -> None:
+    tmp.close()
+    try:
+        os.unlink(tmp.name)
+    except FileNotFoundError:
+        pass
+
+
+async def stream_upload(
+    upload: UploadFile,
+    directory: str,
+    max_bytes: int,
+    chunk_size: int = DEFAULT_CHUNK_BYTES,
+) -> StagedUpload:
+    """
+    Copy `upload` to a staging file in `directory`. File I/O runs in the
+    thread pool so the event loop never blocks on disk.
+
+    Raises UploadTooLarge (before reading anything when the declared size
+    is already over the cap) or EmptyUpload.
+    """
+    declared = getattr(upload, "size", None)
+    if declared is not None and declared > max_bytes:
+        raise UploadTooLarge(max_bytes)
+
+    digest = hashlib.sha256()
+    size = 0
+    tmp = await asyncio.to_thread(_open_temp, directory)
+    try:
+        while True:
+            chunk = await upload.read(chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLarge(max_bytes)
+            digest.update(chunk)
+            await asyncio.to_thread(tmp.write, chunk)
+        if size == 0:
+            raise EmptyUpload("Empty file or unable to read file bytes.")
+        await asyncio.to_thread(_finish, tmp)
+    except BaseException:
+        # Includes cancellation (client disconnect): never leave a partial file
+        _discard(tmp)
+        raise
+
+    logger.info("Audio upload staged", extra={"size_bytes": size})
+    return StagedUpload(path=tmp.name, size_bytes=size, sha256=digest.hexdigest())
+
+
+def stage_bytes(directory: str, data: bytes) -> StagedUpload:
+    """Stage in-memory audio the same way. Blocking."""
+    if not data:
+        raise EmptyUpload("Empty file or unable to read file bytes.")
+    tmp = _open_temp(directory)
+    try:
+        tmp.write(data)
+        _finish(tmp)
+    except BaseException:
+        _discard(tmp)
+        raise
+    return StagedUpload(path=tmp.name, size_bytes=len(data), sha256=hashlib.sha256(data).hexdigest())
@@ -0,0 +1,325 @@
+# File: app/core/services/conversation_store.py
+"""
+Conversation memory for multi-turn /ai/chat.
+
+Sessions and their messages are persisted (chat_sessions, chat_messages)
+and the working state of recently used sessions is kept in an in-process
+LRU, so a follow-up turn costs no history read. The client sends only its
+new message plus the session_id; the model sees:
+
+    [summary of older turns] + the recent window + the new message
+
+The window is bounded by CHAT_HISTORY_MAX_MESSAGES and
+CHAT_HISTORY_MAX_TOKENS. Turns pushed out of it are compacted according to
+CHAT_MEMORY_STRATEGY:
+
+  - "summary": folded into a running summary by the chat model;
+  - "window":  dropped (a plain sliding window).
+
+Either way they are marked compacted in the DB and never replayed again.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.services.token_counter import TokenCounter
+from app.infrastructure.database.conversation_repository import ConversationRepository
+
+logger = logging.getLogger(__name__)
+
+Summarizer = Callable[[Optional[str], List["ChatTurn"]], Awaitable[str]]
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+
+class ConversationNotFound(LookupError):
+    """Unknown session_id, or one that belongs to another user."""
+
+
+@dataclass
+class ChatTurn:
+    seq: int
+    role: str
+    content: str
+    tokens: int
+
+
+@dataclass
+class Conversation:
+    session_id: str
+    user_id: int
+    summary: Optional[str] = None
+    summarized_through: int = 0
+    window: List[ChatTurn] = field(default_factory=list)
+    next_seq: int = 1
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+class ConversationStore:
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        counter: Optional[TokenCounter] = None,
+        max_sessions: int = 1024,
+        max_history_messages: int = 20,
+        max_history_tokens: int = 2000,
+        strategy: str = "summary",
+    ):
+        if strategy not in ("summary", "window"):
+            raise ValueError(f"Unknown chat memory strategy: {strategy}")
+        self._session_factory = session_factory
+        self.counter = counter or TokenCounter(use_tiktoken=False)
+        self.max_sessions = max_sessions
+        self.max_history_messages = max_history_messages
+        self.max_history_tokens = max_history_tokens
+        self.strategy = strategy
+        self._cache: "OrderedDict[str, Conversation]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._compactions = 0
+
+    @classmethod
+    def from_settings(cls) -> "ConversationStore":
+        from app.config.settings import get_settings
+        from app.core.services.prompt_builder import prompt_builder
+        settings = get_settings()
+        return cls(
+            counter=prompt_builder.counter,
+            max_sessions=settings.CHAT_SESSION_CACHE_SIZE,
+            max_history_messages=settings.CHAT_HISTORY_MAX_MESSAGES,
+            max_history_tokens=settings.CHAT_HISTORY_MAX_TOKENS,
+            strategy=settings.CHAT_MEMORY_STRATEGY,
+        )
+
+    # ------------------------------------------------------------------
+    # Public API (async; database work runs in a worker thread)
+    # ------------------------------------------------------------------
+
+    async def open(
+        self, user_id: int, session_id: Optional[str] = None
+    ) -> Conversation:
+        """The user's session, or a new one when session_id is None."""
+        return await asyncio.to_thread(self._open, user_id, session_id)
+
+    def history(self, conversation: Conversation) -> List[Dict[str, str]]:
+        """Messages to send ahead of the new user message."""
+        messages = []
+        if conversation.summary:
+            summary = SUMMARY_PREFIX + conversation.summary
+            messages.append({"role": "system", "content": summary})
+        messages.extend(
+            {"role": t.role, "content": t.content} for t in conversation.window
+        )
+        return messages
+
+    async def add_turn(
+        self,
+        conversation: Conversation,
+        user_text: str,
+        reply: str,
+        summarize: Optional[Summarizer] = None,
+    ) -> None:
+        """
+        Persist one exchange, then compact whatever fell out of the window.
+        A failed summary keeps the previous one; the turns are still dropped.
+        """
+        evicted = await asyncio.to_thread(self._append, conversation, user_text, reply)
+        if not evicted:
+            return
+        summary = conversation.summary
+        if self.strategy == "summary" and summarize is not None:
+            try:
+                summary = await summarize(conversation.summary, evicted)
+            except Exception:
+                logger.warning(
+                    "Chat summary failed; dropping turns unsummarized",
+                    exc_info=True,
+                    extra={"session_id": conversation.session_id},
+                )
+        await asyncio.to_thread(
+            self._save_summary, conversation, summary, evicted[-1].seq
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "sessions_cached": len(self._cache),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "compactions": self._compactions,
+                "strategy": self.strategy,
+            }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _open(self, user_id: int, session_id: Optional[str]) -> Conversation:
+        if session_id is None:
+            db = self._new_session()
+            try:
+                row = ConversationRepository(db).create_session(user_id)
+                conversation = Conversation(session_id=row.id, user_id=user_id)
+            finally:
+                db.close()
+            self._remember(conversation)
+            return conversation
+
+        with self._lock:
+            conversation = self._cache.get(session_id)
+            if conversation is not None:
+                self._cache.move_to_end(session_id)
+                self._hits += 1
+            else:
+                self._misses += 1
+        if conversation is None:
+            conversation = self._load(session_id)
+            self._remember(conversation)
+        if conversation.user_id != user_id:
+            raise ConversationNotFound(session_id)
+        return conversation
+
+    def _load(self, session_id: str) -> Conversation:
+        db = self._new_session()
+        try:
+            repo = ConversationRepository(db)
+            row = repo.get_session(session_id)
+            if row is None:
+                raise ConversationNotFound(session_id)
+            conversation = Conversation(
+                session_id=row.id,
+                user_id=row.user_id,
+                summary=row.summary,
+                summarized_through=row.summarized_through_seq,
+                next_seq=row.summarized_through_seq + 1,
+            )
+            for m in repo.messages_after(row.id, row.summarized_through_seq):
+                conversation.window.append(ChatTurn(m.seq, m.role, m.content, m.tokens))
+                conversation.next_seq = m.seq + 1
+            return conversation
+        finally:
+            db.close()
+
+    def _append(
+        self, conversation: Conversation, user_text: str, reply: str
+    ) -> List[ChatTurn]:
+        turns = [("user", user_text, self.counter.count(user_text)),
+                 ("assistant", reply, self.counter.count(reply))]
+        with conversation.lock:
+            db = self._new_session()
+            try:
+                try:
+                    ConversationRepository(db).append_messages(
+                        conversation.session_id, conversation.next_seq, turns
+                    )
+                except IntegrityError:
+                    # Another process wrote to this session: reload its state
+                    # and append after it
+                    fresh = self._load(conversation.session_id)
+                    conversation.summary = fresh.summary
+                    conversation.summarized_through = fresh.summarized_through
+                    conversation.window = fresh.window
+                    conversation.next_seq = fresh.next_seq
+                    ConversationRepository(db).append_messages(
+                        conversation.session_id, conversation.next_seq, turns
+                    )
+            finally:
+                db.close()
+            for offset, (role, content, tokens) in enumerate(turns):
+                seq = conversation.next_seq + offset
+                conversation.window.append(ChatTurn(seq, role, content, tokens))
+            conversation.next_seq += len(turns)
+            return self._evict(conversation)
+
+    def _evict(self, conversation: Conversation) -> List[ChatTurn]:
+        """
+        Pop the oldest turns until the window fits; the latest exchange always
+        stays.
+        """
+        evicted: List[ChatTurn] = []
+        window = conversation.window
+        tokens = sum(t.tokens for t in window)
+        while len(window) > 2 and (
+            len(window) > self.max_history_messages or tokens > self.max_history_tokens
+        ):
+            turn = window.pop(0)
+            tokens -= turn.tokens
+            evicted.append(turn)
+        return evicted
+
+    def _save_summary(
+        self, conversation: Conversation, summary: Optional[str], through_seq: int
+    ) -> None:
+        db = self._new_session()
+        try:
+            ConversationRepository(db).update_summary(
+                conversation.session_id, summary, through_seq
+            )
+        finally:
+            db.close()
+        with conversation.lock:
+            conversation.summary = summary
+            conversation.summarized_through = through_seq
+        with self._lock:
+            self._compactions += 1
+
+    def _remember(self, conversation: Conversation) -> None:
+        with self._lock:
+            self._cache[conversation.session_id] = conversation
+            self._cache.move_to_end(conversation.session_id)
+            while len(self._cache) > self.max_sessions:
+                self._cache.popitem(last=False)
+
+    def _new_session(self) -> Session:
+        if self._session_factory is None:
+            from app.infrastructure.database.session import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+
+async def summarize_turns(
+    chat_service, previous: Optional[str], turns: List[ChatTurn]
+) -> str:
+    """Fold turns into the running summary with the chat model."""
+    transcript = "\n".join(f"{t.role.upper()}: {t.content}" for t in turns)
+    prompt = (
+        f"Current summary:\n{previous or '(none)'}\n\n"
+        f"New conversation lines:\n{transcript}\n\n"
+        "Update the summary with the new lines. Keep facts the user shared, "
+        "their goals and any advice already given. At most 150 words."
+    )
+    return await chat_service.complete(
+        [
+            {
+                "role": "system",
+                "content": "You maintain a concise running summary of a conversation.",
+            },
+            {"role": "user", "content": prompt},
+        ],
+        temperature=0.2,
+        max_tokens=250,
+    )
+
+
+_conversation_store: Optional[ConversationStore] = None
+_store_lock = threading.Lock()
+
+
+def get_conversation_store() -> ConversationStore:
+    """The process-wide store, created on first use (usable as a FastAPI dependency)."""
+    global _conversation_store
+    if _conversation_store is None:
+        with _store_lock:
+            if _conversation_store is None:
+                _conversation_store = ConversationStore.from_settings()
+    return _conversation_store
@@ -0,0 +1,257 @@
+# File: app/core/services/craving_indexing_worker.py
+"""
+Background worker that keeps the vector index in sync with the cravings table.
+
+Craving writes only add a row to craving_index_outbox in their own
+transaction. This worker drains the outbox in micro-batches: one embedding
+call and one vector upsert per batch for live cravings, one vector delete
+for cravings that were deleted. It is pull-based, so a slow embedding
+provider only lets the outbox grow; it never slows down writes. Each
+completed batch also refreshes the affected users' craving summaries.
+"""
+
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config.settings import get_settings
+from app.core.services.insight_cache import insight_cache
+from app.core.use_cases.index_craving_embeddings import CravingToIndex, index_craving_embeddings
+from app.infrastructure.database.models import CravingModel
+from app.infrastructure.database.outbox_repository import CravingIndexOutboxRepository
+from app.infrastructure.database.summary_repository import CravingSummaryRepository
+
+logger = logging.getLogger(__name__)
+
+
+class CravingIndexingWorker:
+    """
+    Drains craving_index_outbox on the running event loop.
+
+    Database and network work runs in worker threads (asyncio.to_thread);
+    at most `concurrency` batches of `batch_size` rows are in flight, which
+    bounds memory and outbound load however large the backlog gets.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        embedder=None,
+        vector_repo=None,
+        batch_size: int = 64,
+        concurrency: int = 1,
+        poll_interval: float = 5.0,
+        lease_seconds: float = 120.0,
+        max_attempts: int = 8,
+        retry_base_delay: float = 2.0,
+        retry_max_delay: float = 600.0,
+        refresh_summaries: bool = True,
+    ):
+        self._session_factory = session_factory
+        self._embedder = embedder
+        self._vector_repo = vector_repo
+        self.batch_size = batch_size
+        self.concurrency = max(concurrency, 1)
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.refresh_summaries = refresh_summaries
+
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    @classmethod
+    def from_settings(cls, **overrides) -> "CravingIndexingWorker":
+        s = get_settings()
+        options = dict(
+            batch_size=s.INDEXING_BATCH_SIZE,
+            concurrency=s.INDEXING_CONCURRENCY,
+            poll_interval=s.INDEXING_POLL_INTERVAL_SECONDS,
+            lease_seconds=s.INDEXING_LEASE_SECONDS,
+            max_attempts=s.INDEXING_MAX_ATTEMPTS,
+            retry_base_delay=s.INDEXING_RETRY_BASE_SECONDS,
+            retry_max_delay=s.INDEXING_RETRY_MAX_SECONDS,
+            refresh_summaries=s.CRAVING_SUMMARY_ENABLED,
+        )
+        options.update(overrides)
+        return cls(**options)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="craving-indexing-worker")
+        logger.info("Craving indexing worker started", extra={"batch_size": self.batch_size})
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self._stopping = True
+        self._wake.set()
+        try:
+            await self._task
+        finally:
+            self._task = None
+            logger.info("Craving indexing worker stopped")
+
+    def notify(self) -> None:
+        """
+        Hint that new rows were committed. Safe to call from any thread;
+        a no-op when the worker is not running. Hints coalesce.
+        """
+        if not self.running:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._wake.set)
+        except RuntimeError:
+            # Loop already closed during shutdown
+            pass
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                processed = await self.drain()
+            except Exception:
+                logger.error("Craving indexing worker iteration failed", exc_info=True)
+                processed = 0
+            if self._stopping:
+                break
+            if processed == 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+
+    async def drain(self) -> int:
+        """
+        Process batches until the outbox has nothing due. Returns rows handled.
+        """
+        total = 0
+        while not self._stopping:
+            results = await asyncio.gather(
+                *(asyncio.to_thread(self.process_batch) for _ in range(self.concurrency))
+            )
+            handled = sum(results)
+            total += handled
+            if handled < self.batch_size:
+                break
+        return total
+
+    # ------------------------------------------------------------------
+    # Batch processing (synchronous; runs in a worker thread)
+    # ------------------------------------------------------------------
+
+    def process_batch(self) -> int:
+        """
+        Claim one batch, sync it to the vector index, and settle the claim.
+        Returns the number of outbox rows claimed.
+        """
+        db = self._new_session()
+        try:
+            outbox = CravingIndexOutboxRepository(db)
+            items = outbox.claim_batch(self.batch_size, self.lease_seconds)
+            if not items:
+                return 0
+
+            craving_ids = {item.craving_id for item in items}
+            rows = db.query(CravingModel).filter(CravingModel.id.in_(craving_ids)).all()
+            live = [
+                CravingToIndex(c.id, c.user_id, c.description, c.created_at, c.intensity)
+                for c in rows if not c.is_deleted
+            ]
+            # Removed vectors are deleted from their owner's namespace
+            owners = {c.id: c.user_id for c in rows}
+            removed: Dict[Optional[int], List[int]] = {}
+            for craving_id in sorted(craving_ids - {c.id for c in live}):
+                removed.setdefault(owners.get(craving_id), []).append(craving_id)
+
+            error = None
+            try:
+                if live:
+                    # Strict: an embedding outage fails the batch (retried with
+                    # backoff) rather than indexing fallback vectors
+                    upserted = index_craving_embeddings(
+                        live, embedder=self._embedder, vector_repo=self.vector_repo, strict=True
+                    )
+                    if upserted < len(live):
+                        error = f"upserted {upserted} of {len(live)} vectors"
+                for user_id, ids in removed.items():
+                    if error is not None:
+                        break
+                    if not self.vector_repo.delete_craving_embeddings(ids, user_id=user_id):
+                        error = f"failed to delete {len(ids)} vectors"
+            except Exception as e:
+                error = str(e) or e.__class__.__name__
+
+            item_ids = [item.id for item in items]
+            if error is None:
+                outbox.complete(item_ids)
+                # Answers cached before these vectors were searchable are stale
+                for user_id in {c.user_id for c in rows}:
+                    insight_cache.invalidate_user(user_id)
+                if self.refresh_summaries:
+                    self._refresh_summaries(db, rows)
+            else:
+                logger.warning("Indexing batch failed", extra={"count": len(items), "error": error})
+                outbox.fail(
+                    item_ids,
+                    error,
+                    max_attempts=self.max_attempts,
+                    base_delay=self.retry_base_delay,
+                    max_delay=self.retry_max_delay,
+                )
+            return len(items)
+        finally:
+            db.close()
+
+    def _refresh_summaries(self, db: Session, rows: List[CravingModel]) -> None:
+        """
+        Fold the batch's cravings into their owners' summaries. Best effort:
+        the vectors are already synced, so a failure here only leaves a
+        summary behind until the user's next craving.
+        """
+        changed: Dict[int, List[int]] = {}
+        for c in rows:
+            changed.setdefault(c.user_id, []).append(c.id)
+        summaries = CravingSummaryRepository(db)
+        for user_id, craving_ids in changed.items():
+            try:
+                summaries.refresh_for_changes(user_id, craving_ids)
+                db.commit()
+            except Exception:
+                db.rollback()
+                logger.warning("Craving summary refresh failed", exc_info=True, extra={"user_id": user_id})
+
+    def _new_session(self) -> Session:
+        if self._session_factory is None:
+            from app.infrastructure.database.session import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    @property
+    def vector_repo(self):
+        if self._vector_repo is None:
+            # Imported lazily: the vector client is only needed once a batch runs
+            from app.infrastructure.vector_db.vector_repository import vector_repository
+            self._vector_repo = vector_repository
+        return self._vector_repo
+
+
+craving_indexing_worker = CravingIndexingWorker.from_settings()
@@ -0,0 +1,201 @@
+# File: app/core/services/craving_reranker.py
+"""
+Batched re-ranking of retrieved cravings for the RAG prompt.
+
+Each candidate's final score blends its similarity to the query with how
+recent and how intense the craving was:
+
+    score = similarity * recency * intensity
+
+    recency   = floor + (1 - floor) * decay(age_days)
+    intensity = (1 - w) + w * clip(intensity / max_intensity, 0, 1)
+
+All of it is computed over NumPy arrays; top-k uses argpartition. With
+mmr_lambda < 1 the final selection is Maximal Marginal Relevance over the
+candidates' embeddings, so near-duplicate cravings do not crowd the prompt.
+"""
+
+from datetime import datetime
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DecayCurve = Callable[[np.ndarray], np.ndarray]
+
+# The curve RAGService used before re-ranking was vectorised: full weight
+# today, half weight at 30 days, nothing left after a year
+LEGACY_PIECEWISE = ((0.0, 1.0), (30.0, 0.5), (365.0, 0.0))
+
+
+def exponential_decay(half_life_days: float) -> DecayCurve:
+    """Weight halves every half_life_days."""
+    rate = np.log(2.0) / half_life_days
+
+    def decay(age_days: np.ndarray) -> np.ndarray:
+        return np.exp(-rate * np.maximum(age_days, 0.0))
+    return decay
+
+
+def piecewise_decay(points: Sequence[Tuple[float, float]]) -> DecayCurve:
+    """
+    Linear interpolation through (age_days, weight) points, flat beyond the
+    ends.
+    """
+    ages = np.array([p[0] for p in points], dtype=np.float64)
+    weights = np.array([p[1] for p in points], dtype=np.float64)
+
+    def decay(age_days: np.ndarray) -> np.ndarray:
+        return np.interp(age_days, ages, weights)
+    return decay
+
+
+def decay_from_settings(kind: str, half_life_days: float) -> DecayCurve:
+    if kind == "exponential":
+        return exponential_decay(half_life_days)
+    if kind == "piecewise":
+        return piecewise_decay(LEGACY_PIECEWISE)
+    raise ValueError(f"Unknown decay curve: {kind}")
+
+
+def blended_scores(
+    similarity: np.ndarray,
+    age_days: np.ndarray,
+    intensity: np.ndarray,
+    decay: DecayCurve,
+    intensity_weight: float = 0.3,
+    recency_floor: float = 0.2,
+    max_intensity: float = 10.0,
+) -> np.ndarray:
+    recency = recency_floor + (1.0 - recency_floor) * decay(age_days)
+    relative = np.clip(intensity / max_intensity, 0.0, 1.0)
+    intensity_factor = (1.0 - intensity_weight) + intensity_weight * relative
+    return similarity * recency * intensity_factor
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first (O(n) selection +
+    O(k log k) sort).
+    """
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    part = np.argpartition(-scores, k - 1)[:k]
+    return part[np.argsort(-scores[part], kind="stable")]
+
+
+def mmr_select(
+    scores: np.ndarray, vectors: np.ndarray, k: int, mmr_lambda: float = 0.7
+) -> np.ndarray:
+    """
+    Greedy Maximal Marginal Relevance: repeatedly pick the candidate with the
+    best mmr_lambda * score - (1 - mmr_lambda) * (max cosine similarity to
+    anything already picked). O(k * n * dim).
+    """
+    n = len(scores)
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    unit = vectors / np.where(norms == 0, 1.0, norms)
+
+    selected = np.empty(k, dtype=np.int64)
+    max_sim = np.full(n, -np.inf)
+    available = np.ones(n, dtype=bool)
+    for step in range(k):
+        redundancy = np.where(np.isinf(max_sim), 0.0, max_sim)
+        objective = mmr_lambda * scores - (1.0 - mmr_lambda) * redundancy
+        objective[~available] = -np.inf
+        pick = int(np.argmax(objective))
+        selected[step] = pick
+        available[pick] = False
+        max_sim = np.maximum(max_sim, unit @ unit[pick])
+    return selected
+
+
+class CravingReranker:
+    """
+    Re-ranks RetrievedCraving-like objects (id, score, created_at,
+    intensity, embedding).
+    """
+
+    def __init__(
+        self,
+        decay: DecayCurve,
+        intensity_weight: float = 0.3,
+        recency_floor: float = 0.2,
+        mmr_lambda: Optional[float] = 0.7,
+    ):
+        self.decay = decay
+        self.intensity_weight = intensity_weight
+        self.recency_floor = recency_floor
+        self.mmr_lambda = mmr_lambda
+
+    @classmethod
+    def from_settings(cls) -> "CravingReranker":
+        from app.config.settings import get_settings
+        settings = get_settings()
+        return cls(
+            decay=decay_from_settings(
+                settings.RAG_DECAY_CURVE, settings.RAG_DECAY_HALF_LIFE_DAYS
+            ),
+            intensity_weight=settings.RAG_INTENSITY_WEIGHT,
+            recency_floor=settings.RAG_RECENCY_FLOOR,
+            mmr_lambda=settings.RAG_MMR_LAMBDA,
+        )
+
+    def score(self, cravings: List, now: Optional[datetime] = None) -> np.ndarray:
+        """Blended scores for cravings; also stored on each craving's time_score."""
+        if not cravings:
+            return np.empty(0)
+        now = now or datetime.utcnow()
+        n = len(cravings)
+        similarity = np.fromiter(
+            (c.score for c in cravings), dtype=np.float64, count=n
+        )
+        age_days = np.fromiter(
+            ((now - c.created_at).total_seconds() for c in cravings),
+            dtype=np.float64,
+            count=n,
+        ) / 86400.0
+        intensity = np.fromiter(
+            (c.intensity for c in cravings), dtype=np.float64, count=n
+        )
+        scores = blended_scores(
+            similarity,
+            age_days,
+            intensity,
+            self.decay,
+            self.intensity_weight,
+            self.recency_floor,
+        )
+        for c, s in zip(cravings, scores.tolist()):
+            c.time_score = s
+        return scores
+
+    def rerank(
+        self, cravings: List, top_k: int, now: Optional[datetime] = None
+    ) -> List:
+        """
+        The top_k cravings by blended score, diversified with MMR when
+        embeddings are present.
+        """
+        scores = self.score(cravings, now)
+        use_mmr = (
+            self.mmr_lambda is not None
+            and self.mmr_lambda < 1.0
+            and len(cravings) > top_k
+            and all(getattr(c, "embedding", None) is not None for c in cravings)
+        )
+        if use_mmr:
+            # MMR over a shortlist: diversity only matters among plausible picks
+            shortlist = top_k_indices(scores, min(len(scores), top_k * 4))
+            vectors = np.asarray(
+                [cravings[i].embedding for i in shortlist], dtype=np.float32
+            )
+            picks = mmr_select(scores[shortlist], vectors, top_k, self.mmr_lambda)
+            order = shortlist[picks]
+        else:
+            order = top_k_indices(scores, top_k)
+        return [cravings[i] for i in order]
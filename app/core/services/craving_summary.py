@@ -0,0 +1,94 @@
+# File: app/core/services/craving_summary.py
+"""
+Pure helpers for the per-user craving summary (user_craving_summaries).
+
+  - trigger_phrases: the words and two-word phrases of a description that
+    could name a trigger ("after dinner", "stress", "coffee"), stopwords
+    removed, each counted once per craving;
+  - fold_craving: add one craving's emotions and phrases to running counts;
+  - render_summary: the stored summary as a few compact prompt lines.
+
+Persistence and refresh live in CravingSummaryRepository.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+_WORD = re.compile(r"[a-z][a-z']+")
+
+STOPWORDS = frozenset("""
+a about after again all am an and any are as at be because been before being but by can
+could craving cravings crave craved did do does doing don't down during each feel feeling felt
+for from get got had has have having he her here him his how i i'm if in into is it it's its
+just like me more most my myself no not now of off on once only or other our out over really
+she so some still such than that the their them then there these they this those through to
+too under until up very want wanted wanting was we were what when where which while who why
+will with would you your
+""".split())
+
+
+def trigger_phrases(description: str) -> Set[str]:
+    """Content words and adjacent content-word pairs of a description."""
+    words = _WORD.findall(description.lower())
+    phrases: Set[str] = set()
+    previous: Optional[str] = None
+    for word in words:
+        if word in STOPWORDS or len(word) < 3:
+            previous = None
+            continue
+        phrases.add(word)
+        if previous is not None:
+            phrases.add(f"{previous} {word}")
+        previous = word
+    return phrases
+
+
+def fold_craving(
+    emotion_counts: Dict[str, int],
+    phrase_counts: Dict[str, int],
+    description: str,
+    emotions: Optional[Iterable[str]],
+) -> None:
+    for emotion in {str(e).strip().lower() for e in emotions or [] if str(e).strip()}:
+        emotion_counts[emotion] = emotion_counts.get(emotion, 0) + 1
+    for phrase in trigger_phrases(description or ""):
+        phrase_counts[phrase] = phrase_counts.get(phrase, 0) + 1
+
+
+def top_counts(counts: Dict[str, int], n: int, min_count: int = 1) -> List[List[Any]]:
+    """[[key, count], ...] for the n most frequent keys (ties broken alphabetically)."""
+    ranked = sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+    return [[key, count] for key, count in ranked[:n] if count >= min_count]
+
+
+def prune_counts(counts: Dict[str, int], keep: int) -> Dict[str, int]:
+    """
+    Bound stored phrase counts to the `keep` most frequent. Pruned phrases
+    restart from zero if they come back, so rare ones can be under-counted.
+    """
+    if len(counts) <= keep:
+        return counts
+    return {key: count for key, count in top_counts(counts, keep)}
+
+
+def render_summary(summary: Dict[str, Any]) -> str:
+    """A stored summary as compact prompt text."""
+    totals = summary.get("totals") or {}
+    if not totals.get("count"):
+        return ""
+    lines = [
+        f"Total cravings: {totals['count']} since {totals.get('first_day', '?')}, "
+        f"avg intensity {totals.get('avg_intensity', 0):.1f}/10, resisted {totals.get('resisted', 0)}"
+    ]
+    weeks = summary.get("weekly") or []
+    if weeks:
+        lines.append("Weekly (week of: count, avg intensity): " + "; ".join(
+            f"{w['week']}: {w['count']}, {w['avg_intensity']:.1f}" for w in weeks
+        ))
+    emotions = summary.get("top_emotions") or []
+    if emotions:
+        lines.append("Top emotions: " + ", ".join(f"{e} ({n})" for e, n in emotions))
+    phrases = summary.get("top_phrases") or []
+    if phrases:
+        lines.append("Recurring phrases: " + ", ".join(f"{p} ({n})" for p, n in phrases))
+    return "\n".join(lines)
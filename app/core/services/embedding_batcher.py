@@ -0,0 +1,143 @@
+# File: app/core/services/embedding_batcher.py
+"""
+Request coalescing for embedding calls.
+
+SingleFlight: concurrent callers asking for the same key share one
+in-flight computation instead of each calling upstream.
+
+EmbeddingMicroBatcher: texts submitted within `window_ms` of each other are
+sent upstream together as one embeddings request (up to `max_batch` texts).
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls by key."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], object]):
+        """
+        Run fn() for key, unless a call for key is already running, in which
+        case wait for and return (or raise) that call's outcome.
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+
+class EmbeddingMicroBatcher:
+    """
+    Merge single-text embedding requests that arrive close together.
+
+    A daemon thread takes the first queued text, keeps collecting for up to
+    `window_ms` (or until `max_batch` texts), then makes one upstream call:
+    `embed_one(text)` for a batch of one, `embed_many(texts)` otherwise.
+    """
+
+    def __init__(
+        self,
+        embed_one: Callable[[str], List[float]],
+        embed_many: Callable[[List[str]], List[List[float]]],
+        window_ms: float = 5.0,
+        max_batch: int = 64,
+    ):
+        self._embed_one = embed_one
+        self._embed_many = embed_many
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.batches = 0
+        self.texts = 0
+
+    def embed(self, text: str) -> List[float]:
+        """Blocking: queue text and wait for its embedding."""
+        future: Future = Future()
+        self._ensure_started()
+        self._queue.put((text, future))
+        return future.result()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "upstream_batches": self.batches,
+            "batched_texts": self.texts,
+            "avg_batch_size": round(self.texts / self.batches, 2) if self.batches else 0.0,
+        }
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="embedding-micro-batcher", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._flush(batch)
+
+    def _flush(self, batch: List[Tuple[str, Future]]) -> None:
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        self.batches += 1
+        self.texts += len(texts)
+        try:
+            if len(texts) == 1:
+                vectors = [self._embed_one(texts[0])]
+            else:
+                vectors = self._embed_many(texts)
+            if len(vectors) != len(texts):
+                raise ValueError(f"expected {len(texts)} embeddings, got {len(vectors)}")
+        except Exception as e:
+            logger.warning("Embedding batch failed", extra={"size": len(texts)})
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        by_text = dict(zip(texts, vectors))
+        for text, future in batch:
+            future.set_result(by_text[text])
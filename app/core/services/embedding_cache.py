@@ -0,0 +1,229 @@
+# File: app/core/services/embedding_cache.py
+"""
+Bounded embedding cache.
+
+In memory: an LRU of at most `max_entries` vectors, each stored as a packed
+float32 array('f') (~6 KB for 1536 dims instead of ~50 KB as a list of
+Python floats), expiring `ttl_seconds` after insertion. Optionally backed by
+a SQLite file so warm embeddings survive restarts: memory misses fall
+through to disk, and inserts are written behind by a background thread in
+batches. The disk table is pruned of expired rows and capped at
+`disk_max_entries` every `prune_every` writes.
+
+The memory LRU and the SQLite connection have separate locks, so memory
+hits never wait for disk I/O.
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+_WRITE_BATCH = 256
+
+
+class EmbeddingCache:
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: float = 24 * 3600,
+        persistent_path: Optional[str] = None,
+        disk_max_entries: Optional[int] = None,
+        prune_every: int = 1000,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_max_entries = disk_max_entries or 10 * max_entries
+        self.prune_every = max(prune_every, 1)
+        self._entries: "OrderedDict[str, Tuple[array, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "disk_hits": 0}
+        self._disk: Optional[sqlite3.Connection] = None
+        self._disk_lock = threading.Lock()
+        self._writes: "queue.Queue" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writes_since_prune = 0
+        if persistent_path:
+            self._open_disk(persistent_path)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[List[float]]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                vector, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return vector.tolist()
+                del self._entries[key]
+                self._counters["expirations"] += 1
+            if self._disk is None:
+                self._counters["misses"] += 1
+                return None
+
+        # Outside the memory lock: other lookups proceed while this one reads
+        stored = self._disk_get(key, now)
+        with self._lock:
+            if stored is None:
+                self._counters["misses"] += 1
+                return None
+            vector, expires_at = stored
+            self._insert(key, vector, expires_at)
+            self._counters["hits"] += 1
+            self._counters["disk_hits"] += 1
+            return vector.tolist()
+
+    def put(self, key: str, embedding: Sequence[float]) -> List[float]:
+        """
+        Cache an embedding and return it as stored (rounded to float32), so
+        callers see identical values on hits and misses. The disk copy is
+        written behind.
+        """
+        vector = array("f", embedding)
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._insert(key, vector, expires_at)
+            persist = self._disk is not None
+            if persist and self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_behind, name="embedding-cache-writer", daemon=True
+                )
+                self._writer.start()
+        if persist:
+            self._writes.put((key, vector.tobytes(), expires_at))
+        return vector.tolist()
+
+    def flush(self) -> None:
+        """Block until every queued disk write has been applied."""
+        if self._writer is not None:
+            self._writes.join()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": round(self._counters["hits"] / lookups, 4) if lookups else 0.0,
+                "persistent": self._disk is not None,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self) -> None:
+        """Apply queued disk writes, then close the SQLite file."""
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._writes.put(_STOP)
+            writer.join()
+        with self._disk_lock:
+            if self._disk is not None:
+                self._disk.close()
+                self._disk = None
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _insert(self, key: str, vector: array, expires_at: float) -> None:
+        # Caller holds self._lock
+        self._entries[key] = (vector, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _open_disk(self, path: str) -> None:
+        try:
+            self._disk = sqlite3.connect(path, check_same_thread=False)
+            self._disk.execute("PRAGMA journal_mode=WAL")
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " key TEXT PRIMARY KEY, vector BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._disk.execute(
+                "CREATE INDEX IF NOT EXISTS ix_embeddings_expires_at ON embeddings (expires_at)"
+            )
+            self._prune_disk()
+        except sqlite3.Error:
+            logger.error("Embedding cache persistence disabled", exc_info=True, extra={"path": path})
+            self._disk = None
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[array, float]]:
+        with self._disk_lock:
+            if self._disk is None:
+                return None
+            try:
+                row = self._disk.execute(
+                    "SELECT vector, expires_at FROM embeddings WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+            except sqlite3.Error:
+                logger.warning("Embedding cache disk read failed", exc_info=True)
+                return None
+        if row is None:
+            return None
+        vector = array("f")
+        vector.frombytes(row[0])
+        return vector, row[1]
+
+    def _write_behind(self) -> None:
+        """Writer thread: applies queued puts in batches until _STOP."""
+        while True:
+            batch = [self._writes.get()]
+            while len(batch) < _WRITE_BATCH:
+                try:
+                    batch.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+            rows = [item for item in batch if item is not _STOP]
+            try:
+                if rows:
+                    self._disk_put_many(rows)
+            finally:
+                for _ in batch:
+                    self._writes.task_done()
+            if len(rows) < len(batch):
+                return
+
+    def _disk_put_many(self, rows: List[Tuple[str, bytes, float]]) -> None:
+        with self._disk_lock:
+            if self._disk is None:
+                return
+            try:
+                self._disk.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector, expires_at) VALUES (?, ?, ?)", rows
+                )
+                self._writes_since_prune += len(rows)
+                if self._writes_since_prune >= self.prune_every:
+                    self._prune_disk()
+                self._disk.commit()
+            except sqlite3.Error:
+                logger.warning("Embedding cache disk write failed", exc_info=True, extra={"count": len(rows)})
+
+    def _prune_disk(self) -> None:
+        """Drop expired rows, then the soonest-expiring beyond disk_max_entries. Caller holds _disk_lock."""
+        self._writes_since_prune = 0
+        self._disk.execute("DELETE FROM embeddings WHERE expires_at <= ?", (time.time(),))
+        (count,) = self._disk.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        if count > self.disk_max_entries:
+            self._disk.execute(
+                "DELETE FROM embeddings WHERE key IN ("
+                " SELECT key FROM embeddings ORDER BY expires_at, rowid LIMIT ?)",
+                (count - self.disk_max_entries,),
+            )
+        self._disk.commit()
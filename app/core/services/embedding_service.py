@@ -9,9 +9,12 @@ and logs critical steps plus any exceptions.
 from typing import List, Dict, Optional, Any
 import hashlib
 import random
-from datetime import datetime, timedelta
 import logging
+import threading
 
+from app.config.settings import get_settings
+from app.core.services.embedding_batcher import EmbeddingMicroBatcher, SingleFlight
+from app.core.services.embedding_cache import EmbeddingCache
 from app.infrastructure.external.openai_embedding import OpenAIEmbeddingService
 
 logger = logging.getLogger(__name__)
@@ -21,10 +24,28 @@ class EmbeddingService:
     Service for generating and managing text embeddings.
     """
 
-    def __init__(self):
+    def __init__(self, cache: Optional[EmbeddingCache] = None):
         self.openai_service = OpenAIEmbeddingService()
-        self._cache: Dict[str, Dict[str, Any]] = {}
-        self.cache_ttl = timedelta(hours=24)
+        if cache is None:
+            settings = get_settings()
+            cache = EmbeddingCache(
+                max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+                ttl_seconds=settings.EMBEDDING_CACHE_TTL_SECONDS,
+                persistent_path=settings.EMBEDDING_CACHE_PATH,
+                disk_max_entries=settings.EMBEDDING_CACHE_DISK_MAX_ENTRIES,
+            )
+        self._cache = cache
+
+        # Concurrent misses for the same text share one upstream call, and
+        # misses arriving within the batch window share one request
+        self._single_flight = SingleFlight()
+        window_ms = get_settings().EMBEDDING_BATCH_WINDOW_MS
+        self._batcher = EmbeddingMicroBatcher(
+            embed_one=lambda text: self.openai_service.embed_text(text),
+            embed_many=lambda texts: self.openai_service.get_embeddings(texts),
+            window_ms=window_ms,
+            max_batch=get_settings().EMBEDDING_BATCH_MAX_SIZE,
+        ) if window_ms > 0 else None
 
     def get_embedding(self, text: str) -> List[float]:
         """
@@ -37,16 +58,19 @@ class EmbeddingService:
             return cached
 
         try:
-            embedding = self.openai_service.embed_text(text)
-            self._add_to_cache(cache_key, embedding)
-            return embedding
+            return self._single_flight.do(cache_key, lambda: self._fetch_and_cache(cache_key, text))
         except Exception as e:
             logger.error("Error getting embedding", exc_info=True, extra={"text": text})
             return self._generate_fallback_embedding(text)
 
-    def get_batch_embeddings(self, texts: List[str]) -> List[List[float]]:
+    def get_batch_embeddings(self, texts: List[str], fallback: bool = True) -> List[List[float]]:
         """
         Get embeddings for multiple texts, with caching.
+
+        With fallback=False an upstream error is raised instead of being
+        papered over with fallback vectors; callers that persist the
+        vectors (the indexing worker) must use it. Fallback vectors are
+        never cached either way.
         """
         cache_keys = [self._get_cache_key(t) for t in texts]
         cache_results = [self._get_from_cache(k) for k in cache_keys]
@@ -60,32 +84,51 @@ class EmbeddingService:
         try:
             new_embeddings = self.openai_service.get_embeddings(texts_to_embed)
             for i, embedding in zip(missing_indices, new_embeddings):
-                self._add_to_cache(cache_keys[i], embedding)
-                cache_results[i] = embedding
+                cache_results[i] = self._add_to_cache(cache_keys[i], embedding)
             return cache_results
         except Exception:
             logger.error("Error getting batch embeddings", exc_info=True)
+            if not fallback:
+                raise
             for i in missing_indices:
                 cache_results[i] = self._generate_fallback_embedding(texts[i])
             return cache_results
 
+    def _fetch_and_cache(self, cache_key: str, text: str) -> List[float]:
+        # Another caller may have filled the cache while we waited to lead
+        cached = self._get_from_cache(cache_key)
+        if cached:
+            return cached
+        if self._batcher is not None:
+            embedding = self._batcher.embed(text)
+        else:
+            embedding = self.openai_service.embed_text(text)
+        return self._add_to_cache(cache_key, embedding)
+
     def _get_cache_key(self, text: str) -> str:
         return hashlib.md5(text.encode('utf-8')).hexdigest()
 
     def _get_from_cache(self, key: str) -> Optional[List[float]]:
-        if key in self._cache:
-            entry = self._cache[key]
-            if datetime.utcnow() - entry['timestamp'] < self.cache_ttl:
-                return entry['embedding']
-            else:
-                del self._cache[key]
-        return None
-
-    def _add_to_cache(self, key: str, embedding: List[float]) -> None:
-        self._cache[key] = {
-            'embedding': embedding,
-            'timestamp': datetime.utcnow()
-        }
+        return self._cache.get(key)
+
+    def _add_to_cache(self, key: str, embedding: List[float]) -> List[float]:
+        """Cache the embedding; returns it as stored (float32 precision)."""
+        return self._cache.put(key, embedding)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and occupancy of the embedding cache."""
+        return self._cache.stats()
+
+    def request_stats(self) -> Dict[str, Any]:
+        """How many upstream calls were saved by coalescing and batching."""
+        stats: Dict[str, Any] = {"coalesced_requests": self._single_flight.coalesced}
+        if self._batcher is not None:
+            stats.update(self._batcher.stats())
+        return stats
+
+    def close(self) -> None:
+        """Flush and close the cache's disk tier."""
+        self._cache.close()
 
     def _generate_fallback_embedding(self, text: str) -> List[float]:
         """
@@ -96,4 +139,27 @@ class EmbeddingService:
         return [random.uniform(-1, 1) for _ in range(1536)]
 
 
-embedding_service = EmbeddingService()
\ No newline at end of file
+_embedding_service: Optional[EmbeddingService] = None
+_embedding_service_lock = threading.Lock()
+
+
+def get_embedding_service() -> EmbeddingService:
+    """The process-wide service, created on first use."""
+    global _embedding_service
+    if _embedding_service is None:
+        with _embedding_service_lock:
+            if _embedding_service is None:
+                _embedding_service = EmbeddingService()
+    return _embedding_service
+
+
+def current_embedding_service() -> Optional[EmbeddingService]:
+    """The process-wide service if it has been created, else None."""
+    return _embedding_service
+
+
+def __getattr__(name: str):
+    # `embedding_service` stays importable, but is only built when first used
+    if name == "embedding_service":
+        return get_embedding_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,168 @@
+# File: app/core/services/insight_cache.py
+"""
+Semantic cache for RAG insight answers.
+
+An answer is reused when the same user asks a question whose embedding is
+close enough (cosine >= similarity_threshold) to one already answered,
+against the same version of the user's craving data. Entries are keyed on:
+
+    (user_id, data_version, variant)  ->  [unit query embedding, answer]
+
+data_version changes whenever the user's cravings change (see
+CravingRollupRepository.data_version), so a new or deleted craving makes
+every older entry for that user unreachable; they are dropped on the next
+store. variant carries the request options that shape the answer
+(persona, top_k, time weighting).
+
+Users are kept in an LRU (max_users), each with at most max_per_user
+entries, and entries expire after ttl_seconds.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.services.token_counter import estimate_tokens
+
+
+@dataclass
+class _UserEntries:
+    version: str
+    vectors: List[np.ndarray] = field(default_factory=list)
+    variants: List[str] = field(default_factory=list)
+    answers: List[str] = field(default_factory=list)
+    tokens: List[int] = field(default_factory=list)
+    stored_at: List[float] = field(default_factory=list)
+
+    def drop(self, index: int) -> None:
+        for column in (self.vectors, self.variants, self.answers, self.tokens, self.stored_at):
+            del column[index]
+
+
+class InsightCache:
+    def __init__(
+        self,
+        similarity_threshold: float = 0.95,
+        max_users: int = 10000,
+        max_per_user: int = 32,
+        ttl_seconds: float = 3600.0,
+        clock=time.monotonic,
+    ):
+        self.similarity_threshold = similarity_threshold
+        self.max_users = max_users
+        self.max_per_user = max_per_user
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._users: "OrderedDict[int, _UserEntries]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._saved_tokens = 0
+
+    @classmethod
+    def from_settings(cls) -> "InsightCache":
+        from app.config.settings import get_settings
+        settings = get_settings()
+        return cls(
+            similarity_threshold=settings.INSIGHT_CACHE_SIMILARITY,
+            max_users=settings.INSIGHT_CACHE_MAX_USERS,
+            max_per_user=settings.INSIGHT_CACHE_MAX_PER_USER,
+            ttl_seconds=settings.INSIGHT_CACHE_TTL_SECONDS,
+        )
+
+    def get(self, user_id: int, version: str, embedding: Sequence[float], variant: str = "") -> Optional[str]:
+        """The cached answer for the nearest matching question, or None."""
+        query = _unit(embedding)
+        now = self._clock()
+        with self._lock:
+            entries = self._users.get(user_id)
+            best, best_sim = None, self.similarity_threshold
+            if entries is not None and entries.version == version:
+                self._expire(entries, now)
+                candidates = [i for i, v in enumerate(entries.variants) if v == variant]
+                if candidates:
+                    sims = np.stack([entries.vectors[i] for i in candidates]) @ query
+                    pick = int(np.argmax(sims))
+                    if sims[pick] >= best_sim:
+                        best, best_sim = candidates[pick], float(sims[pick])
+            if best is None:
+                self._misses += 1
+                return None
+            self._users.move_to_end(user_id)
+            self._hits += 1
+            self._saved_tokens += entries.tokens[best]
+            return entries.answers[best]
+
+    def put(
+        self,
+        user_id: int,
+        version: str,
+        embedding: Sequence[float],
+        answer: str,
+        variant: str = "",
+        tokens: Optional[int] = None,
+    ) -> None:
+        """
+        Store an answer. tokens is what producing it cost upstream (prompt +
+        completion), counted as saved on every later hit.
+        """
+        now = self._clock()
+        with self._lock:
+            entries = self._users.get(user_id)
+            if entries is None or entries.version != version:
+                if entries is not None:
+                    self._invalidations += 1
+                entries = _UserEntries(version)
+                self._users[user_id] = entries
+            self._users.move_to_end(user_id)
+            self._expire(entries, now)
+            if len(entries.answers) >= self.max_per_user:
+                entries.drop(0)
+            entries.vectors.append(_unit(embedding))
+            entries.variants.append(variant)
+            entries.answers.append(answer)
+            entries.tokens.append(tokens if tokens is not None else estimate_tokens(answer))
+            entries.stored_at.append(now)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            if self._users.pop(user_id, None) is not None:
+                self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "users": len(self._users),
+                "entries": sum(len(e.answers) for e in self._users.values()),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "saved_tokens": self._saved_tokens,
+                "invalidations": self._invalidations,
+            }
+
+    def _expire(self, entries: _UserEntries, now: float) -> None:
+        # Entries are appended in time order, so expired ones are a prefix
+        while entries.stored_at and now - entries.stored_at[0] > self.ttl_seconds:
+            entries.drop(0)
+
+
+def _unit(embedding: Sequence[float]) -> np.ndarray:
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+insight_cache = InsightCache.from_settings()
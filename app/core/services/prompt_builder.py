@@ -0,0 +1,143 @@
+# File: app/core/services/prompt_builder.py
+"""
+Token-budgeted prompt assembly for RAG insights.
+
+The user message is the query, the user's precomputed history summary
+when there is one (see craving_summary.py), then one compact line per
+craving ("- 2025-03-01, intensity 6/10: description"), then the instruction.
+Cravings arrive best first (see CravingReranker) and are packed in that
+order until the token budget is spent; a craving that does not fit is
+skipped so shorter, lower-ranked ones can still use what is left. Long
+descriptions are truncated to max_description_tokens. Vector IDs, raw
+scores and full timestamps are left out: they cost tokens and tell the
+model nothing.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.core.services.token_counter import TokenCounter
+
+logger = logging.getLogger(__name__)
+
+_QUERY = "USER QUERY: {query}\n\n"
+_HISTORY = "USER HISTORY (all cravings):\n{summary}\n\n"
+_CRAVINGS = "RELEVANT CRAVINGS (most relevant first):\n"
+_NO_CRAVINGS = "No relevant cravings found.\n"
+_FOOTER = (
+    "\nPlease generate a personalized insight for the user, "
+    "considering these cravings and the user query."
+)
+
+
+@dataclass
+class BuiltPrompt:
+    text: str
+    tokens: int
+    included: int
+    dropped: int
+    truncated: int
+
+
+class PromptStats:
+    """Running totals of built prompts, for /admin/metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.prompts = 0
+        self.total_tokens = 0
+        self.max_tokens = 0
+        self.last_tokens = 0
+        self.dropped_cravings = 0
+        self.truncated_descriptions = 0
+
+    def record(self, prompt: BuiltPrompt) -> None:
+        with self._lock:
+            self.prompts += 1
+            self.total_tokens += prompt.tokens
+            self.max_tokens = max(self.max_tokens, prompt.tokens)
+            self.last_tokens = prompt.tokens
+            self.dropped_cravings += prompt.dropped
+            self.truncated_descriptions += prompt.truncated
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "prompts": self.prompts,
+                "avg_tokens": round(self.total_tokens / self.prompts, 1) if self.prompts else 0.0,
+                "max_tokens": self.max_tokens,
+                "last_tokens": self.last_tokens,
+                "dropped_cravings": self.dropped_cravings,
+                "truncated_descriptions": self.truncated_descriptions,
+            }
+
+
+class PromptBuilder:
+    def __init__(
+        self,
+        counter: TokenCounter,
+        budget_tokens: int = 1500,
+        max_description_tokens: int = 80,
+    ):
+        self.counter = counter
+        self.budget_tokens = budget_tokens
+        self.max_description_tokens = max_description_tokens
+        self.stats = PromptStats()
+
+    @classmethod
+    def from_settings(cls) -> "PromptBuilder":
+        from app.config.settings import get_settings
+        settings = get_settings()
+        return cls(
+            counter=TokenCounter(
+                model=settings.OPENAI_CHAT_MODEL,
+                use_tiktoken=settings.RAG_PROMPT_TOKENIZER != "approx",
+            ),
+            budget_tokens=settings.RAG_PROMPT_TOKEN_BUDGET,
+            max_description_tokens=settings.RAG_PROMPT_DESCRIPTION_MAX_TOKENS,
+        )
+
+    def build(self, query: str, cravings: Sequence, summary: Optional[str] = None) -> BuiltPrompt:
+        """
+        Pack cravings (objects with description, created_at and intensity)
+        into a prompt of at most budget_tokens, best first. summary, if
+        given, goes ahead of the cravings.
+        """
+        # The query may use at most half the budget and the summary a third,
+        # leaving room for cravings
+        query = self.counter.truncate(query, self.budget_tokens // 2)
+        header = _QUERY.format(query=query)
+        if summary:
+            header += _HISTORY.format(summary=self.counter.truncate(summary, self.budget_tokens // 3))
+        header += _CRAVINGS
+        remaining = self.budget_tokens - self.counter.count(header) - self.counter.count(_FOOTER)
+
+        lines: List[str] = []
+        truncated = 0
+        for c in cravings:
+            description = " ".join(str(c.description).split())
+            short = self.counter.truncate(description, self.max_description_tokens)
+            line = f"- {c.created_at:%Y-%m-%d}, intensity {c.intensity}/10: {short}\n"
+            cost = self.counter.count(line)
+            if cost > remaining:
+                continue
+            lines.append(line)
+            remaining -= cost
+            truncated += short != description
+
+        body = "".join(lines) if lines else _NO_CRAVINGS
+        text = header + body + _FOOTER
+        prompt = BuiltPrompt(
+            text=text,
+            tokens=self.counter.count(text),
+            included=len(lines),
+            dropped=len(cravings) - len(lines),
+            truncated=truncated,
+        )
+        self.stats.record(prompt)
+        return prompt
+
+
+prompt_builder = PromptBuilder.from_settings()
@@ -6,15 +6,24 @@ Uses embeddings and vector DB to retrieve relevant cravings, then calls an LLM.
 Logs all key steps and handles unexpected errors.
 """
 
+import asyncio
 import logging
-from typing import List, Optional
+import threading
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
 from datetime import datetime
 from dataclasses import dataclass
 
-from app.core.services.embedding_service import embedding_service
+from app.config.settings import get_settings
+from app.core.services.craving_reranker import CravingReranker
+from app.core.services.craving_summary import render_summary
+from app.core.services.embedding_service import get_embedding_service
+from app.core.services.insight_cache import InsightCache, insight_cache
+from app.core.services.prompt_builder import PromptBuilder, prompt_builder
+from app.infrastructure.database.rollup_repository import CravingRollupRepository
+from app.infrastructure.database.session import SessionLocal
+from app.infrastructure.database.summary_repository import CravingSummaryRepository
+from app.infrastructure.external.openai_chat import openai_chat_service
 from app.infrastructure.vector_db.vector_repository import VectorRepository
-from app.config.settings import settings
-import openai
 
 logger = logging.getLogger(__name__)
 
@@ -29,15 +38,56 @@ class RetrievedCraving:
     intensity: int
     score: float
     time_score: float = 1.0
+    embedding: Optional[List[float]] = None
+
+def craving_data_version(user_id: int) -> str:
+    """
+    Version of the user's craving set (see CravingRollupRepository.data_version).
+    """
+    db = SessionLocal()
+    try:
+        return CravingRollupRepository(db).data_version(user_id)
+    finally:
+        db.close()
+
+def load_craving_summary(user_id: int) -> Optional[str]:
+    """
+    The user's precomputed craving summary as prompt text, or None if the
+    indexing worker has not built one yet.
+    """
+    db = SessionLocal()
+    try:
+        row = CravingSummaryRepository(db).get(user_id)
+        if row is None:
+            return None
+        return render_summary(row.summary) or None
+    finally:
+        db.close()
 
 class RAGService:
     """
     Service for Retrieval-Augmented Generation for cravings.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        cache: Optional[InsightCache] = None,
+        data_version: Callable[[int], str] = craving_data_version,
+        builder: Optional[PromptBuilder] = None,
+        summary_loader: Optional[Callable[[int], Optional[str]]] = load_craving_summary
+    ):
         self.vector_repository = VectorRepository()
-        openai.api_key = settings.OPENAI_API_KEY
+        self.reranker = CravingReranker.from_settings()
+        self.prompt_builder = builder or prompt_builder
+        if cache is None and get_settings().INSIGHT_CACHE_ENABLED:
+            cache = insight_cache
+        self.insight_cache = cache
+        self._data_version = data_version
+        settings = get_settings()
+        if not settings.CRAVING_SUMMARY_ENABLED:
+            summary_loader = None
+        self._summary_loader = summary_loader
+        self.summary_top_k = settings.RAG_SUMMARY_TOP_K
 
     def generate_personalized_insight(
         self,
@@ -49,34 +99,30 @@ class RAGService:
     ) -> str:
         logger.info("Starting RAG pipeline", extra={"user_id": user_id, "query": query})
         try:
-            query_embedding = embedding_service.get_embedding(query)
-            raw_results = self.vector_repository.search_cravings(
-                user_id=user_id,
-                query_vector=query_embedding,
-                limit=top_k * 2
+            variant = self._cache_variant(persona, top_k, time_weighted)
+            version, query_embedding, cached = self._cache_lookup(
+                user_id, query, variant
+            )
+            if cached is not None:
+                logger.info("RAG insight served from cache", extra={"user_id": user_id})
+                return cached
+            summary = self._user_summary(user_id)
+            sorted_cravings = self._retrieve(
+                user_id,
+                query,
+                self._raw_top_k(top_k, summary),
+                time_weighted,
+                query_embedding,
             )
-            retrieved_cravings = self._process_search_results(raw_results)
-            if time_weighted:
-                retrieved_cravings = self._apply_time_weighting(retrieved_cravings)
-
-            # Sort by final score
-            sorted_cravings = sorted(
-                retrieved_cravings,
-                key=lambda x: x.time_score,
-                reverse=True
-            )[:top_k]
-
-            prompt = self._construct_prompt(user_id, query, sorted_cravings)
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a helpful AI assistant for craving analysis."},
-                    {"role": "user", "content": prompt}
-                ],
+            messages = self._build_messages(user_id, query, sorted_cravings, summary)
+            answer = openai_chat_service.complete_sync(
+                messages,
                 temperature=0.7,
                 max_tokens=500
             )
-            answer = response.choices[0].message.content
+            self._cache_store(
+                user_id, version, query_embedding, variant, messages, answer
+            )
             logger.info("RAG pipeline succeeded", extra={"user_id": user_id})
             return answer
         except Exception:
@@ -86,6 +132,156 @@ class RAGService:
                 "Please try again later."
             )
 
+    async def stream_personalized_insight(
+        self,
+        user_id: int,
+        query: str,
+        persona: Optional[str] = None,
+        top_k: int = 5,
+        time_weighted: bool = True
+    ) -> AsyncIterator[str]:
+        """
+        Same pipeline as generate_personalized_insight, but yields the answer
+        token by token from the async client. Retrieval (embedding + vector
+        search) runs in a worker thread; errors propagate to the caller.
+        A cached answer is yielded as a single chunk.
+        """
+        logger.info(
+            "Starting streaming RAG pipeline",
+            extra={"user_id": user_id, "query": query},
+        )
+        variant = self._cache_variant(persona, top_k, time_weighted)
+        version, query_embedding, cached = await asyncio.to_thread(
+            self._cache_lookup, user_id, query, variant
+        )
+        if cached is not None:
+            logger.info("RAG insight served from cache", extra={"user_id": user_id})
+            yield cached
+            return
+        summary = await asyncio.to_thread(self._user_summary, user_id)
+        sorted_cravings = await asyncio.to_thread(
+            self._retrieve,
+            user_id,
+            query,
+            self._raw_top_k(top_k, summary),
+            time_weighted,
+            query_embedding,
+        )
+        messages = self._build_messages(user_id, query, sorted_cravings, summary)
+        tokens: List[str] = []
+        async for token in openai_chat_service.stream(
+            messages,
+            temperature=0.7,
+            max_tokens=500
+        ):
+            tokens.append(token)
+            yield token
+        # Only a stream that ran to completion is worth reusing
+        self._cache_store(
+            user_id, version, query_embedding, variant, messages, "".join(tokens)
+        )
+
+    def _retrieve(
+        self,
+        user_id: int,
+        query: str,
+        top_k: int,
+        time_weighted: bool,
+        query_embedding: Optional[Sequence[float]] = None
+    ) -> List[RetrievedCraving]:
+        """
+        Embed the query (unless already embedded), search the user's cravings
+        and re-rank them.
+        """
+        if query_embedding is None:
+            query_embedding = get_embedding_service().get_embedding(query)
+        raw_results = self.vector_repository.search_cravings(
+            query_embedding,
+            top_k=top_k * 2,
+            user_id=user_id,
+            include_values=self.reranker.mmr_lambda is not None
+        )
+        retrieved_cravings = self._process_search_results(raw_results)
+        if time_weighted:
+            return self.reranker.rerank(retrieved_cravings, top_k)
+        return sorted(retrieved_cravings, key=lambda x: x.score, reverse=True)[:top_k]
+
+    def _user_summary(self, user_id: int) -> Optional[str]:
+        if self._summary_loader is None:
+            return None
+        try:
+            return self._summary_loader(user_id)
+        except Exception:
+            logger.warning(
+                "Could not load craving summary",
+                exc_info=True,
+                extra={"user_id": user_id},
+            )
+            return None
+
+    def _raw_top_k(self, top_k: int, summary: Optional[str]) -> int:
+        # The summary covers the whole history; a few raw cravings add specifics
+        return min(top_k, self.summary_top_k) if summary else top_k
+
+    @staticmethod
+    def _cache_variant(persona: Optional[str], top_k: int, time_weighted: bool) -> str:
+        # Request options that change the answer for the same question
+        return f"{persona or ''}|{top_k}|{int(time_weighted)}"
+
+    def _cache_lookup(
+        self, user_id: int, query: str, variant: str
+    ) -> Tuple[Optional[str], Optional[List[float]], Optional[str]]:
+        """
+        (data version, query embedding, cached answer). The version is None
+        when caching is off or the version could not be read; the cache is
+        then bypassed and the pipeline runs as usual.
+        """
+        if self.insight_cache is None:
+            return None, None, None
+        try:
+            version = self._data_version(user_id)
+            query_embedding = get_embedding_service().get_embedding(query)
+        except Exception:
+            logger.warning(
+                "Insight cache lookup failed", exc_info=True, extra={"user_id": user_id}
+            )
+            return None, None, None
+        cached = self.insight_cache.get(user_id, version, query_embedding, variant)
+        return version, query_embedding, cached
+
+    def _cache_store(
+        self,
+        user_id: int,
+        version: Optional[str],
+        query_embedding: Optional[Sequence[float]],
+        variant: str,
+        messages: List[Dict[str, str]],
+        answer: str
+    ) -> None:
+        if version is None or query_embedding is None or not answer:
+            return
+        count = self.prompt_builder.counter.count
+        cost = sum(count(m["content"]) for m in messages) + count(answer)
+        self.insight_cache.put(
+            user_id, version, query_embedding, answer, variant, tokens=cost
+        )
+
+    def _build_messages(
+        self,
+        user_id: int,
+        query: str,
+        cravings: List[RetrievedCraving],
+        summary: Optional[str] = None
+    ) -> List[Dict[str, str]]:
+        prompt = self._construct_prompt(user_id, query, cravings, summary)
+        return [
+            {
+                "role": "system",
+                "content": "You are a helpful AI assistant for craving analysis.",
+            },
+            {"role": "user", "content": prompt}
+        ]
+
     def _process_search_results(self, search_results) -> List[RetrievedCraving]:
         """
         Convert raw search results from DB to RetrievedCraving objects.
@@ -101,7 +297,8 @@ class RAGService:
                         description=metadata["description"],
                         created_at=datetime.fromisoformat(metadata["created_at"]),
                         intensity=int(metadata["intensity"]),
-                        score=float(m["score"])
+                        score=float(m["score"]),
+                        embedding=m.get("values") or None
                     )
                 )
             except (KeyError, ValueError, TypeError) as e:
@@ -110,42 +307,52 @@ class RAGService:
 
     def _apply_time_weighting(self, cravings: List[RetrievedCraving]) -> List[RetrievedCraving]:
         """
-        Example time-based weighting to highlight newer cravings.
+        Set each craving's time_score to its blended similarity x recency x
+        intensity score (see CravingReranker).
         """
-        now = datetime.utcnow()
-        recency_boost_days = 30
-        for c in cravings:
-            days_ago = (now - c.created_at).total_seconds() / (60 * 60 * 24)
-            if days_ago <= recency_boost_days:
-                # Weighted more if it's fresh
-                c.time_score = 1.0 - (days_ago / recency_boost_days) * 0.5
-            else:
-                # Slowly decays over time
-                c.time_score = 0.5 * (1.0 - min(days_ago / 365, 1.0))
+        self.reranker.score(cravings)
         return cravings
 
-    def _construct_prompt(self, user_id: int, query: str, cravings: List[RetrievedCraving]) -> str:
+    def _construct_prompt(
+        self,
+        user_id: int,
+        query: str,
+        cravings: List[RetrievedCraving],
+        summary: Optional[str] = None
+    ) -> str:
         """
-        Build a prompt for the LLM based on query and retrieved cravings.
+        Build a prompt for the LLM from the query, the user's history summary
+        and the retrieved cravings (best first), within the token budget.
         """
-        prompt = f"USER QUERY: {query}\n\n"
-        prompt += "RELEVANT CRAVINGS:\n"
-        if cravings:
-            for c in cravings:
-                prompt += (
-                    f"- ID: {c.id}\n"
-                    f"  Description: {c.description}\n"
-                    f"  Created at: {c.created_at}\n"
-                    f"  Intensity: {c.intensity}\n"
-                    f"  Score: {round(c.score, 3)}\n"
-                    f"  Time-Score: {round(c.time_score, 3)}\n\n"
-                )
-        else:
-            prompt += "No relevant cravings found.\n\n"
-        prompt += (
-            "Please generate a personalized insight for the user, "
-            "considering these cravings and the user query."
+        prompt = self.prompt_builder.build(query, cravings, summary)
+        logger.info(
+            "Built RAG prompt",
+            extra={
+                "user_id": user_id,
+                "prompt_tokens": prompt.tokens,
+                "cravings_included": prompt.included,
+                "cravings_dropped": prompt.dropped,
+            }
         )
-        return prompt
+        return prompt.text
+
+_rag_service: Optional[RAGService] = None
+_rag_service_lock = threading.Lock()
+
+def get_rag_service() -> RAGService:
+    """
+    The process-wide service, created on first use (usable as a FastAPI
+    dependency).
+    """
+    global _rag_service
+    if _rag_service is None:
+        with _rag_service_lock:
+            if _rag_service is None:
+                _rag_service = RAGService()
+    return _rag_service
 
-rag_service = RAGService()
\ No newline at end of file
+def __getattr__(name: str):
+    # `rag_service` stays importable, but is only built when first used
+    if name == "rag_service":
+        return get_rag_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,83 @@
+# File: app/core/services/token_counter.py
+"""
+Token counting for prompt budgeting.
+
+TokenCounter uses tiktoken's encoding for the chat model when the package
+and its encoding file are available, and otherwise a character-based
+approximation (~4 characters per token for English text). The encoding is
+loaded on first use, since tiktoken may fetch it over the network.
+"""
+
+import logging
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_ELLIPSIS = "…"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English text)."""
+    return (len(text) + 3) // 4
+
+
+class TokenCounter:
+    def __init__(self, model: Optional[str] = None, use_tiktoken: bool = True):
+        self.model = model
+        self._use_tiktoken = use_tiktoken
+        self._encoding = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self) -> str:
+        return "tiktoken" if self._get_encoding() is not None else "approx"
+
+    def count(self, text: str) -> int:
+        encoding = self._get_encoding()
+        if encoding is None:
+            return estimate_tokens(text)
+        return len(encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """text cut to at most max_tokens (ellipsis included), on a word boundary when possible."""
+        if max_tokens <= 0:
+            return ""
+        if self.count(text) <= max_tokens:
+            return text
+        encoding = self._get_encoding()
+        if encoding is None:
+            cut = text[: max(0, (max_tokens - 1) * 4)]
+        else:
+            cut = encoding.decode(encoding.encode(text, disallowed_special=())[: max_tokens - 1])
+        space = cut.rfind(" ")
+        if space > len(cut) // 2:
+            cut = cut[:space]
+        return cut.rstrip() + _ELLIPSIS
+
+    def _get_encoding(self):
+        if self._loaded:
+            return self._encoding
+        with self._lock:
+            if not self._loaded:
+                self._encoding = self._load_encoding() if self._use_tiktoken else None
+                self._loaded = True
+        return self._encoding
+
+    def _load_encoding(self):
+        try:
+            import tiktoken
+        except ImportError:
+            logger.info("tiktoken not installed; approximating token counts")
+            return None
+        try:
+            if self.model:
+                try:
+                    return tiktoken.encoding_for_model(self.model)
+                except KeyError:
+                    pass
+            return tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            logger.warning("Could not load tiktoken encoding; approximating token counts", exc_info=True)
+            return None
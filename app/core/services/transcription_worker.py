@@ -0,0 +1,226 @@
+# File: app/core/services/transcription_worker.py
+"""
+Background transcription for voice logs.
+
+The transcribe endpoints only add a row to transcription_jobs and return.
+A pool of `concurrency` worker slots on the event loop claims due jobs one
+at a time and runs them in threads (Whisper calls are blocking and can take
+as long as the audio), so one long recording never holds up the others
+and outbound load is bounded by the pool size.
+
+Voice log status follows the job:
+
+    PENDING -> IN_PROGRESS -> COMPLETED
+                           -> PENDING (retry scheduled with backoff)
+                           -> FAILED  (attempts exhausted, or the audio is gone)
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Callable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config.settings import get_settings
+from app.core.services.voice_logs_service import VoiceLogsService
+from app.infrastructure.database.transcription_job_repository import TranscriptionJobRepository
+from app.infrastructure.database.voice_logs_repository import VoiceLogRepository
+
+logger = logging.getLogger(__name__)
+
+# Retrying cannot help these
+PERMANENT_ERRORS = (FileNotFoundError,)
+
+
+class TranscriptionWorker:
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        transcriber=None,
+        concurrency: int = 2,
+        poll_interval: float = 5.0,
+        lease_seconds: float = 600.0,
+        max_attempts: int = 4,
+        retry_base_delay: float = 10.0,
+        retry_max_delay: float = 900.0,
+    ):
+        self._session_factory = session_factory
+        self._transcriber = transcriber
+        self.concurrency = max(concurrency, 1)
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._busy = 0
+        self._busy_lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, **overrides) -> "TranscriptionWorker":
+        s = get_settings()
+        options = dict(
+            concurrency=s.TRANSCRIPTION_CONCURRENCY,
+            poll_interval=s.TRANSCRIPTION_POLL_INTERVAL_SECONDS,
+            lease_seconds=s.TRANSCRIPTION_LEASE_SECONDS,
+            max_attempts=s.TRANSCRIPTION_MAX_ATTEMPTS,
+            retry_base_delay=s.TRANSCRIPTION_RETRY_BASE_SECONDS,
+            retry_max_delay=s.TRANSCRIPTION_RETRY_MAX_SECONDS,
+        )
+        options.update(overrides)
+        return cls(**options)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    @property
+    def busy(self) -> int:
+        """Slots currently running a job."""
+        return self._busy
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._stopping = False
+        self._tasks = [
+            asyncio.create_task(self._slot(), name=f"transcription-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        logger.info("Transcription worker started", extra={"concurrency": self.concurrency})
+
+    async def stop(self) -> None:
+        """Stop claiming jobs and wait for the ones in flight."""
+        if not self.running:
+            return
+        self._stopping = True
+        self._wake.set()
+        try:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        finally:
+            self._tasks = []
+            logger.info("Transcription worker stopped")
+
+    def notify(self) -> None:
+        """
+        Hint that a job was enqueued. Safe to call from any thread; a no-op
+        when the worker is not running.
+        """
+        if not self.running:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._wake.set)
+        except RuntimeError:
+            # Loop already closed during shutdown
+            pass
+
+    async def _slot(self) -> None:
+        while not self._stopping:
+            try:
+                handled = await asyncio.to_thread(self.process_one)
+            except Exception:
+                logger.error("Transcription worker iteration failed", exc_info=True)
+                handled = False
+            if self._stopping:
+                break
+            if not handled:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+
+    async def drain(self) -> int:
+        """Run due jobs on all slots until none are left. Returns jobs handled."""
+        total = 0
+        while True:
+            results = await asyncio.gather(
+                *(asyncio.to_thread(self.process_one) for _ in range(self.concurrency))
+            )
+            handled = sum(results)
+            total += handled
+            if handled == 0:
+                return total
+
+    # ------------------------------------------------------------------
+    # Job processing (synchronous; runs in a worker thread)
+    # ------------------------------------------------------------------
+
+    def process_one(self) -> bool:
+        """Claim and run one due job. Returns False if none was due."""
+        db = self._new_session()
+        try:
+            jobs_repo = TranscriptionJobRepository(db)
+            jobs = jobs_repo.claim(1, self.lease_seconds)
+            if not jobs:
+                return False
+            job = jobs[0]
+            service = VoiceLogsService(VoiceLogRepository(db))
+            with self._busy_lock:
+                self._busy += 1
+            try:
+                completed = service.process_transcription(job.voice_log_id, self.transcriber)
+                error = None if completed is not None else "voice log deleted"
+            except Exception as e:
+                db.rollback()
+                error = str(e) or e.__class__.__name__
+                permanent = isinstance(e, PERMANENT_ERRORS)
+            else:
+                permanent = True
+            finally:
+                with self._busy_lock:
+                    self._busy -= 1
+
+            if error is None:
+                jobs_repo.complete(job.id)
+                logger.info("Transcription job completed", extra={"job_id": job.id, "voice_log_id": job.voice_log_id})
+                return True
+
+            logger.warning(
+                "Transcription job failed",
+                extra={"job_id": job.id, "voice_log_id": job.voice_log_id, "error": error},
+            )
+            try:
+                parked = jobs_repo.fail(
+                    job.id,
+                    error,
+                    max_attempts=1 if permanent else self.max_attempts,
+                    base_delay=self.retry_base_delay,
+                    max_delay=self.retry_max_delay,
+                )
+                # Commits the job's new state along with the voice log's
+                service.set_transcription_status(job.voice_log_id, "FAILED" if parked else "PENDING")
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            return True
+        finally:
+            db.close()
+
+    def _new_session(self) -> Session:
+        if self._session_factory is None:
+            from app.infrastructure.database.session import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    @property
+    def transcriber(self):
+        if self._transcriber is None:
+            from app.infrastructure.external.transcription_service import get_transcription_service
+            self._transcriber = get_transcription_service()
+        return self._transcriber
+
+
+transcription_worker = TranscriptionWorker.from_settings()
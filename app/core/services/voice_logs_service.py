@@ -1,31 +1,26 @@
 # File: app/core/services/voice_logs_service.py
 """
 Service layer for managing voice logs:
- - File storage
+ - Content-addressed audio storage (duplicate audio is stored once)
  - Creating DB records
- - Handling transcription steps
+ - Queueing transcription jobs and running them (see transcription_worker)
 
 Logs both success and error conditions.
 """
 
-import os
 import logging
-from datetime import datetime
 from typing import Optional
 
 from app.core.entities.voice_log import VoiceLog
+from app.core.services.audio_upload import stage_bytes
+from app.infrastructure.database.audio_blob_repository import AudioBlobRepository, blob_root
+from app.infrastructure.database.models import TranscriptionJobModel
+from app.infrastructure.database.transcription_job_repository import JOB_PENDING, TranscriptionJobRepository
 from app.infrastructure.database.voice_logs_repository import VoiceLogRepository
 from app.infrastructure.external.transcription_service import TranscriptionService
 
 logger = logging.getLogger(__name__)
 
-# Define a persistent uploads directory
-UPLOAD_DIR = os.path.join(
-    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
-    "uploads"
-)
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-
 class VoiceLogsService:
     """
     Encapsulates voice log business logic:
@@ -38,27 +33,24 @@ class VoiceLogsService:
         self.repo = repo
 
     def upload_new_voice_log(self, user_id: int, audio_bytes: bytes) -> VoiceLog:
+        """
+        Store in-memory audio (HTTP uploads are streamed instead, see
+        audio_upload) and create its voice log. Blocking.
+        """
         logger.info("Uploading new voice log", extra={"user_id": user_id})
+        staged = None
         try:
-            file_name = f"voice_{user_id}_{datetime.utcnow().timestamp()}.wav"
-            file_path = os.path.join(UPLOAD_DIR, file_name)
-
-            with open(file_path, "wb") as f:
-                f.write(audio_bytes)
-
-            voice_log = VoiceLog(
-                user_id=user_id,
-                file_path=file_path,
-                created_at=datetime.utcnow(),
-                transcription_status="PENDING"
-            )
-            saved = self.repo.create_voice_log(voice_log)
+            staged = stage_bytes(blob_root(), audio_bytes)
+            saved = self.repo.create_from_upload(user_id, staged.sha256, staged.size_bytes, staged.path)
             logger.info("Voice log created successfully", extra={"voice_log_id": saved.id})
             return saved
 
         except Exception:
             logger.error("Error creating voice log", exc_info=True, extra={"user_id": user_id})
             raise
+        finally:
+            if staged is not None:
+                staged.discard()
 
     def trigger_transcription(self, voice_log_id: int) -> Optional[VoiceLog]:
         """
@@ -102,11 +94,56 @@ class VoiceLogsService:
             logger.error("Error retrieving voice log", exc_info=True, extra={"voice_log_id": voice_log_id})
             raise
 
-    def process_transcription(self, voice_log_id: int) -> None:
+    def enqueue_transcription(self, voice_log_id: int) -> Optional[VoiceLog]:
+        """
+        Queue the voice log for the transcription worker and mark it PENDING.
+        Returns immediately; a voice log that already has a queued or
+        running job keeps it.
+        """
+        logger.info("Queueing transcription", extra={"voice_log_id": voice_log_id})
+        try:
+            record = self.repo.get_by_id(voice_log_id)
+            if not record or record.is_deleted:
+                return None
+            transcript = AudioBlobRepository(self.repo.db_session).transcript_for(record.content_sha256)
+            if transcript is not None:
+                # Same audio was transcribed before: no job, no Whisper call
+                return self.complete_transcription(voice_log_id, transcript)
+            job = TranscriptionJobRepository(self.repo.db_session).enqueue(voice_log_id)
+            if job.state == JOB_PENDING:
+                record.transcription_status = "PENDING"
+            # Commits the job together with the status change
+            return self.repo.update(record)
+        except Exception:
+            self.repo.db_session.rollback()
+            logger.error("Error queueing transcription", exc_info=True, extra={"voice_log_id": voice_log_id})
+            raise
+
+    def get_transcription_job(self, voice_log_id: int) -> Optional[TranscriptionJobModel]:
+        return TranscriptionJobRepository(self.repo.db_session).latest_for(voice_log_id)
+
+    def set_transcription_status(self, voice_log_id: int, status: str) -> Optional[VoiceLog]:
+        record = self.repo.get_by_id(voice_log_id)
+        if not record:
+            return None
+        record.transcription_status = status
+        return self.repo.update(record)
+
+    def process_transcription(self, voice_log_id: int, transcriber: TranscriptionService) -> Optional[VoiceLog]:
         """
-        Placeholder background method for transcription.
-        Could integrate Celery, RQ, or another job queue.
+        Run one transcription: IN_PROGRESS, call the transcriber (unless
+        the same audio was transcribed meanwhile), then COMPLETED with the
+        text, which is also kept on the audio blob for later duplicates.
+        Blocking; called by the transcription worker, which owns retries.
+        Returns None if the voice log is gone.
         """
-        logger.info("Processing transcription in background", extra={"voice_log_id": voice_log_id})
-        # Implement async logic if needed
-        pass
\ No newline at end of file
+        voice_log = self.trigger_transcription(voice_log_id)
+        if voice_log is None:
+            return None
+        blobs = AudioBlobRepository(self.repo.db_session)
+        text = blobs.transcript_for(voice_log.content_sha256)
+        if text is None:
+            text = transcriber.transcribe_audio(voice_log)
+            # Committed together with the voice log below
+            blobs.record_transcript(voice_log.content_sha256, text)
+        return self.complete_transcription(voice_log_id, text)
@@ -0,0 +1,71 @@
+# File: app/core/use_cases/index_craving_embeddings.py
+"""
+Embed a set of cravings and push them to the vector index in bulk:
+one embedding request for all descriptions and one vector upsert.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Sequence
+
+from app.infrastructure.vector_db.filters import craving_metadata
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CravingToIndex:
+    """The fields of a saved craving the vector index needs."""
+    id: int
+    user_id: int
+    description: str
+    created_at: datetime
+    intensity: Optional[float] = None
+
+
+def index_craving_embeddings(
+    cravings: Sequence[CravingToIndex],
+    embedder=None,
+    vector_repo=None,
+    strict: bool = False,
+) -> int:
+    """
+    Embed all descriptions with EmbeddingService.get_batch_embeddings and
+    upsert them with VectorRepository.batch_upsert_embeddings.
+
+    Returns the number of vectors upserted. Failures are logged, not raised,
+    since this runs after the cravings are already committed. With strict,
+    errors are raised instead and no fallback vectors are indexed, so the
+    caller can retry the batch.
+    """
+    if not cravings:
+        return 0
+
+    # Imported lazily to keep this module free of the service graph
+    if embedder is None:
+        from app.core.services.embedding_service import get_embedding_service
+        embedder = get_embedding_service()
+    if vector_repo is None:
+        from app.infrastructure.vector_db.vector_repository import vector_repository as vector_repo
+
+    descriptions = [c.description for c in cravings]
+    try:
+        if strict:
+            embeddings = embedder.get_batch_embeddings(descriptions, fallback=False)
+        else:
+            embeddings = embedder.get_batch_embeddings(descriptions)
+        items = [
+            {
+                "id": c.id,
+                "embedding": embedding,
+                "metadata": craving_metadata(c.user_id, c.description, c.created_at, c.intensity),
+            }
+            for c, embedding in zip(cravings, embeddings)
+        ]
+        return vector_repo.batch_upsert_embeddings(items)
+    except Exception:
+        logger.error("Error indexing craving embeddings", exc_info=True, extra={"count": len(cravings)})
+        if strict:
+            raise
+        return 0
@@ -6,8 +6,6 @@ from datetime import datetime
 from pydantic import BaseModel
 from app.core.entities.craving import Craving
 from app.infrastructure.database.repository import CravingRepository
-from app.infrastructure.external.openai_embedding import OpenAIEmbeddingService
-from app.infrastructure.vector_db.vector_repository import VectorRepository
 
 @dataclass
 class IngestCravingInput:
@@ -29,9 +27,9 @@ def ingest_craving(input_dto: IngestCravingInput, repo: CravingRepository) -> In
     Ingest a new craving into the system.
     Steps:
       1) Convert input DTO to domain entity
-      2) Persist via repository
-      3) Optionally embed & store in Pinecone
-      4) Return output DTO
+      2) Persist via repository (which also queues the craving for
+         embedding; the indexing worker writes it to Pinecone later)
+      3) Return output DTO
     """
     domain_craving = Craving(
         id=None,  # DB auto
@@ -46,20 +44,6 @@ def ingest_craving(input_dto: IngestCravingInput, repo: CravingRepository) -> In
         intensity=domain_craving.intensity
     )
 
-    # optionally generate embeddings
-    try:
-        embed_service = OpenAIEmbeddingService()
-        embedding = embed_service.embed_text(saved_craving.description)
-
-        vector_repo = VectorRepository()
-        metadata = {
-            "user_id": saved_craving.user_id,
-            "created_at": str(saved_craving.created_at)
-        }
-        vector_repo.upsert_craving_embedding(saved_craving.id, embedding, metadata)
-    except Exception as e:
-        print(f"Embedding error: {e}")
-
     return IngestCravingOutput(
         id=saved_craving.id,
         user_id=saved_craving.user_id,
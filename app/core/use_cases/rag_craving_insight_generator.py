@@ -3,7 +3,7 @@
 from typing import Optional
 import logging
 from app.core.use_cases.interfaces.icraving_insight_generator import ICravingInsightGenerator
-from app.core.services.rag_service import rag_service
+from app.core.services.rag_service import get_rag_service
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +28,7 @@ class RagCravingInsightGenerator(ICravingInsightGenerator):
         try:
             # Instead of a persona, you could also pass some specialized
             # "InsightPersona" if you have a LoRA model for that. For now, None.
-            answer = rag_service.generate_personalized_insight(
+            answer = get_rag_service().generate_personalized_insight(
                 user_id=user_id,
                 query=rag_query,
                 persona=None,      # or a specific persona if desired
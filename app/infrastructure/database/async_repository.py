@@ -0,0 +1,124 @@
+# File: app/infrastructure/database/async_repository.py
+"""
+Async variants of CravingRepository, UserRepository and VoiceLogRepository.
+
+Each method runs the corresponding sync repository method through
+AsyncSession.run_sync: the SQL, rollup/outbox bookkeeping and error handling
+are shared with the sync repositories, while every database round trip is
+awaited on the async driver instead of blocking the event loop.
+"""
+
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.entities.voice_log import VoiceLog
+from app.infrastructure.database.models import CravingModel, UserModel
+from app.infrastructure.database.repository import CravingRepository, UserRepository
+from app.infrastructure.database.voice_logs_repository import VoiceLogRepository
+
+
+class _AsyncRepository:
+    sync_repository = None
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _call(self, method: str, *args, **kwargs):
+        def run(sync_session):
+            return getattr(self.sync_repository(sync_session), method)(*args, **kwargs)
+        return await self.db.run_sync(run)
+
+
+class AsyncCravingRepository(_AsyncRepository):
+    sync_repository = CravingRepository
+
+    async def create_craving(self, user_id: int, description: str, intensity: float) -> CravingModel:
+        return await self._call("create_craving", user_id, description, intensity)
+
+    async def save_new_craving(self, new_craving: CravingModel) -> CravingModel:
+        return await self._call("save_new_craving", new_craving)
+
+    async def create_cravings_batch(self, rows: List[Dict[str, Any]]) -> List[CravingModel]:
+        return await self._call("create_cravings_batch", rows)
+
+    async def get_cravings_for_user(self, user_id: int, skip: int = 0, limit: int = 100) -> List[CravingModel]:
+        return await self._call("get_cravings_for_user", user_id, skip=skip, limit=limit)
+
+    async def get_cravings_page(
+        self,
+        user_id: int,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+    ) -> Tuple[List[CravingModel], Optional[str]]:
+        return await self._call("get_cravings_page", user_id, limit=limit, cursor=cursor, skip=skip)
+
+    async def count_cravings_for_user(self, user_id: int) -> int:
+        return await self._call("count_cravings_for_user", user_id)
+
+    async def get_craving_by_id(self, craving_id: int) -> Optional[CravingModel]:
+        return await self._call("get_craving_by_id", craving_id)
+
+    async def get_craving_by_uuid(self, craving_uuid: uuid.UUID) -> Optional[CravingModel]:
+        return await self._call("get_craving_by_uuid", craving_uuid)
+
+    async def delete_craving(self, craving_id: int) -> bool:
+        return await self._call("delete_craving", craving_id)
+
+
+class AsyncUserRepository(_AsyncRepository):
+    sync_repository = UserRepository
+
+    async def create_user(
+        self,
+        email: str,
+        password_hash: Optional[str] = None,
+        username: Optional[str] = None,
+        display_name: Optional[str] = None,
+        avatar_url: Optional[str] = None,
+        oauth_provider: Optional[str] = None
+    ) -> UserModel:
+        return await self._call(
+            "create_user",
+            email,
+            password_hash=password_hash,
+            username=username,
+            display_name=display_name,
+            avatar_url=avatar_url,
+            oauth_provider=oauth_provider,
+        )
+
+    async def get_by_email(self, email: str) -> Optional[UserModel]:
+        return await self._call("get_by_email", email)
+
+    async def get_by_username(self, username: str) -> Optional[UserModel]:
+        return await self._call("get_by_username", username)
+
+    async def get_by_id(self, user_id: int) -> Optional[UserModel]:
+        return await self._call("get_by_id", user_id)
+
+
+class AsyncVoiceLogRepository(_AsyncRepository):
+    sync_repository = VoiceLogRepository
+
+    async def create_voice_log(self, voice_log: VoiceLog) -> VoiceLog:
+        return await self._call("create_voice_log", voice_log)
+
+    async def create_from_upload(
+        self, user_id: int, sha256: str, size_bytes: int, staged_path: str, blob_root: Optional[str] = None
+    ) -> VoiceLog:
+        return await self._call("create_from_upload", user_id, sha256, size_bytes, staged_path, blob_root)
+
+    async def get_by_id(self, voice_log_id: int) -> Optional[VoiceLog]:
+        return await self._call("get_by_id", voice_log_id)
+
+    async def list_by_user(self, user_id: int) -> List[VoiceLog]:
+        return await self._call("list_by_user", user_id)
+
+    async def update(self, voice_log: VoiceLog) -> Optional[VoiceLog]:
+        return await self._call("update", voice_log)
+
+    async def soft_delete(self, voice_log_id: int) -> bool:
+        return await self._call("soft_delete", voice_log_id)
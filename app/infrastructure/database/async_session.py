@@ -0,0 +1,93 @@
+# File: app/infrastructure/database/async_session.py
+"""
+Async SQLAlchemy engine and session dependency.
+
+Uses asyncpg for Postgres (aiosqlite for SQLite URLs), so request handlers
+await database round trips instead of blocking the event loop. The engine is
+built lazily on first use from the same DATABASE_URL as the sync engine.
+"""
+
+import logging
+from typing import AsyncGenerator, Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config.settings import get_settings
+from app.infrastructure.database.engine import engine_options
+
+logger = logging.getLogger(__name__)
+
+_ASYNC_DRIVERS = {
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def to_async_url(db_url: str):
+    """
+    Rewrite a sync database URL for its async driver. libpq's `sslmode` is
+    not understood by asyncpg, so it is dropped and returned as connect args.
+
+    Returns:
+        (url, connect_args)
+    """
+    url = make_url(db_url)
+    drivername = _ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    connect_args = {}
+    query = dict(url.query)
+    sslmode = query.pop("sslmode", None)
+    if drivername == "postgresql+asyncpg" and sslmode == "require":
+        connect_args["ssl"] = "require"
+    return url.set(drivername=drivername, query=query), connect_args
+
+
+def build_async_engine(db_url: Optional[str] = None, **overrides) -> AsyncEngine:
+    """
+    Build an async engine with the shared pool settings (see engine.py);
+    keyword overrides win over the settings.
+    """
+    db_url = db_url or get_settings().DATABASE_URL
+    url, url_connect_args = to_async_url(db_url)
+    options = engine_options(db_url, is_async=True, **overrides)
+    if url_connect_args:
+        options["connect_args"] = {**url_connect_args, **options.get("connect_args", {})}
+    logger.info("Creating async database engine", extra={"driver": url.drivername})
+    return create_async_engine(url, **options)
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = build_async_engine()
+    return _async_engine
+
+
+def current_async_engine() -> Optional[AsyncEngine]:
+    """The async engine if one has been created, without creating it."""
+    return _async_engine
+
+
+def get_async_session_factory() -> async_sessionmaker:
+    global _async_session_factory
+    if _async_session_factory is None:
+        # expire_on_commit=False: attributes stay readable after commit
+        # without an implicit (and, in async, illegal) lazy refresh
+        _async_session_factory = async_sessionmaker(
+            get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Provide an AsyncSession per request.
+    """
+    async with get_async_session_factory()() as db:
+        yield db
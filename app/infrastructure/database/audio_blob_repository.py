@@ -0,0 +1,188 @@
+# File: app/infrastructure/database/audio_blob_repository.py
+"""
+AudioBlobRepository: content-addressed storage for voice audio (audio_blobs
+plus the files themselves).
+
+Audio lives at <root>/<sha[:2]>/<sha[2:4]>/<sha>.wav and is shared by every
+voice log with the same content. References are counted in audio_blobs;
+the blob row is locked while a reference is taken or dropped, so a blob is
+never deleted under a concurrent upload of the same audio. Methods do not
+commit: they run in the caller's voice log transaction. A file placed for a
+new blob row is removed again if that transaction rolls back, so no file is
+left under the root without a row.
+"""
+
+import logging
+import os
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.config.settings import get_settings
+from app.infrastructure.database.models import AudioBlobModel, VoiceLogModel
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLOB_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "uploads",
+    "blobs",
+)
+
+
+def blob_root() -> str:
+    """Blob directory; uploads are staged here too so placement is a rename."""
+    return get_settings().AUDIO_BLOB_DIR or DEFAULT_BLOB_DIR
+
+
+def _remove(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+_PLACED_FILES = "audio_blobs.placed_files"
+
+
+def _place_on_rollback_cleanup(db: Session, path: str) -> None:
+    """Delete `path` if the session's current transaction rolls back."""
+    placed = db.info.get(_PLACED_FILES)
+    if placed is None:
+        placed = db.info[_PLACED_FILES] = []
+        event.listen(db, "after_commit", _forget_placed)
+        event.listen(db, "after_soft_rollback", _discard_placed)
+    placed.append(path)
+
+
+def _forget_placed(session: Session) -> None:
+    session.info[_PLACED_FILES].clear()
+
+
+def _discard_placed(session: Session, previous_transaction: SessionTransaction) -> None:
+    # Savepoints roll back too (see _insert); only the outer transaction
+    # undoes the blob rows
+    if previous_transaction.parent is not None:
+        return
+    placed = session.info[_PLACED_FILES]
+    for path in placed:
+        _remove(path)
+        logger.info("Removed blob file of rolled back upload", extra={"path": path})
+    placed.clear()
+
+
+class AudioBlobRepository:
+    def __init__(self, db: Session, root: Optional[str] = None):
+        self.db = db
+        self.root = root or blob_root()
+
+    def blob_path(self, sha256: str) -> str:
+        return os.path.join(self.root, sha256[:2], sha256[2:4], f"{sha256}.wav")
+
+    def get(self, sha256: str) -> Optional[AudioBlobModel]:
+        return self.db.get(AudioBlobModel, sha256)
+
+    def acquire(self, sha256: str, size_bytes: int, staged_path: str) -> AudioBlobModel:
+        """
+        Take a reference to the blob for this content. The staged file
+        becomes the blob if it is not stored yet, and is deleted otherwise,
+        so duplicate content is never written twice.
+        """
+        try:
+            created = None
+            blob = self._locked(sha256)
+            if blob is None:
+                created = self._insert(sha256, size_bytes)
+                # None: a concurrent upload created it first; reference that one
+                blob = created or self._locked(sha256)
+            blob.ref_count += 1
+            if os.path.exists(blob.path):
+                _remove(staged_path)
+            else:
+                os.makedirs(os.path.dirname(blob.path), exist_ok=True)
+                os.replace(staged_path, blob.path)
+                if created is not None:
+                    _place_on_rollback_cleanup(self.db, blob.path)
+            self.db.flush()
+            return blob
+        except Exception:
+            logger.error("Error acquiring audio blob", exc_info=True, extra={"sha256": sha256})
+            raise
+
+    def release(self, sha256: str) -> None:
+        """
+        Drop a reference; the last one deletes the row and the file. The
+        file goes before the commit, while the row is still locked; if the
+        commit then fails, the next upload of this content restores it.
+        """
+        try:
+            blob = self._locked(sha256)
+            if blob is None:
+                return
+            blob.ref_count -= 1
+            if blob.ref_count <= 0:
+                self.db.delete(blob)
+                self.db.flush()
+                _remove(blob.path)
+                logger.info("Audio blob deleted", extra={"sha256": sha256})
+        except Exception:
+            logger.error("Error releasing audio blob", exc_info=True, extra={"sha256": sha256})
+            raise
+
+    def transcript_for(self, sha256: Optional[str]) -> Optional[str]:
+        if not sha256:
+            return None
+        blob = self.get(sha256)
+        return blob.transcribed_text if blob is not None else None
+
+    def record_transcript(self, sha256: Optional[str], text: str) -> None:
+        if not sha256:
+            return
+        self.db.query(AudioBlobModel).filter(AudioBlobModel.sha256 == sha256).update(
+            {AudioBlobModel.transcribed_text: text, AudioBlobModel.updated_at: datetime.utcnow()},
+            synchronize_session=False,
+        )
+
+    def _locked(self, sha256: str) -> Optional[AudioBlobModel]:
+        return (
+            self.db.query(AudioBlobModel)
+            .filter(AudioBlobModel.sha256 == sha256)
+            .with_for_update()
+            .populate_existing()
+            .first()
+        )
+
+    def _insert(self, sha256: str, size_bytes: int) -> Optional[AudioBlobModel]:
+        """The new row, or None if a concurrent upload inserted it first."""
+        now = datetime.utcnow()
+        blob = AudioBlobModel(
+            sha256=sha256,
+            path=self.blob_path(sha256),
+            size_bytes=size_bytes,
+            ref_count=0,
+            transcribed_text=self._existing_transcript(sha256),
+            created_at=now,
+            updated_at=now,
+        )
+        try:
+            with self.db.begin_nested():
+                self.db.add(blob)
+            return blob
+        except IntegrityError:
+            return None
+
+    def _existing_transcript(self, sha256: str) -> Optional[str]:
+        """Transcript of a voice log stored before blobs existed, if any."""
+        row = (
+            self.db.query(VoiceLogModel.transcribed_text)
+            .filter(
+                VoiceLogModel.content_sha256 == sha256,
+                VoiceLogModel.transcription_status == "COMPLETED",
+                VoiceLogModel.transcribed_text.isnot(None),
+            )
+            .first()
+        )
+        return row[0] if row else None
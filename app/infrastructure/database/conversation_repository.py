@@ -0,0 +1,92 @@
+# File: app/infrastructure/database/conversation_repository.py
+"""
+ConversationRepository: persistence for multi-turn chat sessions
+(chat_sessions, chat_messages). Methods commit their own writes.
+"""
+
+import logging
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.infrastructure.database.models import ChatMessageModel, ChatSessionModel
+
+logger = logging.getLogger(__name__)
+
+
+class ConversationRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_session(self, user_id: int) -> ChatSessionModel:
+        logger.info("Creating chat session", extra={"user_id": user_id})
+        try:
+            session = ChatSessionModel(user_id=user_id)
+            self.db.add(session)
+            self.db.commit()
+            self.db.refresh(session)
+            return session
+        except Exception:
+            logger.error("Error creating chat session", exc_info=True, extra={"user_id": user_id})
+            self.db.rollback()
+            raise
+
+    def get_session(self, session_id: str) -> Optional[ChatSessionModel]:
+        try:
+            return self.db.get(ChatSessionModel, session_id)
+        except Exception:
+            logger.error("Error fetching chat session", exc_info=True, extra={"session_id": session_id})
+            raise
+
+    def messages_after(self, session_id: str, after_seq: int) -> List[ChatMessageModel]:
+        """Messages with seq > after_seq, oldest first."""
+        try:
+            return (
+                self.db.query(ChatMessageModel)
+                .filter(ChatMessageModel.session_id == session_id, ChatMessageModel.seq > after_seq)
+                .order_by(ChatMessageModel.seq)
+                .all()
+            )
+        except Exception:
+            logger.error("Error fetching chat messages", exc_info=True, extra={"session_id": session_id})
+            raise
+
+    def append_messages(self, session_id: str, first_seq: int, messages: Sequence[Tuple[str, str, int]]) -> None:
+        """
+        Insert (role, content, tokens) messages at first_seq, first_seq + 1, ...
+        Raises IntegrityError if another writer already used those positions.
+        """
+        now = datetime.utcnow()
+        rows = [
+            {"session_id": session_id, "seq": first_seq + i, "role": role,
+             "content": content, "tokens": tokens, "created_at": now}
+            for i, (role, content, tokens) in enumerate(messages)
+        ]
+        try:
+            self.db.execute(insert(ChatMessageModel), rows)
+            self.db.query(ChatSessionModel).filter(ChatSessionModel.id == session_id).update(
+                {ChatSessionModel.updated_at: now}, synchronize_session=False
+            )
+            self.db.commit()
+        except Exception:
+            logger.error("Error appending chat messages", exc_info=True, extra={"session_id": session_id})
+            self.db.rollback()
+            raise
+
+    def update_summary(self, session_id: str, summary: Optional[str], through_seq: int) -> None:
+        try:
+            self.db.query(ChatSessionModel).filter(ChatSessionModel.id == session_id).update(
+                {
+                    ChatSessionModel.summary: summary,
+                    ChatSessionModel.summarized_through_seq: through_seq,
+                    ChatSessionModel.updated_at: datetime.utcnow(),
+                },
+                synchronize_session=False,
+            )
+            self.db.commit()
+        except Exception:
+            logger.error("Error updating chat summary", exc_info=True, extra={"session_id": session_id})
+            self.db.rollback()
+            raise
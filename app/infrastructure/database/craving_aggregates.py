@@ -0,0 +1,238 @@
+# File: app/infrastructure/database/craving_aggregates.py
+"""
+SQL-side craving aggregation.
+
+Computes window statistics and per-day buckets with GROUP BY in the
+database, so callers receive scalars and one row per day instead of
+hydrating every CravingModel. Postgres uses stddev_samp/date_trunc;
+SQLite (tests) falls back to sum-of-squares and date().
+"""
+
+import math
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, func, literal_column
+from sqlalchemy.orm import Session
+
+from app.infrastructure.database.dialect import is_sqlite
+from app.infrastructure.database.models import CravingDailyRollupModel, CravingModel
+
+logger = logging.getLogger(__name__)
+
+# confidence_to_resist strictly above this counts as a resisted craving
+RESISTED_THRESHOLD = 7.0
+
+
+@dataclass
+class RollupTotals:
+    """Window totals folded from one or more daily rollup rows."""
+    count: int = 0
+    resisted_count: int = 0
+    intensity_sum: float = 0.0
+    intensity_sq_sum: float = 0.0
+    intensity_min: Optional[float] = None
+    intensity_max: Optional[float] = None
+    resistance_sum: float = 0.0
+    resistance_n: int = 0
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[CravingDailyRollupModel]) -> "RollupTotals":
+        totals = cls()
+        for r in rows:
+            totals.count += r.count
+            totals.resisted_count += r.resisted_count
+            totals.intensity_sum += r.intensity_sum
+            totals.intensity_sq_sum += r.intensity_sq_sum
+            totals.resistance_sum += r.resistance_sum
+            totals.resistance_n += r.resistance_n
+            if r.intensity_min is not None:
+                totals.intensity_min = (
+                    r.intensity_min if totals.intensity_min is None
+                    else min(totals.intensity_min, r.intensity_min)
+                )
+            if r.intensity_max is not None:
+                totals.intensity_max = (
+                    r.intensity_max if totals.intensity_max is None
+                    else max(totals.intensity_max, r.intensity_max)
+                )
+        return totals
+
+    def add(self, intensity: float, confidence_to_resist: Optional[float]) -> None:
+        """Fold a single craving into the totals."""
+        self.count += 1
+        self.intensity_sum += intensity
+        self.intensity_sq_sum += intensity ** 2
+        self.intensity_min = intensity if self.intensity_min is None else min(self.intensity_min, intensity)
+        self.intensity_max = intensity if self.intensity_max is None else max(self.intensity_max, intensity)
+        if confidence_to_resist is not None:
+            self.resistance_sum += confidence_to_resist
+            self.resistance_n += 1
+        if (confidence_to_resist or 0.0) > RESISTED_THRESHOLD:
+            self.resisted_count += 1
+
+    @property
+    def average_intensity(self) -> float:
+        return self.intensity_sum / self.count if self.count else 0.0
+
+    @property
+    def average_resistance(self) -> float:
+        return self.resistance_sum / self.resistance_n if self.resistance_n else 0.0
+
+    @property
+    def intensity_stddev(self) -> float:
+        """Sample standard deviation (matches statistics.stdev); 0 for n < 2."""
+        if self.count < 2:
+            return 0.0
+        variance = (self.intensity_sq_sum - self.intensity_sum ** 2 / self.count) / (self.count - 1)
+        return math.sqrt(max(variance, 0.0))
+
+
+@dataclass
+class CravingWindowStats:
+    """Scalar statistics for a user's cravings in a time window."""
+    total: int = 0
+    resisted: int = 0
+    average_intensity: float = 0.0
+    average_resistance: float = 0.0
+    min_intensity: Optional[float] = None
+    max_intensity: Optional[float] = None
+    intensity_stddev: float = 0.0
+
+
+def _as_date(value) -> date:
+    # date_trunc returns a timestamp on Postgres, date() a string on SQLite
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value
+
+
+class CravingAggregateQueries:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def day_bucket(self):
+        """Expression truncating cravings.timestamp to its day."""
+        if is_sqlite(self.db):
+            return func.date(CravingModel.timestamp)
+        # literal 'day' so the SELECT and GROUP BY expressions compare equal
+        return func.date_trunc(literal_column("'day'"), CravingModel.timestamp)
+
+    def _window_filter(self, user_id: int, start: datetime, end: datetime, inclusive_end: bool = True):
+        return (
+            CravingModel.user_id == user_id,
+            CravingModel.is_deleted == False,
+            CravingModel.timestamp >= start,
+            CravingModel.timestamp <= end if inclusive_end else CravingModel.timestamp < end,
+        )
+
+    def _resisted_expr(self):
+        return func.sum(
+            case((func.coalesce(CravingModel.confidence_to_resist, 0.0) > RESISTED_THRESHOLD, 1), else_=0)
+        )
+
+    def window_stats(self, user_id: int, start: datetime, end: datetime) -> CravingWindowStats:
+        """
+        One aggregate query over [start, end]; returns only scalars.
+        """
+        logger.debug("Aggregating craving window", extra={"user_id": user_id})
+        try:
+            sqlite = is_sqlite(self.db)
+            spread = (
+                func.sum(CravingModel.intensity * CravingModel.intensity)
+                if sqlite else func.stddev_samp(CravingModel.intensity)
+            )
+            row = (
+                self.db.query(
+                    func.count(CravingModel.id),
+                    self._resisted_expr(),
+                    func.avg(CravingModel.intensity),
+                    func.avg(CravingModel.confidence_to_resist),
+                    func.min(CravingModel.intensity),
+                    func.max(CravingModel.intensity),
+                    spread,
+                    func.sum(CravingModel.intensity),
+                )
+                .filter(*self._window_filter(user_id, start, end))
+                .one()
+            )
+        except Exception:
+            logger.error("Error aggregating craving window", exc_info=True, extra={"user_id": user_id})
+            raise
+
+        total, resisted, avg_int, avg_res, min_int, max_int, spread_value, intensity_sum = row
+        if not total:
+            return CravingWindowStats()
+
+        if sqlite:
+            stddev = 0.0
+            if total > 1:
+                variance = (spread_value - intensity_sum ** 2 / total) / (total - 1)
+                stddev = math.sqrt(max(variance, 0.0))
+        else:
+            stddev = float(spread_value or 0.0)
+
+        return CravingWindowStats(
+            total=total,
+            resisted=int(resisted or 0),
+            average_intensity=float(avg_int or 0.0),
+            average_resistance=float(avg_res or 0.0),
+            min_intensity=min_int,
+            max_intensity=max_int,
+            intensity_stddev=stddev,
+        )
+
+    def daily_totals(
+        self,
+        user_id: int,
+        start: datetime,
+        end: datetime,
+        inclusive_end: bool = True,
+    ) -> List[Tuple[date, RollupTotals]]:
+        """
+        GROUP BY day over the window; one RollupTotals per day with cravings.
+        """
+        logger.debug("Aggregating cravings per day", extra={"user_id": user_id})
+        try:
+            bucket = self.day_bucket().label("day")
+            rows = (
+                self.db.query(
+                    bucket,
+                    func.count(CravingModel.id),
+                    self._resisted_expr(),
+                    func.sum(CravingModel.intensity),
+                    func.sum(CravingModel.intensity * CravingModel.intensity),
+                    func.min(CravingModel.intensity),
+                    func.max(CravingModel.intensity),
+                    func.coalesce(func.sum(CravingModel.confidence_to_resist), 0.0),
+                    func.count(CravingModel.confidence_to_resist),
+                )
+                .filter(*self._window_filter(user_id, start, end, inclusive_end))
+                .group_by(bucket)
+                .order_by(bucket)
+                .all()
+            )
+        except Exception:
+            logger.error("Error aggregating cravings per day", exc_info=True, extra={"user_id": user_id})
+            raise
+
+        return [
+            (
+                _as_date(day),
+                RollupTotals(
+                    count=count,
+                    resisted_count=int(resisted or 0),
+                    intensity_sum=float(i_sum or 0.0),
+                    intensity_sq_sum=float(i_sq_sum or 0.0),
+                    intensity_min=i_min,
+                    intensity_max=i_max,
+                    resistance_sum=float(r_sum or 0.0),
+                    resistance_n=r_n,
+                ),
+            )
+            for day, count, resisted, i_sum, i_sq_sum, i_min, i_max, r_sum, r_n in rows
+        ]
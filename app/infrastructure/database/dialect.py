@@ -0,0 +1,27 @@
+# File: app/infrastructure/database/dialect.py
+"""
+Small helpers for the few statements that differ between Postgres (production)
+and SQLite (tests), e.g. INSERT ... ON CONFLICT upserts.
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+def dialect_name(db: Session) -> str:
+    """Name of the dialect the session is bound to ("postgresql", "sqlite", ...)."""
+    return db.get_bind().dialect.name
+
+
+def is_sqlite(db: Session) -> bool:
+    return dialect_name(db) == "sqlite"
+
+
+def insert_for(db: Session):
+    """
+    Return the dialect-specific `insert` construct so callers can use
+    on_conflict_do_update / on_conflict_do_nothing on both Postgres and SQLite.
+    """
+    if is_sqlite(db):
+        return sqlite.insert
+    return postgresql.insert
@@ -0,0 +1,150 @@
+# File: app/infrastructure/database/engine.py
+"""
+Single engine factory for the application.
+
+Both the sync engine (session.py) and the async engine (async_session.py)
+are built here from DATABASE_URL and the DB_* pool settings, so there is one
+pool per driver per process and every pool reports the same statistics.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.config.settings import get_settings
+
+
+class PoolStats:
+    """Checkout counters and wait times for one pool, shared across recreate()."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, waited: float, timed_out: bool) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.timeouts,
+                "wait_ms_avg": round(self.wait_seconds_total / attempts * 1000, 3) if attempts else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+            }
+
+
+class _InstrumentedPoolMixin:
+    """Times every checkout, including the wait for a free connection."""
+    stats: PoolStats
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record(time.perf_counter() - start, timed_out=False)
+        return conn
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _with_stats(pool_class):
+    # Per-engine subclass so Pool.recreate() (which uses self.__class__) keeps the counters
+    return type(pool_class.__name__, (pool_class,), {"stats": PoolStats()})
+
+
+def engine_options(db_url: str, is_async: bool = False, **overrides) -> Dict[str, Any]:
+    """
+    create_engine / create_async_engine keyword arguments for db_url, built
+    from the DB_* settings; keyword overrides win. SQLite keeps SQLAlchemy's
+    default pooling.
+    """
+    settings = get_settings()
+    backend = make_url(db_url).get_backend_name()
+    options: Dict[str, Any] = {"pool_pre_ping": True}
+    if backend == "sqlite":
+        options.update(overrides)
+        return options
+
+    options.update(
+        poolclass=_with_stats(InstrumentedAsyncAdaptedQueuePool if is_async else InstrumentedQueuePool),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    )
+
+    connect_args: Dict[str, Any] = {}
+    require_ssl = "railway" in db_url
+    timeout_ms = settings.DB_STATEMENT_TIMEOUT_MS
+    if is_async:
+        if require_ssl:
+            connect_args["ssl"] = "require"
+        if timeout_ms:
+            connect_args["server_settings"] = {"statement_timeout": str(timeout_ms)}
+    else:
+        if require_ssl:
+            connect_args["sslmode"] = "require"
+        if timeout_ms:
+            connect_args["options"] = f"-c statement_timeout={timeout_ms}"
+    if connect_args:
+        options["connect_args"] = connect_args
+
+    if "poolclass" in overrides:
+        # Sizing arguments are QueuePool-specific (NullPool rejects them)
+        for key in ("pool_size", "max_overflow", "pool_timeout"):
+            options.pop(key, None)
+    options.update(overrides)
+    return options
+
+
+def build_engine(db_url: Optional[str] = None, **overrides) -> Engine:
+    """Build the sync engine; keyword overrides win over the settings."""
+    db_url = db_url or get_settings().DATABASE_URL
+    return create_engine(db_url, **engine_options(db_url, **overrides))
+
+
+def pool_status(engine) -> Dict[str, Any]:
+    """
+    Live pool occupancy plus checkout statistics for a sync or async engine.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    pool = sync_engine.pool
+    status: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            timeout_seconds=pool.timeout(),
+        )
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(stats.snapshot())
+    return status
@@ -0,0 +1,61 @@
+"""
+Create craving_daily_rollups table and backfill it from cravings
+
+Revision ID: 20250307_add_craving_daily_rollups
+Revises: 20250306_add_oauth_cols
+Create Date: 2025-03-07 10:00:00
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "20250307_add_craving_daily_rollups"
+down_revision: Union[str, None] = "20250306_add_oauth_cols"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.create_table(
+        "craving_daily_rollups",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("resisted_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("intensity_sum", sa.Float(precision=53), server_default="0", nullable=False),
+        sa.Column("intensity_sq_sum", sa.Float(precision=53), server_default="0", nullable=False),
+        sa.Column("intensity_min", sa.Float(precision=53), nullable=True),
+        sa.Column("intensity_max", sa.Float(precision=53), nullable=True),
+        sa.Column("resistance_sum", sa.Float(precision=53), server_default="0", nullable=False),
+        sa.Column("resistance_n", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("user_id", "day"),
+    )
+
+    # Backfill from existing, non-deleted cravings. timestamp is a naive UTC
+    # DateTime, so a plain ::date gives its UTC day regardless of the session
+    # TimeZone (AT TIME ZONE would make it timestamptz and shift it), matching
+    # craving_day() and day_bucket
+    op.execute("""
+    INSERT INTO craving_daily_rollups (
+        user_id, day, count, resisted_count, intensity_sum, intensity_sq_sum,
+        intensity_min, intensity_max, resistance_sum, resistance_n, updated_at
+    )
+    SELECT
+        user_id,
+        timestamp::date AS day,
+        COUNT(*),
+        COUNT(*) FILTER (WHERE COALESCE(confidence_to_resist, 0) > 7),
+        SUM(intensity),
+        SUM(intensity * intensity),
+        MIN(intensity),
+        MAX(intensity),
+        COALESCE(SUM(confidence_to_resist), 0),
+        COUNT(confidence_to_resist),
+        now()
+    FROM cravings
+    WHERE is_deleted = false
+    GROUP BY user_id, timestamp::date
+    """)
+
+def downgrade() -> None:
+    op.drop_table("craving_daily_rollups")
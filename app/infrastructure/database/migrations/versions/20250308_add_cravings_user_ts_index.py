@@ -0,0 +1,28 @@
+"""
+Add partial composite index on cravings(user_id, timestamp) for live rows
+
+Revision ID: 20250308_add_cravings_user_ts_index
+Revises: 20250307_add_craving_daily_rollups
+Create Date: 2025-03-08 10:00:00
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "20250308_add_cravings_user_ts_index"
+down_revision: Union[str, None] = "20250307_add_craving_daily_rollups"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # is_deleted is fixed by the predicate, so it is not repeated as a key column
+    op.create_index(
+        "ix_cravings_user_id_timestamp_active",
+        "cravings",
+        ["user_id", "timestamp"],
+        unique=False,
+        postgresql_where=sa.text("is_deleted = false"),
+    )
+
+def downgrade() -> None:
+    op.drop_index("ix_cravings_user_id_timestamp_active", table_name="cravings")
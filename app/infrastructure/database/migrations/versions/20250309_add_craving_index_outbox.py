@@ -0,0 +1,43 @@
+"""
+Create craving_index_outbox table for asynchronous vector indexing
+
+Revision ID: 20250309_add_craving_index_outbox
+Revises: 20250308_add_cravings_user_ts_index
+Create Date: 2025-03-09 10:00:00
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "20250309_add_craving_index_outbox"
+down_revision: Union[str, None] = "20250308_add_cravings_user_ts_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.create_table(
+        "craving_index_outbox",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("craving_id", sa.Integer(), nullable=False),
+        sa.Column("state", sa.String(), server_default="PENDING", nullable=False),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("next_attempt_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_craving_index_outbox_id", "craving_index_outbox", ["id"], unique=False)
+    op.create_index("ix_craving_index_outbox_craving_id", "craving_index_outbox", ["craving_id"], unique=False)
+    op.create_index(
+        "ix_craving_index_outbox_state_next_attempt",
+        "craving_index_outbox",
+        ["state", "next_attempt_at"],
+        unique=False,
+    )
+
+def downgrade() -> None:
+    op.drop_index("ix_craving_index_outbox_state_next_attempt", table_name="craving_index_outbox")
+    op.drop_index("ix_craving_index_outbox_craving_id", table_name="craving_index_outbox")
+    op.drop_index("ix_craving_index_outbox_id", table_name="craving_index_outbox")
+    op.drop_table("craving_index_outbox")
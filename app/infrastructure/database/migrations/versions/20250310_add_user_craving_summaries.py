@@ -0,0 +1,33 @@
+"""
+Create user_craving_summaries table for precomputed per-user craving digests
+
+Revision ID: 20250310_add_user_craving_summaries
+Revises: 20250309_add_craving_index_outbox
+Create Date: 2025-03-10 10:00:00
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "20250310_add_user_craving_summaries"
+down_revision: Union[str, None] = "20250309_add_craving_index_outbox"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # Rows are created by the indexing worker as cravings arrive; users
+    # without one fall back to raw retrieved cravings
+    op.create_table(
+        "user_craving_summaries",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("craving_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("last_craving_id", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("emotion_counts", sa.JSON(), nullable=False),
+        sa.Column("phrase_counts", sa.JSON(), nullable=False),
+        sa.Column("summary", sa.JSON(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+def downgrade() -> None:
+    op.drop_table("user_craving_summaries")
@@ -0,0 +1,45 @@
+"""
+Create chat_sessions and chat_messages tables for multi-turn /ai/chat
+
+Revision ID: 20250311_add_chat_sessions
+Revises: 20250310_add_user_craving_summaries
+Create Date: 2025-03-11 10:00:00
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "20250311_add_chat_sessions"
+down_revision: Union[str, None] = "20250310_add_user_craving_summaries"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.create_table(
+        "chat_sessions",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("summary", sa.Text(), nullable=True),
+        sa.Column("summarized_through_seq", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_chat_sessions_user_id", "chat_sessions", ["user_id"], unique=False)
+    op.create_table(
+        "chat_messages",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("session_id", sa.String(length=36), nullable=False),
+        sa.Column("seq", sa.Integer(), nullable=False),
+        sa.Column("role", sa.String(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("tokens", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("session_id", "seq", name="uq_chat_messages_session_seq"),
+    )
+
+def downgrade() -> None:
+    op.drop_table("chat_messages")
+    op.drop_index("ix_chat_sessions_user_id", table_name="chat_sessions")
+    op.drop_table("chat_sessions")
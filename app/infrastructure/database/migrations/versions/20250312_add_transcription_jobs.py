@@ -0,0 +1,43 @@
+"""
+Create transcription_jobs table for background voice log transcription
+
+Revision ID: 20250312_add_transcription_jobs
+Revises: 20250311_add_chat_sessions
+Create Date: 2025-03-12 10:00:00
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "20250312_add_transcription_jobs"
+down_revision: Union[str, None] = "20250311_add_chat_sessions"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.create_table(
+        "transcription_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("voice_log_id", sa.Integer(), nullable=False),
+        sa.Column("state", sa.String(), server_default="PENDING", nullable=False),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("next_attempt_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_transcription_jobs_id", "transcription_jobs", ["id"], unique=False)
+    op.create_index("ix_transcription_jobs_voice_log_id", "transcription_jobs", ["voice_log_id"], unique=False)
+    op.create_index(
+        "ix_transcription_jobs_state_next_attempt",
+        "transcription_jobs",
+        ["state", "next_attempt_at"],
+        unique=False,
+    )
+
+def downgrade() -> None:
+    op.drop_index("ix_transcription_jobs_state_next_attempt", table_name="transcription_jobs")
+    op.drop_index("ix_transcription_jobs_voice_log_id", table_name="transcription_jobs")
+    op.drop_index("ix_transcription_jobs_id", table_name="transcription_jobs")
+    op.drop_table("transcription_jobs")
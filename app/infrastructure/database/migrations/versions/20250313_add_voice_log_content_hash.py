@@ -0,0 +1,23 @@
+"""
+Add content_sha256 and size_bytes to voice_logs
+
+Revision ID: 20250313_add_voice_log_content_hash
+Revises: 20250312_add_transcription_jobs
+Create Date: 2025-03-13 10:00:00
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "20250313_add_voice_log_content_hash"
+down_revision: Union[str, None] = "20250312_add_transcription_jobs"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.add_column("voice_logs", sa.Column("content_sha256", sa.String(length=64), nullable=True))
+    op.add_column("voice_logs", sa.Column("size_bytes", sa.Integer(), nullable=True))
+
+def downgrade() -> None:
+    op.drop_column("voice_logs", "size_bytes")
+    op.drop_column("voice_logs", "content_sha256")
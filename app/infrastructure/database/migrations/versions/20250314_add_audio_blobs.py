@@ -0,0 +1,34 @@
+"""
+Create audio_blobs table for content-addressed voice audio
+
+Revision ID: 20250314_add_audio_blobs
+Revises: 20250313_add_voice_log_content_hash
+Create Date: 2025-03-14 10:00:00
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "20250314_add_audio_blobs"
+down_revision: Union[str, None] = "20250313_add_voice_log_content_hash"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.create_table(
+        "audio_blobs",
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("path", sa.String(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("transcribed_text", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("sha256"),
+    )
+    # Voice logs are looked up by content when a blob's transcript is backfilled
+    op.create_index("ix_voice_logs_content_sha256", "voice_logs", ["content_sha256"], unique=False)
+
+def downgrade() -> None:
+    op.drop_index("ix_voice_logs_content_sha256", table_name="voice_logs")
+    op.drop_table("audio_blobs")
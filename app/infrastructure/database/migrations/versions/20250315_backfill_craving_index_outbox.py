@@ -0,0 +1,33 @@
+"""
+Queue every live craving for re-indexing into per-user vector namespaces
+
+Vectors indexed before VECTOR_NAMESPACE_PER_USER sit in the default
+namespace without created_ts / is_deleted metadata, so user-scoped searches
+cannot see them. Queueing the cravings lets the indexing worker re-embed
+them into "user-<id>" with full metadata.
+
+Revision ID: 20250315_backfill_craving_index_outbox
+Revises: 20250314_add_audio_blobs
+Create Date: 2025-03-15 10:00:00
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = "20250315_backfill_craving_index_outbox"
+down_revision: Union[str, None] = "20250314_add_audio_blobs"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.execute("""
+    INSERT INTO craving_index_outbox (craving_id, state, attempts, next_attempt_at, created_at, updated_at)
+    SELECT c.id, 'PENDING', 0, now(), now(), now()
+    FROM cravings c
+    WHERE c.is_deleted = false
+      AND NOT EXISTS (SELECT 1 FROM craving_index_outbox o WHERE o.craving_id = c.id)
+    """)
+
+def downgrade() -> None:
+    # Queued rows are indistinguishable from regular ones, and re-indexing
+    # is harmless, so nothing is undone
+    pass
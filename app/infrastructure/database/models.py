@@ -7,10 +7,16 @@ from sqlalchemy import (
     Integer,
     String,
     Boolean,
+    Date,
     DateTime,
-    Float
+    Float,
+    Index,
+    JSON,
+    Text,
+    UniqueConstraint,
+    Uuid,
+    text
 )
-from sqlalchemy.dialects.postgresql import UUID, JSON
 
 Base = declarative_base()
 
@@ -19,7 +25,9 @@ class CravingModel(Base):
     __tablename__ = "cravings"
 
     id = Column(Integer, primary_key=True, index=True)
-    craving_uuid = Column(UUID(as_uuid=True), unique=True, index=True, nullable=False)
+    # Generic Uuid renders as native UUID on Postgres and CHAR(32) on SQLite (tests)
+    craving_uuid = Column(Uuid(as_uuid=True), unique=True, index=True, nullable=False,
+                          default=uuid.uuid4)
 
     user_id = Column(Integer, nullable=False)
     description = Column(String, nullable=False)
@@ -35,6 +43,121 @@ class CravingModel(Base):
     updated_at = Column(DateTime, default=datetime.datetime.utcnow,
                         onupdate=datetime.datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        # Hot path: a user's live cravings over a time range (listing, analytics,
+        # rollup recompute). Partial so soft-deleted rows never enter the index.
+        Index(
+            "ix_cravings_user_id_timestamp_active",
+            "user_id",
+            "timestamp",
+            postgresql_where=text("is_deleted = false"),
+            sqlite_where=text("is_deleted = 0"),
+        ),
+    )
+
+# Per-user, per-day craving aggregates kept in step with the cravings table,
+# so analytics reads O(days) rows instead of every craving in the window
+class CravingDailyRollupModel(Base):
+    __tablename__ = "craving_daily_rollups"
+
+    user_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)
+
+    count = Column(Integer, default=0, nullable=False)
+    resisted_count = Column(Integer, default=0, nullable=False)
+    intensity_sum = Column(Float, default=0.0, nullable=False)
+    intensity_sq_sum = Column(Float, default=0.0, nullable=False)  # for std deviation
+    intensity_min = Column(Float, nullable=True)
+    intensity_max = Column(Float, nullable=True)
+    resistance_sum = Column(Float, default=0.0, nullable=False)
+    resistance_n = Column(Integer, default=0, nullable=False)  # rows with confidence_to_resist
+
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow,
+                        onupdate=datetime.datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<CravingDailyRollupModel user_id={self.user_id} day={self.day} count={self.count}>"
+
+# Outbox of cravings whose vector-index entry must be (re)built or removed.
+# Written in the same transaction as the craving; drained by the indexing worker.
+class CravingIndexOutboxModel(Base):
+    __tablename__ = "craving_index_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    craving_id = Column(Integer, nullable=False, index=True)
+    state = Column(String, default="PENDING", nullable=False)  # PENDING, IN_PROGRESS, FAILED
+    attempts = Column(Integer, default=0, nullable=False)
+    # Earliest time the row may be claimed: retry backoff, or lease expiry while IN_PROGRESS
+    next_attempt_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    last_error = Column(String, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow,
+                        onupdate=datetime.datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_craving_index_outbox_state_next_attempt", "state", "next_attempt_at"),
+    )
+
+    def __repr__(self):
+        return f"<CravingIndexOutboxModel id={self.id} craving_id={self.craving_id} state={self.state}>"
+
+# Compact per-user digest of the whole craving history (weekly aggregates,
+# top emotions and trigger phrases) for LLM context. Kept current by the
+# indexing worker: new cravings are folded in past last_craving_id, any
+# other change rebuilds the row.
+class UserCravingSummaryModel(Base):
+    __tablename__ = "user_craving_summaries"
+
+    user_id = Column(Integer, primary_key=True)
+    craving_count = Column(Integer, default=0, nullable=False)  # cravings folded into the counts
+    last_craving_id = Column(Integer, default=0, nullable=False)
+    emotion_counts = Column(JSON, nullable=False, default=dict)
+    phrase_counts = Column(JSON, nullable=False, default=dict)
+    summary = Column(JSON, nullable=False, default=dict)  # rendered into prompts
+
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow,
+                        onupdate=datetime.datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<UserCravingSummaryModel user_id={self.user_id} craving_count={self.craving_count}>"
+
+# Multi-turn /ai/chat conversations. Messages before summarized_through_seq
+# have been compacted into `summary` and are no longer replayed to the model.
+class ChatSessionModel(Base):
+    __tablename__ = "chat_sessions"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(Integer, nullable=False, index=True)
+    summary = Column(Text, nullable=True)
+    summarized_through_seq = Column(Integer, default=0, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow,
+                        onupdate=datetime.datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<ChatSessionModel id={self.id} user_id={self.user_id}>"
+
+class ChatMessageModel(Base):
+    __tablename__ = "chat_messages"
+
+    id = Column(Integer, primary_key=True)
+    session_id = Column(String(36), nullable=False)
+    seq = Column(Integer, nullable=False)  # 1-based position in the session
+    role = Column(String, nullable=False)  # user, assistant
+    content = Column(Text, nullable=False)
+    tokens = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # Also makes concurrent appends to one session conflict instead of interleaving
+        UniqueConstraint("session_id", "seq", name="uq_chat_messages_session_seq"),
+    )
+
+    def __repr__(self):
+        return f"<ChatMessageModel session_id={self.session_id} seq={self.seq} role={self.role}>"
+
 # Database model representing application users (regular and OAuth users)
 class UserModel(Base):
     __tablename__ = "users"
@@ -70,6 +193,54 @@ class VoiceLogModel(Base):
     transcribed_text = Column(String, nullable=True)
     transcription_status = Column(String, nullable=True)
     is_deleted = Column(Boolean, default=False, nullable=False)
+    # Computed while the upload streams to disk (null for older rows)
+    content_sha256 = Column(String(64), nullable=True, index=True)
+    size_bytes = Column(Integer, nullable=True)
+
+    def __repr__(self):
+        return f"<VoiceLogModel id={self.id} user_id={self.user_id} file_path={self.file_path}>"
+
+# Durable queue for voice log transcription, drained by the transcription
+# worker pool. Rows are kept after they settle so the voice log's status
+# endpoint can report attempts and the last error.
+class TranscriptionJobModel(Base):
+    __tablename__ = "transcription_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    voice_log_id = Column(Integer, nullable=False, index=True)
+    state = Column(String, default="PENDING", nullable=False)  # PENDING, IN_PROGRESS, COMPLETED, FAILED
+    attempts = Column(Integer, default=0, nullable=False)
+    # Earliest time the job may be claimed: retry backoff, or lease expiry while IN_PROGRESS
+    next_attempt_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    last_error = Column(String, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow,
+                        onupdate=datetime.datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_transcription_jobs_state_next_attempt", "state", "next_attempt_at"),
+    )
+
+    def __repr__(self):
+        return f"<TranscriptionJobModel id={self.id} voice_log_id={self.voice_log_id} state={self.state}>"
+
+# Content-addressed voice audio: one file per distinct SHA-256, shared by
+# every voice log with that content. ref_count counts live (not deleted)
+# voice logs; the row and file are removed when it drops to zero. The
+# transcript is kept here so duplicate audio is never transcribed twice.
+class AudioBlobModel(Base):
+    __tablename__ = "audio_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    path = Column(String, nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+    ref_count = Column(Integer, default=0, nullable=False)
+    transcribed_text = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow,
+                        onupdate=datetime.datetime.utcnow, nullable=False)
 
     def __repr__(self):
-        return f"<VoiceLogModel id={self.id} user_id={self.user_id} file_path={self.file_path}>"
\ No newline at end of file
+        return f"<AudioBlobModel sha256={self.sha256} ref_count={self.ref_count}>"
@@ -0,0 +1,225 @@
+# File: app/infrastructure/database/outbox_repository.py
+"""
+CravingIndexOutboxRepository: the durable queue behind asynchronous vector
+indexing (craving_index_outbox).
+
+Rows are enqueued in the craving's own transaction (caller commits). The
+worker claims due rows with a lease, then deletes them on success or
+reschedules them with jittered backoff; rows that run out of attempts are
+parked as FAILED until re-driven.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import false, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.infrastructure.database.models import CravingIndexOutboxModel, CravingModel
+from app.utils.backoff import full_jitter_delay
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_PENDING = "PENDING"
+OUTBOX_IN_PROGRESS = "IN_PROGRESS"
+OUTBOX_FAILED = "FAILED"
+
+
+@dataclass
+class OutboxItem:
+    """A claimed outbox row."""
+    id: int
+    craving_id: int
+    attempts: int
+
+
+class CravingIndexOutboxRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def enqueue(self, craving_ids: Iterable[int]) -> None:
+        """
+        Queue cravings for (re)indexing. Does not commit: call inside the
+        transaction that changed the cravings.
+        """
+        now = datetime.utcnow()
+        rows = [
+            {"craving_id": cid, "state": OUTBOX_PENDING, "attempts": 0,
+             "next_attempt_at": now, "created_at": now, "updated_at": now}
+            for cid in dict.fromkeys(craving_ids)
+        ]
+        if not rows:
+            return
+        logger.debug("Enqueueing cravings for indexing", extra={"count": len(rows)})
+        try:
+            self.db.execute(insert(CravingIndexOutboxModel), rows)
+        except Exception:
+            logger.error("Error enqueueing cravings for indexing", exc_info=True)
+            raise
+
+    def enqueue_all_live(self, user_id: Optional[int] = None) -> int:
+        """
+        Queue every live craving (optionally only user_id's) that is not
+        already queued, and commit. Used to re-index existing vectors, e.g.
+        into per-user namespaces. Returns the number queued.
+        """
+        now = datetime.utcnow()
+        already_queued = (
+            select(CravingIndexOutboxModel.id)
+            .where(CravingIndexOutboxModel.craving_id == CravingModel.id)
+            .exists()
+        )
+        live = select(
+            CravingModel.id,
+            literal(OUTBOX_PENDING),
+            literal(0),
+            literal(now),
+            literal(now),
+            literal(now),
+        ).where(CravingModel.is_deleted == false(), ~already_queued)
+        if user_id is not None:
+            live = live.where(CravingModel.user_id == user_id)
+        logger.info("Queueing all live cravings for indexing", extra={"user_id": user_id})
+        try:
+            result = self.db.execute(
+                insert(CravingIndexOutboxModel).from_select(
+                    ["craving_id", "state", "attempts", "next_attempt_at", "created_at", "updated_at"],
+                    live,
+                )
+            )
+            self.db.commit()
+            return result.rowcount
+        except Exception:
+            logger.error("Error queueing live cravings for indexing", exc_info=True)
+            self.db.rollback()
+            raise
+
+    def claim_batch(self, limit: int, lease_seconds: float) -> List[OutboxItem]:
+        """
+        Claim up to `limit` due rows and commit the claim.
+
+        Claimed rows stay IN_PROGRESS until `lease_seconds` pass; after that
+        they are due again, so a worker that dies mid-batch loses nothing.
+        Concurrent workers on Postgres skip each other's locked rows.
+        """
+        now = datetime.utcnow()
+        try:
+            rows = (
+                self.db.query(CravingIndexOutboxModel)
+                .filter(
+                    CravingIndexOutboxModel.state.in_([OUTBOX_PENDING, OUTBOX_IN_PROGRESS]),
+                    CravingIndexOutboxModel.next_attempt_at <= now,
+                )
+                .order_by(CravingIndexOutboxModel.next_attempt_at, CravingIndexOutboxModel.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            lease_until = now + timedelta(seconds=lease_seconds)
+            items = []
+            for row in rows:
+                row.state = OUTBOX_IN_PROGRESS
+                row.next_attempt_at = lease_until
+                items.append(OutboxItem(row.id, row.craving_id, row.attempts))
+            self.db.commit()
+            return items
+        except Exception:
+            logger.error("Error claiming indexing outbox batch", exc_info=True)
+            self.db.rollback()
+            raise
+
+    def complete(self, item_ids: List[int]) -> None:
+        """Remove successfully processed rows."""
+        if not item_ids:
+            return
+        try:
+            self.db.query(CravingIndexOutboxModel).filter(
+                CravingIndexOutboxModel.id.in_(item_ids)
+            ).delete(synchronize_session=False)
+            self.db.commit()
+        except Exception:
+            logger.error("Error completing indexing outbox rows", exc_info=True)
+            self.db.rollback()
+            raise
+
+    def fail(
+        self,
+        item_ids: List[int],
+        error: str,
+        max_attempts: int,
+        base_delay: float,
+        max_delay: float,
+    ) -> int:
+        """
+        Record a failed attempt. Rows are rescheduled with full-jitter backoff,
+        or marked FAILED once they reach max_attempts. Returns how many were
+        marked FAILED.
+        """
+        if not item_ids:
+            return 0
+        now = datetime.utcnow()
+        parked = 0
+        try:
+            rows = (
+                self.db.query(CravingIndexOutboxModel)
+                .filter(CravingIndexOutboxModel.id.in_(item_ids))
+                .all()
+            )
+            for row in rows:
+                row.attempts += 1
+                row.last_error = (error or "")[:1000]
+                if row.attempts >= max_attempts:
+                    row.state = OUTBOX_FAILED
+                    parked += 1
+                else:
+                    row.state = OUTBOX_PENDING
+                    delay = full_jitter_delay(row.attempts, base=base_delay, cap=max_delay)
+                    row.next_attempt_at = now + timedelta(seconds=delay)
+            self.db.commit()
+            if parked:
+                logger.warning("Indexing outbox rows exhausted retries", extra={"count": parked})
+            return parked
+        except Exception:
+            logger.error("Error recording indexing outbox failure", exc_info=True)
+            self.db.rollback()
+            raise
+
+    def redrive_failed(self, craving_ids: Optional[List[int]] = None) -> int:
+        """
+        Move FAILED rows (optionally only those for craving_ids) back to
+        PENDING with a fresh attempt budget. Returns the number re-driven.
+        """
+        logger.info("Re-driving failed indexing outbox rows")
+        try:
+            query = self.db.query(CravingIndexOutboxModel).filter(
+                CravingIndexOutboxModel.state == OUTBOX_FAILED
+            )
+            if craving_ids:
+                query = query.filter(CravingIndexOutboxModel.craving_id.in_(craving_ids))
+            count = query.update(
+                {
+                    CravingIndexOutboxModel.state: OUTBOX_PENDING,
+                    CravingIndexOutboxModel.attempts: 0,
+                    CravingIndexOutboxModel.next_attempt_at: datetime.utcnow(),
+                },
+                synchronize_session=False,
+            )
+            self.db.commit()
+            return count
+        except Exception:
+            logger.error("Error re-driving indexing outbox rows", exc_info=True)
+            self.db.rollback()
+            raise
+
+    def state_counts(self) -> Dict[str, int]:
+        """Number of outbox rows per state."""
+        rows = (
+            self.db.query(CravingIndexOutboxModel.state, func.count(CravingIndexOutboxModel.id))
+            .group_by(CravingIndexOutboxModel.state)
+            .all()
+        )
+        counts = {OUTBOX_PENDING: 0, OUTBOX_IN_PROGRESS: 0, OUTBOX_FAILED: 0}
+        counts.update({state: n for state, n in rows})
+        return counts
@@ -0,0 +1,33 @@
+# File: app/infrastructure/database/pagination.py
+"""
+Opaque keyset cursors for paginating cravings by (timestamp, id).
+
+A cursor encodes the sort key of the last row on a page; the next page is
+everything strictly after it in (timestamp DESC, id DESC) order, so page
+cost does not grow with depth and rows never shift between pages.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    payload = json.dumps({"t": timestamp.isoformat(), "i": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(payload["t"]), int(payload["i"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
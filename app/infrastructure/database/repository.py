@@ -1,9 +1,15 @@
 # File: app/infrastructure/database/repository.py
-from typing import Optional, List
+import uuid
+from typing import Any, Dict, Optional, List, Tuple
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 import logging
 
+from app.infrastructure.database.dialect import insert_for
 from app.infrastructure.database.models import CravingModel, UserModel
+from app.infrastructure.database.outbox_repository import CravingIndexOutboxRepository
+from app.infrastructure.database.pagination import decode_cursor, encode_cursor
+from app.infrastructure.database.rollup_repository import CravingRollupRepository, craving_day
 
 logger = logging.getLogger(__name__)
 
@@ -12,20 +18,65 @@ class CravingRepository:
         self.db = db
 
     def create_craving(self, user_id: int, description: str, intensity: float) -> CravingModel:
-        logger.info("Creating new craving", extra={"user_id": user_id})
+        return self.save_new_craving(CravingModel(
+            user_id=user_id,
+            description=description,
+            intensity=intensity
+        ))
+
+    def save_new_craving(self, new_craving: CravingModel) -> CravingModel:
+        """
+        Insert a craving, fold it into its daily rollup and queue it for
+        vector indexing, all in one transaction.
+        """
+        logger.info("Creating new craving", extra={"user_id": new_craving.user_id})
         try:
-            new_craving = CravingModel(
-                user_id=user_id,
-                description=description,
-                intensity=intensity
-            )
             self.db.add(new_craving)
+            self.db.flush()
+            CravingRollupRepository(self.db).apply_new_craving(new_craving)
+            CravingIndexOutboxRepository(self.db).enqueue([new_craving.id])
             self.db.commit()
             self.db.refresh(new_craving)
             logger.info("Craving created successfully", extra={"craving_id": new_craving.id})
             return new_craving
         except Exception:
-            logger.error("Error creating craving", exc_info=True, extra={"user_id": user_id})
+            logger.error("Error creating craving", exc_info=True, extra={"user_id": new_craving.user_id})
+            self.db.rollback()
+            raise
+
+    def create_cravings_batch(self, rows: List[Dict[str, Any]]) -> List[CravingModel]:
+        """
+        Insert many cravings in one INSERT ... ON CONFLICT (craving_uuid) DO NOTHING
+        RETURNING statement, fold them into the daily rollups and queue them for
+        vector indexing, then commit once.
+
+        Each row is a dict of CravingModel column values and must carry a
+        craving_uuid. Rows whose uuid already exists are skipped, so replaying
+        the same batch is a no-op. Returns only the newly inserted cravings,
+        as detached instances.
+        """
+        if not rows:
+            return []
+        logger.info("Creating craving batch", extra={"size": len(rows)})
+        try:
+            stmt = (
+                insert_for(self.db)(CravingModel)
+                .values(rows)
+                .on_conflict_do_nothing(index_elements=[CravingModel.craving_uuid])
+                .returning(CravingModel)
+            )
+            created = list(self.db.scalars(stmt).all())
+            CravingRollupRepository(self.db).apply_new_cravings(created)
+            CravingIndexOutboxRepository(self.db).enqueue([c.id for c in created])
+            # Detach so commit does not expire them; reading the returned rows
+            # must not cost a refresh SELECT per craving
+            for craving in created:
+                self.db.expunge(craving)
+            self.db.commit()
+            logger.info("Craving batch created", extra={"inserted": len(created), "size": len(rows)})
+            return created
+        except Exception:
+            logger.error("Error creating craving batch", exc_info=True, extra={"size": len(rows)})
             self.db.rollback()
             raise
 
@@ -35,6 +86,7 @@ class CravingRepository:
             return (
                 self.db.query(CravingModel)
                 .filter(CravingModel.user_id == user_id, CravingModel.is_deleted == False)
+                .order_by(CravingModel.timestamp.desc(), CravingModel.id.desc())
                 .offset(skip)
                 .limit(limit)
                 .all()
@@ -43,6 +95,55 @@ class CravingRepository:
             logger.error("Error fetching cravings", exc_info=True, extra={"user_id": user_id})
             raise
 
+    def get_cravings_page(
+        self,
+        user_id: int,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+    ) -> Tuple[List[CravingModel], Optional[str]]:
+        """
+        Keyset page of a user's cravings, newest first, ordered by (timestamp, id).
+
+        Returns the page and the cursor for the next one (None on the last page).
+        `skip` is only honoured without a cursor, for legacy offset clients.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        logger.debug("Fetching craving page", extra={"user_id": user_id, "limit": limit})
+        query = (
+            self.db.query(CravingModel)
+            .filter(CravingModel.user_id == user_id, CravingModel.is_deleted == False)
+        )
+        if cursor:
+            last_ts, last_id = decode_cursor(cursor)
+            # timestamp <= last_ts is the index range; the OR only breaks ties
+            query = query.filter(
+                CravingModel.timestamp <= last_ts,
+                or_(
+                    CravingModel.timestamp < last_ts,
+                    and_(CravingModel.timestamp == last_ts, CravingModel.id < last_id),
+                ),
+            )
+        elif skip:
+            query = query.offset(skip)
+        try:
+            rows = (
+                query.order_by(CravingModel.timestamp.desc(), CravingModel.id.desc())
+                .limit(limit + 1)
+                .all()
+            )
+        except Exception:
+            logger.error("Error fetching craving page", exc_info=True, extra={"user_id": user_id})
+            raise
+
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(page[-1].timestamp, page[-1].id)
+        return page, next_cursor
+
     def count_cravings_for_user(self, user_id: int) -> int:
         logger.debug("Counting cravings for user", extra={"user_id": user_id})
         try:
@@ -67,6 +168,44 @@ class CravingRepository:
             logger.error("Error getting craving by ID", exc_info=True, extra={"craving_id": craving_id})
             raise
 
+    def get_craving_by_uuid(self, craving_uuid: uuid.UUID) -> Optional[CravingModel]:
+        logger.debug("Getting craving by UUID", extra={"craving_uuid": str(craving_uuid)})
+        try:
+            return (
+                self.db.query(CravingModel)
+                .filter(CravingModel.craving_uuid == craving_uuid, CravingModel.is_deleted == False)
+                .first()
+            )
+        except Exception:
+            logger.error("Error getting craving by UUID", exc_info=True, extra={"craving_uuid": str(craving_uuid)})
+            raise
+
+    def delete_craving(self, craving_id: int) -> bool:
+        """
+        Soft-delete a craving, refresh the daily rollup it was counted in and
+        queue removal of its vector.
+        """
+        logger.info("Soft deleting craving", extra={"craving_id": craving_id})
+        try:
+            craving = (
+                self.db.query(CravingModel)
+                .filter(CravingModel.id == craving_id, CravingModel.is_deleted == False)
+                .first()
+            )
+            if not craving:
+                return False
+            craving.is_deleted = True
+            self.db.flush()
+            CravingRollupRepository(self.db).recompute_day(craving.user_id, craving_day(craving.timestamp))
+            CravingIndexOutboxRepository(self.db).enqueue([craving.id])
+            self.db.commit()
+            logger.info("Craving soft-deleted", extra={"craving_id": craving_id})
+            return True
+        except Exception:
+            logger.error("Error soft-deleting craving", exc_info=True, extra={"craving_id": craving_id})
+            self.db.rollback()
+            raise
+
 
 class UserRepository:
     def __init__(self, db: Session):
@@ -0,0 +1,175 @@
+# File: app/infrastructure/database/rollup_repository.py
+"""
+CravingRollupRepository: maintains the per-user daily craving rollups
+(craving_daily_rollups) and reads them back for analytics.
+
+Rollups are written in the same transaction as the craving change they
+reflect; callers own the commit.
+"""
+
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.infrastructure.database.craving_aggregates import CravingAggregateQueries, RollupTotals
+from app.infrastructure.database.dialect import insert_for, is_sqlite
+from app.infrastructure.database.models import CravingDailyRollupModel, CravingModel
+
+logger = logging.getLogger(__name__)
+
+
+def craving_day(timestamp: datetime) -> date:
+    """UTC calendar day a craving timestamp falls on."""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc)
+    return timestamp.date()
+
+
+class CravingRollupRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply_new_craving(self, craving: CravingModel) -> None:
+        """
+        Fold a newly created (already flushed) craving into its day's rollup.
+        """
+        self.apply_new_cravings([craving])
+
+    def apply_new_cravings(self, cravings: Iterable[CravingModel]) -> None:
+        """
+        Fold several new cravings into their rollups, one upsert per (user, day).
+        """
+        deltas: Dict[Tuple[int, date], RollupTotals] = {}
+        for c in cravings:
+            if c.is_deleted:
+                continue
+            key = (c.user_id, craving_day(c.timestamp))
+            deltas.setdefault(key, RollupTotals()).add(c.intensity, c.confidence_to_resist)
+
+        for (user_id, day), delta in deltas.items():
+            logger.debug("Applying craving rollup delta", extra={"user_id": user_id, "day": str(day)})
+            try:
+                self._upsert_delta(user_id, day, delta)
+            except Exception:
+                logger.error("Error applying craving rollup", exc_info=True, extra={"user_id": user_id})
+                raise
+
+    def recompute_day(self, user_id: int, day: date) -> None:
+        """
+        Rebuild one (user, day) rollup from the cravings table. Used by the
+        soft-delete path, where min/max cannot be decremented in place.
+        """
+        logger.debug("Recomputing craving rollup", extra={"user_id": user_id, "day": str(day)})
+        try:
+            start = datetime.combine(day, datetime.min.time())
+            buckets = CravingAggregateQueries(self.db).daily_totals(
+                user_id, start, start + timedelta(days=1), inclusive_end=False
+            )
+            self._delete_rollups(user_id, day, day)
+            for _, totals in buckets:
+                self._upsert_delta(user_id, day, totals)
+        except Exception:
+            logger.error("Error recomputing craving rollup", exc_info=True, extra={"user_id": user_id})
+            raise
+
+    def rebuild_for_user(self, user_id: int) -> int:
+        """
+        Drop and regenerate every rollup for a user with one GROUP BY query.
+        Returns the number of day rows written. Caller commits.
+        """
+        logger.info("Rebuilding craving rollups", extra={"user_id": user_id})
+        try:
+            buckets = CravingAggregateQueries(self.db).daily_totals(user_id, datetime.min, datetime.max)
+            self._delete_rollups(user_id, date.min, date.max)
+            for day, totals in buckets:
+                self._upsert_delta(user_id, day, totals)
+            return len(buckets)
+        except Exception:
+            logger.error("Error rebuilding craving rollups", exc_info=True, extra={"user_id": user_id})
+            raise
+
+    def get_rollups(self, user_id: int, start_day: date, end_day: date) -> List[CravingDailyRollupModel]:
+        logger.debug("Fetching craving rollups", extra={"user_id": user_id})
+        try:
+            return (
+                self.db.query(CravingDailyRollupModel)
+                .filter(
+                    CravingDailyRollupModel.user_id == user_id,
+                    CravingDailyRollupModel.day >= start_day,
+                    CravingDailyRollupModel.day <= end_day,
+                )
+                .order_by(CravingDailyRollupModel.day)
+                .all()
+            )
+        except Exception:
+            logger.error("Error fetching craving rollups", exc_info=True, extra={"user_id": user_id})
+            raise
+
+    def data_version(self, user_id: int) -> str:
+        """
+        Opaque token that changes whenever the user's cravings change: every
+        create or delete rewrites a rollup row (new updated_at) or removes one
+        (lower total). Used to key caches derived from a user's cravings.
+        """
+        try:
+            total, last_change = (
+                self.db.query(func.coalesce(func.sum(CravingDailyRollupModel.count), 0),
+                              func.max(CravingDailyRollupModel.updated_at))
+                .filter(CravingDailyRollupModel.user_id == user_id)
+                .one()
+            )
+        except Exception:
+            logger.error("Error reading craving data version", exc_info=True, extra={"user_id": user_id})
+            raise
+        stamp = last_change.isoformat() if last_change is not None else "-"
+        return f"{int(total)}:{stamp}"
+
+    def _delete_rollups(self, user_id: int, start_day: date, end_day: date) -> None:
+        self.db.query(CravingDailyRollupModel).filter(
+            CravingDailyRollupModel.user_id == user_id,
+            CravingDailyRollupModel.day >= start_day,
+            CravingDailyRollupModel.day <= end_day,
+        ).delete(synchronize_session=False)
+
+    def _upsert_delta(self, user_id: int, day: date, delta: RollupTotals) -> None:
+        table = CravingDailyRollupModel
+        # Two-argument min()/max() are scalar functions on SQLite
+        least = func.min if is_sqlite(self.db) else func.least
+        greatest = func.max if is_sqlite(self.db) else func.greatest
+
+        stmt = insert_for(self.db)(table).values(
+            user_id=user_id,
+            day=day,
+            count=delta.count,
+            resisted_count=delta.resisted_count,
+            intensity_sum=delta.intensity_sum,
+            intensity_sq_sum=delta.intensity_sq_sum,
+            intensity_min=delta.intensity_min,
+            intensity_max=delta.intensity_max,
+            resistance_sum=delta.resistance_sum,
+            resistance_n=delta.resistance_n,
+            updated_at=datetime.utcnow(),
+        )
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.user_id, table.day],
+            set_={
+                "count": table.count + excluded.count,
+                "resisted_count": table.resisted_count + excluded.resisted_count,
+                "intensity_sum": table.intensity_sum + excluded.intensity_sum,
+                "intensity_sq_sum": table.intensity_sq_sum + excluded.intensity_sq_sum,
+                "intensity_min": least(
+                    func.coalesce(table.intensity_min, excluded.intensity_min), excluded.intensity_min
+                ),
+                "intensity_max": greatest(
+                    func.coalesce(table.intensity_max, excluded.intensity_max), excluded.intensity_max
+                ),
+                "resistance_sum": table.resistance_sum + excluded.resistance_sum,
+                "resistance_n": table.resistance_n + excluded.resistance_n,
+                "updated_at": excluded.updated_at,
+            },
+        )
+        self.db.execute(stmt)
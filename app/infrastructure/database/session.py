@@ -1,52 +1,71 @@
 #======================
 # app/infrastructure/database/session.py
 #======================
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-import os
+"""
+The process-wide sync engine and session factory.
+
+Nothing is built at import: the engine is created on first use (or by the
+app's lifespan hook), so importing the app needs no database driver setup
+and a forked worker builds its own pool instead of inheriting the parent's.
+"""
+import logging
+import threading
+from typing import Optional
+
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session, sessionmaker
+
 from app.config.settings import get_settings
+from app.infrastructure.database.engine import build_engine
+
+logger = logging.getLogger(__name__)
 
-print("=== DATABASE ENV VARS ===")
-for key in sorted(os.environ.keys()):
-    if any(db_term in key.lower() for db_term in ["postgres", "pg", "sql", "db"]):
-        value = os.environ[key]
-        if "password" in key.lower():
-            value = "********"
-        print(f"  {key}: {value}")
-print("========================")
+_engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
+_session_factory = sessionmaker(autocommit=False, autoflush=False)
 
-def get_engine():
+def get_engine() -> Engine:
     """
-    Build and return the SQLAlchemy engine using the single DATABASE_URL.
-    Enable sslmode=require for Railway if needed.
+    Build (once) and return the process-wide SQLAlchemy engine from
+    DATABASE_URL and the DB_* pool settings (see engine.py). Every sync
+    session in the app should come from SessionLocal below so they share
+    this one pool.
     """
-    settings = get_settings()
-    db_url = settings.DATABASE_URL
-    print(f"[SESSION] Using database URL: {db_url}")
-
-    is_railway = "railway" in db_url
-    engine_args = {
-        "pool_pre_ping": True,
-        "pool_recycle": 300,
-    }
-    if is_railway:
-        engine_args["connect_args"] = {"sslmode": "require"}
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                db_url = get_settings().DATABASE_URL
+                logger.info(
+                    "Creating database engine",
+                    extra={"database_url": make_url(db_url).render_as_string(hide_password=True)}
+                )
+                try:
+                    _engine = build_engine(db_url)
+                except Exception:
+                    logger.error("Database engine creation failed", exc_info=True)
+                    raise
+                _session_factory.configure(bind=_engine)
+    return _engine
 
-    try:
-        return create_engine(db_url, **engine_args)
-    except Exception as e:
-        error_msg = f"Database connection failed: {str(e)}"
-        print(f"[SESSION] ERROR: {error_msg}")
-        print(f"[SESSION] Connection string: {db_url}")
-        raise
+def current_engine() -> Optional[Engine]:
+    """The engine if it has been built (for shutdown and metrics)."""
+    return _engine
 
-engine = get_engine()
+def dispose_engine() -> None:
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
 
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine
-)
+def SessionLocal(**kwargs) -> Session:
+    """
+    New session on the shared engine. A function rather than a bare
+    sessionmaker so the engine is only built when a session is needed.
+    """
+    get_engine()
+    return _session_factory(**kwargs)
 
 def get_db():
     """
@@ -56,4 +75,10 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def __getattr__(name: str):
+    # `from ...session import engine` keeps working, building the engine on access
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
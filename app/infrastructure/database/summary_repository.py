@@ -0,0 +1,163 @@
+# File: app/infrastructure/database/summary_repository.py
+"""
+CravingSummaryRepository: maintains user_craving_summaries, one compact
+digest of each user's whole craving history for LLM context.
+
+Emotion and trigger-phrase counts are folded incrementally: a refresh only
+reads live cravings with an id above the row's last_craving_id. A change
+to a craving that was already folded in (soft delete, edit, re-index)
+cannot be subtracted, so it rebuilds the counts from scratch. Weekly and
+lifetime aggregates are read from craving_daily_rollups, which are kept in
+step with the cravings table already.
+
+Callers own the commit.
+"""
+
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config.settings import get_settings
+from app.core.services.craving_summary import fold_craving, prune_counts, top_counts
+from app.infrastructure.database.craving_aggregates import RollupTotals
+from app.infrastructure.database.models import (
+    CravingDailyRollupModel,
+    CravingModel,
+    UserCravingSummaryModel,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CravingSummaryRepository:
+    def __init__(self, db: Session):
+        self.db = db
+        settings = get_settings()
+        self.weeks = settings.CRAVING_SUMMARY_WEEKS
+        self.top_n = settings.CRAVING_SUMMARY_TOP_N
+        self.max_phrases = settings.CRAVING_SUMMARY_MAX_PHRASES
+
+    def get(self, user_id: int) -> Optional[UserCravingSummaryModel]:
+        try:
+            return self.db.get(UserCravingSummaryModel, user_id)
+        except Exception:
+            logger.error("Error fetching craving summary", exc_info=True, extra={"user_id": user_id})
+            raise
+
+    def refresh_for_changes(self, user_id: int, changed_craving_ids: Iterable[int]) -> UserCravingSummaryModel:
+        """
+        Bring a user's summary up to date after the given cravings changed.
+        Folds new cravings in; rebuilds if any changed craving was already folded.
+        """
+        row = self._locked_row(user_id)
+        rebuild = row is None or any(cid <= row.last_craving_id for cid in changed_craving_ids)
+        return self.refresh(user_id, rebuild=rebuild, row=row)
+
+    def refresh(
+        self, user_id: int, rebuild: bool = False, row: Optional[UserCravingSummaryModel] = None
+    ) -> UserCravingSummaryModel:
+        logger.debug("Refreshing craving summary", extra={"user_id": user_id, "rebuild": rebuild})
+        try:
+            if row is None:
+                row = self._locked_row(user_id)
+            if row is None:
+                row = UserCravingSummaryModel(user_id=user_id)
+                self.db.add(row)
+                rebuild = True
+
+            if rebuild:
+                emotion_counts: Dict[str, int] = {}
+                phrase_counts: Dict[str, int] = {}
+                craving_count, watermark = 0, 0
+            else:
+                # Copies: JSON columns only persist on reassignment
+                emotion_counts = dict(row.emotion_counts or {})
+                phrase_counts = dict(row.phrase_counts or {})
+                craving_count, watermark = row.craving_count, row.last_craving_id
+
+            new_rows = (
+                self.db.query(CravingModel.id, CravingModel.description, CravingModel.emotions)
+                .filter(
+                    CravingModel.user_id == user_id,
+                    CravingModel.is_deleted.is_(False),
+                    CravingModel.id > watermark,
+                )
+                .order_by(CravingModel.id)
+                .yield_per(1000)
+            )
+            for craving_id, description, emotions in new_rows:
+                fold_craving(emotion_counts, phrase_counts, description, emotions)
+                craving_count += 1
+                watermark = craving_id
+
+            phrase_counts = prune_counts(phrase_counts, self.max_phrases)
+            row.emotion_counts = emotion_counts
+            row.phrase_counts = phrase_counts
+            row.craving_count = craving_count
+            row.last_craving_id = watermark
+            row.summary = {
+                "totals": self._lifetime_totals(user_id),
+                "weekly": self._weekly(user_id),
+                "top_emotions": top_counts(emotion_counts, self.top_n),
+                # A phrase seen once says nothing about a pattern
+                "top_phrases": top_counts(phrase_counts, self.top_n, min_count=2),
+            }
+            row.updated_at = datetime.utcnow()
+            self.db.flush()
+            return row
+        except Exception:
+            logger.error("Error refreshing craving summary", exc_info=True, extra={"user_id": user_id})
+            raise
+
+    def _locked_row(self, user_id: int) -> Optional[UserCravingSummaryModel]:
+        # Concurrent indexing batches for one user refresh one at a time
+        return (
+            self.db.query(UserCravingSummaryModel)
+            .filter(UserCravingSummaryModel.user_id == user_id)
+            .with_for_update()
+            .one_or_none()
+        )
+
+    def _lifetime_totals(self, user_id: int) -> Dict:
+        rows = (
+            self.db.query(CravingDailyRollupModel)
+            .filter(CravingDailyRollupModel.user_id == user_id)
+            .all()
+        )
+        totals = RollupTotals.from_rows(rows)
+        return {
+            "count": totals.count,
+            "resisted": totals.resisted_count,
+            "avg_intensity": round(totals.average_intensity, 2),
+            "first_day": min(r.day for r in rows).isoformat() if rows else None,
+            "last_day": max(r.day for r in rows).isoformat() if rows else None,
+        }
+
+    def _weekly(self, user_id: int) -> List[Dict]:
+        """Counts and average intensity for the last `weeks` ISO weeks with cravings, oldest first."""
+        today = datetime.utcnow().date()
+        first_week = today - timedelta(days=today.weekday(), weeks=self.weeks - 1)
+        rows = (
+            self.db.query(CravingDailyRollupModel)
+            .filter(
+                CravingDailyRollupModel.user_id == user_id,
+                CravingDailyRollupModel.day >= first_week,
+            )
+            .all()
+        )
+        by_week: Dict[date, List[CravingDailyRollupModel]] = {}
+        for r in rows:
+            by_week.setdefault(r.day - timedelta(days=r.day.weekday()), []).append(r)
+        weekly = []
+        for week in sorted(by_week):
+            totals = RollupTotals.from_rows(by_week[week])
+            if totals.count:
+                weekly.append({
+                    "week": week.isoformat(),
+                    "count": totals.count,
+                    "avg_intensity": round(totals.average_intensity, 2),
+                    "resisted": totals.resisted_count,
+                })
+        return weekly
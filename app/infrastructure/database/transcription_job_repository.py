@@ -0,0 +1,204 @@
+# File: app/infrastructure/database/transcription_job_repository.py
+"""
+TranscriptionJobRepository: the durable queue behind background voice log
+transcription (transcription_jobs).
+
+Jobs are enqueued in the request's transaction (caller commits). Workers
+claim due jobs with a lease, then settle them as COMPLETED, or reschedule
+them with jittered backoff; jobs that run out of attempts are parked as
+FAILED (transcribing the voice log again enqueues a fresh job). Settled
+rows are kept as the voice log's job history.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.infrastructure.database.models import TranscriptionJobModel
+from app.utils.backoff import full_jitter_delay
+
+logger = logging.getLogger(__name__)
+
+JOB_PENDING = "PENDING"
+JOB_IN_PROGRESS = "IN_PROGRESS"
+JOB_COMPLETED = "COMPLETED"
+JOB_FAILED = "FAILED"
+
+ACTIVE_STATES = (JOB_PENDING, JOB_IN_PROGRESS)
+
+
+@dataclass
+class TranscriptionJob:
+    """A claimed job."""
+    id: int
+    voice_log_id: int
+    attempts: int
+
+
+class TranscriptionJobRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def enqueue(self, voice_log_id: int) -> TranscriptionJobModel:
+        """
+        Queue a voice log for transcription, reusing its active job if it
+        already has one. Does not commit.
+        """
+        try:
+            job = self.active_job(voice_log_id)
+            if job is not None:
+                return job
+            now = datetime.utcnow()
+            job = TranscriptionJobModel(
+                voice_log_id=voice_log_id, state=JOB_PENDING, attempts=0,
+                next_attempt_at=now, created_at=now, updated_at=now,
+            )
+            self.db.add(job)
+            self.db.flush()
+            logger.info("Transcription job enqueued", extra={"voice_log_id": voice_log_id, "job_id": job.id})
+            return job
+        except Exception:
+            logger.error("Error enqueueing transcription job", exc_info=True, extra={"voice_log_id": voice_log_id})
+            raise
+
+    def active_job(self, voice_log_id: int) -> Optional[TranscriptionJobModel]:
+        return (
+            self.db.query(TranscriptionJobModel)
+            .filter(
+                TranscriptionJobModel.voice_log_id == voice_log_id,
+                TranscriptionJobModel.state.in_(ACTIVE_STATES),
+            )
+            .first()
+        )
+
+    def latest_for(self, voice_log_id: int) -> Optional[TranscriptionJobModel]:
+        """The voice log's most recent job, whatever its state."""
+        try:
+            return (
+                self.db.query(TranscriptionJobModel)
+                .filter(TranscriptionJobModel.voice_log_id == voice_log_id)
+                .order_by(TranscriptionJobModel.id.desc())
+                .first()
+            )
+        except Exception:
+            logger.error("Error fetching transcription job", exc_info=True, extra={"voice_log_id": voice_log_id})
+            raise
+
+    def claim(self, limit: int, lease_seconds: float) -> List[TranscriptionJob]:
+        """
+        Claim up to `limit` due jobs and commit the claim.
+
+        Claimed jobs stay IN_PROGRESS until `lease_seconds` pass; after that
+        they are due again, so a worker that dies mid-job loses nothing.
+        Concurrent workers on Postgres skip each other's locked rows; the
+        conditional update settles any remaining race (e.g. on SQLite), so
+        a job is never run twice under one lease.
+        """
+        now = datetime.utcnow()
+        try:
+            rows = (
+                self.db.query(
+                    TranscriptionJobModel.id,
+                    TranscriptionJobModel.voice_log_id,
+                    TranscriptionJobModel.attempts,
+                    TranscriptionJobModel.next_attempt_at,
+                )
+                .filter(
+                    TranscriptionJobModel.state.in_(ACTIVE_STATES),
+                    TranscriptionJobModel.next_attempt_at <= now,
+                )
+                .order_by(TranscriptionJobModel.next_attempt_at, TranscriptionJobModel.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            lease_until = now + timedelta(seconds=lease_seconds)
+            jobs = []
+            for row in rows:
+                claimed = self.db.query(TranscriptionJobModel).filter(
+                    TranscriptionJobModel.id == row.id,
+                    TranscriptionJobModel.state.in_(ACTIVE_STATES),
+                    TranscriptionJobModel.next_attempt_at == row.next_attempt_at,
+                ).update(
+                    {
+                        TranscriptionJobModel.state: JOB_IN_PROGRESS,
+                        TranscriptionJobModel.next_attempt_at: lease_until,
+                        TranscriptionJobModel.updated_at: now,
+                    },
+                    synchronize_session=False,
+                )
+                if claimed:
+                    jobs.append(TranscriptionJob(row.id, row.voice_log_id, row.attempts))
+            self.db.commit()
+            return jobs
+        except Exception:
+            logger.error("Error claiming transcription jobs", exc_info=True)
+            self.db.rollback()
+            raise
+
+    def complete(self, job_id: int) -> None:
+        try:
+            self.db.query(TranscriptionJobModel).filter(TranscriptionJobModel.id == job_id).update(
+                {
+                    TranscriptionJobModel.state: JOB_COMPLETED,
+                    TranscriptionJobModel.last_error: None,
+                    TranscriptionJobModel.updated_at: datetime.utcnow(),
+                },
+                synchronize_session=False,
+            )
+            self.db.commit()
+        except Exception:
+            logger.error("Error completing transcription job", exc_info=True, extra={"job_id": job_id})
+            self.db.rollback()
+            raise
+
+    def fail(
+        self,
+        job_id: int,
+        error: str,
+        max_attempts: int,
+        base_delay: float,
+        max_delay: float,
+    ) -> bool:
+        """
+        Record a failed attempt. The job is rescheduled with full-jitter
+        backoff, or marked FAILED once it reaches max_attempts. Returns True
+        if it was marked FAILED. Does not commit, so the caller can update
+        the voice log in the same transaction.
+        """
+        try:
+            row = self.db.get(TranscriptionJobModel, job_id)
+            if row is None:
+                return False
+            row.attempts += 1
+            row.last_error = (error or "")[:1000]
+            row.updated_at = datetime.utcnow()
+            if row.attempts >= max_attempts:
+                row.state = JOB_FAILED
+                logger.warning(
+                    "Transcription job exhausted retries",
+                    extra={"job_id": job_id, "voice_log_id": row.voice_log_id},
+                )
+                return True
+            row.state = JOB_PENDING
+            delay = full_jitter_delay(row.attempts, base=base_delay, cap=max_delay)
+            row.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+            return False
+        except Exception:
+            logger.error("Error recording transcription job failure", exc_info=True, extra={"job_id": job_id})
+            raise
+
+    def state_counts(self) -> Dict[str, int]:
+        """Number of jobs per state."""
+        rows = (
+            self.db.query(TranscriptionJobModel.state, func.count(TranscriptionJobModel.id))
+            .group_by(TranscriptionJobModel.state)
+            .all()
+        )
+        counts = {JOB_PENDING: 0, JOB_IN_PROGRESS: 0, JOB_COMPLETED: 0, JOB_FAILED: 0}
+        counts.update({state: n for state, n in rows})
+        return counts
@@ -4,11 +4,13 @@ VoiceLogRepository: Manages CRUD operations for voice logs.
 Logs each DB operation for auditing and debugging.
 """
 
+from datetime import datetime
 from typing import List, Optional
 from sqlalchemy.orm import Session
 import logging
 
 from app.core.entities.voice_log import VoiceLog
+from app.infrastructure.database.audio_blob_repository import AudioBlobRepository
 from app.infrastructure.database.models import VoiceLogModel
 
 logger = logging.getLogger(__name__)
@@ -26,7 +28,9 @@ class VoiceLogRepository:
                 created_at=voice_log.created_at,
                 transcribed_text=voice_log.transcribed_text,
                 transcription_status=voice_log.transcription_status,
-                is_deleted=voice_log.is_deleted
+                is_deleted=voice_log.is_deleted,
+                content_sha256=voice_log.content_sha256,
+                size_bytes=voice_log.size_bytes
             )
             self.db_session.add(db_item)
             self.db_session.commit()
@@ -39,7 +43,9 @@ class VoiceLogRepository:
                 created_at=db_item.created_at,
                 transcribed_text=db_item.transcribed_text,
                 transcription_status=db_item.transcription_status,
-                is_deleted=db_item.is_deleted
+                is_deleted=db_item.is_deleted,
+                content_sha256=db_item.content_sha256,
+                size_bytes=db_item.size_bytes
             )
         except Exception:
             logger.error(
@@ -50,6 +56,39 @@ class VoiceLogRepository:
             self.db_session.rollback()
             raise
 
+    def create_from_upload(
+        self,
+        user_id: int,
+        sha256: str,
+        size_bytes: int,
+        staged_path: str,
+        blob_root: Optional[str] = None,
+    ) -> VoiceLog:
+        """
+        Create a voice log on the content-addressed blob for the staged
+        upload. Audio that was already transcribed gets its transcript
+        straight away (COMPLETED) and needs no transcription job.
+        """
+        logger.info("Creating voice log from upload", extra={"user_id": user_id, "sha256": sha256})
+        try:
+            blob = AudioBlobRepository(self.db_session, blob_root).acquire(sha256, size_bytes, staged_path)
+            transcript = blob.transcribed_text
+            voice_log = self.create_voice_log(VoiceLog(
+                user_id=user_id,
+                file_path=blob.path,
+                created_at=datetime.utcnow(),
+                transcribed_text=transcript,
+                transcription_status="COMPLETED" if transcript is not None else "PENDING",
+                content_sha256=sha256,
+                size_bytes=size_bytes,
+            ))
+            if transcript is not None:
+                logger.info("Reused transcript for duplicate audio", extra={"voice_log_id": voice_log.id})
+            return voice_log
+        except Exception:
+            self.db_session.rollback()
+            raise
+
     def get_by_id(self, voice_log_id: int) -> Optional[VoiceLog]:
         logger.debug("Fetching voice log by ID", extra={"voice_log_id": voice_log_id})
         try:
@@ -66,7 +105,9 @@ class VoiceLogRepository:
                 created_at=db_item.created_at,
                 transcribed_text=db_item.transcribed_text,
                 transcription_status=db_item.transcription_status,
-                is_deleted=db_item.is_deleted
+                is_deleted=db_item.is_deleted,
+                content_sha256=db_item.content_sha256,
+                size_bytes=db_item.size_bytes
             )
         except Exception:
             logger.error("Error fetching voice log by ID", exc_info=True, extra={"voice_log_id": voice_log_id})
@@ -87,7 +128,9 @@ class VoiceLogRepository:
                     created_at=item.created_at,
                     transcribed_text=item.transcribed_text,
                     transcription_status=item.transcription_status,
-                    is_deleted=item.is_deleted
+                    is_deleted=item.is_deleted,
+                    content_sha256=item.content_sha256,
+                    size_bytes=item.size_bytes
                 )
                 for item in records.all()
             ]
@@ -116,7 +159,9 @@ class VoiceLogRepository:
                 created_at=db_item.created_at,
                 transcribed_text=db_item.transcribed_text,
                 transcription_status=db_item.transcription_status,
-                is_deleted=db_item.is_deleted
+                is_deleted=db_item.is_deleted,
+                content_sha256=db_item.content_sha256,
+                size_bytes=db_item.size_bytes
             )
         except Exception:
             logger.error("Error updating voice log", exc_info=True, extra={"voice_log_id": voice_log.id})
@@ -131,6 +176,13 @@ class VoiceLogRepository:
             ).first()
             if not db_item:
                 return False
+            if not db_item.is_deleted and db_item.content_sha256:
+                blobs = AudioBlobRepository(self.db_session)
+                blob = blobs.get(db_item.content_sha256)
+                # Only logs stored as blobs hold a reference. Compare with the
+                # stored path: blob_path() follows the current AUDIO_BLOB_DIR
+                if blob is not None and db_item.file_path == blob.path:
+                    blobs.release(db_item.content_sha256)
             db_item.is_deleted = True
             self.db_session.commit()
             logger.info("Voice log soft-deleted", extra={"voice_log_id": voice_log_id})
@@ -10,7 +10,8 @@ from langchain.embeddings import OpenAIEmbeddings # THIS MIGHT NEED UPDATING.
 from langchain.schema import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.chains import ConversationalRetrievalChain
-from langchain.memory import ConversationBufferMemory
+from langchain.memory import ConversationBufferWindowMemory
+from langchain.schema import BaseMemory
 from langchain.prompts import PromptTemplate
 from langchain.llms.base import BaseLLM
 
@@ -132,19 +133,31 @@ class LangChainService:
     def create_conversational_rag_chain(
         self,
         system_prompt: str = None,
-        memory_key: str = "chat_history"
+        memory_key: str = "chat_history",
+        memory: Optional[BaseMemory] = None,
+        history: Optional[List[Dict[str, str]]] = None
     ):
         """
         Create a conversational retrieval chain.
+
+        Pass `memory` to share one across calls, or `history` (role/content
+        messages, e.g. ConversationStore.history()) to seed a fresh one.
+        Fresh memory keeps only the last CHAT_HISTORY_MAX_MESSAGES messages.
         """
         if self.llm is None:
             raise ValueError("LLM must be provided to create conversational chain")
 
-        # Conversation memory
-        memory = ConversationBufferMemory(
-            memory_key=memory_key,
-            return_messages=True
-        )
+        # Conversation memory: a bounded window instead of an ever-growing buffer
+        if memory is None:
+            memory = ConversationBufferWindowMemory(
+                memory_key=memory_key,
+                return_messages=True,
+                output_key="answer",
+                k=max(settings.CHAT_HISTORY_MAX_MESSAGES // 2, 1)
+            )
+            turns = [m for m in history or [] if m["role"] in ("user", "assistant")]
+            for user, assistant in zip(turns[::2], turns[1::2]):
+                memory.save_context({"question": user["content"]}, {"answer": assistant["content"]})
 
         # Default system prompt
         if system_prompt is None:
@@ -0,0 +1,98 @@
+# File: app/infrastructure/external/openai_chat.py
+"""
+Chat completions through the shared OpenAI provider: whole or as a token
+stream on the async client (request handlers never block the event loop),
+or whole on the sync client for code already running in a worker thread.
+"""
+
+import logging
+from typing import AsyncIterator, Dict, List, Optional
+
+from app.config.settings import get_settings
+from app.infrastructure.external.openai_client import (
+    OpenAIProvider,
+    get_openai_provider,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class OpenAIChatService:
+
+    def __init__(
+        self, provider: Optional[OpenAIProvider] = None, model: Optional[str] = None
+    ):
+        self._provider = provider
+        self.model = model or get_settings().OPENAI_CHAT_MODEL
+
+    @property
+    def provider(self) -> OpenAIProvider:
+        if self._provider is None:
+            self._provider = get_openai_provider()
+        return self._provider
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        async with self.provider.aguard():
+            response = await self.provider.async_client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+        return response.choices[0].message.content or ""
+
+    def complete_sync(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        with self.provider.guard():
+            response = self.provider.sync_client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+        return response.choices[0].message.content or ""
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Yield content deltas as they arrive; closes the upstream stream if
+        abandoned.
+        """
+        async with self.provider.aguard():
+            stream = await self.provider.async_client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+            )
+            try:
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        yield delta
+            finally:
+                await stream.close()
+
+
+openai_chat_service = OpenAIChatService()
+
+
+def get_openai_chat_service() -> OpenAIChatService:
+    """FastAPI dependency for the shared chat service."""
+    return openai_chat_service
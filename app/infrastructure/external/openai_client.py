@@ -0,0 +1,306 @@
+# File: app/infrastructure/external/openai_client.py
+"""
+One process-wide OpenAI provider shared by chat, embeddings and transcription.
+
+OpenAIProvider owns:
+  - an AsyncOpenAI client (chat, streaming) and a sync OpenAI client (the
+    embedding batcher and transcription run in worker threads), each on a
+    pooled httpx client with keep-alive, optional HTTP/2 and explicit
+    timeouts, so requests reuse warm TLS connections;
+  - the SDK's retry policy (OPENAI_MAX_RETRIES, exponential backoff);
+  - a concurrency limit on in-flight upstream calls;
+  - a circuit breaker that fails fast after repeated upstream failures.
+
+Get it with get_openai_provider() (usable as a FastAPI dependency).
+
+The openai SDK and httpx are imported when the first provider is built,
+not when this module is, so importing the app stays fast and offline.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from app.config.settings import get_settings
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling upstream while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Closed: calls pass; `failure_threshold` consecutive failures open it.
+    Open: calls fail fast until `reset_timeout` has passed.
+    Half-open: one trial call passes; success closes it, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def before_call(self) -> None:
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            raise CircuitOpenError("OpenAI circuit breaker is open")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial_in_flight:
+                    logger.warning("OpenAI circuit breaker opened", extra={"failures": self._failures})
+                self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        with self._lock:
+            self._trial_in_flight = False
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+
+class OpenAIProvider:
+    def __init__(
+        self,
+        api_key: str,
+        timeout_seconds: float = 30.0,
+        connect_timeout_seconds: float = 5.0,
+        max_retries: int = 2,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry_seconds: float = 30.0,
+        http2: bool = True,
+        max_concurrency: int = 32,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        import httpx
+
+        self.api_key = api_key
+        self.max_retries = max_retries
+        self.max_concurrency = max_concurrency
+        self.breaker = breaker or CircuitBreaker()
+        self._timeout = httpx.Timeout(timeout_seconds, connect=connect_timeout_seconds)
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry_seconds,
+        )
+        self._http2 = http2 and _http2_available()
+        self._sync_slots = threading.BoundedSemaphore(max_concurrency)
+        self._async_slots: Optional[asyncio.Semaphore] = None
+        self._in_flight = 0
+        self._count_lock = threading.Lock()
+        self._async_client: Optional["AsyncOpenAI"] = None
+        self._sync_client: Optional["OpenAI"] = None
+        self._client_lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "OpenAIProvider":
+        settings = get_settings()
+        return cls(
+            api_key=settings.OPENAI_API_KEY,
+            timeout_seconds=settings.OPENAI_TIMEOUT_SECONDS,
+            connect_timeout_seconds=settings.OPENAI_CONNECT_TIMEOUT_SECONDS,
+            max_retries=settings.OPENAI_MAX_RETRIES,
+            max_connections=settings.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry_seconds=settings.OPENAI_KEEPALIVE_EXPIRY_SECONDS,
+            http2=settings.OPENAI_HTTP2,
+            max_concurrency=settings.OPENAI_MAX_CONCURRENCY,
+            breaker=CircuitBreaker(
+                settings.OPENAI_BREAKER_FAILURE_THRESHOLD, settings.OPENAI_BREAKER_RESET_SECONDS
+            ),
+        )
+
+    # ------------------------------------------------------------------
+    # Clients (built on first use)
+    # ------------------------------------------------------------------
+
+    @property
+    def async_client(self) -> "AsyncOpenAI":
+        if self._async_client is None:
+            with self._client_lock:
+                if self._async_client is None:
+                    import httpx
+                    from openai import AsyncOpenAI
+                    self._async_client = AsyncOpenAI(
+                        api_key=self.api_key,
+                        max_retries=self.max_retries,
+                        timeout=self._timeout,
+                        http_client=httpx.AsyncClient(
+                            limits=self._limits, timeout=self._timeout, http2=self._http2
+                        ),
+                    )
+        return self._async_client
+
+    @property
+    def sync_client(self) -> "OpenAI":
+        if self._sync_client is None:
+            with self._client_lock:
+                if self._sync_client is None:
+                    import httpx
+                    from openai import OpenAI
+                    self._sync_client = OpenAI(
+                        api_key=self.api_key,
+                        max_retries=self.max_retries,
+                        timeout=self._timeout,
+                        http_client=httpx.Client(
+                            limits=self._limits, timeout=self._timeout, http2=self._http2
+                        ),
+                    )
+        return self._sync_client
+
+    # ------------------------------------------------------------------
+    # Call guards: concurrency limit + circuit breaker
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def guard(self):
+        """Wrap one blocking upstream call."""
+        self.breaker.before_call()
+        with self._sync_slots:
+            self._count(1)
+            settled = False
+            try:
+                yield
+            except Exception as exc:
+                settled = True
+                self._settle(exc)
+                raise
+            else:
+                settled = True
+                self.breaker.record_success()
+            finally:
+                if not settled:
+                    # Cancelled (e.g. client went away): neither outcome
+                    self.breaker.release_trial()
+                self._count(-1)
+
+    @asynccontextmanager
+    async def aguard(self):
+        """Wrap one async upstream call (for streams: the whole stream)."""
+        self.breaker.before_call()
+        if self._async_slots is None:
+            self._async_slots = asyncio.Semaphore(self.max_concurrency)
+        async with self._async_slots:
+            self._count(1)
+            settled = False
+            try:
+                yield
+            except Exception as exc:
+                settled = True
+                self._settle(exc)
+                raise
+            else:
+                settled = True
+                self.breaker.record_success()
+            finally:
+                if not settled:
+                    # Cancelled (e.g. client went away): neither outcome
+                    self.breaker.release_trial()
+                self._count(-1)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "circuit": self.breaker.state,
+            "in_flight": self._in_flight,
+            "max_concurrency": self.max_concurrency,
+            "http2": self._http2,
+        }
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+        if self._sync_client is not None:
+            self._sync_client.close()
+            self._sync_client = None
+
+    def _settle(self, exc: Exception) -> None:
+        # Only an unhealthy upstream trips the breaker; a 4xx for a bad
+        # request means it answered fine
+        if is_upstream_failure(exc):
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    def _count(self, delta: int) -> None:
+        with self._count_lock:
+            self._in_flight += delta
+
+
+def is_upstream_failure(exc: BaseException) -> bool:
+    """Connection errors, timeouts, 429s and 5xx count against the breaker."""
+    openai = sys.modules.get("openai")
+    if openai is None:
+        # The SDK was never loaded, so this cannot be one of its errors
+        return False
+    if isinstance(exc, (openai.APIConnectionError, openai.APITimeoutError)):
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code == 429 or exc.status_code >= 500
+    return False
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("HTTP/2 requested for OpenAI but the h2 package is missing; using HTTP/1.1")
+        return False
+    return True
+
+
+_provider: Optional[OpenAIProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_openai_provider() -> OpenAIProvider:
+    """The process-wide provider, created on first use."""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = OpenAIProvider.from_settings()
+    return _provider
+
+
+def current_openai_provider() -> Optional[OpenAIProvider]:
+    """The provider if one has been created (for shutdown and metrics)."""
+    return _provider
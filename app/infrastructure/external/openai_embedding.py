@@ -1,38 +1,51 @@
 # File: app/infrastructure/external/openai_embedding.py (CORRECTED)
 
-from typing import List
+import logging
+from typing import List, Optional
 from app.config.settings import Settings
-from openai import OpenAI  # Use the new client
+from app.infrastructure.external.openai_client import OpenAIProvider, get_openai_provider
+
+logger = logging.getLogger(__name__)
 
 settings = Settings()
 
 class OpenAIEmbeddingService:
 
-    def __init__(self, api_key: str = None):
-        self.api_key = api_key or settings.OPENAI_API_KEY
-        # Initialize the client here
-        self.client = OpenAI(api_key=self.api_key)
+    def __init__(self, provider: Optional[OpenAIProvider] = None):
+        # Shared pooled client, concurrency limit and circuit breaker
+        self._provider = provider
+
+    @property
+    def provider(self) -> OpenAIProvider:
+        if self._provider is None:
+            self._provider = get_openai_provider()
+        return self._provider
 
     def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embeddings for texts, in order. Errors (including CircuitOpenError
+        while the breaker is open) are raised: callers that can live with a
+        substitute vector decide that themselves.
+        """
         try:
             # Use the new embeddings.create method
-            response = self.client.embeddings.create(
-                model="text-embedding-ada-002",
-                input=texts
-            )
-
-            # Extract embeddings correctly from the response
-            return [item.embedding for item in response.data]
-        except Exception as e:
-            print(f"Warning: OpenAI embedding error: {e}")
-            import random
-            mock_dim = 1536
-            return [[random.random() for _ in range(mock_dim)] for _ in texts]
+            with self.provider.guard():
+                response = self.provider.sync_client.embeddings.create(
+                    model="text-embedding-ada-002",
+                    input=texts
+                )
+        except Exception:
+            logger.warning("OpenAI embedding request failed", exc_info=True, extra={"count": len(texts)})
+            raise
+
+        # Extract embeddings correctly from the response
+        return [item.embedding for item in response.data]
 
     def embed_text(self, text: str) -> List[float]:
         embeddings = self.get_embeddings([text])
         return embeddings[0] if embeddings else []
 
+_embedding_service = OpenAIEmbeddingService()
+
 def get_embeddings(texts: List[str]) -> List[List[float]]:
-    service = OpenAIEmbeddingService()
-    return service.get_embeddings(texts)
\ No newline at end of file
+    return _embedding_service.get_embeddings(texts)
\ No newline at end of file
@@ -0,0 +1,170 @@
+# File: app/infrastructure/external/transcription_backends.py
+"""
+Speech-to-text backends behind TranscriptionService.
+
+  openai  whisper-1 over the API, through the shared OpenAIProvider
+          (pooled client, concurrency limit, circuit breaker).
+  local   faster-whisper (CTranslate2) on this machine, int8 on CPU by
+          default: no network, no per-minute cost. Needs the optional
+          `faster-whisper` package; the model is loaded once per process
+          and shared by every call.
+
+The backend is chosen by settings.TRANSCRIPTION_BACKEND.
+"""
+
+import io
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, BinaryIO, Dict, Optional, Tuple, Union
+
+from app.infrastructure.external.openai_client import OpenAIProvider, get_openai_provider
+
+logger = logging.getLogger(__name__)
+
+# A file object, or a (file name, bytes) pair as accepted by the OpenAI SDK
+AudioInput = Union[BinaryIO, Tuple[str, bytes]]
+
+
+class TranscriptionBackend(ABC):
+    name: str = ""
+    # Calls this backend can usefully run at once (None = no limit of its own)
+    max_concurrency: Optional[int] = None
+
+    @abstractmethod
+    def transcribe(self, audio: AudioInput) -> str:
+        """Text of one recording or chunk."""
+
+    def load(self) -> None:
+        """Do any expensive one-off setup now rather than on the first call."""
+
+
+class OpenAIWhisperBackend(TranscriptionBackend):
+    name = "openai"
+
+    def __init__(self, provider: Optional[OpenAIProvider] = None, model: str = "whisper-1"):
+        self._provider = provider
+        self.model = model
+
+    @property
+    def provider(self) -> OpenAIProvider:
+        if self._provider is None:
+            self._provider = get_openai_provider()
+        return self._provider
+
+    def transcribe(self, audio: AudioInput) -> str:
+        with self.provider.guard():
+            response = self.provider.sync_client.audio.transcriptions.create(file=audio, model=self.model)
+        return response.text
+
+
+_local_models: Dict[Tuple, Any] = {}
+_local_models_lock = threading.Lock()
+
+
+def get_local_whisper_model(
+    model_size: str,
+    device: str = "cpu",
+    compute_type: str = "int8",
+    cpu_threads: int = 0,
+    num_workers: int = 1,
+):
+    """
+    One faster-whisper model per configuration per process. Loading takes
+    seconds and hundreds of MB, so it must never happen per request.
+    """
+    key = (model_size, device, compute_type, cpu_threads, num_workers)
+    with _local_models_lock:
+        model = _local_models.get(key)
+        if model is None:
+            try:
+                from faster_whisper import WhisperModel
+            except ImportError as e:
+                raise RuntimeError(
+                    "TRANSCRIPTION_BACKEND=local needs the faster-whisper package (pip install faster-whisper)"
+                ) from e
+            logger.info(
+                "Loading local Whisper model",
+                extra={"model": model_size, "device": device, "compute_type": compute_type},
+            )
+            model = WhisperModel(
+                model_size,
+                device=device,
+                compute_type=compute_type,
+                cpu_threads=cpu_threads,
+                num_workers=num_workers,
+            )
+            _local_models[key] = model
+        return model
+
+
+class LocalWhisperBackend(TranscriptionBackend):
+    name = "local"
+
+    def __init__(
+        self,
+        model_size: str = "base",
+        device: str = "cpu",
+        compute_type: str = "int8",
+        cpu_threads: int = 0,
+        num_workers: int = 1,
+        beam_size: int = 1,
+        language: Optional[str] = None,
+        model: Any = None,
+    ):
+        """
+        Args:
+            model_size: faster-whisper model name ("tiny", "base", "small",
+                        ...) or the path of a converted model directory.
+            cpu_threads: Threads per inference (0 = CTranslate2 default).
+            num_workers: Inferences the model runs in parallel; also caps
+                         how many chunks are sent to it at once.
+            language: ISO code, or None to detect it per recording.
+            model: An already loaded model to use instead.
+        """
+        self.model_size = model_size
+        self.device = device
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.num_workers = max(num_workers, 1)
+        self.beam_size = beam_size
+        self.language = language
+        self.max_concurrency = self.num_workers
+        self._model = model
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = get_local_whisper_model(
+                self.model_size, self.device, self.compute_type, self.cpu_threads, self.num_workers
+            )
+        return self._model
+
+    def load(self) -> None:
+        _ = self.model
+
+    def transcribe(self, audio: AudioInput) -> str:
+        if isinstance(audio, tuple):
+            audio = io.BytesIO(audio[1])
+        # Silence is already trimmed by the preprocessor, so no VAD pass here
+        segments, _info = self.model.transcribe(audio, beam_size=self.beam_size, language=self.language)
+        # segments is a generator: decoding happens while it is consumed
+        return "".join(segment.text for segment in segments).strip()
+
+
+def backend_from_settings() -> TranscriptionBackend:
+    from app.config.settings import get_settings
+    s = get_settings()
+    if s.TRANSCRIPTION_BACKEND == "local":
+        return LocalWhisperBackend(
+            model_size=s.LOCAL_WHISPER_MODEL,
+            device=s.LOCAL_WHISPER_DEVICE,
+            compute_type=s.LOCAL_WHISPER_COMPUTE_TYPE,
+            cpu_threads=s.LOCAL_WHISPER_CPU_THREADS,
+            num_workers=s.LOCAL_WHISPER_NUM_WORKERS,
+            beam_size=s.LOCAL_WHISPER_BEAM_SIZE,
+            language=s.LOCAL_WHISPER_LANGUAGE,
+        )
+    if s.TRANSCRIPTION_BACKEND != "openai":
+        raise ValueError(f"Unknown TRANSCRIPTION_BACKEND: {s.TRANSCRIPTION_BACKEND}")
+    return OpenAIWhisperBackend()
@@ -3,40 +3,72 @@
 """
 Transcription Service
 --------------------
-Provides audio transcription functionality using OpenAI's Whisper API.
-Compatible with OpenAI Python SDK v1.x+
+Provides audio transcription through a pluggable backend (see
+transcription_backends): OpenAI's Whisper API by default, or a local
+faster-whisper model selected with TRANSCRIPTION_BACKEND=local.
+
+Audio is preprocessed first (see audio_preprocessing): 16 kHz mono, silence
+trimmed, and long recordings split into chunks that are transcribed in
+parallel and stitched back together in order.
 """
 
-from typing import BinaryIO, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+import logging
 import os
-from openai import OpenAI
 from app.core.entities.voice_log import VoiceLog
+from app.core.services.audio_preprocessing import AudioChunk, AudioPreprocessor, UnsupportedAudio
+from app.infrastructure.external.openai_client import OpenAIProvider
+from app.infrastructure.external.transcription_backends import (
+    AudioInput,
+    OpenAIWhisperBackend,
+    TranscriptionBackend,
+    backend_from_settings,
+)
 
-# Import the settings singleton instance
-from app.config.settings import settings
+logger = logging.getLogger(__name__)
 
 class TranscriptionService:
     """
-    Service for transcribing audio files using OpenAI's Whisper model.
-    Follows the new OpenAI v1.x+ API conventions.
+    Service for transcribing audio files with a Whisper backend.
     """
     
-    def __init__(self, openai_api_key: Optional[str] = None):
+    def __init__(
+        self,
+        provider: Optional[OpenAIProvider] = None,
+        preprocessor: Optional[AudioPreprocessor] = None,
+        chunk_concurrency: int = 4,
+        backend: Optional[TranscriptionBackend] = None,
+    ):
         """
-        Initialize the transcription service with an OpenAI API key.
+        Initialize the transcription service.
         
         Args:
-            openai_api_key: Optional override for the OpenAI API key.
-                          Defaults to the value from settings if not provided.
+            provider: Optional OpenAI provider for the default API backend.
+                      Defaults to the process-wide one (pooled client,
+                      concurrency limit, circuit breaker).
+            preprocessor: Audio preprocessing; None sends files unchanged.
+            chunk_concurrency: Chunks of one recording transcribed at once.
+            backend: Speech-to-text backend; defaults to whisper-1 over the
+                     OpenAI API.
         """
-        # Use provided key or fall back to settings
-        self.api_key = openai_api_key or settings.OPENAI_API_KEY
-        self.client = OpenAI(api_key=self.api_key)
-        self.default_model = "whisper-1"
+        self.backend = backend or OpenAIWhisperBackend(provider)
+        self.preprocessor = preprocessor
+        self.chunk_concurrency = max(chunk_concurrency, 1)
+
+    @classmethod
+    def from_settings(cls) -> "TranscriptionService":
+        from app.config.settings import get_settings
+        s = get_settings()
+        return cls(
+            preprocessor=AudioPreprocessor.from_settings() if s.AUDIO_PREPROCESSING_ENABLED else None,
+            chunk_concurrency=s.AUDIO_CHUNK_CONCURRENCY,
+            backend=backend_from_settings(),
+        )
     
     def transcribe_audio(self, voice_log: VoiceLog) -> str:
         """
-        Transcribe an audio file using OpenAI's Whisper model.
+        Transcribe an audio file with the configured backend.
         
         Args:
             voice_log: A VoiceLog entity containing the file_path to the audio file
@@ -48,34 +80,63 @@ class TranscriptionService:
         Raises:
             FileNotFoundError: If the audio file does not exist.
             IOError: If the audio file cannot be read.
-            Exception: If the OpenAI API returns an error.
+            Exception: If the backend fails.
         """
         if not os.path.exists(voice_log.file_path):
             raise FileNotFoundError(f"Audio file not found at path: {voice_log.file_path}")
-            
+
+        if self.preprocessor is not None:
+            try:
+                prepared = self.preprocessor.prepare(voice_log.file_path)
+            except UnsupportedAudio:
+                logger.info("Audio not preprocessed; sending as is", extra={"voice_log_id": voice_log.id})
+            else:
+                return self._transcribe_chunks(prepared.chunks)
+
         try:
             with open(voice_log.file_path, "rb") as audio_file:
                 return self._perform_transcription(audio_file)
         except IOError as e:
             raise IOError(f"Error reading audio file: {str(e)}")
+
+    def _transcribe_chunks(self, chunks: List[AudioChunk]) -> str:
+        """
+        Transcribe chunks in parallel (bounded by chunk_concurrency and the
+        backend's own limit) and join the texts in recording order. Any
+        failed chunk fails the whole transcription so it is retried.
+        """
+        if not chunks:
+            return ""  # silence only: nothing to send
+        if len(chunks) == 1:
+            texts = [self._perform_transcription((chunks[0].file_name, chunks[0].data))]
+        else:
+            workers = min(self.chunk_concurrency, len(chunks), self.backend.max_concurrency or len(chunks))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                texts = list(pool.map(
+                    lambda chunk: self._perform_transcription((chunk.file_name, chunk.data)), chunks
+                ))
+        return " ".join(t.strip() for t in texts if t and t.strip())
     
-    def _perform_transcription(self, audio_file: BinaryIO) -> str:
+    def _perform_transcription(self, audio_file: AudioInput) -> str:
         """
-        Internal method to perform the actual transcription API call.
+        Internal method to run the backend on one file or chunk.
         
         Args:
-            audio_file: An open binary file object containing the audio data.
+            audio_file: An open binary file object, or a (file name, bytes)
+                        pair, containing the audio data.
             
         Returns:
             str: The transcribed text.
         """
         try:
-            # Using the new OpenAI v1.x+ API format
-            response = self.client.audio.transcriptions.create(
-                file=audio_file,
-                model=self.default_model
-            )
-            return response.text
+            return self.backend.transcribe(audio_file)
         except Exception as e:
-            # TODO: Add proper logging here
-            raise Exception(f"Transcription failed: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Transcription failed ({self.backend.name}): {str(e)}")
+
+
+transcription_service = TranscriptionService.from_settings()
+
+
+def get_transcription_service() -> TranscriptionService:
+    """FastAPI dependency for the shared transcription service."""
+    return transcription_service
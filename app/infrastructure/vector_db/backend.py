@@ -0,0 +1,67 @@
+# File: app/infrastructure/vector_db/backend.py
+"""
+Backend interface behind VectorRepository.
+
+The method set mirrors the subset of the Pinecone index API the repository
+uses (query / upsert / delete / describe_index_stats), so the Pinecone index
+and the local in-process index are interchangeable.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+
+class VectorBackend(ABC):
+    @abstractmethod
+    def query(
+        self,
+        vector: List[float],
+        top_k: int,
+        include_metadata: bool = True,
+        filter: Optional[Dict[str, Any]] = None,
+        namespace: Optional[str] = None,
+        include_values: bool = False,
+    ) -> Dict[str, Any]:
+        """Return {"matches": [{"id", "score", "metadata"[, "values"]}, ...]}, best first."""
+
+    @abstractmethod
+    def upsert(self, vectors: List[Dict[str, Any]], namespace: Optional[str] = None) -> Dict[str, Any]:
+        """Insert or replace vectors given as {"id", "values", "metadata"} dicts."""
+
+    @abstractmethod
+    def delete(self, ids: List[str], namespace: Optional[str] = None) -> None:
+        """Delete vectors by id; unknown ids are ignored."""
+
+    @abstractmethod
+    def describe_index_stats(self) -> Dict[str, Any]:
+        """Vector counts, overall and per namespace."""
+
+
+class PineconeBackend(VectorBackend):
+    """Thin adapter over a Pinecone index object."""
+
+    def __init__(self, index):
+        self._index = index
+
+    def query(self, vector, top_k, include_metadata=True, filter=None, namespace=None, include_values=False):
+        kwargs: Dict[str, Any] = {"vector": vector, "top_k": top_k, "include_metadata": include_metadata}
+        if include_values:
+            kwargs["include_values"] = True
+        if filter:
+            kwargs["filter"] = filter
+        if namespace:
+            kwargs["namespace"] = namespace
+        return self._index.query(**kwargs)
+
+    def upsert(self, vectors, namespace=None):
+        if namespace:
+            return self._index.upsert(vectors=vectors, namespace=namespace)
+        return self._index.upsert(vectors=vectors)
+
+    def delete(self, ids, namespace=None):
+        if namespace:
+            return self._index.delete(ids=ids, namespace=namespace)
+        return self._index.delete(ids=ids)
+
+    def describe_index_stats(self):
+        return self._index.describe_index_stats()
@@ -0,0 +1,116 @@
+# File: app/infrastructure/vector_db/filters.py
+"""
+Metadata filters for craving vectors.
+
+CravingVectorFilter builds the Pinecone-style filter sent to the backend;
+matches_filter evaluates the same filter locally (the local index uses it
+for search, VectorRepository to re-check over-fetched matches).
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+
+def matches_filter(metadata: Dict[str, Any], filter: Optional[Dict[str, Any]]) -> bool:
+    """
+    Evaluate a Pinecone-style metadata filter: {field: value} or
+    {field: {"$eq"|"$ne"|"$in"|"$nin"|"$gt"|"$gte"|"$lt"|"$lte": value}},
+    plus top-level "$and" / "$or" lists.
+    """
+    if not filter:
+        return True
+    for field, condition in filter.items():
+        if field == "$and":
+            if not all(matches_filter(metadata, c) for c in condition):
+                return False
+            continue
+        if field == "$or":
+            if not any(matches_filter(metadata, c) for c in condition):
+                return False
+            continue
+        value = metadata.get(field)
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        for op, operand in condition.items():
+            try:
+                if op == "$eq":
+                    ok = value == operand
+                elif op == "$ne":
+                    ok = value != operand
+                elif op == "$in":
+                    ok = value in operand
+                elif op == "$nin":
+                    ok = value not in operand
+                elif op == "$gt":
+                    ok = value is not None and value > operand
+                elif op == "$gte":
+                    ok = value is not None and value >= operand
+                elif op == "$lt":
+                    ok = value is not None and value < operand
+                elif op == "$lte":
+                    ok = value is not None and value <= operand
+                else:
+                    raise ValueError(f"Unsupported filter operator: {op}")
+            except TypeError:
+                ok = False
+            if not ok:
+                return False
+    return True
+
+
+def _epoch(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+@dataclass
+class CravingVectorFilter:
+    """Restrictions on which of a user's craving vectors a search may return."""
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    min_intensity: Optional[float] = None
+    max_intensity: Optional[float] = None
+    include_deleted: bool = False
+
+    def to_metadata_filter(self, user_id: Optional[int] = None) -> Dict[str, Any]:
+        clauses: Dict[str, Any] = {}
+        if user_id is not None:
+            clauses["user_id"] = {"$eq": user_id}
+        created: Dict[str, float] = {}
+        if self.start is not None:
+            created["$gte"] = _epoch(self.start)
+        if self.end is not None:
+            created["$lte"] = _epoch(self.end)
+        if created:
+            clauses["created_ts"] = created
+        intensity: Dict[str, float] = {}
+        if self.min_intensity is not None:
+            intensity["$gte"] = self.min_intensity
+        if self.max_intensity is not None:
+            intensity["$lte"] = self.max_intensity
+        if intensity:
+            clauses["intensity"] = intensity
+        if not self.include_deleted:
+            clauses["is_deleted"] = {"$ne": True}
+        return clauses
+
+
+def craving_metadata(
+    user_id: int,
+    description: str,
+    created_at: datetime,
+    intensity: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Metadata stored with a craving vector; the fields the filters above use."""
+    metadata: Dict[str, Any] = {
+        "user_id": user_id,
+        "description": description,
+        "created_at": created_at.isoformat(),
+        "created_ts": _epoch(created_at),
+        "is_deleted": False,
+    }
+    if intensity is not None:
+        metadata["intensity"] = intensity
+    return metadata
@@ -0,0 +1,484 @@
+# File: app/infrastructure/vector_db/local_index.py
+"""
+In-process vector index: a drop-in VectorBackend that needs no network.
+
+Vectors are partitioned by namespace, or by metadata["user_id"] when no
+namespace is given (partition "user-<id>"). Each partition is a float32
+matrix of L2-normalised rows in a memory-mapped file, grown by doubling;
+deleted rows are zeroed and their slots reused. Ids, metadata and slot
+numbers are kept in a SQLite catalog, so every add and delete is
+incremental and the index survives restarts.
+
+Search is exact (one matrix-vector product plus argpartition) while a
+partition is small. Once it holds `ivf_threshold` vectors an IVF index is
+trained (spherical k-means, ~sqrt(n) lists) and queries score only the
+`nprobe` lists nearest the query; new vectors join their nearest list and
+the centroids are retrained when the partition has doubled.
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.infrastructure.vector_db.backend import VectorBackend
+from app.infrastructure.vector_db.filters import matches_filter
+
+logger = logging.getLogger(__name__)
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def partition_for(
+    namespace: Optional[str], metadata: Optional[Dict[str, Any]] = None
+) -> str:
+    """Partition a vector lives in: its namespace, else its owner's."""
+    if namespace:
+        return namespace
+    if metadata and metadata.get("user_id") is not None:
+        return f"user-{metadata['user_id']}"
+    return "default"
+
+
+def _normalise(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores, best first."""
+    if k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    part = np.argpartition(-scores, k - 1)[:k]
+    return part[np.argsort(-scores[part], kind="stable")]
+
+
+def train_centroids(
+    vectors: np.ndarray, nlist: int, iterations: int = 10, seed: int = 0
+) -> np.ndarray:
+    """Spherical k-means over unit vectors; returns (nlist, dim) unit centroids."""
+    rng = np.random.default_rng(seed)
+    nlist = max(1, min(nlist, len(vectors)))
+    sample = vectors
+    if len(vectors) > 64 * nlist:
+        sample = vectors[rng.choice(len(vectors), 64 * nlist, replace=False)]
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assign = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, sample)
+        empty = ~np.bincount(assign, minlength=nlist).astype(bool)
+        # Re-seed empty lists from random points so every list stays in use
+        sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+        centroids = _normalise(sums)
+    return centroids
+
+
+class _Partition:
+    """One memory-mapped matrix plus its slot bookkeeping."""
+
+    def __init__(self, path: str, dimension: int):
+        self.path = path
+        self.dimension = dimension
+        self.matrix: Optional[np.memmap] = None
+        self.capacity = 0
+        self.ids: List[Optional[str]] = []          # slot -> id (None = free)
+        self.metadata: List[Optional[Dict[str, Any]]] = []
+        self.slot_of: Dict[str, int] = {}
+        self.free: List[int] = []
+        self.centroids: Optional[np.ndarray] = None
+        self.assign: Optional[np.ndarray] = None    # slot -> IVF list (-1 = none)
+        self.trained_on = 0
+        if os.path.exists(path):
+            self.capacity = os.path.getsize(path) // (dimension * 4)
+            if self.capacity:
+                self.matrix = np.memmap(
+                    path, dtype=np.float32, mode="r+", shape=(self.capacity, dimension)
+                )
+
+    @property
+    def size(self) -> int:
+        return len(self.slot_of)
+
+    def _centroid_path(self) -> str:
+        return self.path[: -len(".f32")] + ".centroids.npy"
+
+    def restore(
+        self, entries: List[Tuple[str, int, Dict[str, Any]]], threshold: int
+    ) -> None:
+        high = max((slot for _, slot, _ in entries), default=-1) + 1
+        self.ids = [None] * high
+        self.metadata = [None] * high
+        for vector_id, slot, metadata in entries:
+            self.ids[slot] = vector_id
+            self.metadata[slot] = metadata
+            self.slot_of[vector_id] = slot
+        self.free = [slot for slot in range(high) if self.ids[slot] is None]
+        centroid_path = self._centroid_path()
+        if self.size < threshold:
+            # Centroids from when the partition was larger would cut recall
+            self._drop_ivf()
+        elif os.path.exists(centroid_path):
+            self.centroids = np.load(centroid_path)
+            self.trained_on = self.size
+            self._assign_all()
+
+    def put(self, vector_id: str, vector: np.ndarray, metadata: Dict[str, Any]) -> int:
+        slot = self.slot_of.get(vector_id)
+        if slot is None:
+            if self.free:
+                slot = self.free.pop()
+            else:
+                slot = len(self.ids)
+                self.ids.append(None)
+                self.metadata.append(None)
+            self._ensure_capacity(slot + 1)
+        self.matrix[slot] = vector
+        self.ids[slot] = vector_id
+        self.metadata[slot] = metadata
+        self.slot_of[vector_id] = slot
+        if self.assign is not None:
+            self._grow_assign()
+            self.assign[slot] = int(np.argmax(self.centroids @ vector))
+        return slot
+
+    def remove(self, vector_id: str) -> Optional[int]:
+        slot = self.slot_of.pop(vector_id, None)
+        if slot is None:
+            return None
+        self.matrix[slot] = 0.0
+        self.ids[slot] = None
+        self.metadata[slot] = None
+        self.free.append(slot)
+        if self.assign is not None:
+            self.assign[slot] = -1
+        return slot
+
+    def maybe_train(self, threshold: int) -> None:
+        n = self.size
+        if n < threshold:
+            self._drop_ivf()
+            return
+        if self.centroids is not None and n <= 2 * self.trained_on:
+            return
+        live = np.fromiter(self.slot_of.values(), dtype=np.int64, count=n)
+        nlist = int(np.sqrt(n))
+        self.centroids = train_centroids(np.asarray(self.matrix[live]), nlist)
+        np.save(self._centroid_path(), self.centroids)
+        self.trained_on = n
+        self._assign_all()
+        logger.info(
+            "Trained IVF index",
+            extra={"path": self.path, "vectors": n, "lists": len(self.centroids)},
+        )
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        filter: Optional[Dict[str, Any]],
+        nprobe: int,
+    ) -> List[Tuple[int, float]]:
+        high = len(self.ids)
+        if not self.size:
+            return []
+        if self.assign is not None:
+            probe = _top_k(self.centroids @ query, min(nprobe, len(self.centroids)))
+            candidates = np.nonzero(np.isin(self.assign[:high], probe))[0]
+            if not len(candidates):
+                return []
+            scores = np.asarray(self.matrix[candidates]) @ query
+        else:
+            # Exact: score the contiguous block in place, sinking free slots
+            candidates = np.arange(high)
+            scores = np.asarray(self.matrix[:high]) @ query
+            if self.free:
+                scores[self.free] = -np.inf
+        top_k = min(top_k, self.size)
+
+        if not filter:
+            return [
+                (int(candidates[i]), float(scores[i])) for i in _top_k(scores, top_k)
+            ]
+        # Filtered: take the best few times top_k, widening until top_k pass
+        window = top_k * 4
+        while True:
+            window = min(window, len(scores))
+            results = []
+            for i in _top_k(scores, window):
+                slot = int(candidates[i])
+                if self.ids[slot] is None:
+                    continue
+                if matches_filter(self.metadata[slot], filter):
+                    results.append((slot, float(scores[i])))
+                    if len(results) == top_k:
+                        return results
+            if window == len(scores):
+                return results
+            window *= 4
+
+    def flush(self) -> None:
+        if self.matrix is not None:
+            self.matrix.flush()
+
+    def _ensure_capacity(self, rows: int) -> None:
+        if rows <= self.capacity:
+            return
+        capacity = max(rows, 2 * self.capacity, 64)
+        if self.matrix is not None:
+            self.matrix.flush()
+            self.matrix = None
+        with open(self.path, "ab") as f:
+            f.truncate(capacity * self.dimension * 4)
+        self.matrix = np.memmap(
+            self.path, dtype=np.float32, mode="r+", shape=(capacity, self.dimension)
+        )
+        self.capacity = capacity
+
+    def _drop_ivf(self) -> None:
+        """Back to exact search, including after a restart."""
+        self.centroids = None
+        self.assign = None
+        self.trained_on = 0
+        try:
+            os.unlink(self._centroid_path())
+        except FileNotFoundError:
+            pass
+
+    def _grow_assign(self) -> None:
+        if len(self.assign) < len(self.ids):
+            size = max(len(self.ids), 2 * len(self.assign))
+            grown = np.full(size, -1, dtype=np.int32)
+            grown[: len(self.assign)] = self.assign
+            self.assign = grown
+
+    def _assign_all(self) -> None:
+        self.assign = np.full(len(self.ids), -1, dtype=np.int32)
+        live = np.fromiter(self.slot_of.values(), dtype=np.int64, count=self.size)
+        for start in range(0, len(live), 8192):
+            chunk = live[start:start + 8192]
+            scores = np.asarray(self.matrix[chunk]) @ self.centroids.T
+            self.assign[chunk] = np.argmax(scores, axis=1)
+
+
+class LocalVectorIndex(VectorBackend):
+    """
+    Local VectorBackend rooted at a directory:
+      catalog.db                     ids, partitions, slots, metadata
+      <partition>.f32                memory-mapped float32 rows
+      <partition>.centroids.npy      IVF centroids, once trained
+    """
+
+    def __init__(self, root: str, ivf_threshold: int = 20000, nprobe: int = 8):
+        self.root = root
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self._lock = threading.RLock()
+        self._partitions: Dict[str, _Partition] = {}
+        self._owner: Dict[str, str] = {}   # id -> partition name
+        os.makedirs(root, exist_ok=True)
+        self._catalog = sqlite3.connect(
+            os.path.join(root, "catalog.db"), check_same_thread=False
+        )
+        self._catalog.execute("PRAGMA journal_mode=WAL")
+        self._catalog.executescript(
+            "CREATE TABLE IF NOT EXISTS vectors ("
+            " id TEXT PRIMARY KEY, partition TEXT NOT NULL,"
+            " slot INTEGER NOT NULL, metadata TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS settings"
+            " (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+        )
+        row = self._catalog.execute(
+            "SELECT value FROM settings WHERE key = 'dimension'"
+        ).fetchone()
+        self.dimension: Optional[int] = int(row[0]) if row else None
+        self._load()
+
+    # ------------------------------------------------------------------
+    # VectorBackend
+    # ------------------------------------------------------------------
+
+    def query(
+        self,
+        vector,
+        top_k,
+        include_metadata=True,
+        filter=None,
+        namespace=None,
+        include_values=False,
+    ):
+        if self.dimension is None or top_k <= 0:
+            return {"matches": []}
+        query = _normalise(np.asarray(vector, dtype=np.float32))
+        with self._lock:
+            names, residual = self._route(namespace, filter)
+            hits: List[Tuple[float, str, Dict[str, Any], Optional[List[float]]]] = []
+            for name in names:
+                partition = self._partitions[name]
+                found = partition.search(query, top_k, residual, self.nprobe)
+                for slot, score in found:
+                    values = partition.matrix[slot].tolist() if include_values else None
+                    hits.append(
+                        (score, partition.ids[slot], partition.metadata[slot], values)
+                    )
+        hits.sort(key=lambda hit: -hit[0])
+        matches = []
+        for score, vector_id, metadata, values in hits[:top_k]:
+            match = {"id": vector_id, "score": score}
+            if include_metadata:
+                match["metadata"] = dict(metadata)
+            if include_values:
+                match["values"] = values
+            matches.append(match)
+        return {"matches": matches, "namespace": namespace or ""}
+
+    def upsert(self, vectors, namespace=None):
+        if not vectors:
+            return {"upserted_count": 0}
+        matrix = _normalise(
+            np.asarray([v["values"] for v in vectors], dtype=np.float32)
+        )
+        with self._lock:
+            self._check_dimension(matrix.shape[1])
+            touched = set()
+            rows = []
+            for item, row in zip(vectors, matrix):
+                vector_id = str(item["id"])
+                metadata = dict(item.get("metadata") or {})
+                name = partition_for(namespace, metadata)
+                previous = self._owner.get(vector_id)
+                if previous is not None and previous != name:
+                    # An id lives in one partition; moving it drops the old copy
+                    self._partitions[previous].remove(vector_id)
+                    touched.add(previous)
+                slot = self._partition(name).put(vector_id, row, metadata)
+                self._owner[vector_id] = name
+                rows.append((vector_id, name, slot, json.dumps(metadata, default=str)))
+                touched.add(name)
+            self._catalog.executemany(
+                "INSERT OR REPLACE INTO vectors (id, partition, slot, metadata)"
+                " VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._catalog.commit()
+            for name in touched:
+                partition = self._partitions[name]
+                partition.flush()
+                partition.maybe_train(self.ivf_threshold)
+        return {"upserted_count": len(vectors)}
+
+    def delete(self, ids, namespace=None):
+        with self._lock:
+            removed = []
+            for vector_id in map(str, ids):
+                name = self._owner.get(vector_id)
+                if name is None or (namespace and name != namespace):
+                    continue
+                self._partitions[name].remove(vector_id)
+                del self._owner[vector_id]
+                removed.append((vector_id, name))
+            self._catalog.executemany(
+                "DELETE FROM vectors WHERE id = ?", [(i,) for i, _ in removed]
+            )
+            self._catalog.commit()
+            for name in {name for _, name in removed}:
+                partition = self._partitions[name]
+                partition.flush()
+                # A partition that shrank below the threshold goes back to exact search
+                partition.maybe_train(self.ivf_threshold)
+
+    def describe_index_stats(self):
+        with self._lock:
+            namespaces = {
+                name: {
+                    "vector_count": p.size,
+                    "ivf_lists": len(p.centroids) if p.assign is not None else 0,
+                }
+                for name, p in self._partitions.items()
+            }
+        return {
+            "dimension": self.dimension,
+            "total_vector_count": sum(ns["vector_count"] for ns in namespaces.values()),
+            "namespaces": namespaces,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            for partition in self._partitions.values():
+                partition.flush()
+            self._partitions.clear()
+            self._catalog.close()
+
+    # ------------------------------------------------------------------
+    # Internals (caller holds the lock)
+    # ------------------------------------------------------------------
+
+    def _load(self) -> None:
+        grouped: Dict[str, List[Tuple[str, int, Dict[str, Any]]]] = {}
+        for vector_id, name, slot, metadata in self._catalog.execute(
+            "SELECT id, partition, slot, metadata FROM vectors"
+        ):
+            grouped.setdefault(name, []).append((vector_id, slot, json.loads(metadata)))
+            self._owner[vector_id] = name
+        for name, entries in grouped.items():
+            self._partition(name).restore(entries, self.ivf_threshold)
+
+    def _partition(self, name: str) -> _Partition:
+        partition = self._partitions.get(name)
+        if partition is None:
+            path = os.path.join(self.root, _UNSAFE_CHARS.sub("_", name) + ".f32")
+            partition = _Partition(path, self.dimension)
+            self._partitions[name] = partition
+        return partition
+
+    def _route(self, namespace, filter) -> Tuple[List[str], Optional[Dict[str, Any]]]:
+        """Partitions to search, and what is left of the filter after routing."""
+        if namespace:
+            return ([namespace] if namespace in self._partitions else []), filter
+        condition = (filter or {}).get("user_id")
+        if isinstance(condition, dict) and len(condition) == 1:
+            user_id = condition.get("$eq")
+        else:
+            user_id = condition
+        if user_id is None or isinstance(user_id, dict):
+            return list(self._partitions), filter
+        # Every vector in a user partition has that user_id: no need to check it
+        residual = {k: v for k, v in filter.items() if k != "user_id"}
+        name = partition_for(None, {"user_id": user_id})
+        return ([name] if name in self._partitions else []), residual
+
+    def _check_dimension(self, dimension: int) -> None:
+        if self.dimension is None:
+            self.dimension = dimension
+            self._catalog.execute(
+                "INSERT OR REPLACE INTO settings (key, value) VALUES ('dimension', ?)",
+                (str(dimension),),
+            )
+        elif dimension != self.dimension:
+            raise ValueError(
+                f"Vector dimension {dimension} does not match "
+                f"index dimension {self.dimension}"
+            )
+
+
+_local_indexes: Dict[str, LocalVectorIndex] = {}
+_local_indexes_lock = threading.Lock()
+
+
+def get_local_index(
+    root: str, ivf_threshold: int = 20000, nprobe: int = 8
+) -> LocalVectorIndex:
+    """One LocalVectorIndex per directory per process (it owns the memmaps)."""
+    root = os.path.abspath(root)
+    with _local_indexes_lock:
+        index = _local_indexes.get(root)
+        if index is None:
+            index = LocalVectorIndex(root, ivf_threshold=ivf_threshold, nprobe=nprobe)
+            _local_indexes[root] = index
+        return index
@@ -1,29 +1,47 @@
 # pinecone_client.py
-from pinecone.grpc import PineconeGRPC as Pinecone
-from pinecone import ServerlessSpec
+import logging
+import threading
+
 from app.config.settings import Settings
 
+logger = logging.getLogger(__name__)
+
 settings = Settings()
 
+_pc = None
+_pc_lock = threading.Lock()
+
 def init_pinecone():
-   pc = Pinecone(api_key=settings.PINECONE_API_KEY)
-   return pc
-
-pc = init_pinecone()
-index_name = settings.PINECONE_INDEX_NAME
-if index_name not in pc.list_indexes().names():
-   pc.create_index(
-       name=index_name,
-       dimension=1536,
-       metric="cosine",
-       spec=ServerlessSpec(
-           cloud="aws",
-           region="us-east-1"
-       )
-   )
-   print(f"Index '{index_name}' created as serverless index.")
-else:
-   print(f"Index '{index_name}' already exists.")
+    # The gRPC client is slow to import; load it with the first connection
+    from pinecone.grpc import PineconeGRPC as Pinecone
+    from pinecone import ServerlessSpec
+
+    pc = Pinecone(api_key=settings.PINECONE_API_KEY)
+    index_name = settings.PINECONE_INDEX_NAME
+    if index_name not in pc.list_indexes().names():
+        pc.create_index(
+            name=index_name,
+            dimension=1536,
+            metric="cosine",
+            spec=ServerlessSpec(
+                cloud="aws",
+                region="us-east-1"
+            )
+        )
+        logger.info(f"Index '{index_name}' created as serverless index.")
+    else:
+        logger.info(f"Index '{index_name}' already exists.")
+    return pc
+
+def get_pinecone_client():
+    # Connect on first use rather than at import, so importing the vector
+    # layer (or running with the local backend) needs no network
+    global _pc
+    if _pc is None:
+        with _pc_lock:
+            if _pc is None:
+                _pc = init_pinecone()
+    return _pc
 
 def get_pinecone_index(index_name: str):
-   return pc.Index(index_name)
\ No newline at end of file
+    return get_pinecone_client().Index(index_name)
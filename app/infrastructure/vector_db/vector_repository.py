@@ -1,8 +1,13 @@
 # File: app/infrastructure/vector_db/vector_repository.py
 """
-Vector repository for handling Pinecone-based retrieval operations.
+Vector repository for handling craving embedding retrieval operations.
 Optimized for fast, reliable search of craving embeddings with comprehensive
 error handling and connection management.
+
+The store behind it is a VectorBackend chosen by settings.VECTOR_BACKEND:
+Pinecone (default) or the in-process LocalVectorIndex. With
+VECTOR_NAMESPACE_PER_USER each user's vectors live in their own namespace,
+so a user-scoped search only touches that user's vectors.
 """
 
 import time
@@ -11,6 +16,8 @@ from typing import List, Dict, Any, Optional
 import json
 
 from app.config.settings import Settings
+from app.infrastructure.vector_db.backend import PineconeBackend, VectorBackend
+from app.infrastructure.vector_db.filters import CravingVectorFilter, matches_filter
 from app.infrastructure.vector_db.pinecone_client import get_pinecone_index
 
 # Setup logging
@@ -19,53 +26,122 @@ logger = logging.getLogger(__name__)
 # Get settings
 settings = Settings()
 
+
+def user_namespace(user_id: Optional[int]) -> Optional[str]:
+    """Namespace holding user_id's vectors (None = the default namespace)."""
+    if user_id is None or not settings.VECTOR_NAMESPACE_PER_USER:
+        return None
+    return f"user-{user_id}"
+
+
+def _as_match(match) -> Dict[str, Any]:
+    # Pinecone returns ScoredVector objects; normalise to plain dicts
+    if isinstance(match, dict):
+        return match
+    normalised = {"id": match.id, "score": match.score, "metadata": dict(match.metadata or {})}
+    if getattr(match, "values", None):
+        normalised["values"] = list(match.values)
+    return normalised
+
+
 class VectorRepository:
     """
     Repository for vector-based storage and retrieval of craving embeddings.
     
-    This class handles all interactions with the vector database (Pinecone),
+    This class handles all interactions with the vector database,
     providing a clean interface for the rest of the application.
     """
     
-    def __init__(self, index_name: Optional[str] = None):
+    def __init__(self, index_name: Optional[str] = None, backend: Optional[VectorBackend] = None):
         """
         Initialize the repository with an optional index name override.
         
         Args:
             index_name: Optional override for the Pinecone index name.
                        Defaults to the value from settings.
+            backend: Optional VectorBackend to use instead of the one
+                     selected by settings.VECTOR_BACKEND.
         """
         self.index_name = index_name or settings.PINECONE_INDEX_NAME
-        self._index = None
+        self._index = backend
         self._max_retries = 3
         self._retry_delay = 1  # seconds
     
     @property
-    def index(self):
+    def index(self) -> VectorBackend:
         """
-        Lazy-loaded Pinecone index property.
+        Lazy-loaded vector backend property.
         
         Returns:
-            The Pinecone index instance, initialized on first use.
+            The configured VectorBackend, initialized on first use.
         """
         if self._index is None:
-            self._index = get_pinecone_index(self.index_name)
+            self._index = self._build_backend()
         return self._index
+
+    def _build_backend(self) -> VectorBackend:
+        if settings.VECTOR_BACKEND == "local":
+            from app.infrastructure.vector_db.local_index import get_local_index
+            return get_local_index(
+                settings.VECTOR_LOCAL_PATH,
+                ivf_threshold=settings.VECTOR_LOCAL_IVF_THRESHOLD,
+                nprobe=settings.VECTOR_LOCAL_IVF_NPROBE,
+            )
+        if settings.VECTOR_BACKEND != "pinecone":
+            raise ValueError(f"Unknown VECTOR_BACKEND: {settings.VECTOR_BACKEND}")
+        return PineconeBackend(get_pinecone_index(self.index_name))
     
-    def search_cravings(self, embedding: List[float], top_k: int = 10) -> Dict[str, Any]:
+    def search_cravings(
+        self,
+        embedding: List[float],
+        top_k: int = 10,
+        user_id: Optional[int] = None,
+        filters: Optional[CravingVectorFilter] = None,
+        include_values: bool = False,
+    ) -> Dict[str, Any]:
         """
-        Execute a vector search on Pinecone with retries.
+        Execute a vector search with retries.
+        
+        With user_id the search is confined to that user's namespace and
+        filtered on user_id plus `filters`; it over-fetches
+        VECTOR_SEARCH_OVERFETCH x top_k matches, re-checks them against the
+        filter, de-duplicates and re-ranks by score, and returns the top_k.
         
         Args:
             embedding: The vector representation of the query
             top_k: The number of top results to retrieve
+            user_id: Optional owner to restrict the search to
+            filters: Optional date / intensity / deletion restrictions
+            include_values: Also return each match's embedding ("values")
             
         Returns:
             dict: Search results including metadata
-            
-        Raises:
-            Exception: If all retries fail
         """
+        if user_id is None and filters is None:
+            return self._query(embedding, top_k, include_values=include_values)
+
+        metadata_filter = (filters or CravingVectorFilter()).to_metadata_filter(user_id)
+        fetch_k = top_k * max(1, settings.VECTOR_SEARCH_OVERFETCH)
+        results = self._query(embedding, fetch_k, metadata_filter, user_namespace(user_id), include_values)
+
+        best: Dict[str, Dict[str, Any]] = {}
+        for match in map(_as_match, results.get("matches", [])):
+            if not matches_filter(match.get("metadata") or {}, metadata_filter):
+                continue
+            seen = best.get(match["id"])
+            if seen is None or match["score"] > seen["score"]:
+                best[match["id"]] = match
+        ranked = sorted(best.values(), key=lambda m: m["score"], reverse=True)
+        return {"matches": ranked[:top_k]}
+
+    def _query(
+        self,
+        embedding: List[float],
+        top_k: int,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        namespace: Optional[str] = None,
+        include_values: bool = False,
+    ) -> Dict[str, Any]:
         retries = 0
         last_error = None
         
@@ -75,7 +151,10 @@ class VectorRepository:
                 results = self.index.query(
                     vector=embedding,
                     top_k=top_k,
-                    include_metadata=True
+                    include_metadata=True,
+                    filter=metadata_filter,
+                    namespace=namespace,
+                    include_values=include_values
                 )
                 
                 # Log a subtle warning if no matches found
@@ -107,7 +186,7 @@ class VectorRepository:
         metadata: Dict[str, Any]
     ) -> bool:
         """
-        Upsert a craving's embedding to the Pinecone index with retries.
+        Upsert a craving's embedding to the vector index with retries.
         
         Args:
             craving_id: Unique identifier of the craving
@@ -128,7 +207,7 @@ class VectorRepository:
                 }
                 
                 # Execute the upsert
-                self.index.upsert(vectors=[vector])
+                self.index.upsert(vectors=[vector], namespace=user_namespace(metadata.get("user_id")))
                 
                 logger.debug(f"Successfully upserted vector for craving_id={craving_id}")
                 return True
@@ -149,24 +228,46 @@ class VectorRepository:
         )
         return False
     
-    def delete_craving_embedding(self, craving_id: int) -> bool:
+    def delete_craving_embedding(self, craving_id: int, user_id: Optional[int] = None) -> bool:
         """
-        Delete a craving's embedding from the Pinecone index.
+        Delete a craving's embedding from the vector index.
         
         Args:
             craving_id: The ID of the craving to delete
+            user_id: Owner of the craving, whose namespace holds the vector
             
         Returns:
             bool: True if the operation succeeded, False otherwise
         """
         try:
-            self.index.delete(ids=[str(craving_id)])
+            self.index.delete(ids=[str(craving_id)], namespace=user_namespace(user_id))
             logger.debug(f"Successfully deleted vector for craving_id={craving_id}")
             return True
         except Exception as e:
             logger.error(f"Failed to delete vector for craving_id={craving_id}: {str(e)}")
             return False
     
+    def delete_craving_embeddings(self, craving_ids: List[int], user_id: Optional[int] = None) -> bool:
+        """
+        Delete several cravings' embeddings in one request.
+        
+        Args:
+            craving_ids: IDs of the cravings to delete
+            user_id: Owner of the cravings, whose namespace holds the vectors
+            
+        Returns:
+            bool: True if the operation succeeded, False otherwise
+        """
+        if not craving_ids:
+            return True
+        try:
+            self.index.delete(ids=[str(cid) for cid in craving_ids], namespace=user_namespace(user_id))
+            logger.debug(f"Successfully deleted {len(craving_ids)} vectors")
+            return True
+        except Exception as e:
+            logger.error(f"Batch vector delete failed: {str(e)}")
+            return False
+    
     def batch_upsert_embeddings(
         self, 
         items: List[Dict[str, Any]]
@@ -184,20 +285,22 @@ class VectorRepository:
             return 0
             
         try:
-            # Format vectors for Pinecone batch upsert
-            vectors = []
+            # Format vectors for the backend's batch upsert, one group per namespace
+            by_namespace: Dict[Optional[str], List[Dict[str, Any]]] = {}
             for item in items:
-                vectors.append({
+                namespace = user_namespace(item['metadata'].get('user_id'))
+                by_namespace.setdefault(namespace, []).append({
                     "id": str(item['id']),
                     "values": item['embedding'],
                     "metadata": item['metadata']
                 })
                 
-            # Batch upsert to Pinecone
-            self.index.upsert(vectors=vectors)
+            # Batch upsert to the backend
+            for namespace, vectors in by_namespace.items():
+                self.index.upsert(vectors=vectors, namespace=namespace)
             
-            logger.info(f"Successfully batch upserted {len(vectors)} vectors")
-            return len(vectors)
+            logger.info(f"Successfully batch upserted {len(items)} vectors")
+            return len(items)
             
         except Exception as e:
             logger.error(f"Batch upsert failed: {str(e)}")
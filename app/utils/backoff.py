@@ -0,0 +1,23 @@
+# File: app/utils/backoff.py
+"""
+Retry delay helpers.
+"""
+
+import random
+from typing import Callable
+
+
+def full_jitter_delay(
+    attempt: int,
+    base: float = 1.0,
+    cap: float = 300.0,
+    rand: Callable[[], float] = random.random,
+) -> float:
+    """
+    Exponential backoff with full jitter: uniform in [0, min(cap, base * 2**(attempt-1))].
+
+    Spreading retries over the whole window keeps clients that failed together
+    from retrying together.
+    """
+    ceiling = min(cap, base * (2 ** max(attempt - 1, 0)))
+    return rand() * ceiling
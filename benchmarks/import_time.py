@@ -0,0 +1,95 @@
+# File: benchmarks/import_time.py
+"""
+Startup benchmark: cold import of the API (what uvicorn, test collection
+and every forked worker pay before serving anything).
+
+Runs `python -X importtime` in fresh subprocesses with outbound sockets
+blocked, so an import that tries to reach Pinecone, the database or
+OpenAI fails loudly instead of silently adding latency. Reports wall time
+and the modules with the largest cumulative import cost.
+
+Usage:
+
+    python benchmarks/import_time.py --runs 5 --top 15
+    python benchmarks/import_time.py --module app.core.services.rag_service
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Executed in the child before the import under test
+PRELUDE = """
+import socket
+def _blocked(self, address, *args, **kwargs):
+    raise RuntimeError("network access during import: %r" % (address,))
+socket.socket.connect = _blocked
+socket.socket.connect_ex = _blocked
+import {module}
+"""
+
+
+def run_once(module):
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PRELUDE.format(module=module)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        errors = [line for line in proc.stderr.splitlines() if not line.startswith("import time:")]
+        raise SystemExit("Import failed:\n" + "\n".join(errors[-20:]))
+    return wall, proc.stdout, parse_importtime(proc.stderr)
+
+
+def parse_importtime(stderr):
+    """{module: (self_us, cumulative_us)} from -X importtime output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.api.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    walls = []
+    for _ in range(args.runs):
+        wall, stdout, modules = run_once(args.module)
+        walls.append(wall)
+
+    print(f"import {args.module}: {len(modules)} modules, no network access")
+    print(f"wall time over {args.runs} runs: median {statistics.median(walls) * 1000:.0f} ms, "
+          f"min {min(walls) * 1000:.0f} ms")
+    if args.module in modules:
+        print(f"import-time cumulative for {args.module}: {modules[args.module][1] / 1000:.0f} ms")
+    if stdout.strip():
+        print(f"warning: import wrote {len(stdout.splitlines())} line(s) to stdout")
+
+    # Top-level packages only, so a heavy SDK shows up once rather than per submodule
+    packages = {name: times for name, times in modules.items() if "." not in name}
+    ranked = sorted(packages.items(), key=lambda item: item[1][1], reverse=True)[:args.top]
+    print(f"\n{'cumulative ms':>14} {'self ms':>9}  package")
+    for name, (self_us, cumulative_us) in ranked:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+    heavy = [name for name in ("openai", "httpx", "pinecone", "sentry_sdk") if name in modules]
+    print("\nlazily loaded SDKs imported anyway: " + (", ".join(heavy) if heavy else "none"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# File: benchmarks/rerank.py
+"""
+Micro-benchmark: RAG re-ranking of retrieved cravings.
+
+Compares the previous per-object loop (time weight per dataclass, then a
+full sort) with CravingReranker (NumPy blend + argpartition), with and
+without MMR, over --candidates synthetic cravings. The "arrays only" row
+is the scoring core without pulling fields out of the dataclasses.
+
+Usage:
+
+    python benchmarks/rerank.py --candidates 10000 --top-k 10
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.services.craving_reranker import (  # noqa: E402
+    CravingReranker,
+    blended_scores,
+    exponential_decay,
+    top_k_indices,
+)
+from app.core.services.rag_service import RetrievedCraving  # noqa: E402
+
+
+def legacy_rerank(cravings, top_k, now):
+    for c in cravings:
+        days_ago = (now - c.created_at).total_seconds() / (60 * 60 * 24)
+        if days_ago <= 30:
+            c.time_score = 1.0 - (days_ago / 30) * 0.5
+        else:
+            c.time_score = 0.5 * (1.0 - min(days_ago / 365, 1.0))
+    return sorted(cravings, key=lambda x: x.time_score, reverse=True)[:top_k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=10000)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    now = datetime.utcnow()
+    embeddings = rng.standard_normal((args.candidates, args.dim)).astype(np.float32)
+    cravings = [
+        RetrievedCraving(
+            id=i,
+            description="",
+            created_at=now - timedelta(days=float(rng.uniform(0, 400))),
+            intensity=int(rng.integers(1, 11)),
+            score=float(rng.uniform(0.2, 0.95)),
+            embedding=embeddings[i],
+        )
+        for i in range(args.candidates)
+    ]
+
+    similarity = np.array([c.score for c in cravings])
+    age_days = np.array([(now - c.created_at).total_seconds() / 86400 for c in cravings])
+    intensity = np.array([c.intensity for c in cravings], dtype=np.float64)
+    decay = exponential_decay(30.0)
+
+    plain = CravingReranker(exponential_decay(30.0), mmr_lambda=None)
+    mmr = CravingReranker(exponential_decay(30.0), mmr_lambda=0.7)
+    cases = {
+        "legacy loop + sort": lambda: legacy_rerank(cravings, args.top_k, now),
+        "numpy blend + argpartition": lambda: plain.rerank(cravings, args.top_k, now),
+        "numpy blend + MMR": lambda: mmr.rerank(cravings, args.top_k, now),
+        "numpy core (arrays only)": lambda: top_k_indices(
+            blended_scores(similarity, age_days, intensity, decay), args.top_k
+        ),
+    }
+    print(f"{args.candidates} candidates, top_k={args.top_k}, dim={args.dim}")
+    for name, fn in cases.items():
+        best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+        print(f"{name:<28} {best * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
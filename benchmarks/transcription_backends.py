@@ -0,0 +1,166 @@
+# File: benchmarks/transcription_backends.py
+"""
+Benchmark: transcription latency and real-time factor per backend.
+
+Runs the full TranscriptionService path (preprocessing, chunking, parallel
+chunk transcription) over each --audio file with each --backends entry and
+prints, per file and backend, the best and median wall time, the real-time
+factor (RTF = processing time / audio duration; below 1 is faster than
+real time) and the processing seconds per minute of audio. For the local
+backend the one-off model load is timed separately; it is not part of any
+request.
+
+Without --audio a synthetic recording of --minutes is generated (bursts of
+modulated tones between pauses). Its timings are representative, its text
+is not: pass real voice logs to compare output.
+
+Usage:
+
+    pip install faster-whisper
+    python benchmarks/transcription_backends.py \\
+        --backends local --model base --threads 4
+    OPENAI_API_KEY=... python benchmarks/transcription_backends.py \\
+        --backends openai,local --audio app/uploads/blobs/ab/cd/<sha>.wav
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.entities.voice_log import VoiceLog  # noqa: E402
+from app.core.services.audio_preprocessing import (  # noqa: E402
+    AudioPreprocessor,
+    read_wav,
+)
+from app.infrastructure.external.transcription_backends import (  # noqa: E402
+    LocalWhisperBackend,
+    OpenAIWhisperBackend,
+)
+from app.infrastructure.external.transcription_service import (  # noqa: E402
+    TranscriptionService,
+)
+
+
+def synthetic_recording(path, minutes, rate=44100):
+    """Speech-like bursts (1-6 s) separated by short pauses, stereo 16-bit."""
+    rng = np.random.default_rng(0)
+    parts, total = [], 0.0
+    while total < minutes * 60:
+        seconds = float(rng.uniform(1, 6))
+        t = np.arange(int(seconds * rate)) / rate
+        pitch = float(rng.uniform(110, 260))
+        envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)  # ~syllable rate
+        parts.append(0.3 * envelope * np.sin(2 * np.pi * pitch * t))
+        pause = float(rng.uniform(0.2, 0.8))
+        parts.append(np.zeros(int(pause * rate)))
+        total += seconds + pause
+    mono = (np.concatenate(parts) * 32767).astype("<i2")
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(np.repeat(mono, 2).tobytes())
+    return path
+
+
+def build_backend(name, args):
+    if name == "openai":
+        return OpenAIWhisperBackend()
+    if name == "local":
+        return LocalWhisperBackend(
+            model_size=args.model,
+            compute_type=args.compute_type,
+            cpu_threads=args.threads,
+            num_workers=args.workers,
+            beam_size=args.beam_size,
+            language=args.language,
+        )
+    raise SystemExit(f"unknown backend: {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--backends", default="local", help="comma-separated: openai, local"
+    )
+    parser.add_argument(
+        "--audio", nargs="*", default=[],
+        help="WAV files (default: one synthetic recording)",
+    )
+    parser.add_argument(
+        "--minutes", type=float, default=1.0,
+        help="length of the synthetic recording",
+    )
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--compute-type", default="int8")
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--beam-size", type=int, default=1)
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--chunk-seconds", type=float, default=60.0)
+    parser.add_argument("--chunk-concurrency", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    tmp = None
+    files = args.audio
+    if not files:
+        tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(tmp.name, "synthetic.wav")
+        files = [synthetic_recording(path, args.minutes)]
+
+    preprocessor = AudioPreprocessor(
+        output_format="wav", max_chunk_seconds=args.chunk_seconds
+    )
+    print(
+        f"{'file':<24} {'backend':<8} {'audio s':>8} {'best s':>8} "
+        f"{'median s':>9} {'RTF':>6} {'s/min':>7}"
+    )
+    try:
+        for name in args.backends.split(","):
+            backend = build_backend(name.strip(), args)
+            started = time.perf_counter()
+            backend.load()
+            if isinstance(backend, LocalWhisperBackend):
+                print(f"# local model {args.model} ({args.compute_type}) loaded in "
+                      f"{time.perf_counter() - started:.2f} s")
+            service = TranscriptionService(
+                backend=backend,
+                preprocessor=preprocessor,
+                chunk_concurrency=args.chunk_concurrency,
+            )
+            for path in files:
+                samples, rate = read_wav(path)
+                duration = len(samples) / rate
+                voice_log = VoiceLog(
+                    id=0, user_id=0, file_path=path, created_at="2025-03-01T00:00:00"
+                )
+                timings = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    text = service.transcribe_audio(voice_log)
+                    timings.append(time.perf_counter() - started)
+                best, median = min(timings), statistics.median(timings)
+                print(
+                    f"{os.path.basename(path)[:24]:<24} {backend.name:<8} "
+                    f"{duration:8.1f} {best:8.2f} {median:9.2f} "
+                    f"{median / duration:6.3f} {median / duration * 60:7.2f}"
+                )
+                print(f"#   {text[:100]!r}")
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
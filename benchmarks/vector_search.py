@@ -0,0 +1,92 @@
+# File: benchmarks/vector_search.py
+"""
+Offline benchmark for the local vector index: exact vs IVF search.
+
+Builds two LocalVectorIndex instances in a temp directory over the same
+synthetic clustered vectors (one user), then reports per-query latency for
+each and the IVF recall@k against exact search.
+
+Usage:
+
+    python benchmarks/vector_search.py --vectors 50000 --dim 1536 --nprobe 8
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.infrastructure.vector_db.local_index import LocalVectorIndex  # noqa: E402
+
+
+def synthetic(n: int, dim: int, clusters: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    noise = 0.3 * rng.standard_normal((n, dim)).astype(np.float32)
+    return centers[rng.integers(0, clusters, n)] + noise
+
+
+def load(index: LocalVectorIndex, vectors: np.ndarray, batch: int = 2000) -> float:
+    started = time.perf_counter()
+    for start in range(0, len(vectors), batch):
+        index.upsert([
+            {"id": str(start + i), "values": v, "metadata": {"user_id": 1}}
+            for i, v in enumerate(vectors[start:start + batch])
+        ])
+    return time.perf_counter() - started
+
+
+def time_queries(index: LocalVectorIndex, queries: np.ndarray, top_k: int):
+    latencies, results = [], []
+    for q in queries:
+        started = time.perf_counter()
+        matches = index.query(q, top_k=top_k, filter={"user_id": 1})["matches"]
+        latencies.append(time.perf_counter() - started)
+        results.append({m["id"] for m in matches})
+    return latencies, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, default=8)
+    args = parser.parse_args()
+
+    vectors = synthetic(args.vectors, args.dim, args.clusters)
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.choice(len(vectors), args.queries, replace=False)]
+    queries = queries + 0.1 * rng.standard_normal(queries.shape).astype(np.float32)
+
+    with tempfile.TemporaryDirectory() as root:
+        exact = LocalVectorIndex(os.path.join(root, "exact"), ivf_threshold=args.vectors + 1)
+        ivf = LocalVectorIndex(os.path.join(root, "ivf"), ivf_threshold=1, nprobe=args.nprobe)
+        print(f"{args.vectors} vectors x {args.dim} dims, {args.queries} queries, top_k={args.top_k}")
+        print(f"load: exact {load(exact, vectors):.1f}s   ivf {load(ivf, vectors):.1f}s (incl. training)")
+
+        exact_lat, exact_hits = time_queries(exact, queries, args.top_k)
+        ivf_lat, ivf_hits = time_queries(ivf, queries, args.top_k)
+        recall = statistics.mean(len(a & b) / args.top_k for a, b in zip(ivf_hits, exact_hits))
+
+        for name, lat in (("exact", exact_lat), ("ivf", ivf_lat)):
+            lat = sorted(lat)
+            print(
+                f"{name:<6} p50 {statistics.median(lat) * 1000:7.2f} ms   "
+                f"p95 {lat[int(len(lat) * 0.95) - 1] * 1000:7.2f} ms"
+            )
+        print(f"ivf recall@{args.top_k}: {recall:.3f}  (nprobe={args.nprobe})")
+        exact.close()
+        ivf.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# File: tests/conftest.py
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.infrastructure.database.models import Base
+
+
+@pytest.fixture
+def sqlite_path(tmp_path):
+    return tmp_path / "test.db"
+
+
+@pytest.fixture
+def sqlite_engine(sqlite_path):
+    """
+    File-backed SQLite engine with the full schema, so the sync and async
+    fixtures below see the same database.
+    """
+    engine = create_engine(
+        f"sqlite:///{sqlite_path}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(sqlite_engine):
+    """
+    SQLAlchemy session bound to the test SQLite database.
+    """
+    session = sessionmaker(autocommit=False, autoflush=False, bind=sqlite_engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def async_session_factory(sqlite_engine, sqlite_path):
+    """
+    async_sessionmaker (aiosqlite) on the same database as db_session.
+    NullPool: connections never outlive the event loop that opened them.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{sqlite_path}", poolclass=NullPool)
+    yield async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def run_with_async_db(async_session_factory):
+    """
+    Call an async endpoint with a fresh AsyncSession: run(endpoint, **kwargs).
+    """
+    def run(endpoint, **kwargs):
+        async def call():
+            async with async_session_factory() as db:
+                return await endpoint(db=db, **kwargs)
+        return asyncio.run(call())
+    return run
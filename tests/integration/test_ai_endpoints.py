@@ -1,22 +1,29 @@
 # File: tests/integration/test_ai_endpoints.py
 
 import pytest
+from types import SimpleNamespace
 from unittest.mock import patch
 from fastapi.testclient import TestClient
+from app.api.endpoints import ai_endpoints
 from app.api.main import app
 
 client = TestClient(app)
 
+@pytest.fixture
+def authenticated():
+    app.dependency_overrides[ai_endpoints.get_current_user] = lambda: SimpleNamespace(id=1)
+    yield
+    app.dependency_overrides.clear()
+
 @pytest.mark.integration
 @patch("app.core.services.rag_service.RAGService.generate_personalized_insight")
-def test_insights_endpoint(mock_rag):
+def test_insights_endpoint(mock_rag, authenticated):
     """
     Tests the AI insights endpoint with a patched RAGService method.
     """
     mock_rag.return_value = "Mocked response about cravings."
 
     payload = {
-        "user_id": 1,
         "query": "Why do I crave sugar at night?",
         "persona": "NighttimeBinger"
     }
@@ -24,4 +31,5 @@ def test_insights_endpoint(mock_rag):
     assert response.status_code == 200
 
     data = response.json()
-    assert data["answer"] == "Mocked response about cravings."
\ No newline at end of file
+    assert data["answer"] == "Mocked response about cravings."
+    assert mock_rag.call_args.kwargs["user_id"] == 1
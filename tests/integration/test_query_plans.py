@@ -0,0 +1,205 @@
+# File: tests/integration/test_query_plans.py
+
+"""
+Query-plan regression tests for the hot craving queries.
+
+Each test runs the real repository / endpoint code, captures the SELECTs it
+issues against `cravings`, and EXPLAINs them. The test fails if any of them
+falls back to a sequential scan of the table.
+
+By default this runs on a temporary SQLite file. Set QUERY_PLAN_DATABASE_URL
+to a scratch Postgres database (tables are created and dropped) to check the
+Postgres planner instead; sequential scans are disabled for every connection
+so any remaining "Seq Scan" means no usable index exists.
+
+Endpoints run on an AsyncSession; their statements are EXPLAINed on that
+same async connection so driver-specific placeholders ($1 for asyncpg) work.
+"""
+
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.api.endpoints.analytics import get_basic_craving_analytics, get_user_craving_summary
+from app.api.endpoints.craving_logs import list_cravings
+from app.config.settings import get_settings
+from app.infrastructure.database.async_session import build_async_engine
+from app.infrastructure.database.models import Base, CravingModel
+from app.infrastructure.database.repository import CravingRepository
+from app.infrastructure.database.rollup_repository import CravingRollupRepository
+
+PLAN_DATABASE_URL = os.environ.get("QUERY_PLAN_DATABASE_URL")
+
+
+def _disable_seqscan(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("SET enable_seqscan = off")
+    cursor.close()
+
+
+@pytest.fixture
+def plan_url(tmp_path):
+    return PLAN_DATABASE_URL or f"sqlite:///{tmp_path / 'plans.db'}"
+
+
+@pytest.fixture
+def plan_session(plan_url):
+    engine = create_engine(plan_url)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+    now = datetime.utcnow()
+    for user_id in range(1, 6):
+        for i in range(40):
+            session.add(CravingModel(
+                user_id=user_id,
+                description=f"craving {i}",
+                intensity=float(i % 10),
+                confidence_to_resist=float((i * 3) % 10),
+                timestamp=now - timedelta(hours=6 * i),
+                is_deleted=(i % 7 == 0),
+            ))
+    session.commit()
+    if PLAN_DATABASE_URL:
+        session.execute(text("ANALYZE cravings"))
+        session.commit()
+        event.listen(engine, "connect", _disable_seqscan)
+        session.close()
+
+    try:
+        yield session
+    finally:
+        session.close()
+        if PLAN_DATABASE_URL:
+            Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+@pytest.fixture
+def plan_async_engine(plan_url, plan_session):
+    engine = build_async_engine(plan_url, poolclass=NullPool)
+    if PLAN_DATABASE_URL:
+        event.listen(engine.sync_engine, "connect", _disable_seqscan)
+    yield engine
+    asyncio.run(engine.dispose())
+
+
+class StatementCapture:
+    """Records SELECT statements that touch the cravings table."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        lowered = statement.lower()
+        if lowered.lstrip().startswith("select") and "from cravings" in lowered:
+            self.statements.append((statement, parameters))
+
+
+def _sequential_scans(conn, statement, parameters):
+    """Return the plan lines that read cravings without an index."""
+    if conn.dialect.name == "sqlite":
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+        details = [row[-1] for row in rows]
+        # SEARCH is an index range lookup; any SCAN (even "USING INDEX") reads every row
+        return [d for d in details if d.startswith("SCAN cravings")]
+
+    plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    offenders = []
+
+    def walk(node):
+        if node.get("Node Type") == "Seq Scan" and node.get("Relation Name") == "cravings":
+            offenders.append(json.dumps(node))
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan[0]["Plan"])
+    return offenders
+
+
+def _assert_no_seq_scans(statements, explain):
+    assert statements, "expected at least one query against cravings"
+    for statement, parameters in statements:
+        offenders = explain(statement, parameters)
+        assert not offenders, f"sequential scan on cravings:\n{statement}\n{offenders}"
+
+
+def _assert_indexed(session, capture):
+    conn = session.connection()
+    _assert_no_seq_scans(capture.statements, lambda st, p: _sequential_scans(conn, st, p))
+
+
+def _assert_endpoints_indexed(async_engine, *calls):
+    """Run endpoint calls on one AsyncSession and EXPLAIN what they issued."""
+    factory = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def scenario():
+        async with factory() as db:
+            with StatementCapture(async_engine.sync_engine) as capture:
+                for call in calls:
+                    await call(db)
+            conn = await db.connection()
+            plans = [
+                (statement, await conn.run_sync(_sequential_scans, statement, parameters))
+                for statement, parameters in capture.statements
+            ]
+        return capture.statements, dict(plans)
+
+    statements, plans = asyncio.run(scenario())
+    _assert_no_seq_scans(statements, lambda st, p: plans[st])
+
+
+@pytest.mark.integration
+def test_repository_queries_use_index(plan_session):
+    repo = CravingRepository(plan_session)
+    with StatementCapture(plan_session.get_bind()) as capture:
+        repo.get_cravings_for_user(1, skip=0, limit=20)
+        repo.count_cravings_for_user(1)
+    _assert_indexed(plan_session, capture)
+
+
+@pytest.mark.integration
+def test_list_cravings_uses_index(plan_async_engine):
+    async def first_and_next_page(db):
+        first = await list_cravings(
+            user_id=2, cursor=None, include_total=True, skip=0, limit=20, db=db
+        )
+        await list_cravings(
+            user_id=2, cursor=first.next_cursor, include_total=False, skip=0, limit=20, db=db
+        )
+
+    _assert_endpoints_indexed(plan_async_engine, first_and_next_page)
+
+
+@pytest.mark.integration
+def test_sql_analytics_use_index(plan_async_engine, monkeypatch):
+    monkeypatch.setattr(get_settings(), "ANALYTICS_USE_ROLLUPS", False)
+    _assert_endpoints_indexed(
+        plan_async_engine,
+        lambda db: get_basic_craving_analytics(user_id=3, days=30, db=db),
+        lambda db: get_user_craving_summary(user_id=3, days=30, db=db),
+    )
+
+
+@pytest.mark.integration
+def test_rollup_recompute_uses_index(plan_session):
+    with StatementCapture(plan_session.get_bind()) as capture:
+        CravingRollupRepository(plan_session).recompute_day(4, datetime.utcnow().date())
+    _assert_indexed(plan_session, capture)
@@ -0,0 +1,122 @@
+# File: tests/unit/test_ai_streaming.py
+
+"""
+Tests for the Server-Sent Events modes of /ai/chat and /ai/insights.
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.api.endpoints import ai_endpoints
+from app.api.main import app
+from app.core.services import rag_service as rag_module
+from app.core.services.conversation_store import ConversationStore
+
+
+class FakeChat:
+    def __init__(self, tokens, fail_after=None):
+        self.tokens = tokens
+        self.fail_after = fail_after
+        self.calls = []
+
+    async def stream(self, messages, temperature=0.7, max_tokens=None):
+        self.calls.append(messages)
+        for i, token in enumerate(self.tokens):
+            if self.fail_after is not None and i == self.fail_after:
+                raise RuntimeError("upstream reset")
+            yield token
+
+    async def complete(self, messages, temperature=0.7, max_tokens=None):
+        self.calls.append(messages)
+        return "".join(self.tokens)
+
+
+def _events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = "message", None
+        for line in block.splitlines():
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                data = json.loads(line[len("data: "):])
+        events.append((event, data))
+    return events
+
+
+@pytest.fixture
+def client(sqlite_engine):
+    store = ConversationStore(session_factory=sessionmaker(bind=sqlite_engine))
+    app.dependency_overrides[ai_endpoints.get_current_user] = lambda: SimpleNamespace(id=1)
+    app.dependency_overrides[ai_endpoints.get_conversation_store] = lambda: store
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def _use_chat(chat):
+    app.dependency_overrides[ai_endpoints.get_openai_chat_service] = lambda: chat
+
+
+@pytest.mark.unit
+def test_chat_streams_tokens_then_done(client):
+    _use_chat(FakeChat(["Hel", "lo", "!"]))
+    response = client.post("/ai/chat", json={"userQuery": "hi", "stream": True})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["x-session-id"]
+    assert _events(response.text) == [
+        ("message", {"token": "Hel"}),
+        ("message", {"token": "lo"}),
+        ("message", {"token": "!"}),
+        ("done", {}),
+    ]
+
+
+@pytest.mark.unit
+def test_chat_without_stream_returns_whole_message(client):
+    _use_chat(FakeChat(["Hel", "lo"]))
+    response = client.post("/ai/chat", json={"userQuery": "hi"})
+    assert response.json()["message"] == "Hello"
+    assert response.json()["session_id"]
+
+
+@pytest.mark.unit
+def test_stream_errors_before_and_after_first_token(client):
+    _use_chat(FakeChat(["a"], fail_after=0))
+    assert client.post("/ai/chat", json={"userQuery": "hi", "stream": True}).status_code == 502
+
+    _use_chat(FakeChat(["a", "b"], fail_after=1))
+    response = client.post("/ai/chat", json={"userQuery": "hi", "stream": True})
+    assert response.status_code == 200
+    assert _events(response.text)[-1] == ("error", {"detail": "upstream reset"})
+
+
+@pytest.mark.unit
+def test_insights_stream_uses_retrieved_cravings(client, monkeypatch):
+    chat = FakeChat(["You ", "crave ", "sugar."])
+    monkeypatch.setattr(rag_module, "openai_chat_service", chat)
+    monkeypatch.setattr(rag_module.RAGService, "_retrieve", lambda self, *args: [])
+
+    response = client.post("/ai/insights", json={"query": "why?", "stream": True})
+    tokens = [data["token"] for event, data in _events(response.text) if event == "message"]
+    assert "".join(tokens) == "You crave sugar."
+    assert "USER QUERY: why?" in chat.calls[0][-1]["content"]
+
+
+@pytest.mark.unit
+def test_insights_require_auth_and_ignore_user_id_in_body(client, monkeypatch):
+    seen = []
+    monkeypatch.setattr(
+        rag_module.RAGService, "generate_personalized_insight", lambda self, user_id, **kwargs: seen.append(user_id) or "ok"
+    )
+    response = client.post("/ai/insights", json={"user_id": 99, "query": "why?"})
+    assert response.json() == {"answer": "ok"}
+    assert seen == [1]
+
+    app.dependency_overrides.pop(ai_endpoints.get_current_user)
+    assert client.post("/ai/insights", json={"query": "why?"}).status_code == 401
@@ -0,0 +1,134 @@
+# File: tests/unit/test_audio_blobs.py
+
+"""
+Tests for content-addressed voice audio: duplicates share one blob, reuse
+its transcript without another Whisper call, and the last delete removes it.
+"""
+
+import asyncio
+import os
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.services.transcription_worker import TranscriptionWorker
+from app.core.services.voice_logs_service import VoiceLogsService
+from app.infrastructure.database.models import AudioBlobModel, TranscriptionJobModel, VoiceLogModel
+from app.infrastructure.database.voice_logs_repository import VoiceLogRepository
+
+
+class CountingTranscriber:
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe_audio(self, voice_log):
+        self.calls += 1
+        return "craving chips again"
+
+
+@pytest.fixture
+def blob_dir(tmp_path, monkeypatch):
+    from app.config.settings import get_settings
+    path = tmp_path / "blobs"
+    monkeypatch.setattr(get_settings(), "AUDIO_BLOB_DIR", str(path))
+    return path
+
+
+@pytest.fixture
+def service(db_session, blob_dir):
+    return VoiceLogsService(VoiceLogRepository(db_session))
+
+
+def _files(root):
+    return sorted(
+        os.path.relpath(os.path.join(d, f), root) for d, _, files in os.walk(root) for f in files
+    )
+
+
+@pytest.mark.unit
+def test_duplicate_uploads_share_one_sharded_blob(service, db_session, blob_dir):
+    first = service.upload_new_voice_log(1, b"RIFF audio")
+    second = service.upload_new_voice_log(2, b"RIFF audio")
+    other = service.upload_new_voice_log(1, b"RIFF other")
+
+    sha = first.content_sha256
+    assert second.file_path == first.file_path != other.file_path
+    assert _files(blob_dir) == sorted([
+        os.path.join(sha[:2], sha[2:4], f"{sha}.wav"),
+        os.path.relpath(other.file_path, blob_dir),
+    ])
+    assert db_session.get(AudioBlobModel, sha).ref_count == 2
+
+
+@pytest.mark.unit
+def test_transcript_is_reused_for_duplicate_audio(service, db_session, sqlite_engine):
+    first = service.upload_new_voice_log(1, b"RIFF audio")
+    pending = service.upload_new_voice_log(2, b"RIFF audio")
+    service.enqueue_transcription(first.id)
+    service.enqueue_transcription(pending.id)
+
+    transcriber = CountingTranscriber()
+    worker = TranscriptionWorker(
+        session_factory=sessionmaker(bind=sqlite_engine), transcriber=transcriber, concurrency=1
+    )
+    asyncio.run(worker.drain())
+    assert transcriber.calls == 1
+
+    db_session.expire_all()
+    for voice_log_id in (first.id, pending.id):
+        assert service.get_voice_log(voice_log_id).transcribed_text == "craving chips again"
+
+    # A later duplicate is complete on upload: no job, no transcription
+    later = service.upload_new_voice_log(3, b"RIFF audio")
+    assert later.transcription_status == "COMPLETED"
+    assert service.enqueue_transcription(later.id).transcribed_text == "craving chips again"
+    assert db_session.query(TranscriptionJobModel).count() == 2
+
+
+@pytest.mark.unit
+def test_last_delete_removes_the_blob(service, db_session, blob_dir):
+    first = service.upload_new_voice_log(1, b"RIFF audio")
+    second = service.upload_new_voice_log(2, b"RIFF audio")
+    repo = service.repo
+
+    assert repo.soft_delete(first.id)
+    assert repo.soft_delete(first.id)  # deleting twice does not drop another reference
+    assert os.path.exists(second.file_path)
+    assert db_session.get(AudioBlobModel, first.content_sha256).ref_count == 1
+
+    assert repo.soft_delete(second.id)
+    assert db_session.get(AudioBlobModel, first.content_sha256) is None
+    assert _files(blob_dir) == []
+    assert db_session.query(VoiceLogModel).filter(VoiceLogModel.is_deleted == False).count() == 0
+
+
+@pytest.mark.unit
+def test_references_survive_a_blob_dir_change(service, db_session, blob_dir, tmp_path, monkeypatch):
+    from app.config.settings import get_settings
+
+    first = service.upload_new_voice_log(1, b"RIFF audio")
+    monkeypatch.setattr(get_settings(), "AUDIO_BLOB_DIR", str(tmp_path / "moved"))
+
+    assert service.repo.soft_delete(first.id)
+    assert db_session.get(AudioBlobModel, first.content_sha256) is None
+    assert _files(blob_dir) == []
+
+
+@pytest.mark.unit
+def test_rolled_back_upload_leaves_no_blob_file(service, db_session, blob_dir, monkeypatch):
+    kept = service.upload_new_voice_log(1, b"RIFF kept")
+
+    def broken_insert(voice_log):
+        raise RuntimeError("insert failed")
+
+    monkeypatch.setattr(service.repo, "create_voice_log", broken_insert)
+    with pytest.raises(RuntimeError):
+        service.upload_new_voice_log(2, b"RIFF lost")
+    # A duplicate of stored audio must not take the existing file with it
+    with pytest.raises(RuntimeError):
+        service.upload_new_voice_log(2, b"RIFF kept")
+
+    # Files only: pysqlite releases the insert's SAVEPOINT as a commit, so
+    # the "lost" row itself outlives the rollback here (not on Postgres)
+    assert _files(blob_dir) == [os.path.relpath(kept.file_path, blob_dir)]
+    assert db_session.get(AudioBlobModel, kept.content_sha256).ref_count == 1
@@ -0,0 +1,120 @@
+# File: tests/unit/test_audio_preprocessing.py
+
+"""
+Tests for audio preprocessing: 16 kHz mono output, silence trimming,
+chunking at quiet points and ordered stitching of parallel transcriptions.
+"""
+
+import contextlib
+import io
+import threading
+import time
+import wave
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.core.entities.voice_log import VoiceLog
+from app.core.services.audio_preprocessing import AudioPreprocessor, read_wav
+from app.infrastructure.external.transcription_service import TranscriptionService
+
+
+def _write_wav(path, segments, rate=44100, channels=2):
+    """segments: (seconds, amplitude) pairs; amplitude 0 is silence."""
+    parts = []
+    for seconds, amplitude in segments:
+        t = np.arange(int(seconds * rate)) / rate
+        parts.append(amplitude * np.sin(2 * np.pi * 220 * t))
+    mono = (np.concatenate(parts) * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(np.repeat(mono, channels).tobytes())
+    return str(path)
+
+
+def _chunk_info(chunk):
+    with wave.open(io.BytesIO(chunk.data), "rb") as wav:
+        return wav.getframerate(), wav.getnchannels(), wav.getnframes() / wav.getframerate()
+
+
+@pytest.mark.unit
+def test_prepare_downsamples_trims_and_splits_at_silence(tmp_path):
+    # 1s silence, 4s speech, 0.5s pause, 3s speech, 1s silence
+    path = _write_wav(tmp_path / "a.wav", [(1, 0), (4, 0.5), (0.5, 0), (3, 0.5), (1, 0)])
+    prepared = AudioPreprocessor(output_format="wav", max_chunk_seconds=5, split_search_seconds=2).prepare(path)
+
+    assert len(prepared.chunks) == 2
+    first, second = prepared.chunks
+    assert _chunk_info(first)[:2] == (16000, 1)
+    # Leading silence is gone and the cut falls inside the pause
+    assert first.start_seconds == pytest.approx(1.0, abs=0.05)
+    assert 5.0 <= first.end_seconds <= 5.5 and second.start_seconds == first.end_seconds
+    assert second.end_seconds == pytest.approx(8.5, abs=0.1)
+    assert prepared.trimmed_seconds == pytest.approx(2.0, abs=0.1)
+    assert prepared.output_bytes < prepared.input_bytes / 5
+
+    samples, rate = read_wav(path)
+    assert rate == 44100 and samples.ndim == 1
+
+
+@pytest.mark.unit
+def test_silence_only_has_no_chunks(tmp_path):
+    path = _write_wav(tmp_path / "quiet.wav", [(2, 0.001)])
+    assert AudioPreprocessor(output_format="wav").prepare(path).chunks == []
+
+
+class FakeProvider:
+    """Records concurrent transcription calls; answers with the chunk's whole seconds."""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.files = []
+        self._lock = threading.Lock()
+        self.sync_client = SimpleNamespace(audio=SimpleNamespace(transcriptions=SimpleNamespace(create=self.create)))
+
+    @contextlib.contextmanager
+    def guard(self):
+        yield
+
+    def create(self, file, model):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.files.append(file)
+        time.sleep(0.05)
+        with self._lock:
+            self.active -= 1
+        name, data = file
+        with wave.open(io.BytesIO(data), "rb") as wav:
+            return SimpleNamespace(text=f" part{int(wav.getnframes() / wav.getframerate())} ")
+
+
+@pytest.mark.unit
+def test_chunks_are_transcribed_in_parallel_and_stitched_in_order(tmp_path):
+    path = _write_wav(tmp_path / "long.wav", [(3, 0.5), (0.4, 0), (2, 0.5), (0.4, 0), (1, 0.5)], channels=1)
+    provider = FakeProvider()
+    service = TranscriptionService(
+        provider=provider,
+        preprocessor=AudioPreprocessor(output_format="wav", max_chunk_seconds=3.5, split_search_seconds=1),
+        chunk_concurrency=3,
+    )
+    voice_log = VoiceLog(id=1, user_id=1, file_path=path, created_at="2025-03-01T00:00:00")
+
+    assert service.transcribe_audio(voice_log) == "part3 part2 part1"
+    assert provider.max_active > 1
+    assert all(name == "audio.wav" for name, _ in provider.files)
+
+    # Undecodable input is sent unchanged
+    other = tmp_path / "note.m4a"
+    other.write_bytes(b"not a wav")
+    raw = TranscriptionService(provider=SimpleNamespace(
+        guard=provider.guard,
+        sync_client=SimpleNamespace(audio=SimpleNamespace(transcriptions=SimpleNamespace(
+            create=lambda file, model: SimpleNamespace(text=file.read().decode())
+        ))),
+    ), preprocessor=AudioPreprocessor())
+    assert raw.transcribe_audio(VoiceLog(user_id=1, file_path=str(other), created_at="2025-03-01T00:00:00")) == "not a wav"
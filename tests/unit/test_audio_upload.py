@@ -0,0 +1,89 @@
+# File: tests/unit/test_audio_upload.py
+
+"""
+Tests for streaming voice log uploads: chunked copy, on-the-fly hashing,
+the size cap and cleanup of rejected uploads.
+"""
+
+import asyncio
+import hashlib
+import io
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from starlette.datastructures import UploadFile
+
+from app.api.endpoints import voice_logs_endpoints
+from app.core.services.audio_upload import EmptyUpload, UploadTooLarge, stream_upload
+from app.core.services.voice_logs_service import VoiceLogsService
+from app.infrastructure.database.voice_logs_repository import VoiceLogRepository
+
+
+class CountingUpload(UploadFile):
+    """Records the size of every read, to prove the file is never read whole."""
+
+    def __init__(self, data: bytes, declare_size: bool = False):
+        super().__init__(io.BytesIO(data), size=len(data) if declare_size else None, filename="a.wav")
+        self.reads = []
+
+    async def read(self, size: int = -1) -> bytes:
+        self.reads.append(size)
+        return await super().read(size)
+
+
+def _store(upload, tmp_path, max_bytes=1024, chunk_size=100):
+    return asyncio.run(stream_upload(upload, str(tmp_path), max_bytes, chunk_size))
+
+
+@pytest.mark.unit
+def test_upload_is_streamed_in_chunks_and_hashed(tmp_path):
+    data = bytes(range(256)) * 3
+    upload = CountingUpload(data)
+    stored = _store(upload, tmp_path)
+
+    assert stored.size_bytes == len(data)
+    assert stored.sha256 == hashlib.sha256(data).hexdigest()
+    assert open(stored.path, "rb").read() == data
+    assert set(upload.reads) == {100}
+    stored.discard()
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.unit
+def test_oversized_and_empty_uploads_leave_nothing_behind(tmp_path):
+    upload = CountingUpload(b"x" * 2000)
+    with pytest.raises(UploadTooLarge):
+        _store(upload, tmp_path)
+    # Stopped at the first chunk past the cap, not after reading everything
+    assert len(upload.reads) == 11
+
+    declared = CountingUpload(b"x" * 2000, declare_size=True)
+    with pytest.raises(UploadTooLarge):
+        _store(declared, tmp_path)
+    assert declared.reads == []
+
+    with pytest.raises(EmptyUpload):
+        _store(CountingUpload(b""), tmp_path)
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.unit
+def test_create_voice_log_records_hash_and_rejects_oversized(run_with_async_db, db_session, tmp_path, monkeypatch):
+    monkeypatch.setattr(voice_logs_endpoints.get_settings(), "AUDIO_BLOB_DIR", str(tmp_path))
+    monkeypatch.setattr(voice_logs_endpoints.get_settings(), "VOICE_UPLOAD_MAX_BYTES", 1000)
+    user = SimpleNamespace(id=7)
+
+    created = run_with_async_db(
+        voice_logs_endpoints.create_voice_log, file=CountingUpload(b"RIFF" * 100), payload=None, current_user=user
+    )
+    assert created.size_bytes == 400
+    assert created.content_sha256 == hashlib.sha256(b"RIFF" * 100).hexdigest()
+    saved = VoiceLogsService(VoiceLogRepository(db_session)).get_voice_log(created.id)
+    assert saved.file_path.startswith(str(tmp_path))
+
+    with pytest.raises(HTTPException) as exc:
+        run_with_async_db(
+            voice_logs_endpoints.create_voice_log, file=CountingUpload(b"x" * 1001), payload=None, current_user=user
+        )
+    assert exc.value.status_code == 413
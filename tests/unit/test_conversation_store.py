@@ -0,0 +1,91 @@
+# File: tests/unit/test_conversation_store.py
+
+"""
+Tests for multi-turn chat memory: persistence, the session LRU and
+window compaction.
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.services.conversation_store import (
+    SUMMARY_PREFIX,
+    ConversationNotFound,
+    ConversationStore,
+)
+
+
+def _store(engine, **kwargs):
+    return ConversationStore(session_factory=sessionmaker(bind=engine), **kwargs)
+
+
+async def _summarize(previous, turns):
+    return (previous or "") + "|" + ",".join(t.content for t in turns)
+
+
+@pytest.mark.unit
+def test_follow_up_turns_reuse_history_from_cache_and_db(sqlite_engine):
+    store = _store(sqlite_engine)
+
+    async def scenario():
+        conversation = await store.open(1)
+        await store.add_turn(conversation, "I crave sugar at night", "Try a walk")
+        again = await store.open(1, conversation.session_id)
+        assert again is conversation
+        return conversation.session_id
+
+    session_id = asyncio.run(scenario())
+    assert store.stats()["hits"] == 1
+
+    # A fresh process has no cache and reads the session back from the DB
+    conversation = asyncio.run(_store(sqlite_engine).open(1, session_id))
+    assert _store(sqlite_engine).history(conversation) == [
+        {"role": "user", "content": "I crave sugar at night"},
+        {"role": "assistant", "content": "Try a walk"},
+    ]
+    assert conversation.next_seq == 3
+
+    with pytest.raises(ConversationNotFound):
+        asyncio.run(_store(sqlite_engine).open(2, session_id))
+
+
+@pytest.mark.unit
+def test_old_turns_are_summarized_out_of_the_window(sqlite_engine):
+    store = _store(sqlite_engine, max_history_messages=4)
+
+    async def scenario():
+        conversation = await store.open(1)
+        for i in range(3):
+            await store.add_turn(conversation, f"q{i}", f"a{i}", summarize=_summarize)
+        return conversation
+
+    conversation = asyncio.run(scenario())
+    history = store.history(conversation)
+    assert history[0] == {"role": "system", "content": SUMMARY_PREFIX + "|q0,a0"}
+    assert [m["content"] for m in history[1:]] == ["q1", "a1", "q2", "a2"]
+
+    # Compacted turns are not replayed after a reload either
+    reloaded = asyncio.run(_store(sqlite_engine).open(1, conversation.session_id))
+    assert reloaded.summary == "|q0,a0"
+    assert [t.content for t in reloaded.window] == ["q1", "a1", "q2", "a2"]
+
+
+@pytest.mark.unit
+def test_window_strategy_drops_and_concurrent_writer_is_reconciled(sqlite_engine):
+    store = _store(sqlite_engine, max_history_messages=2, strategy="window")
+    other = _store(sqlite_engine, max_history_messages=2, strategy="window")
+
+    async def scenario():
+        conversation = await store.open(1)
+        await store.add_turn(conversation, "q0", "a0")
+        # Another process appends to the same session behind this cache's back
+        await other.add_turn(await other.open(1, conversation.session_id), "x", "y")
+        await store.add_turn(conversation, "q1", "a1", summarize=_summarize)
+        return conversation
+
+    conversation = asyncio.run(scenario())
+    assert conversation.summary is None
+    assert [t.content for t in conversation.window] == ["q1", "a1"]
+    assert conversation.window[0].seq == 5
@@ -0,0 +1,82 @@
+# File: tests/unit/test_craving_aggregates.py
+
+"""
+Tests for the SQL-side craving aggregation layer (SQLite fallback path).
+"""
+
+import statistics
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.api.endpoints.analytics import get_basic_craving_analytics, get_user_craving_summary
+from app.config.settings import get_settings
+from app.infrastructure.database.craving_aggregates import CravingAggregateQueries
+from app.infrastructure.database.models import CravingDailyRollupModel, CravingModel
+from app.infrastructure.database.rollup_repository import CravingRollupRepository
+
+
+@pytest.fixture
+def seeded(db_session):
+    now = datetime.utcnow() - timedelta(minutes=1)
+    rows = [
+        (3.0, 8.0, now),
+        (5.0, None, now),
+        (8.0, 9.0, now - timedelta(days=2)),
+        (9.0, 1.0, now - timedelta(days=3)),
+    ]
+    for intensity, resistance, ts in rows:
+        db_session.add(CravingModel(
+            user_id=1, description="x", intensity=intensity,
+            confidence_to_resist=resistance, timestamp=ts,
+        ))
+    db_session.add(CravingModel(user_id=1, description="gone", intensity=1.0, timestamp=now, is_deleted=True))
+    db_session.add(CravingModel(user_id=2, description="other", intensity=10.0, timestamp=now))
+    db_session.commit()
+    return now, [r[0] for r in rows]
+
+
+@pytest.mark.unit
+def test_window_stats_matches_python(db_session, seeded):
+    now, intensities = seeded
+    stats = CravingAggregateQueries(db_session).window_stats(1, now - timedelta(days=30), now + timedelta(hours=1))
+    assert stats.total == 4
+    assert stats.resisted == 2
+    assert stats.average_intensity == pytest.approx(statistics.mean(intensities))
+    assert stats.average_resistance == pytest.approx(6.0)
+    assert (stats.min_intensity, stats.max_intensity) == (3.0, 9.0)
+    assert stats.intensity_stddev == pytest.approx(statistics.stdev(intensities))
+
+
+@pytest.mark.unit
+def test_daily_totals_one_row_per_day(db_session, seeded):
+    now, _ = seeded
+    buckets = CravingAggregateQueries(db_session).daily_totals(1, now - timedelta(days=30), now + timedelta(hours=1))
+    assert [(day, totals.count) for day, totals in buckets] == [
+        ((now - timedelta(days=3)).date(), 1),
+        ((now - timedelta(days=2)).date(), 1),
+        (now.date(), 2),
+    ]
+
+
+@pytest.mark.unit
+def test_rebuild_for_user(db_session, seeded):
+    written = CravingRollupRepository(db_session).rebuild_for_user(1)
+    db_session.commit()
+    assert written == 3
+    assert db_session.query(CravingDailyRollupModel).filter_by(user_id=1).count() == 3
+
+
+@pytest.mark.unit
+def test_endpoints_sql_path(db_session, seeded, monkeypatch, run_with_async_db):
+    _, intensities = seeded
+    monkeypatch.setattr(get_settings(), "ANALYTICS_USE_ROLLUPS", False)
+
+    basic = run_with_async_db(get_basic_craving_analytics, user_id=1, days=30)
+    assert basic.totalCravings == 4
+    assert basic.totalResisted == 2
+    assert len(basic.cravingsByDate) == 3
+
+    summary = run_with_async_db(get_user_craving_summary, user_id=1, days=30)
+    assert summary.total_cravings == 4
+    assert summary.std_deviation == round(statistics.stdev(intensities), 2)
@@ -0,0 +1,106 @@
+# File: tests/unit/test_craving_batch.py
+
+"""
+Tests for bulk craving ingestion (POST /cravings/batch) and the batched
+embedding step that follows it.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.endpoints.craving_logs import (
+    BatchCreateCravingsRequest,
+    CreateCravingRequest,
+    create_cravings_batch,
+)
+from app.config.settings import get_settings
+from app.core.use_cases.index_craving_embeddings import CravingToIndex, index_craving_embeddings
+from app.infrastructure.database.models import (
+    CravingDailyRollupModel,
+    CravingIndexOutboxModel,
+    CravingModel,
+)
+
+
+class FakeEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    def get_batch_embeddings(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t))] for t in texts]
+
+
+class FakeVectorRepo:
+    def __init__(self):
+        self.batches = []
+
+    def batch_upsert_embeddings(self, items):
+        self.batches.append(items)
+        return len(items)
+
+
+def _items(n, user_id=1):
+    now = datetime.utcnow() - timedelta(minutes=5)
+    return [
+        CreateCravingRequest(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            cravingDescription=f"queued craving {i}",
+            cravingStrength=float(i % 10),
+            confidenceToResist=8.0,
+            timestamp=now - timedelta(minutes=i),
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def post_batch(run_with_async_db):
+    def post(items):
+        return run_with_async_db(create_cravings_batch, request=BatchCreateCravingsRequest(cravings=items))
+    return post
+
+
+@pytest.mark.unit
+def test_batch_insert_is_idempotent(db_session, post_batch):
+    items = _items(30)
+    first = post_batch(items)
+    assert len(first.created) == 30
+    assert first.skipped == []
+
+    # Replaying the batch plus one new item inserts only the new one
+    extra = _items(1)
+    second = post_batch(items + extra)
+    assert [c.id for c in second.created] == [extra[0].id]
+    assert set(second.skipped) == {i.id for i in items}
+
+    assert db_session.query(CravingModel).count() == 31
+    rollup_total = sum(r.count for r in db_session.query(CravingDailyRollupModel).all())
+    assert rollup_total == 31
+    # Every inserted craving is queued once for vector indexing
+    assert db_session.query(CravingIndexOutboxModel).count() == 31
+
+
+@pytest.mark.unit
+def test_batch_rejects_oversized_requests(db_session, monkeypatch, post_batch):
+    monkeypatch.setattr(get_settings(), "CRAVING_BATCH_MAX_ITEMS", 5)
+    with pytest.raises(HTTPException) as exc:
+        post_batch(_items(6))
+    assert exc.value.status_code == 413
+    assert db_session.query(CravingModel).count() == 0
+
+
+@pytest.mark.unit
+def test_index_embeddings_uses_one_call_each():
+    embedder, vectors = FakeEmbedder(), FakeVectorRepo()
+    cravings = [CravingToIndex(i, 1, f"text {i}", datetime.utcnow()) for i in range(50)]
+
+    assert index_craving_embeddings(cravings, embedder=embedder, vector_repo=vectors) == 50
+    assert len(embedder.calls) == 1
+    assert len(vectors.batches) == 1
+    assert vectors.batches[0][7]["id"] == 7
+    assert vectors.batches[0][7]["metadata"]["user_id"] == 1
@@ -0,0 +1,200 @@
+# File: tests/unit/test_craving_indexing_worker.py
+
+"""
+Tests for the craving indexing outbox and the background worker that drains it.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.services.craving_indexing_worker import CravingIndexingWorker
+from app.core.services.embedding_cache import EmbeddingCache
+from app.core.services.embedding_service import EmbeddingService
+from app.infrastructure.database.models import CravingIndexOutboxModel
+from app.infrastructure.database.outbox_repository import (
+    OUTBOX_FAILED,
+    OUTBOX_PENDING,
+    CravingIndexOutboxRepository,
+)
+from app.infrastructure.database.repository import CravingRepository
+from app.utils.backoff import full_jitter_delay
+
+
+class FakeEmbedder:
+    def __init__(self):
+        self.calls = 0
+
+    def get_batch_embeddings(self, texts, fallback=True):
+        self.calls += 1
+        return [[0.1, 0.2] for _ in texts]
+
+
+class FakeVectorRepo:
+    def __init__(self, healthy=True):
+        self.healthy = healthy
+        self.upserted = {}
+        self.deleted = []
+        self.deleted_owners = set()
+
+    def batch_upsert_embeddings(self, items):
+        if not self.healthy:
+            return 0
+        for item in items:
+            self.upserted[item["id"]] = item
+        return len(items)
+
+    def delete_craving_embeddings(self, craving_ids, user_id=None):
+        if not self.healthy:
+            return False
+        self.deleted.extend(craving_ids)
+        self.deleted_owners.add(user_id)
+        return True
+
+
+def _worker(engine, vectors, **kwargs):
+    return CravingIndexingWorker(
+        session_factory=sessionmaker(bind=engine),
+        embedder=FakeEmbedder(),
+        vector_repo=vectors,
+        retry_base_delay=0.0,
+        **kwargs,
+    )
+
+
+def _outbox_rows(db):
+    db.expire_all()
+    return db.query(CravingIndexOutboxModel).all()
+
+
+@pytest.mark.unit
+def test_full_jitter_delay_bounds():
+    assert full_jitter_delay(1, base=2.0, rand=lambda: 1.0) == 2.0
+    assert full_jitter_delay(4, base=2.0, rand=lambda: 0.5) == 8.0
+    assert full_jitter_delay(30, base=2.0, cap=60.0, rand=lambda: 1.0) == 60.0
+
+
+@pytest.mark.unit
+def test_write_enqueues_and_worker_indexes_in_one_batch(db_session, sqlite_engine):
+    repo = CravingRepository(db_session)
+    ids = [repo.create_craving(1, f"craving {i}", 5.0).id for i in range(10)]
+    assert len(_outbox_rows(db_session)) == 10
+
+    vectors = FakeVectorRepo()
+    worker = _worker(sqlite_engine, vectors, batch_size=64)
+    assert worker.process_batch() == 10
+    assert worker._embedder.calls == 1
+    assert sorted(vectors.upserted) == sorted(ids)
+    assert _outbox_rows(db_session) == []
+
+
+@pytest.mark.unit
+def test_deleted_craving_removes_vector(db_session, sqlite_engine):
+    repo = CravingRepository(db_session)
+    craving = repo.create_craving(1, "to delete", 3.0)
+    vectors = FakeVectorRepo()
+    worker = _worker(sqlite_engine, vectors)
+    worker.process_batch()
+
+    repo.delete_craving(craving.id)
+    assert worker.process_batch() == 1
+    assert vectors.deleted == [craving.id]
+    assert vectors.deleted_owners == {1}
+
+
+@pytest.mark.unit
+def test_failures_retry_then_park_and_redrive(db_session, sqlite_engine):
+    CravingRepository(db_session).create_craving(1, "flaky", 4.0)
+    vectors = FakeVectorRepo(healthy=False)
+    worker = _worker(sqlite_engine, vectors, max_attempts=3)
+
+    for attempt in range(1, 4):
+        assert worker.process_batch() == 1
+        (row,) = _outbox_rows(db_session)
+        assert row.attempts == attempt
+    assert row.state == OUTBOX_FAILED
+    assert worker.process_batch() == 0
+
+    outbox = CravingIndexOutboxRepository(db_session)
+    assert outbox.state_counts()[OUTBOX_FAILED] == 1
+    assert outbox.redrive_failed() == 1
+    (row,) = _outbox_rows(db_session)
+    assert (row.state, row.attempts) == (OUTBOX_PENDING, 0)
+
+    vectors.healthy = True
+    assert worker.process_batch() == 1
+    assert _outbox_rows(db_session) == []
+
+
+@pytest.mark.unit
+def test_embedding_outage_fails_the_batch_instead_of_indexing_fallbacks(db_session, sqlite_engine):
+    craving = CravingRepository(db_session).create_craving(1, "late night chips", 6.0)
+    vectors = FakeVectorRepo()
+    embedder = EmbeddingService(cache=EmbeddingCache(max_entries=10, ttl_seconds=60))
+    worker = CravingIndexingWorker(
+        session_factory=sessionmaker(bind=sqlite_engine),
+        embedder=embedder,
+        vector_repo=vectors,
+        retry_base_delay=0.0,
+        max_attempts=2,
+    )
+
+    with patch.object(embedder.openai_service, "get_embeddings", side_effect=RuntimeError("upstream down")):
+        for attempt in (1, 2):
+            assert worker.process_batch() == 1
+            (row,) = _outbox_rows(db_session)
+            assert (row.attempts, row.last_error) == (attempt, "upstream down")
+    assert row.state == OUTBOX_FAILED
+    assert vectors.upserted == {}
+    assert embedder.cache_stats()["entries"] == 0
+
+    CravingIndexOutboxRepository(db_session).redrive_failed()
+    with patch.object(embedder.openai_service, "get_embeddings", return_value=[[0.5, 0.5]]):
+        assert worker.process_batch() == 1
+    assert vectors.upserted[craving.id]["embedding"] == pytest.approx([0.5, 0.5])
+
+
+@pytest.mark.unit
+def test_backfill_queues_live_cravings_once(db_session, sqlite_engine):
+    repo = CravingRepository(db_session)
+    ids = [repo.create_craving(1, f"old {i}", 5.0).id for i in range(3)]
+    other = repo.create_craving(2, "someone else", 5.0).id
+    repo.delete_craving(ids[2])
+    vectors = FakeVectorRepo()
+    worker = _worker(sqlite_engine, vectors)
+    worker.process_batch()
+    assert _outbox_rows(db_session) == []
+
+    outbox = CravingIndexOutboxRepository(db_session)
+    assert outbox.enqueue_all_live(user_id=1) == 2
+    assert outbox.enqueue_all_live() == 1  # user 1's are already queued
+    assert sorted(row.craving_id for row in _outbox_rows(db_session)) == sorted(ids[:2] + [other])
+
+    vectors.upserted.clear()
+    worker.process_batch()
+    assert sorted(vectors.upserted) == sorted(ids[:2] + [other])
+
+
+@pytest.mark.unit
+def test_running_worker_drains_on_notify(db_session, sqlite_engine):
+    vectors = FakeVectorRepo()
+    worker = _worker(sqlite_engine, vectors, batch_size=4, poll_interval=30.0)
+
+    async def scenario():
+        await worker.start()
+        try:
+            ids = [CravingRepository(db_session).create_craving(2, f"c{i}", 1.0).id for i in range(9)]
+            worker.notify()
+            for _ in range(200):
+                if len(vectors.upserted) == len(ids):
+                    break
+                await asyncio.sleep(0.01)
+            return ids
+        finally:
+            await worker.stop()
+
+    ids = asyncio.run(scenario())
+    assert sorted(vectors.upserted) == sorted(ids)
+    assert not worker.running
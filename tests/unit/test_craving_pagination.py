@@ -0,0 +1,85 @@
+# File: tests/unit/test_craving_pagination.py
+
+"""
+Tests for keyset (cursor) pagination of a user's cravings.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.endpoints.craving_logs import list_cravings
+from app.infrastructure.database.models import CravingModel
+from app.infrastructure.database.pagination import decode_cursor, encode_cursor
+from app.infrastructure.database.repository import CravingRepository
+
+
+@pytest.fixture
+def paged_session(db_session):
+    base = datetime(2025, 3, 1, 12, 0, 0)
+    for i in range(25):
+        # pairs of cravings share a timestamp so ties exercise the id tie-break
+        db_session.add(CravingModel(
+            user_id=1,
+            description=f"craving {i}",
+            intensity=5.0,
+            timestamp=base - timedelta(minutes=i // 2),
+            is_deleted=(i == 3),
+        ))
+    db_session.add(CravingModel(user_id=2, description="other", intensity=1.0, timestamp=base))
+    db_session.commit()
+    return db_session
+
+
+@pytest.fixture
+def list_page(paged_session, run_with_async_db):
+    def call(**kwargs):
+        params = dict(cursor=None, include_total=True, skip=0, limit=10)
+        params.update(kwargs)
+        return run_with_async_db(list_cravings, user_id=1, **params)
+    return call
+
+
+@pytest.mark.unit
+def test_cursor_round_trip():
+    ts = datetime(2025, 3, 1, 8, 30, 15, 123456)
+    assert decode_cursor(encode_cursor(ts, 42)) == (ts, 42)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.unit
+def test_pages_cover_every_live_craving_once(paged_session):
+    repo = CravingRepository(paged_session)
+    seen, cursor = [], None
+    while True:
+        page, cursor = repo.get_cravings_page(1, limit=7, cursor=cursor)
+        seen.extend(page)
+        if cursor is None:
+            break
+
+    keys = [(c.timestamp, c.id) for c in seen]
+    assert len(seen) == 24
+    assert len(set(keys)) == 24
+    assert keys == sorted(keys, reverse=True)
+    assert [c.id for c in seen] == [c.id for c in repo.get_cravings_for_user(1, skip=0, limit=100)]
+
+
+@pytest.mark.unit
+def test_list_endpoint_cursor_and_total(list_page):
+    first = list_page()
+    assert first.count == 24
+    assert len(first.cravings) == 10
+    assert first.next_cursor
+
+    second = list_page(cursor=first.next_cursor, include_total=False)
+    assert second.count is None
+    assert not {c.id for c in first.cravings} & {c.id for c in second.cravings}
+
+    last = list_page(limit=100)
+    assert last.next_cursor is None
+
+    with pytest.raises(HTTPException) as exc:
+        list_page(cursor="garbage")
+    assert exc.value.status_code == 400
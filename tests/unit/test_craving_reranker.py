@@ -0,0 +1,80 @@
+# File: tests/unit/test_craving_reranker.py
+
+"""
+Tests for the vectorised RAG re-ranker: decay curves, blended scores,
+argpartition top-k and MMR diversity.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.core.services.craving_reranker import (
+    CravingReranker,
+    LEGACY_PIECEWISE,
+    exponential_decay,
+    mmr_select,
+    piecewise_decay,
+    top_k_indices,
+)
+from app.core.services.rag_service import RetrievedCraving
+
+NOW = datetime(2025, 3, 1, 12, 0)
+
+
+def _craving(i, score, days_ago, intensity=5, embedding=None):
+    return RetrievedCraving(
+        id=i,
+        description=f"craving {i}",
+        created_at=NOW - timedelta(days=days_ago),
+        intensity=intensity,
+        score=score,
+        embedding=embedding,
+    )
+
+
+@pytest.mark.unit
+def test_decay_curves():
+    ages = np.array([0.0, 30.0, 60.0])
+    assert exponential_decay(30.0)(ages) == pytest.approx([1.0, 0.5, 0.25])
+    legacy = piecewise_decay(LEGACY_PIECEWISE)
+    assert legacy(np.array([0.0, 15.0, 30.0, 400.0])) == pytest.approx([1.0, 0.75, 0.5, 0.0])
+
+
+@pytest.mark.unit
+def test_similarity_is_blended_not_replaced():
+    reranker = CravingReranker(exponential_decay(30.0), intensity_weight=0.0, recency_floor=0.0, mmr_lambda=None)
+    fresh_weak = _craving(1, score=0.2, days_ago=0)
+    old_strong = _craving(2, score=0.9, days_ago=10)
+    ranked = reranker.rerank([fresh_weak, old_strong], top_k=2, now=NOW)
+    # Pure recency would put the fresh craving first; the blend keeps similarity
+    assert [c.id for c in ranked] == [2, 1]
+    assert old_strong.time_score == pytest.approx(0.9 * 0.5 ** (10 / 30))
+
+
+@pytest.mark.unit
+def test_intensity_breaks_ties():
+    reranker = CravingReranker(exponential_decay(30.0), intensity_weight=0.5, mmr_lambda=None)
+    mild = _craving(1, score=0.8, days_ago=1, intensity=2)
+    intense = _craving(2, score=0.8, days_ago=1, intensity=9)
+    assert [c.id for c in reranker.rerank([mild, intense], top_k=1, now=NOW)] == [2]
+
+
+@pytest.mark.unit
+def test_top_k_indices_matches_full_sort():
+    scores = np.random.default_rng(0).random(1000)
+    assert top_k_indices(scores, 10).tolist() == np.argsort(-scores)[:10].tolist()
+    assert top_k_indices(scores[:3], 10).tolist() == np.argsort(-scores[:3]).tolist()
+
+
+@pytest.mark.unit
+def test_mmr_skips_near_duplicates():
+    vectors = np.array([[1.0, 0.0], [0.999, 0.01], [0.0, 1.0]])
+    scores = np.array([0.9, 0.89, 0.6])
+    assert top_k_indices(scores, 2).tolist() == [0, 1]
+    assert mmr_select(scores, vectors, 2, mmr_lambda=0.5).tolist() == [0, 2]
+
+    reranker = CravingReranker(exponential_decay(30.0), mmr_lambda=0.5)
+    cravings = [_craving(i, s, days_ago=1, embedding=v.tolist()) for i, (s, v) in enumerate(zip(scores, vectors))]
+    assert [c.id for c in reranker.rerank(cravings, top_k=2, now=NOW)] == [0, 2]
@@ -0,0 +1,90 @@
+# File: tests/unit/test_craving_rollups.py
+
+"""
+Tests for the per-user daily craving rollups and the analytics
+endpoints that read from them.
+"""
+
+import statistics
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.api.endpoints.analytics import get_basic_craving_analytics, get_user_craving_summary
+from app.infrastructure.database.models import CravingDailyRollupModel, CravingModel
+from app.infrastructure.database.repository import CravingRepository
+from app.infrastructure.database.rollup_repository import CravingRollupRepository
+
+
+def _add_craving(db, user_id, intensity, resistance, timestamp):
+    craving = CravingModel(
+        user_id=user_id,
+        description="test craving",
+        intensity=intensity,
+        confidence_to_resist=resistance,
+        timestamp=timestamp,
+    )
+    db.add(craving)
+    db.flush()
+    CravingRollupRepository(db).apply_new_craving(craving)
+    db.commit()
+    return craving
+
+
+@pytest.mark.unit
+def test_rollup_accumulates_per_day(db_session):
+    today = datetime.utcnow().replace(hour=12)
+    _add_craving(db_session, 1, 4.0, 8.0, today)
+    _add_craving(db_session, 1, 6.0, None, today)
+    _add_craving(db_session, 1, 9.0, 2.0, today - timedelta(days=1))
+    _add_craving(db_session, 2, 5.0, 9.0, today)
+
+    rows = CravingRollupRepository(db_session).get_rollups(1, (today - timedelta(days=5)).date(), today.date())
+    assert [r.count for r in rows] == [1, 2]
+    latest = rows[-1]
+    assert latest.resisted_count == 1
+    assert latest.intensity_sum == 10.0
+    assert latest.intensity_min == 4.0
+    assert latest.intensity_max == 6.0
+    assert latest.resistance_n == 1
+
+
+@pytest.mark.unit
+def test_soft_delete_recomputes_rollup(db_session):
+    today = datetime.utcnow().replace(hour=12)
+    low = _add_craving(db_session, 1, 2.0, 8.0, today)
+    _add_craving(db_session, 1, 7.0, 3.0, today)
+
+    assert CravingRepository(db_session).delete_craving(low.id) is True
+
+    row = db_session.query(CravingDailyRollupModel).filter_by(user_id=1, day=today.date()).one()
+    assert row.count == 1
+    assert row.resisted_count == 0
+    assert row.intensity_min == 7.0
+
+    remaining = db_session.query(CravingModel).filter_by(is_deleted=False).one()
+    CravingRepository(db_session).delete_craving(remaining.id)
+    assert db_session.query(CravingDailyRollupModel).count() == 0
+
+
+@pytest.mark.unit
+def test_analytics_endpoints_read_rollups(db_session, run_with_async_db):
+    now = datetime.utcnow().replace(hour=12)
+    intensities = [3.0, 5.0, 8.0, 9.0]
+    for i, intensity in enumerate(intensities):
+        _add_craving(db_session, 1, intensity, 8.0 if i % 2 else 1.0, now - timedelta(days=i))
+    # outside the window
+    _add_craving(db_session, 1, 10.0, 10.0, now - timedelta(days=60))
+
+    basic = run_with_async_db(get_basic_craving_analytics, user_id=1, days=30)
+    assert basic.totalCravings == 4
+    assert basic.totalResisted == 2
+    assert basic.averageIntensity == pytest.approx(statistics.mean(intensities))
+    assert basic.successRate == pytest.approx(50.0)
+    assert sum(basic.cravingsByDate.values()) == 4
+
+    summary = run_with_async_db(get_user_craving_summary, user_id=1, days=30)
+    assert summary.total_cravings == 4
+    assert summary.max_intensity == 9.0
+    assert summary.min_intensity == 3.0
+    assert summary.std_deviation == round(statistics.stdev(intensities), 2)
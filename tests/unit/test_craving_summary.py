@@ -0,0 +1,105 @@
+# File: tests/unit/test_craving_summary.py
+
+"""
+Tests for per-user craving summaries: phrase extraction, incremental
+refresh by the indexing worker, and rendering into RAG prompts.
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.services.craving_indexing_worker import CravingIndexingWorker
+from app.core.services.craving_summary import render_summary, trigger_phrases
+from app.core.services.prompt_builder import PromptBuilder
+from app.core.services.token_counter import TokenCounter
+from app.infrastructure.database.models import CravingModel, UserCravingSummaryModel
+from app.infrastructure.database.repository import CravingRepository
+
+
+class NullVectorRepo:
+    def batch_upsert_embeddings(self, items):
+        return len(items)
+
+    def delete_craving_embeddings(self, craving_ids, user_id=None):
+        return True
+
+
+class FakeEmbedder:
+    def get_batch_embeddings(self, texts, fallback=True):
+        return [[0.1, 0.2] for _ in texts]
+
+
+def _worker(engine):
+    return CravingIndexingWorker(
+        session_factory=sessionmaker(bind=engine), embedder=FakeEmbedder(), vector_repo=NullVectorRepo()
+    )
+
+
+def _summary(db, user_id):
+    db.expire_all()
+    return db.get(UserCravingSummaryModel, user_id)
+
+
+@pytest.mark.unit
+def test_trigger_phrases_drop_stopwords_and_keep_pairs():
+    phrases = trigger_phrases("Wanted chocolate after a stressful work call")
+    assert {"chocolate", "stressful work", "work call"} <= phrases
+    assert "after" not in phrases and "a" not in phrases
+    assert "chocolate stressful" not in phrases  # split by a stopword
+
+
+@pytest.mark.unit
+def test_worker_folds_new_cravings_and_rebuilds_on_delete(db_session, sqlite_engine):
+    repo = CravingRepository(db_session)
+    now = datetime.utcnow()
+    ids = [
+        repo.save_new_craving(CravingModel(
+            user_id=1, description=text, intensity=6.0, emotions=emotions, timestamp=now
+        )).id
+        for text, emotions in [
+            ("chips after work stress", ["Stressed"]),
+            ("chocolate after work stress", ["stressed", "tired"]),
+        ]
+    ]
+    worker = _worker(sqlite_engine)
+    worker.process_batch()
+
+    row = _summary(db_session, 1)
+    assert row.craving_count == 2 and row.last_craving_id == ids[1]
+    assert row.summary["top_emotions"][0] == ["stressed", 2]
+    assert ["work stress", 2] in row.summary["top_phrases"]
+    assert row.summary["totals"]["count"] == 2
+    assert row.summary["weekly"][-1]["count"] == 2
+
+    # A new craving is folded in incrementally
+    repo.create_craving(1, "late night chips", 4.0)
+    worker.process_batch()
+    row = _summary(db_session, 1)
+    assert row.craving_count == 3
+    assert ["chips", 2] in row.summary["top_phrases"]
+
+    # Deleting an already-folded craving rebuilds the counts
+    repo.delete_craving(ids[1])
+    worker.process_batch()
+    row = _summary(db_session, 1)
+    assert row.craving_count == 2
+    assert row.emotion_counts == {"stressed": 1}
+    assert row.summary["totals"]["count"] == 2
+
+
+@pytest.mark.unit
+def test_summary_is_rendered_ahead_of_raw_cravings():
+    text = render_summary({
+        "totals": {"count": 12, "first_day": "2025-01-06", "avg_intensity": 6.25, "resisted": 4},
+        "weekly": [{"week": "2025-03-03", "count": 5, "avg_intensity": 7.0}],
+        "top_emotions": [["stressed", 6]],
+        "top_phrases": [["after work", 5]],
+    })
+    assert "Total cravings: 12 since 2025-01-06" in text
+    assert "stressed (6)" in text and "after work (5)" in text
+    assert render_summary({}) == ""
+
+    prompt = PromptBuilder(TokenCounter(use_tiktoken=False)).build("why?", [], summary=text)
+    assert prompt.text.index("USER HISTORY") < prompt.text.index("RELEVANT CRAVINGS")
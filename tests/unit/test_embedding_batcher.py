@@ -0,0 +1,84 @@
+# File: tests/unit/test_embedding_batcher.py
+
+"""
+Tests for single-flight coalescing and micro-batching of embedding calls.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.services.embedding_batcher import EmbeddingMicroBatcher, SingleFlight
+
+
+@pytest.mark.unit
+def test_single_flight_shares_one_call():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def slow():
+        calls.append(1)
+        release.wait(2)
+        return [1.0]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(flight.do, "same", slow) for _ in range(8)]
+        time.sleep(0.05)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert len(calls) == 1
+    assert results == [[1.0]] * 8
+    assert flight.coalesced == 7
+
+
+@pytest.mark.unit
+def test_single_flight_propagates_errors_and_forgets_key():
+    flight = SingleFlight()
+
+    def boom():
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        flight.do("k", boom)
+    assert flight.do("k", lambda: 42) == 42
+
+
+@pytest.mark.unit
+def test_micro_batcher_merges_texts_in_window():
+    one_calls, many_calls = [], []
+
+    def embed_one(text):
+        one_calls.append(text)
+        return [float(len(text))]
+
+    def embed_many(texts):
+        many_calls.append(list(texts))
+        return [[float(len(t))] for t in texts]
+
+    batcher = EmbeddingMicroBatcher(embed_one, embed_many, window_ms=100, max_batch=16)
+    texts = ["a", "bb", "ccc", "bb"]
+    with ThreadPoolExecutor(max_workers=len(texts)) as pool:
+        results = list(pool.map(batcher.embed, texts))
+
+    assert results == [[1.0], [2.0], [3.0], [2.0]]
+    assert one_calls == []
+    assert len(many_calls) == 1
+    assert sorted(many_calls[0]) == ["a", "bb", "ccc"]  # duplicates sent once
+    assert batcher.stats()["upstream_batches"] == 1
+
+
+@pytest.mark.unit
+def test_micro_batcher_single_text_uses_embed_one_and_fails_all_waiters():
+    batcher = EmbeddingMicroBatcher(lambda t: [0.5], lambda ts: [], window_ms=1)
+    assert batcher.embed("solo") == [0.5]
+
+    failing = EmbeddingMicroBatcher(lambda t: [0.5], lambda ts: [[0.0]], window_ms=100)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(failing.embed, t) for t in ("x", "y")]
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
@@ -0,0 +1,99 @@
+# File: tests/unit/test_embedding_cache.py
+
+"""
+Tests for the bounded LRU/TTL embedding cache and its SQLite tier.
+"""
+
+import pytest
+
+from app.core.services import embedding_cache as cache_module
+from app.core.services.embedding_cache import EmbeddingCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = {"t": 1_000_000.0}
+    monkeypatch.setattr(cache_module.time, "time", lambda: now["t"])
+    return now
+
+
+@pytest.mark.unit
+def test_lru_eviction_and_counters():
+    cache = EmbeddingCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", [1.0, 2.0])
+    cache.put("b", [3.0])
+    assert cache.get("a") == [1.0, 2.0]  # a becomes most recently used
+    cache.put("c", [4.0])                # evicts b
+
+    assert cache.get("b") is None
+    assert cache.get("c") == [4.0]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 1)
+    assert stats["entries"] == 2
+
+
+@pytest.mark.unit
+def test_entries_expire_and_are_float32(clock):
+    cache = EmbeddingCache(max_entries=10, ttl_seconds=60)
+    stored = cache.put("k", [0.1] * 1536)
+    assert stored == pytest.approx([0.1] * 1536)
+    assert cache._entries["k"][0].itemsize == 4
+
+    clock["t"] += 61
+    assert cache.get("k") is None
+    assert cache.stats()["expirations"] == 1
+    assert len(cache) == 0
+
+
+@pytest.mark.unit
+def test_persistent_tier_survives_restart(tmp_path, clock):
+    path = str(tmp_path / "embeddings.sqlite")
+    first = EmbeddingCache(max_entries=10, ttl_seconds=60, persistent_path=path)
+    first.put("warm", [0.5, 0.25])
+    first.close()
+
+    second = EmbeddingCache(max_entries=10, ttl_seconds=60, persistent_path=path)
+    assert second.get("warm") == [0.5, 0.25]
+    assert second.stats()["disk_hits"] == 1
+    second.close()
+
+    clock["t"] += 120
+    third = EmbeddingCache(max_entries=10, ttl_seconds=60, persistent_path=path)
+    assert third.get("warm") is None
+    third.close()
+
+
+@pytest.mark.unit
+def test_memory_hits_do_not_wait_for_disk(tmp_path):
+    import threading
+
+    cache = EmbeddingCache(max_entries=10, ttl_seconds=60, persistent_path=str(tmp_path / "e.sqlite"))
+    cache.put("hot", [1.0])
+    cache.flush()
+
+    results = []
+    with cache._disk_lock:  # a slow disk read or write in progress
+        worker = threading.Thread(target=lambda: results.extend([cache.get("hot"), cache.put("new", [2.0])]))
+        worker.start()
+        worker.join(timeout=2)
+        assert not worker.is_alive()
+    assert results == [[1.0], [2.0]]
+    cache.close()
+
+
+@pytest.mark.unit
+def test_disk_tier_is_pruned_and_capped(tmp_path, clock):
+    import sqlite3
+
+    path = str(tmp_path / "e.sqlite")
+    cache = EmbeddingCache(max_entries=100, ttl_seconds=60, persistent_path=path, disk_max_entries=5, prune_every=1)
+    cache.put("old", [0.0])
+    cache.flush()
+    clock["t"] += 61
+    for i in range(20):
+        cache.put(f"k{i}", [float(i)])
+    cache.close()
+
+    keys = {row[0] for row in sqlite3.connect(path).execute("SELECT key FROM embeddings")}
+    # Expired rows are gone and the newest entries are kept
+    assert keys == {f"k{i}" for i in range(15, 20)}
@@ -0,0 +1,119 @@
+# File: tests/unit/test_insight_cache.py
+
+"""
+Tests for the semantic insight cache and its use in RAGService.
+"""
+
+from datetime import date, datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core.services.insight_cache import InsightCache
+from app.core.services.rag_service import RAGService
+from app.infrastructure.database.craving_aggregates import RollupTotals
+from app.infrastructure.database.rollup_repository import CravingRollupRepository
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.unit
+def test_near_duplicate_question_hits_and_counts_saved_tokens():
+    cache = InsightCache(similarity_threshold=0.95)
+    cache.put(1, "v1", [1.0, 0.0, 0.0], "answer", tokens=120)
+
+    assert cache.get(1, "v1", [0.99, 0.05, 0.0]) == "answer"
+    assert cache.get(1, "v1", [0.0, 1.0, 0.0]) is None
+    assert cache.get(2, "v1", [1.0, 0.0, 0.0]) is None
+    assert cache.get(1, "v1", [1.0, 0.0, 0.0], variant="coach|5|1") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 3
+    assert stats["hit_rate"] == 0.25
+    assert stats["saved_tokens"] == 120
+
+
+@pytest.mark.unit
+def test_new_data_version_invalidates_user_entries():
+    cache = InsightCache()
+    cache.put(1, "v1", [1.0, 0.0], "old")
+    assert cache.get(1, "v2", [1.0, 0.0]) is None
+
+    cache.put(1, "v2", [0.0, 1.0], "new")
+    assert cache.get(1, "v1", [1.0, 0.0]) is None
+    assert cache.stats()["entries"] == 1
+
+    cache.invalidate_user(1)
+    assert cache.get(1, "v2", [0.0, 1.0]) is None
+    assert cache.stats()["invalidations"] == 2
+
+
+@pytest.mark.unit
+def test_entries_expire_and_users_are_bounded():
+    clock = Clock()
+    cache = InsightCache(max_users=2, max_per_user=2, ttl_seconds=10, clock=clock)
+    cache.put(1, "v", [1.0, 0.0], "a")
+    clock.now = 11
+    assert cache.get(1, "v", [1.0, 0.0]) is None
+
+    for i in range(3):
+        cache.put(1, "v", [1.0, float(i)], str(i))
+    assert cache.stats()["entries"] == 2
+
+    cache.put(2, "v", [1.0], "b")
+    cache.put(3, "v", [1.0], "c")
+    assert cache.get(1, "v", [1.0, 2.0]) is None
+    assert cache.stats()["users"] == 2
+
+
+@pytest.mark.unit
+def test_data_version_changes_with_cravings(db_session):
+    repo = CravingRollupRepository(db_session)
+    empty = repo.data_version(1)
+
+    totals = RollupTotals()
+    totals.add(5, None)
+    repo._upsert_delta(1, date(2025, 3, 1), totals)
+    first = repo.data_version(1)
+    assert first != empty
+    assert repo.data_version(2) == empty
+
+    repo._delete_rollups(1, date.min, date.max)
+    assert repo.data_version(1) == empty
+
+
+@pytest.mark.unit
+def test_rag_service_reuses_answer_until_data_changes(monkeypatch):
+    from app.core.services import rag_service as rag_module
+    from app.core.services.embedding_service import get_embedding_service
+
+    version = {"value": "v1"}
+    service = RAGService(
+        cache=InsightCache(), data_version=lambda user_id: version["value"], summary_loader=None
+    )
+    monkeypatch.setattr(get_embedding_service(), "get_embedding", lambda text: [1.0, 0.0])
+    service.vector_repository = MagicMock()
+    service.vector_repository.search_cravings.return_value = {
+        "matches": [{
+            "id": "1",
+            "score": 0.9,
+            "metadata": {"description": "chips", "created_at": datetime.utcnow().isoformat(), "intensity": 6},
+        }]
+    }
+    chat = MagicMock()
+    chat.complete_sync.side_effect = ["first", "second"]
+    monkeypatch.setattr(rag_module, "openai_chat_service", chat)
+
+    assert service.generate_personalized_insight(1, "why chips?") == "first"
+    assert service.generate_personalized_insight(1, "why chips?") == "first"
+    assert chat.complete_sync.call_count == 1
+
+    version["value"] = "v2"
+    assert service.generate_personalized_insight(1, "why chips?") == "second"
+    assert service.insight_cache.stats()["saved_tokens"] > 0
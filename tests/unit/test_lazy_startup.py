@@ -0,0 +1,53 @@
+# File: tests/unit/test_lazy_startup.py
+
+"""
+Importing the app must stay cheap and side-effect free: no network access,
+no output, and no heavy SDKs until a provider is first used.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+
+PROBE = """
+import json, socket, sys
+def _blocked(self, address, *args, **kwargs):
+    raise RuntimeError("network access during import: %r" % (address,))
+socket.socket.connect = _blocked
+import app.api.main
+from app.infrastructure.database import session
+print(json.dumps({
+    "loaded": sorted(m for m in ("openai", "httpx", "pinecone", "sentry_sdk") if m in sys.modules),
+    "engine_built": session.current_engine() is not None,
+}))
+"""
+
+
+@pytest.mark.unit
+def test_importing_the_app_builds_nothing_and_stays_offline():
+    proc = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=ROOT, capture_output=True, text=True, timeout=120
+    )
+    assert proc.returncode == 0, proc.stderr
+    # The probe's own line is the only output
+    assert json.loads(proc.stdout) == {"loaded": [], "engine_built": False}
+
+
+@pytest.mark.unit
+def test_lifespan_warms_providers_and_disposes_engine(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.api import main
+    from app.infrastructure.database import session
+
+    monkeypatch.setattr(main.get_settings(), "INDEXING_WORKER_ENABLED", False)
+    monkeypatch.setattr(main.get_settings(), "TRANSCRIPTION_WORKER_ENABLED", False)
+    monkeypatch.setattr(main.get_settings(), "STARTUP_WARM_PROVIDERS", True)
+    with TestClient(main.app):
+        assert session.current_engine() is not None
+    assert session.current_engine() is None
@@ -0,0 +1,148 @@
+# File: tests/unit/test_local_vector_index.py
+
+"""
+Tests for the in-process vector index (exact and IVF search, persistence).
+"""
+
+import numpy as np
+import pytest
+
+from app.infrastructure.vector_db.filters import matches_filter
+from app.infrastructure.vector_db.local_index import LocalVectorIndex
+from app.infrastructure.vector_db.vector_repository import VectorRepository
+
+
+def _vectors(n, dim=16, seed=0):
+    return np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+
+
+def _items(vectors, user_id=1, start=0):
+    return [
+        {"id": str(start + i), "values": v.tolist(), "metadata": {"user_id": user_id, "intensity": i % 10}}
+        for i, v in enumerate(vectors)
+    ]
+
+
+@pytest.mark.unit
+def test_exact_search_matches_numpy(tmp_path):
+    vectors = _vectors(200)
+    index = LocalVectorIndex(str(tmp_path))
+    index.upsert(_items(vectors))
+
+    query = vectors[17] + 0.01
+    result = index.query(query.tolist(), top_k=5)
+
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = np.argsort(-(unit @ (query / np.linalg.norm(query))))[:5]
+    assert [m["id"] for m in result["matches"]] == [str(i) for i in expected]
+    assert result["matches"][0]["id"] == "17"
+    assert result["matches"][0]["metadata"]["user_id"] == 1
+
+
+@pytest.mark.unit
+def test_partitions_filters_and_deletes(tmp_path):
+    index = LocalVectorIndex(str(tmp_path))
+    index.upsert(_items(_vectors(20, seed=1), user_id=1))
+    index.upsert(_items(_vectors(20, seed=2), user_id=2, start=100))
+
+    query = _vectors(1, seed=3)[0].tolist()
+    only_user_2 = index.query(query, top_k=50, filter={"user_id": 2})
+    assert {m["metadata"]["user_id"] for m in only_user_2["matches"]} == {2}
+    assert len(only_user_2["matches"]) == 20
+
+    intense = index.query(query, top_k=50, filter={"user_id": 1, "intensity": {"$gte": 8}})
+    assert {m["metadata"]["intensity"] for m in intense["matches"]} == {8, 9}
+
+    index.delete(["100", "101"])
+    assert index.describe_index_stats()["namespaces"]["user-2"]["vector_count"] == 18
+    # Freed slots are reused rather than growing the file
+    index.upsert(_items(_vectors(1, seed=4), user_id=2, start=500))
+    assert len(index._partitions["user-2"].ids) == 20
+
+
+@pytest.mark.unit
+def test_index_persists_across_reopen(tmp_path):
+    vectors = _vectors(50)
+    index = LocalVectorIndex(str(tmp_path))
+    index.upsert(_items(vectors))
+    index.delete(["3"])
+    index.close()
+
+    reopened = LocalVectorIndex(str(tmp_path))
+    assert reopened.describe_index_stats()["total_vector_count"] == 49
+    top = reopened.query(vectors[10].tolist(), top_k=1)["matches"][0]
+    assert top["id"] == "10"
+    assert top["score"] == pytest.approx(1.0, abs=1e-5)
+    assert "3" not in {m["id"] for m in reopened.query(vectors[3].tolist(), top_k=49)["matches"]}
+
+
+@pytest.mark.unit
+def test_ivf_recall_on_clustered_data(tmp_path):
+    rng = np.random.default_rng(5)
+    centers = rng.standard_normal((20, 32))
+    vectors = (centers[rng.integers(0, 20, 2000)] + 0.1 * rng.standard_normal((2000, 32))).astype(np.float32)
+    index = LocalVectorIndex(str(tmp_path), ivf_threshold=500, nprobe=4)
+    index.upsert(_items(vectors))
+    assert index.describe_index_stats()["namespaces"]["user-1"]["ivf_lists"] > 0
+
+    exact = LocalVectorIndex(str(tmp_path / "exact"), ivf_threshold=10**9)
+    exact.upsert(_items(vectors))
+    recall = []
+    for q in vectors[:20] + 0.05:
+        got = {m["id"] for m in index.query(q.tolist(), top_k=10)["matches"]}
+        want = {m["id"] for m in exact.query(q.tolist(), top_k=10)["matches"]}
+        recall.append(len(got & want) / 10)
+    assert np.mean(recall) >= 0.9
+
+
+@pytest.mark.unit
+def test_shrunk_partition_returns_to_exact_search_across_restart(tmp_path):
+    vectors = _vectors(200)
+    index = LocalVectorIndex(str(tmp_path), ivf_threshold=50)
+    index.upsert(_items(vectors))
+    assert index.describe_index_stats()["namespaces"]["user-1"]["ivf_lists"] > 0
+    assert (tmp_path / "user-1.centroids.npy").exists()
+
+    index.delete([str(i) for i in range(10, 200)])
+    assert index.describe_index_stats()["namespaces"]["user-1"]["ivf_lists"] == 0
+    assert not (tmp_path / "user-1.centroids.npy").exists()
+    index.close()
+
+    reopened = LocalVectorIndex(str(tmp_path), ivf_threshold=50)
+    assert reopened.describe_index_stats()["namespaces"]["user-1"] == {"vector_count": 10, "ivf_lists": 0}
+    assert len(reopened.query(vectors[0].tolist(), top_k=3)["matches"]) == 3
+
+
+@pytest.mark.unit
+def test_stale_centroids_are_ignored_below_threshold_on_restart(tmp_path):
+    vectors = _vectors(200)
+    index = LocalVectorIndex(str(tmp_path), ivf_threshold=50)
+    index.upsert(_items(vectors))
+    index.close()
+
+    # Same files, higher threshold: the saved centroids must not switch IVF back on
+    reopened = LocalVectorIndex(str(tmp_path), ivf_threshold=500)
+    assert reopened.describe_index_stats()["namespaces"]["user-1"]["ivf_lists"] == 0
+    assert not (tmp_path / "user-1.centroids.npy").exists()
+    assert len(reopened.query(vectors[0].tolist(), top_k=20)["matches"]) == 20
+
+
+@pytest.mark.unit
+def test_filter_operators():
+    metadata = {"user_id": 1, "intensity": 7, "trigger": "stress"}
+    assert matches_filter(metadata, {"intensity": {"$gt": 5, "$lte": 7}})
+    assert matches_filter(metadata, {"trigger": {"$in": ["stress", "boredom"]}})
+    assert not matches_filter(metadata, {"$or": [{"user_id": 2}, {"trigger": "hunger"}]})
+    assert not matches_filter(metadata, {"missing": {"$gt": 1}})
+
+
+@pytest.mark.unit
+def test_repository_uses_injected_backend(tmp_path):
+    repo = VectorRepository(backend=LocalVectorIndex(str(tmp_path)))
+    vectors = _vectors(3)
+    assert repo.batch_upsert_embeddings(
+        [{"id": i, "embedding": v.tolist(), "metadata": {"user_id": 9}} for i, v in enumerate(vectors)]
+    ) == 3
+    assert repo.search_cravings(vectors[2].tolist(), top_k=1)["matches"][0]["id"] == "2"
+    assert repo.delete_craving_embeddings([0, 1, 2])
+    assert repo.get_namespace_stats()["total_vector_count"] == 0
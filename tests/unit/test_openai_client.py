@@ -0,0 +1,131 @@
+# File: tests/unit/test_openai_client.py
+
+"""
+Tests for the shared OpenAI provider: circuit breaker and call guards.
+"""
+
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+from app.infrastructure.external.openai_client import (
+    CircuitBreaker,
+    CircuitOpenError,
+    OpenAIProvider,
+    is_upstream_failure,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _server_error(status=503):
+    request = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+    return openai.APIStatusError("boom", response=httpx.Response(status, request=request), body=None)
+
+
+def _provider(clock, **kwargs):
+    return OpenAIProvider(api_key="test", http2=False, breaker=CircuitBreaker(2, 10.0, clock=clock), **kwargs)
+
+
+@pytest.mark.unit
+def test_breaker_opens_fails_fast_and_recovers():
+    clock = Clock()
+    provider = _provider(clock)
+    for _ in range(2):
+        with pytest.raises(openai.APIStatusError):
+            with provider.guard():
+                raise _server_error()
+    assert provider.breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        with provider.guard():
+            pass
+
+    clock.now = 11.0
+    assert provider.breaker.state == "half_open"
+    with provider.guard():
+        # Only the trial call is let through while half-open
+        with pytest.raises(CircuitOpenError):
+            provider.breaker.before_call()
+    assert provider.breaker.state == "closed"
+
+
+@pytest.mark.unit
+def test_failed_trial_reopens_and_client_errors_do_not_count():
+    clock = Clock()
+    provider = _provider(clock)
+    for _ in range(5):
+        with pytest.raises(openai.APIStatusError):
+            with provider.guard():
+                raise _server_error(400)
+    assert provider.breaker.state == "closed"
+    assert is_upstream_failure(_server_error(429))
+
+    for _ in range(2):
+        with pytest.raises(openai.APIStatusError):
+            with provider.guard():
+                raise _server_error()
+    clock.now = 11.0
+    with pytest.raises(openai.APIStatusError):
+        with provider.guard():
+            raise _server_error()
+    assert provider.breaker.state == "open"
+
+
+@pytest.mark.unit
+def test_async_guard_limits_concurrency():
+    provider = _provider(Clock(), max_concurrency=2)
+    peak = {"now": 0, "max": 0}
+
+    async def call():
+        async with provider.aguard():
+            peak["now"] += 1
+            peak["max"] = max(peak["max"], peak["now"])
+            await asyncio.sleep(0.01)
+            peak["now"] -= 1
+
+    async def main():
+        await asyncio.gather(*(call() for _ in range(6)))
+
+    asyncio.run(main())
+    assert peak["max"] == 2
+    assert provider.stats()["in_flight"] == 0
+
+
+@pytest.mark.unit
+def test_clients_are_built_once_and_shared():
+    provider = _provider(Clock())
+    assert provider.sync_client is provider.sync_client
+    assert provider.async_client is provider.async_client
+    asyncio.run(provider.aclose())
+
+
+@pytest.mark.unit
+def test_embedding_errors_propagate_and_open_breaker_fails_fast():
+    from types import SimpleNamespace
+
+    from app.infrastructure.external.openai_embedding import OpenAIEmbeddingService
+
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        raise _server_error()
+
+    provider = _provider(Clock())
+    provider._sync_client = SimpleNamespace(embeddings=SimpleNamespace(create=create))
+    service = OpenAIEmbeddingService(provider)
+    for _ in range(2):
+        with pytest.raises(openai.APIStatusError):
+            service.get_embeddings(["chips"])
+    # No random vectors, and no upstream call while the breaker is open
+    with pytest.raises(CircuitOpenError):
+        service.embed_text("chips")
+    assert len(calls) == 2
@@ -0,0 +1,74 @@
+# File: tests/unit/test_prompt_builder.py
+
+"""
+Tests for the token-budgeted RAG prompt builder.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from app.core.services.prompt_builder import PromptBuilder
+from app.core.services.rag_service import RetrievedCraving
+from app.core.services.token_counter import TokenCounter
+
+
+def _craving(i, description, intensity=5):
+    return RetrievedCraving(
+        id=i,
+        description=description,
+        created_at=datetime(2025, 3, i % 28 + 1, 21, 15, 42),
+        intensity=intensity,
+        score=0.87654321,
+    )
+
+
+def _builder(**kwargs):
+    return PromptBuilder(TokenCounter(use_tiktoken=False), **kwargs)
+
+
+@pytest.mark.unit
+def test_prompt_is_compact_and_keeps_rank_order():
+    prompt = _builder().build("Why at night?", [_craving(1, "Chocolate after dinner", 7), _craving(2, "Chips")])
+
+    assert "USER QUERY: Why at night?" in prompt.text
+    assert "- 2025-03-02, intensity 7/10: Chocolate after dinner" in prompt.text
+    assert prompt.text.index("Chocolate") < prompt.text.index("Chips")
+    # IDs, raw scores and full timestamps are not sent
+    assert "0.876" not in prompt.text and "21:15" not in prompt.text
+    assert prompt.included == 2 and prompt.dropped == 0
+
+
+@pytest.mark.unit
+def test_budget_is_respected_and_long_descriptions_truncated():
+    builder = _builder(budget_tokens=120, max_description_tokens=10)
+    cravings = [_craving(i, "sugar " * 50) for i in range(20)]
+    prompt = builder.build("why?", cravings)
+
+    assert prompt.tokens <= 120
+    assert 0 < prompt.included < 20
+    assert prompt.dropped == 20 - prompt.included
+    assert prompt.truncated == prompt.included
+    assert "…" in prompt.text
+
+    stats = builder.stats.snapshot()
+    assert stats["prompts"] == 1 and stats["last_tokens"] == prompt.tokens
+
+
+@pytest.mark.unit
+def test_smaller_lower_ranked_cravings_fill_leftover_budget():
+    builder = _builder(budget_tokens=80, max_description_tokens=200)
+    prompt = builder.build("q", [_craving(1, "x" * 400), _craving(2, "short one")])
+
+    assert "short one" in prompt.text
+    assert prompt.included == 1 and prompt.dropped == 1
+
+
+@pytest.mark.unit
+def test_no_cravings_and_truncate_word_boundary():
+    assert "No relevant cravings found." in _builder().build("q", []).text
+
+    counter = TokenCounter(use_tiktoken=False)
+    cut = counter.truncate("alpha beta gamma delta epsilon zeta", 5)
+    assert cut.endswith("…") and counter.count(cut) <= 5
+    assert not cut[:-1].endswith(" ")
@@ -60,7 +60,7 @@ def mock_search_results():
 class TestRAGService:
     @patch("app.core.services.embedding_service.embedding_service.get_embedding")
     @patch("app.infrastructure.vector_db.vector_repository.VectorRepository.search_cravings")
-    @patch("openai.ChatCompletion.create")
+    @patch("app.infrastructure.external.openai_chat.OpenAIChatService.complete_sync")
     def test_generate_personalized_insight(
         self,
         mock_chat_create,
@@ -74,9 +74,7 @@ class TestRAGService:
         """
         mock_get_embedding.return_value = mock_embedding
         mock_search_cravings.return_value = mock_search_results
-        mock_chat_create.return_value = MagicMock(
-            choices=[MagicMock(message=MagicMock(content="Mocked RAG answer"))]
-        )
+        mock_chat_create.return_value = "Mocked RAG answer"
 
         service = RAGService()
         result = service.generate_personalized_insight(
@@ -140,7 +138,8 @@ class TestEmbeddingService:
         cache_key = service._get_cache_key(test_text)
         assert service._get_from_cache(cache_key) is None
         service._add_to_cache(cache_key, [0.1, 0.2])
-        assert service._get_from_cache(cache_key) == [0.1, 0.2]
+        # Cached vectors are stored as float32
+        assert service._get_from_cache(cache_key) == pytest.approx([0.1, 0.2])
 
     @patch("app.infrastructure.external.openai_embedding.OpenAIEmbeddingService.embed_text")
     def test_get_embedding_with_cache(self, mock_embed_text):
@@ -160,8 +159,8 @@ class TestEmbeddingService:
         texts = ["Text 1", "Text 2"]
         results = service.get_batch_embeddings(texts)
         assert len(results) == 2
-        assert results[0] == [0.1]
-        assert results[1] == [0.2]
+        assert results[0] == pytest.approx([0.1])
+        assert results[1] == pytest.approx([0.2])
 
     @patch("app.infrastructure.external.openai_embedding.OpenAIEmbeddingService.embed_text")
     def test_error_handling(self, mock_embed_text):
@@ -0,0 +1,119 @@
+# File: tests/unit/test_transcription_backends.py
+
+"""
+Tests for pluggable transcription backends: selection through settings,
+the local faster-whisper backend (model loaded once, chunks capped at its
+worker count) and its failure modes. faster-whisper itself is replaced by a
+fake module, so nothing is downloaded and no network is used.
+"""
+
+import sys
+import threading
+import time
+import wave
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.config.settings import get_settings
+from app.core.entities.voice_log import VoiceLog
+from app.core.services.audio_preprocessing import AudioPreprocessor
+from app.infrastructure.external import transcription_backends
+from app.infrastructure.external.transcription_backends import LocalWhisperBackend, OpenAIWhisperBackend
+from app.infrastructure.external.transcription_service import TranscriptionService
+
+
+class FakeWhisperModel:
+    """Stands in for faster_whisper.WhisperModel; answers with each chunk's whole seconds."""
+
+    instances = []
+
+    def __init__(self, model_size, device, compute_type, cpu_threads, num_workers):
+        self.options = dict(model_size=model_size, device=device, compute_type=compute_type, num_workers=num_workers)
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        FakeWhisperModel.instances.append(self)
+
+    def transcribe(self, audio, beam_size, language):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.05)
+        with self._lock:
+            self.active -= 1
+        with wave.open(audio, "rb") as wav:
+            seconds = int(wav.getnframes() / wav.getframerate())
+        segments = (SimpleNamespace(text=text) for text in (f" part{seconds}", " done"))
+        return segments, SimpleNamespace(language=language or "en")
+
+
+@pytest.fixture
+def local_backend(monkeypatch):
+    FakeWhisperModel.instances = []
+    monkeypatch.setitem(sys.modules, "faster_whisper", SimpleNamespace(WhisperModel=FakeWhisperModel))
+    monkeypatch.setattr(transcription_backends, "_local_models", {})
+    settings = get_settings()
+    monkeypatch.setattr(settings, "TRANSCRIPTION_BACKEND", "local")
+    monkeypatch.setattr(settings, "LOCAL_WHISPER_MODEL", "tiny")
+    monkeypatch.setattr(settings, "LOCAL_WHISPER_NUM_WORKERS", 2)
+
+
+def _write_wav(path, segments, rate=16000):
+    parts = [amplitude * np.sin(2 * np.pi * 220 * np.arange(int(s * rate)) / rate) for s, amplitude in segments]
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes((np.concatenate(parts) * 32767).astype("<i2").tobytes())
+    return str(path)
+
+
+@pytest.mark.unit
+def test_local_backend_is_selected_and_loads_the_model_once(local_backend, tmp_path):
+    path = _write_wav(tmp_path / "a.wav", [(3, 0.5), (0.4, 0), (2, 0.5), (0.4, 0), (1, 0.5)])
+    voice_log = VoiceLog(id=1, user_id=1, file_path=path, created_at="2025-03-01T00:00:00")
+
+    service = TranscriptionService.from_settings()
+    assert isinstance(service.backend, LocalWhisperBackend)
+    assert FakeWhisperModel.instances == []  # nothing loaded until needed
+
+    service.preprocessor = AudioPreprocessor(output_format="wav", max_chunk_seconds=3.5, split_search_seconds=1)
+    assert service.transcribe_audio(voice_log) == "part3 done part2 done part1 done"
+
+    # A second service (and a second call) reuses the loaded model
+    other = TranscriptionService.from_settings()
+    other.backend.load()
+    service.transcribe_audio(voice_log)
+    assert len(FakeWhisperModel.instances) == 1
+    model = FakeWhisperModel.instances[0]
+    assert model.options == dict(model_size="tiny", device="cpu", compute_type="int8", num_workers=2)
+    # Three chunks, but never more in flight than the model has workers
+    assert model.max_active == 2
+
+    # Files that skip preprocessing go to the model as open files
+    raw = TranscriptionService(backend=LocalWhisperBackend(model=model))
+    with open(path, "rb") as f:
+        assert raw._perform_transcription(f) == "part6 done"
+
+
+@pytest.mark.unit
+def test_backend_selection_and_missing_package(monkeypatch):
+    settings = get_settings()
+    assert isinstance(TranscriptionService.from_settings().backend, OpenAIWhisperBackend)
+
+    monkeypatch.setattr(settings, "TRANSCRIPTION_BACKEND", "carrier-pigeon")
+    with pytest.raises(ValueError):
+        TranscriptionService.from_settings()
+
+    monkeypatch.setattr(settings, "TRANSCRIPTION_BACKEND", "local")
+    monkeypatch.setattr(transcription_backends, "_local_models", {})
+    monkeypatch.setitem(sys.modules, "faster_whisper", None)
+    with pytest.raises(RuntimeError, match="faster-whisper"):
+        TranscriptionService.from_settings().backend.load()
+
+    # The per-call error names the backend, so a worker's last_error is useful
+    service = TranscriptionService(backend=LocalWhisperBackend(model_size="tiny"))
+    with pytest.raises(Exception, match=r"Transcription failed \(local\)"):
+        service._perform_transcription(("audio.wav", b""))
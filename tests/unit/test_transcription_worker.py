@@ -0,0 +1,130 @@
+# File: tests/unit/test_transcription_worker.py
+
+"""
+Tests for background transcription: enqueue returns at once, the worker
+pool runs jobs, retries with backoff and parks exhausted jobs as FAILED.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.entities.voice_log import VoiceLog
+from app.core.services.transcription_worker import TranscriptionWorker
+from app.core.services.voice_logs_service import VoiceLogsService
+from app.infrastructure.database.models import TranscriptionJobModel
+from app.infrastructure.database.voice_logs_repository import VoiceLogRepository
+
+
+class FlakyTranscriber:
+    """Fails the first `failures` calls, then returns the file name."""
+
+    def __init__(self, failures=0, delay=0.0):
+        self.failures = failures
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def transcribe_audio(self, voice_log):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            fail = self.calls <= self.failures
+        try:
+            time.sleep(self.delay)
+            if fail:
+                raise RuntimeError("upstream timeout")
+            return f"text for {voice_log.file_path}"
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def _enqueue(db, path="a.wav"):
+    repo = VoiceLogRepository(db)
+    voice_log = repo.create_voice_log(VoiceLog(
+        user_id=1, file_path=path, created_at=datetime.utcnow(), transcription_status="PENDING"
+    ))
+    VoiceLogsService(repo).enqueue_transcription(voice_log.id)
+    return voice_log.id
+
+
+def _worker(engine, transcriber, **kwargs):
+    return TranscriptionWorker(
+        session_factory=sessionmaker(bind=engine), transcriber=transcriber,
+        retry_base_delay=0.0, **kwargs
+    )
+
+
+@pytest.mark.unit
+def test_enqueue_is_idempotent_and_worker_completes_job(db_session, sqlite_engine):
+    voice_log_id = _enqueue(db_session)
+    VoiceLogsService(VoiceLogRepository(db_session)).enqueue_transcription(voice_log_id)
+    assert db_session.query(TranscriptionJobModel).count() == 1
+
+    transcriber = FlakyTranscriber()
+    assert asyncio.run(_worker(sqlite_engine, transcriber).drain()) == 1
+
+    db_session.expire_all()
+    voice_log = VoiceLogRepository(db_session).get_by_id(voice_log_id)
+    assert voice_log.transcription_status == "COMPLETED"
+    assert voice_log.transcribed_text == "text for a.wav"
+    job = VoiceLogsService(VoiceLogRepository(db_session)).get_transcription_job(voice_log_id)
+    assert job.state == "COMPLETED" and transcriber.calls == 1
+
+
+@pytest.mark.unit
+def test_failures_retry_then_park_as_failed(db_session, sqlite_engine):
+    voice_log_id = _enqueue(db_session)
+    worker = _worker(sqlite_engine, FlakyTranscriber(failures=10), max_attempts=3)
+    service = VoiceLogsService(VoiceLogRepository(db_session))
+
+    worker.process_one()
+    db_session.expire_all()
+    assert service.get_voice_log(voice_log_id).transcription_status == "PENDING"
+    assert service.get_transcription_job(voice_log_id).attempts == 1
+
+    asyncio.run(worker.drain())
+    db_session.expire_all()
+    job = service.get_transcription_job(voice_log_id)
+    assert (job.state, job.attempts, job.last_error) == ("FAILED", 3, "upstream timeout")
+    assert service.get_voice_log(voice_log_id).transcription_status == "FAILED"
+
+    # A missing audio file is not retried
+    other_id = _enqueue(db_session, path="missing.wav")
+
+    class MissingFile:
+        def transcribe_audio(self, voice_log):
+            raise FileNotFoundError(voice_log.file_path)
+
+    _worker(sqlite_engine, MissingFile(), max_attempts=3).process_one()
+    db_session.expire_all()
+    assert service.get_transcription_job(other_id).state == "FAILED"
+
+
+@pytest.mark.unit
+def test_pool_runs_jobs_concurrently_up_to_its_size(db_session, sqlite_engine):
+    for i in range(4):
+        _enqueue(db_session, path=f"{i}.wav")
+    transcriber = FlakyTranscriber(delay=0.2)
+    worker = _worker(sqlite_engine, transcriber, concurrency=2, poll_interval=0.05)
+
+    async def scenario():
+        await worker.start()
+        deadline = time.monotonic() + 10
+        while transcriber.calls < 4 or transcriber.active:
+            assert time.monotonic() < deadline
+            await asyncio.sleep(0.05)
+        await worker.stop()
+
+    asyncio.run(scenario())
+    assert transcriber.max_active == 2
+    db_session.expire_all()
+    assert {j.state for j in db_session.query(TranscriptionJobModel)} == {"COMPLETED"}
@@ -0,0 +1,101 @@
+# File: tests/unit/test_vector_search.py
+
+"""
+Tests for user-scoped vector search: namespaces, metadata filters and
+over-fetch / re-rank in VectorRepository.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.infrastructure.vector_db.filters import CravingVectorFilter, craving_metadata
+from app.infrastructure.vector_db.local_index import LocalVectorIndex
+from app.infrastructure.vector_db.vector_repository import VectorRepository
+
+
+class RecordingBackend:
+    """Returns canned matches and records what was asked of it."""
+
+    def __init__(self, matches):
+        self.matches = matches
+        self.queries = []
+
+    def query(self, vector, top_k, include_metadata=True, filter=None, namespace=None, include_values=False):
+        self.queries.append({"top_k": top_k, "filter": filter, "namespace": namespace})
+        return {"matches": self.matches}
+
+
+def _repo_with_cravings(tmp_path):
+    rng = np.random.default_rng(0)
+    now = datetime(2025, 3, 1, 12, 0)
+    repo = VectorRepository(backend=LocalVectorIndex(str(tmp_path)))
+    items = []
+    for i in range(40):
+        user_id = 1 if i < 30 else 2
+        items.append({
+            "id": i,
+            "embedding": rng.standard_normal(8).tolist(),
+            "metadata": craving_metadata(user_id, f"craving {i}", now - timedelta(days=i), float(i % 10)),
+        })
+    repo.batch_upsert_embeddings(items)
+    return repo, items, now
+
+
+@pytest.mark.unit
+def test_search_touches_only_the_users_namespace(tmp_path):
+    repo, items, _ = _repo_with_cravings(tmp_path)
+    stats = repo.get_namespace_stats()["namespaces"]
+    assert stats["user-1"]["vector_count"] == 30
+    assert stats["user-2"]["vector_count"] == 10
+
+    # User 2's own vector is the best match for its embedding, but never for user 1
+    query = items[35]["embedding"]
+    user_2 = repo.search_cravings(query, top_k=3, user_id=2)["matches"]
+    user_1 = repo.search_cravings(query, top_k=50, user_id=1)["matches"]
+    assert user_2[0]["id"] == "35"
+    assert {m["metadata"]["user_id"] for m in user_1} == {1}
+    assert len(user_1) == 30
+
+
+@pytest.mark.unit
+def test_date_and_intensity_filters(tmp_path):
+    repo, items, now = _repo_with_cravings(tmp_path)
+    filters = CravingVectorFilter(
+        start=now - timedelta(days=9), end=now - timedelta(days=2), min_intensity=5
+    )
+    matches = repo.search_cravings(items[0]["embedding"], top_k=50, user_id=1, filters=filters)["matches"]
+    assert sorted(int(m["id"]) for m in matches) == [5, 6, 7, 8, 9]
+
+
+@pytest.mark.unit
+def test_overfetch_rechecks_dedupes_and_reranks(monkeypatch):
+    from app.infrastructure.vector_db import vector_repository as module
+    monkeypatch.setattr(module.settings, "VECTOR_SEARCH_OVERFETCH", 4)
+
+    meta = {"user_id": 7, "is_deleted": False}
+    backend = RecordingBackend([
+        {"id": "1", "score": 0.5, "metadata": meta},
+        {"id": "2", "score": 0.9, "metadata": {"user_id": 7, "is_deleted": True}},
+        {"id": "3", "score": 0.7, "metadata": meta},
+        {"id": "1", "score": 0.8, "metadata": meta},
+        {"id": "4", "score": 0.95, "metadata": {"user_id": 8}},
+    ])
+    repo = VectorRepository(backend=backend)
+    matches = repo.search_cravings([0.1, 0.2], top_k=2, user_id=7)["matches"]
+
+    assert [(m["id"], m["score"]) for m in matches] == [("1", 0.8), ("3", 0.7)]
+    sent = backend.queries[0]
+    assert sent["top_k"] == 8
+    assert sent["namespace"] == "user-7"
+    assert sent["filter"]["user_id"] == {"$eq": 7}
+    assert sent["filter"]["is_deleted"] == {"$ne": True}
+
+
+@pytest.mark.unit
+def test_unscoped_search_is_unchanged():
+    backend = RecordingBackend([{"id": "1", "score": 0.5, "metadata": {}}])
+    repo = VectorRepository(backend=backend)
+    assert repo.search_cravings([0.1], top_k=5)["matches"][0]["id"] == "1"
+    assert backend.queries == [{"top_k": 5, "filter": None, "namespace": None}]